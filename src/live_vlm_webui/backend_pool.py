@@ -0,0 +1,391 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Backend Pool
+Routes VLM requests across several equivalent OpenAI-compatible replicas
+(e.g. vLLM/Ollama instances on different GPUs or hosts) with health checks,
+ejection of failing backends and automatic failover.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Iterable, List, Optional
+
+import aiohttp
+from openai import AsyncOpenAI
+
+from .fast_client import FastChatClient
+from .ollama_client import OllamaChatClient
+from .rate_limiter import QuotaLimiter
+
+logger = logging.getLogger(__name__)
+
+# Supported routing strategies
+ROUTING_STRATEGIES = ("least_outstanding", "latency_weighted")
+
+
+class Backend:
+    """A single OpenAI-compatible VLM endpoint and its routing statistics"""
+
+    def __init__(
+        self,
+        api_base: str,
+        api_key: str = "EMPTY",
+        ewma_alpha: float = 0.3,
+        max_retries: Optional[int] = None,
+    ):
+        """
+        Initialize backend
+
+        Args:
+            api_base: Base URL for the API (e.g., "http://gpu1:8000/v1")
+            api_key: API key (use "EMPTY" for local servers)
+            ewma_alpha: Smoothing factor for the latency moving average (0-1)
+            max_retries: Client-level retries (default: OpenAI SDK default). Use 0 when
+                failing over to other replicas so a dead backend is abandoned immediately.
+        """
+        self.api_base = api_base.rstrip("/")
+        self.api_key = api_key if api_key else "EMPTY"
+        client_kwargs = {} if max_retries is None else {"max_retries": max_retries}
+        self.client = AsyncOpenAI(base_url=self.api_base, api_key=self.api_key, **client_kwargs)
+        self._fast_client: Optional[FastChatClient] = None
+        self._ollama_client: Optional[OllamaChatClient] = None
+        self._closed = False
+        self.ewma_alpha = ewma_alpha
+        self.limiter: Optional[QuotaLimiter] = None  # Shared quota of this API base and key
+
+        # Routing state
+        self.outstanding = 0  # Requests currently in flight on this backend
+        self.healthy = True
+        self.warming = False  # Warm-up request still running (see warmup.ModelWarmer)
+        self.ejected_until = 0.0  # time.monotonic() deadline, 0 = not ejected
+        self.last_used = 0.0  # time.monotonic() of the last finished request
+
+        # Statistics
+        self.total_requests = 0
+        self.total_errors = 0
+        self.consecutive_failures = 0
+        self.last_latency = 0.0  # seconds
+        self.ewma_latency = 0.0  # seconds, 0 until the first success
+        self.last_error: Optional[str] = None
+
+    @property
+    def fast_client(self) -> FastChatClient:
+        """Raw HTTP client for the fast request path (created on first use)"""
+        if self._fast_client is None:
+            if self._closed:
+                raise RuntimeError(f"Backend {self.api_base} is closed")
+            self._fast_client = FastChatClient(self.api_base, self.api_key)
+        return self._fast_client
+
+    @property
+    def ollama_client(self) -> OllamaChatClient:
+        """Client for Ollama's native API (created on first use)"""
+        if self._ollama_client is None:
+            if self._closed:
+                raise RuntimeError(f"Backend {self.api_base} is closed")
+            self._ollama_client = OllamaChatClient(self.api_base, self.api_key)
+        return self._ollama_client
+
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections"""
+        self._closed = True
+        if self._fast_client is not None:
+            await self._fast_client.aclose()
+            self._fast_client = None
+        if self._ollama_client is not None:
+            await self._ollama_client.aclose()
+            self._ollama_client = None
+        await self.client.close()
+
+    def is_available(self, now: Optional[float] = None) -> bool:
+        """Check if the backend may receive traffic (healthy, warm and not ejected)"""
+        if now is None:
+            now = time.monotonic()
+        return self.healthy and not self.warming and now >= self.ejected_until
+
+    def record_success(self, latency: float) -> None:
+        """
+        Record a successful request
+
+        Args:
+            latency: Backend round-trip time in seconds
+        """
+        self.total_requests += 1
+        self.consecutive_failures = 0
+        self.last_used = time.monotonic()
+        self.last_latency = latency
+        if self.ewma_latency == 0.0:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency += self.ewma_alpha * (latency - self.ewma_latency)
+
+    def record_failure(self, error: Exception) -> None:
+        """
+        Record a failed request
+
+        Args:
+            error: Exception raised by the request
+        """
+        self.total_requests += 1
+        self.total_errors += 1
+        self.consecutive_failures += 1
+        self.last_used = time.monotonic()
+        self.last_error = str(error)
+
+    def get_stats(self) -> dict:
+        """
+        Get routing statistics for this backend
+
+        Returns:
+            Dict with latency, error and availability stats
+        """
+        return {
+            "api_base": self.api_base,
+            "healthy": self.healthy,
+            "warming": self.warming,
+            "ejected": time.monotonic() < self.ejected_until,
+            "outstanding": self.outstanding,
+            "total_requests": self.total_requests,
+            "total_errors": self.total_errors,
+            "error_rate": (
+                self.total_errors / self.total_requests if self.total_requests > 0 else 0.0
+            ),
+            "last_latency_ms": self.last_latency * 1000,
+            "ewma_latency_ms": self.ewma_latency * 1000,
+            "last_error": self.last_error,
+            "rate_limit": self.limiter.get_stats() if self.limiter else None,
+        }
+
+
+class BackendPool:
+    """
+    Pool of equivalent VLM backends
+
+    Requests are routed to the backend with the fewest outstanding requests
+    ("least_outstanding") or the lowest expected latency given its current load
+    ("latency_weighted"). Backends that fail repeatedly are ejected for a while;
+    an active health probe against /models ejects dead backends early and
+    reinstates recovered ones.
+    """
+
+    def __init__(
+        self,
+        backends: Iterable[Backend],
+        strategy: str = "least_outstanding",
+        max_failures: int = 3,
+        ejection_time: float = 30.0,
+        health_check_interval: float = 10.0,
+        health_check_timeout: float = 2.0,
+    ):
+        """
+        Initialize backend pool
+
+        Args:
+            backends: Backends to route across (the first one is the primary)
+            strategy: Routing strategy, one of ROUTING_STRATEGIES
+            max_failures: Consecutive failures before a backend is ejected
+            ejection_time: Seconds an ejected backend is kept out of rotation
+            health_check_interval: Seconds between active health probes
+            health_check_timeout: Timeout for a single health probe in seconds
+        """
+        self.backends: List[Backend] = list(backends)
+        if not self.backends:
+            raise ValueError("BackendPool requires at least one backend")
+        if strategy not in ROUTING_STRATEGIES:
+            raise ValueError(
+                f"Unknown routing strategy '{strategy}' (expected one of {ROUTING_STRATEGIES})"
+            )
+
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.ejection_time = ejection_time
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+
+        self._rr_counter = 0  # Round-robin tie breaker
+        self._health_task: Optional[asyncio.Task] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def __len__(self) -> int:
+        return len(self.backends)
+
+    @property
+    def primary(self) -> Backend:
+        """The first configured backend (used for model listing)"""
+        return self.backends[0]
+
+    def _score(self, backend: Backend) -> float:
+        """Lower is better"""
+        if self.strategy == "latency_weighted":
+            # Expected completion time if we queue behind the in-flight requests.
+            # Unmeasured backends score 0 so they get probed with real traffic first.
+            return backend.ewma_latency * (backend.outstanding + 1)
+        return float(backend.outstanding)
+
+    def select(self, exclude: Iterable[Backend] = ()) -> Optional[Backend]:
+        """
+        Pick the backend for the next request
+
+        Args:
+            exclude: Backends that must not be chosen (e.g. already tried)
+
+        Returns:
+            Selected backend, or None if every backend is excluded
+        """
+        excluded = set(id(b) for b in exclude)
+        candidates = [b for b in self.backends if id(b) not in excluded]
+        if not candidates:
+            return None
+
+        now = time.monotonic()
+        available = [b for b in candidates if b.is_available(now)]
+        if not available:
+            # Everything is ejected - fail open on the backend that recovers first
+            # rather than refusing traffic entirely
+            return min(candidates, key=lambda b: (not b.healthy, b.ejected_until))
+
+        # Rotate the starting point so ties are spread evenly
+        self._rr_counter = (self._rr_counter + 1) % len(available)
+        rotated = available[self._rr_counter :] + available[: self._rr_counter]
+        return min(rotated, key=self._score)
+
+    def record_success(self, backend: Backend, latency: float) -> None:
+        """Record a successful request on a backend"""
+        backend.record_success(latency)
+        if backend.ejected_until:
+            backend.ejected_until = 0.0
+
+    def record_failure(self, backend: Backend, error: Exception) -> None:
+        """Record a failed request on a backend, ejecting it if it keeps failing"""
+        backend.record_failure(error)
+        if backend.consecutive_failures >= self.max_failures:
+            self._eject(backend, f"{backend.consecutive_failures} consecutive failures")
+
+    def _eject(self, backend: Backend, reason: str) -> None:
+        if len(self.backends) == 1:
+            # Nothing to fail over to, keep the single backend in rotation
+            return
+        backend.ejected_until = time.monotonic() + self.ejection_time
+        logger.warning(
+            f"Ejecting backend {backend.api_base} for {self.ejection_time:.0f}s ({reason})"
+        )
+
+    async def check_health(self, backend: Backend) -> bool:
+        """
+        Actively probe a backend by listing its models
+
+        Args:
+            backend: Backend to probe
+
+        Returns:
+            True if the backend answered GET /models with HTTP 200
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.health_check_timeout)
+            )
+
+        headers = {}
+        if backend.api_key and backend.api_key != "EMPTY":
+            headers["Authorization"] = f"Bearer {backend.api_key}"
+
+        try:
+            async with self._session.get(f"{backend.api_base}/models", headers=headers) as resp:
+                ok = resp.status == 200
+                if not ok:
+                    backend.last_error = f"Health check returned HTTP {resp.status}"
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            ok = False
+            backend.last_error = f"Health check failed: {e or type(e).__name__}"
+
+        if ok and not backend.healthy:
+            logger.info(f"Backend {backend.api_base} is healthy again")
+            backend.ejected_until = 0.0
+            backend.consecutive_failures = 0
+        elif not ok and backend.healthy:
+            logger.warning(f"Backend {backend.api_base} failed health check")
+        backend.healthy = ok or len(self.backends) == 1
+        return ok
+
+    async def check_all(self) -> List[bool]:
+        """Probe all backends concurrently"""
+        return await asyncio.gather(*[self.check_health(b) for b in self.backends])
+
+    async def _health_loop(self) -> None:
+        logger.info(
+            f"Backend health checks started for {len(self.backends)} backends "
+            f"(every {self.health_check_interval:.0f}s)"
+        )
+        try:
+            while True:
+                await self.check_all()
+                await asyncio.sleep(self.health_check_interval)
+        except asyncio.CancelledError:
+            logger.info("Backend health checks stopped")
+
+    @property
+    def health_checks_running(self) -> bool:
+        """Whether the periodic health probe task is active"""
+        return self._health_task is not None and not self._health_task.done()
+
+    def start_health_checks(self) -> None:
+        """Start the periodic health probe task (requires a running event loop)"""
+        if not self.health_checks_running:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def stop_health_checks(self) -> None:
+        """Stop the health probe task and close its HTTP session"""
+        if self._health_task and not self._health_task.done():
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+        self._health_task = None
+
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def retire(self, grace: float) -> None:
+        """
+        Stop health checks and close the backends once their requests finished
+
+        Args:
+            grace: Seconds to wait for in-flight requests before closing anyway
+        """
+        await self.stop_health_checks()
+        deadline = time.monotonic() + grace
+        while any(b.outstanding for b in self.backends) and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Stop health checks and close all backend connections"""
+        await self.stop_health_checks()
+        for backend in self.backends:
+            await backend.aclose()
+
+    def get_stats(self) -> List[dict]:
+        """
+        Get per-backend statistics
+
+        Returns:
+            List of per-backend stat dicts (see Backend.get_stats)
+        """
+        return [b.get_stats() for b in self.backends]
@@ -0,0 +1,226 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Capacity Calibration
+Measures what the configured backends can sustain and derives the sampling
+interval and in-flight limit from it, instead of guessing --process-every.
+
+A short ramp sends synthetic frames (full max_tokens, like real requests) at
+increasing concurrency. Throughput grows with concurrency until the backend
+saturates; beyond that point only latency grows. The recommended in-flight limit
+is the lowest concurrency that reaches most of the peak throughput, and the
+sampling interval spreads that throughput over the active streams.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+from .warmup import synthetic_image
+
+if TYPE_CHECKING:
+    from .vlm_service import VLMService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEVELS = (1, 2, 4, 8)
+
+# Share of the peak throughput at which the backend counts as saturated
+SATURATION = 0.9
+
+
+def _percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    rank = max(int(math.ceil(p / 100 * len(ordered))), 1)
+    return ordered[rank - 1]
+
+
+class CalibrationError(Exception):
+    """Raised when no calibration request succeeded"""
+
+
+async def run_level(
+    service: "VLMService", concurrency: int, requests: int, image, timeout: float
+) -> dict:
+    """
+    Send a fixed number of synthetic requests with a fixed number of workers
+
+    Args:
+        service: VLM service whose backend pool is measured
+        concurrency: Requests kept in flight
+        requests: Total requests of this level
+        image: Synthetic frame to send
+        timeout: Timeout of a single request in seconds
+
+    Returns:
+        Dict with throughput, latency percentiles and errors of the level
+    """
+    latencies: List[float] = []
+    errors: List[str] = []
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            backend = service.backend_pool.select() or service.backend_pool.primary
+            start = time.perf_counter()
+            try:
+                await service.send_synthetic_request(
+                    backend, image, timeout, max_tokens=service.max_tokens
+                )
+            except Exception as e:
+                errors.append(str(e) or type(e).__name__)
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+
+    level = {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": len(errors),
+        "throughput_rps": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "mean_ms": sum(latencies) / len(latencies) * 1000 if latencies else None,
+        "p50_ms": _percentile(latencies, 50) * 1000 if latencies else None,
+        "p95_ms": _percentile(latencies, 95) * 1000 if latencies else None,
+    }
+    if errors:
+        level["last_error"] = errors[-1]
+    return level
+
+
+def recommend(
+    levels: List[dict],
+    sessions: int,
+    fps: float = 30.0,
+    latency_slo_ms: Optional[float] = None,
+) -> dict:
+    """
+    Derive the in-flight limit and per-stream sampling interval from a ramp
+
+    Args:
+        levels: Results of run_level() in ramp order
+        sessions: Number of streams sharing the backend (at least 1 is assumed)
+        fps: Frame rate of the streams, to convert the interval to --process-every
+        latency_slo_ms: Ignore levels whose p95 latency exceeds this
+
+    Returns:
+        Dict with max_in_flight, capacity_rps, interval_s and process_every
+
+    Raises:
+        CalibrationError: If no level had a successful request
+    """
+    usable = [
+        level
+        for level in levels
+        if level["throughput_rps"] > 0
+        and (latency_slo_ms is None or level["p95_ms"] <= latency_slo_ms)
+        and level["errors"] == 0
+    ]
+    if not usable:
+        # Nothing met the SLO without errors; fall back to the most conservative level
+        usable = [level for level in levels if level["throughput_rps"] > 0][:1]
+    if not usable:
+        raise CalibrationError("No calibration request succeeded")
+
+    peak = max(level["throughput_rps"] for level in usable)
+    knee = next(level for level in usable if level["throughput_rps"] >= SATURATION * peak)
+    sessions = max(sessions, 1)
+    capacity = knee["throughput_rps"]
+    interval = sessions / capacity
+    return {
+        "max_in_flight": knee["concurrency"],
+        "capacity_rps": capacity,
+        "latency_p95_ms": knee["p95_ms"],
+        "sessions": sessions,
+        "fps": fps,
+        "interval_s": interval,
+        "process_every": max(1, min(3600, math.ceil(interval * fps))),
+    }
+
+
+async def calibrate(
+    service: "VLMService",
+    levels: Sequence[int] = DEFAULT_LEVELS,
+    requests_per_level: Optional[int] = None,
+    sessions: int = 1,
+    fps: float = 30.0,
+    latency_slo_ms: Optional[float] = None,
+    timeout: float = 60.0,
+) -> dict:
+    """
+    Run a concurrency ramp against the service's backends and recommend settings
+
+    The ramp stops early once throughput stops growing (the backend is saturated) or
+    requests fail. Live frames are skipped while calibrating, and calibration requests
+    are not recorded in the latency metrics.
+
+    Args:
+        service: VLM service to calibrate
+        levels: Concurrency levels in increasing order
+        requests_per_level: Requests per level (default: 2 per worker, at least 4)
+        sessions: Streams the recommendation is computed for
+        fps: Frame rate of the streams
+        latency_slo_ms: Highest acceptable p95 latency (default: none)
+        timeout: Timeout of a single request in seconds
+
+    Returns:
+        Dict with the measured levels, the recommendation and the duration
+
+    Raises:
+        CalibrationError: If no calibration request succeeded
+    """
+    image = synthetic_image(service.image_profile)
+    results: List[dict] = []
+    start = time.monotonic()
+    logger.info(f"Calibrating {service.model} at concurrency {list(levels)}")
+
+    service.calibrating = True
+    try:
+        for concurrency in levels:
+            requests = requests_per_level or max(4, 2 * concurrency)
+            level = await run_level(service, concurrency, requests, image, timeout)
+            results.append(level)
+            logger.info(
+                f"Calibration c={concurrency}: {level['throughput_rps']:.2f} req/s, "
+                f"p95={level['p95_ms'] or 0:.0f}ms, errors={level['errors']}"
+            )
+            if level["errors"]:
+                break
+            previous = results[-2]["throughput_rps"] if len(results) > 1 else 0.0
+            if previous and level["throughput_rps"] < previous * 1.1:
+                break  # Saturated: more concurrency only adds queueing
+    finally:
+        service.calibrating = False
+
+    recommendation = recommend(results, sessions, fps, latency_slo_ms)
+    logger.info(
+        f"Calibration: capacity {recommendation['capacity_rps']:.2f} req/s at "
+        f"{recommendation['max_in_flight']} in flight; for {recommendation['sessions']} "
+        f"stream(s) sample every {recommendation['interval_s']:.1f}s "
+        f"(--process-every {recommendation['process_every']} at {fps:g} fps)"
+    )
+    return {
+        "model": service.model,
+        "levels": results,
+        "recommendation": recommendation,
+        "duration_s": time.monotonic() - start,
+    }
@@ -0,0 +1,317 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Camera Registry
+RTSP cameras shared by every viewer of the same URL.
+
+Without sharing, each browser tab watching a camera opens its own RTSP
+connection, decodes the stream again and runs its own analysis, so N viewers
+cost N times the network, decode CPU and VLM requests for identical answers.
+The registry keeps one connection, one decode and one analysis per URL. Peer
+connections get a viewer track fed from that single pipeline; WebSocket clients
+and /api/rtsp sessions just hold the camera open. The camera is torn down when
+its last holder releases it.
+
+With passthrough, H.264 viewers get the camera's encoded packets instead of
+decoded frames, so aiortc only packetizes them: no encode per viewer.
+"""
+
+import asyncio
+import logging
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from aiortc import MediaStreamTrack
+from aiortc.mediastreams import MediaStreamError
+
+logger = logging.getLogger(__name__)
+
+
+class ViewerTrack(MediaStreamTrack):
+    """
+    Video track of one viewer of a shared camera
+
+    Holds only the newest analyzed frame: a viewer whose encoder falls behind
+    skips frames instead of delaying the camera or the other viewers.
+    """
+
+    kind = "video"
+
+    def __init__(self, camera: "Camera"):
+        super().__init__()
+        self._camera = camera
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+
+    def _push(self, frame) -> None:
+        """Hand over a frame (None = the camera ended)"""
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(frame)
+
+    async def recv(self):
+        if self.readyState != "live":
+            raise MediaStreamError
+        frame = await self._queue.get()
+        if frame is None:
+            self.stop()
+            raise MediaStreamError
+        return frame
+
+    def stop(self) -> None:
+        super().stop()
+        self._camera._viewers.discard(self)
+        self._camera._packet_viewers.discard(self)
+
+
+class PacketViewerTrack(ViewerTrack):
+    """
+    Video track of a viewer receiving the camera's encoded packets (passthrough)
+
+    Packets of an encoded stream cannot be skipped one by one: the viewer starts at
+    a keyframe, and one that falls too far behind drops its backlog and resumes at
+    the next keyframe. The server-side text overlay is not drawn on this video.
+    """
+
+    # Packets queued before the backlog is dropped (about 2 s at 30 fps)
+    MAX_BACKLOG = 60
+
+    def __init__(self, camera: "Camera"):
+        super().__init__(camera)
+        self._queue = asyncio.Queue()
+        self._synced = False  # A keyframe was queued since the start or the last drop
+        self.dropped_packets = 0
+
+    def _push(self, packet) -> None:
+        if packet is None:
+            self._queue.put_nowait(None)
+            return
+        if self._queue.qsize() >= self.MAX_BACKLOG:
+            self.dropped_packets += self._queue.qsize()
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._synced = False
+        if not (self._synced or packet.is_keyframe):
+            self.dropped_packets += 1
+            return
+        self._synced = True
+        self._queue.put_nowait(packet)
+
+    def stop(self) -> None:
+        super().stop()
+        self._camera.rtsp_track.packet_sinks.discard(self._push)
+
+
+class Camera:
+    """One RTSP source: connection, decode and analysis shared by all its holders"""
+
+    def __init__(self, url: str, rtsp_track, processor_track):
+        """
+        Args:
+            url: RTSP URL the camera was opened with
+            rtsp_track: RTSPVideoTrack of the connection
+            processor_track: VideoProcessorTrack analyzing rtsp_track
+        """
+        self.url = url
+        self.rtsp_track = rtsp_track
+        self.processor_track = processor_track
+        self.holders = set()  # Peer connections, WebSocket clients, API session keys
+        self._viewers = set()  # ViewerTracks of peer connections
+        self._packet_viewers = set()  # PacketViewerTracks of passthrough peer connections
+        self._task = asyncio.create_task(self._run())
+
+    @property
+    def session_id(self) -> str:
+        """Session id of the camera's analysis"""
+        return self.processor_track.session_id
+
+    @property
+    def ref_count(self) -> int:
+        return len(self.holders)
+
+    @property
+    def can_passthrough(self) -> bool:
+        """Whether viewers can get the encoded packets (H.264 cameras)"""
+        return getattr(self.rtsp_track, "codec", None) == "h264"
+
+    def subscribe(self, passthrough: bool = False) -> ViewerTrack:
+        """
+        New video track for a peer connection
+
+        Args:
+            passthrough: Forward the camera's H.264 packets instead of analyzed frames
+                (the peer connection must send H.264; see can_passthrough)
+        """
+        if passthrough:
+            viewer = PacketViewerTrack(self)
+            self._packet_viewers.add(viewer)
+            self.rtsp_track.packet_sinks.add(viewer._push)
+        else:
+            viewer = ViewerTrack(self)
+            self._viewers.add(viewer)
+        return viewer
+
+    async def _run(self):
+        """Pull frames through the analysis and fan them out to the viewers"""
+        try:
+            while True:
+                frame = await self.processor_track.recv()
+                for viewer in list(self._viewers):
+                    viewer._push(frame)
+        except (StopAsyncIteration, MediaStreamError):
+            logger.info(f"Camera {self.session_id} stream ended")
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Error reading camera {self.session_id}: {e}")
+        finally:
+            for viewer in list(self._viewers | self._packet_viewers):
+                viewer._push(None)
+            logger.info(f"Frame consumption stopped for {self.session_id}")
+
+    async def close(self) -> None:
+        """Stop the connection, the frame task and the analysis"""
+        logger.info(f"Stopping camera {self.session_id}...")
+
+        # Stopping the RTSP track first makes a pending recv() return promptly
+        try:
+            self.rtsp_track.stop()
+        except Exception as e:
+            logger.error(f"Error stopping RTSP track: {e}", exc_info=True)
+
+        await asyncio.sleep(0.1)
+
+        if not self._task.done():
+            self._task.cancel()
+            try:
+                await asyncio.wait_for(self._task, timeout=2.0)
+            except asyncio.CancelledError:
+                logger.debug(f"Frame task cancelled for {self.session_id}")
+            except asyncio.TimeoutError:
+                logger.warning(f"Frame task cancellation timeout for {self.session_id}")
+            except Exception as e:
+                logger.warning(f"Error waiting for frame task: {e}")
+
+        try:
+            self.processor_track.stop()
+        except Exception as e:
+            logger.warning(f"Error stopping processor track: {e}")
+        logger.info(f"Camera stopped: {self.session_id}")
+
+    def get_stats(self) -> dict:
+        """
+        Get sharing statistics of the camera
+
+        Returns:
+            Dictionary with the session id, holder and viewer counts
+        """
+        return {
+            "session_id": self.session_id,
+            "holders": self.ref_count,
+            "viewers": len(self._viewers) + len(self._packet_viewers),
+            "passthrough_viewers": len(self._packet_viewers),
+            "running": not self._task.done(),
+        }
+
+
+class CameraRegistry:
+    """
+    Open cameras, deduplicated by URL and reference-counted by holder
+
+    Example:
+        camera = registry.acquire(url, pc)
+        pc.addTrack(camera.subscribe())
+        ...
+        await registry.release(url, pc)
+    """
+
+    def __init__(self, open_camera: Callable[[str, Optional[str]], Tuple[object, object]]):
+        """
+        Args:
+            open_camera: Called with (url, session_id) for a URL that is not open
+                yet; connects and returns (rtsp_track, processor_track). May raise.
+        """
+        self.open_camera = open_camera
+        self._cameras: Dict[str, Camera] = {}
+
+    def __len__(self) -> int:
+        return len(self._cameras)
+
+    def get(self, url: str) -> Optional[Camera]:
+        return self._cameras.get(url.strip())
+
+    def cameras(self) -> List[Camera]:
+        return list(self._cameras.values())
+
+    def acquire(self, url: str, holder: Hashable, session_id: Optional[str] = None) -> Camera:
+        """
+        Open a camera or join the one already open for url
+
+        Opening is synchronous, so concurrent callers never connect twice.
+
+        Args:
+            url: RTSP URL
+            holder: Owner of the reference (released with the same object)
+            session_id: Analysis session id if the camera is opened now
+
+        Returns:
+            The shared Camera
+
+        Raises:
+            Exception: Whatever open_camera raises when the connection fails
+        """
+        url = url.strip()
+        camera = self._cameras.get(url)
+        if camera is None:
+            rtsp_track, processor_track = self.open_camera(url, session_id)
+            camera = Camera(url, rtsp_track, processor_track)
+            self._cameras[url] = camera
+            logger.info(f"Camera {camera.session_id} opened")
+        camera.holders.add(holder)
+        logger.info(f"Camera {camera.session_id}: {camera.ref_count} holder(s)")
+        return camera
+
+    async def release(self, url: str, holder: Hashable) -> bool:
+        """
+        Drop a holder's reference; closes the camera after the last one
+
+        Returns:
+            True if the camera was closed
+        """
+        url = url.strip()
+        camera = self._cameras.get(url)
+        if camera is None or holder not in camera.holders:
+            return False
+        camera.holders.discard(holder)
+        if camera.holders:
+            logger.info(f"Camera {camera.session_id}: {camera.ref_count} holder(s)")
+            return False
+        del self._cameras[url]
+        # Finish the teardown even if the releasing handler is cancelled (closed WebSocket)
+        await asyncio.shield(camera.close())
+        return True
+
+    async def release_all(self, holder: Hashable) -> None:
+        """Drop every reference of a holder (e.g. a closed WebSocket)"""
+        for camera in self.cameras():
+            if holder in camera.holders:
+                await self.release(camera.url, holder)
+
+    async def close_all(self) -> None:
+        """Close every camera regardless of holders (server shutdown)"""
+        cameras = self.cameras()
+        self._cameras.clear()
+        for camera in cameras:
+            camera.holders.clear()
+            await camera.close()
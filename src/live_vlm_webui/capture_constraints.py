@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Capture Constraints
+Resolution and frame rate a browser camera needs to capture for the analysis.
+
+Browsers send 720p or 1080p at 30 fps by default, while a model profile may only
+use a 512 px image every two seconds. The server publishes the capture size of the
+current image profile and a frame rate just above the sampling rate; the page
+applies them to its camera track, which cuts upstream bandwidth and decode CPU
+per session.
+
+The sampling interval (process_every) counts frames of a REFERENCE_FPS stream.
+Sessions that report a lower capture frame rate are sampled at the same interval
+in seconds.
+"""
+
+import math
+
+from .image_profiles import ImageProfile
+
+# Frame rate the sampling interval is defined against
+REFERENCE_FPS = 30
+# Lowest capture frame rate requested (keeps quality-gate retries and previews usable)
+MIN_CAPTURE_FPS = 5
+
+
+def capture_constraints(
+    profile: ImageProfile,
+    process_every: int,
+    width: int = 1280,
+    height: int = 720,
+    min_fps: float = MIN_CAPTURE_FPS,
+) -> dict:
+    """
+    Capture settings for a camera feeding the current analysis
+
+    Args:
+        profile: Image profile of the current model
+        process_every: Sampling interval in frames at REFERENCE_FPS
+        width: Camera resolution the page asks for without constraints
+        height: Camera resolution the page asks for without constraints
+        min_fps: Lowest frame rate to request
+
+    Returns:
+        {"width", "height", "frame_rate"}; width and height are None when the
+        profile sends frames at camera resolution
+    """
+    analysis_fps = REFERENCE_FPS / max(process_every, 1)
+    frame_rate = min(REFERENCE_FPS, max(min_fps, math.ceil(analysis_fps)))
+    if profile.mode == "passthrough":
+        return {"width": None, "height": None, "frame_rate": frame_rate}
+    # The content the model sees of a frame; never ask for more than the default
+    _, _, content_w, content_h = profile.geometry(width, height)
+    return {
+        "width": min(content_w, width),
+        "height": min(content_h, height),
+        "frame_rate": frame_rate,
+    }
+
+
+def sample_interval(process_every: int, source_fps: float) -> int:
+    """
+    Sampling interval in frames of a stream captured at source_fps
+
+    Args:
+        process_every: Sampling interval in frames at REFERENCE_FPS
+        source_fps: Frame rate of the session's stream
+
+    Returns:
+        Frames between samples (at least 1), same interval in seconds
+    """
+    return max(1, round(process_every * source_fps / REFERENCE_FPS))
@@ -0,0 +1,263 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Circuit Breaker
+Stops sending frames to a VLM backend that keeps failing and probes it with
+exponential backoff until it recovers.
+
+closed -> (failure_threshold consecutive failures) -> open
+open -> (backoff elapsed) -> half_open: one probe request is let through
+half_open -> probe succeeds -> closed / probe fails -> open with doubled backoff
+"""
+
+import logging
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+CIRCUIT_STATES = (CLOSED, HALF_OPEN, OPEN)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the circuit is open"""
+
+
+class Permit:
+    """Permission to send one request, returned by CircuitBreaker.allow()"""
+
+    __slots__ = ("probe",)
+
+    def __init__(self, probe: bool = False):
+        self.probe = probe  # This request is the half-open probe
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with exponential backoff"""
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        backoff: float = 2.0,
+        max_backoff: float = 60.0,
+        multiplier: float = 2.0,
+        on_state_change: Optional[Callable[[str, str], None]] = None,
+    ):
+        """
+        Initialize circuit breaker
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit (0 = disabled)
+            backoff: Seconds the circuit stays open after the first trip
+            max_backoff: Upper bound of the open time in seconds
+            multiplier: Backoff growth factor after every failed probe
+            on_state_change: Called with (old_state, new_state) on every transition
+        """
+        self.failure_threshold = failure_threshold
+        self.base_backoff = backoff
+        self.max_backoff = max_backoff
+        self.multiplier = multiplier
+        self.on_state_change = on_state_change
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.backoff = backoff  # Open time of the current/next trip
+        self.open_until = 0.0  # time.monotonic() when the next probe is allowed
+        self._probe: Optional[Permit] = None  # Permit of the running half-open probe
+
+        # Statistics
+        self.trips = 0  # closed -> open transitions
+        self.short_circuited = 0  # Requests refused while open
+        self.last_error: Optional[str] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.failure_threshold > 0
+
+    @property
+    def probe_in_flight(self) -> bool:
+        return self._probe is not None
+
+    def _end_probe(self, permit: Optional[Permit]) -> None:
+        """Free the probe slot if permit holds it (a stale or regular permit does not)"""
+        if permit is not None and permit is self._probe:
+            self._probe = None
+
+    def _transition(self, new_state: str) -> None:
+        old_state = self.state
+        if old_state == new_state:
+            return
+        self.state = new_state
+        if new_state == OPEN:
+            logger.warning(
+                f"Circuit open after {self.consecutive_failures} failures, "
+                f"retrying in {self.backoff:.1f}s ({self.last_error})"
+            )
+        elif new_state == CLOSED:
+            logger.info("Circuit closed, backend recovered")
+        if self.on_state_change:
+            try:
+                self.on_state_change(old_state, new_state)
+            except Exception as e:
+                logger.error(f"Circuit state change callback failed: {e}")
+
+    def is_open(self, now: Optional[float] = None) -> bool:
+        """
+        Cheap check whether a request would be refused right now (claims nothing)
+
+        Args:
+            now: time.monotonic() timestamp (default: now)
+
+        Returns:
+            True while open and backing off, or while the half-open probe is running
+        """
+        if self.state == CLOSED:
+            return False
+        if self.state == HALF_OPEN:
+            return self.probe_in_flight
+        if now is None:
+            now = time.monotonic()
+        return now < self.open_until
+
+    def allow(self, now: Optional[float] = None) -> Optional[Permit]:
+        """
+        Ask to send a request; the caller must report the outcome with
+        record_success(), record_failure() or release(), passing the permit
+
+        Args:
+            now: time.monotonic() timestamp (default: now)
+
+        Returns:
+            Permit if the request may be sent (permit.probe: it is the half-open
+            probe), None if it is refused
+        """
+        if self.state == CLOSED:
+            return Permit()
+        if self.is_open(now):
+            self.short_circuited += 1
+            return None
+        # Backoff elapsed (or probe slot free): this request is the probe
+        self._transition(HALF_OPEN)
+        self._probe = Permit(probe=True)
+        return self._probe
+
+    def record_success(self, permit: Optional[Permit] = None) -> None:
+        """
+        Report a successful request
+
+        Args:
+            permit: Permit the request was sent with
+        """
+        self.consecutive_failures = 0
+        self._end_probe(permit)
+        self.backoff = self.base_backoff
+        self._transition(CLOSED)
+
+    def record_failure(
+        self, error: Optional[Exception] = None, permit: Optional[Permit] = None
+    ) -> None:
+        """
+        Report a failed request
+
+        Args:
+            error: Exception raised by the request
+            permit: Permit the request was sent with
+        """
+        self.consecutive_failures += 1
+        if error is not None:
+            self.last_error = str(error) or type(error).__name__
+        if not self.enabled:
+            return
+
+        if self.state == HALF_OPEN:
+            # Probe failed: back off longer
+            self._end_probe(permit)
+            self.backoff = min(self.backoff * self.multiplier, self.max_backoff)
+            self._open()
+        elif self.state == CLOSED and self.consecutive_failures >= self.failure_threshold:
+            self.trips += 1
+            self._open()
+
+    def _open(self) -> None:
+        self.open_until = time.monotonic() + self.backoff
+        self._transition(OPEN)
+
+    def release(self, permit: Optional[Permit] = None) -> None:
+        """
+        Report a request that ended without an outcome (e.g. cancelled)
+
+        Args:
+            permit: Permit the request was sent with
+        """
+        self._end_probe(permit)
+
+    def reset(self) -> None:
+        """Close the circuit and forget failures (e.g. after the backend was changed)"""
+        self.consecutive_failures = 0
+        self._probe = None
+        self.backoff = self.base_backoff
+        self.open_until = 0.0
+        self._transition(CLOSED)
+
+    def renewed(self) -> "CircuitBreaker":
+        """
+        Closed breaker with the same settings and statistics, replacing this one
+        (e.g. after the backend was changed)
+
+        Requests still running keep reporting to this breaker, which is detached from
+        on_state_change so their outcome no longer affects the new backend's state.
+
+        Returns:
+            New breaker in the closed state
+        """
+        breaker = CircuitBreaker(
+            failure_threshold=self.failure_threshold,
+            backoff=self.base_backoff,
+            max_backoff=self.max_backoff,
+            multiplier=self.multiplier,
+            on_state_change=self.on_state_change,
+        )
+        breaker.trips = self.trips
+        breaker.short_circuited = self.short_circuited
+        old_state, callback = self.state, self.on_state_change
+        self.on_state_change = None
+        if old_state != CLOSED and callback:
+            try:
+                callback(old_state, CLOSED)
+            except Exception as e:
+                logger.error(f"Circuit state change callback failed: {e}")
+        return breaker
+
+    def get_stats(self) -> dict:
+        """
+        Get breaker state and statistics
+
+        Returns:
+            Dict with state, failures, trips and time until the next probe
+        """
+        retry_in = max(self.open_until - time.monotonic(), 0.0) if self.state == OPEN else 0.0
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "trips": self.trips,
+            "short_circuited": self.short_circuited,
+            "backoff_s": self.backoff,
+            "retry_in_s": retry_in,
+            "last_error": self.last_error,
+        }
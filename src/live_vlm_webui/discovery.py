@@ -0,0 +1,288 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Backend Discovery
+Cached detection of local VLM services and their models.
+
+Lookups are cached with a TTL and de-duplicated while in flight (single-flight),
+so concurrent page loads share one probe. Expired entries are served stale while
+a background refresh runs, so only the very first lookup of a key ever waits on
+a dead port. All probes share one HTTP session and run in parallel.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Local services probed by default, in order of preference
+LOCAL_SERVICES = (
+    {"name": "Ollama", "url": "http://localhost:11434/v1", "port": 11434, "path": "/api/tags"},
+    {"name": "vLLM", "url": "http://localhost:8000/v1", "port": 8000, "path": "/v1/models"},
+    {"name": "SGLang", "url": "http://localhost:30000/v1", "port": 30000, "path": "/v1/models"},
+)
+
+# Substrings of model ids preferred when auto-selecting a model
+VISION_KEYWORDS = ("vision", "llava", "llama-3.2", "gemini")
+
+
+class DiscoveryCache:
+    """TTL cache with single-flight loading and stale-while-revalidate refresh"""
+
+    def __init__(self, ttl: float = 30.0, error_ttl: float = 5.0):
+        """
+        Initialize cache
+
+        Args:
+            ttl: Seconds a successful lookup is fresh
+            error_ttl: Seconds a failed lookup is fresh (failures are cached too, so a
+                dead endpoint is not probed on every request)
+        """
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        # {key: (expires_at, value, error)}
+        self._entries: Dict[str, Tuple[float, object, Optional[BaseException]]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Statistics
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.loads = 0  # Loader calls (misses + refreshes, after de-duplication)
+
+    def _load(self, key: str, loader: Callable[[], Awaitable]) -> asyncio.Future:
+        """Start the loader for a key unless a load is already running"""
+        future = self._inflight.get(key)
+        if future is not None:
+            return future
+
+        async def run():
+            self.loads += 1
+            try:
+                value = await loader()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._entries[key] = (time.monotonic() + self.error_ttl, None, e)
+                raise
+            else:
+                self._entries[key] = (time.monotonic() + self.ttl, value, None)
+                return value
+            finally:
+                self._inflight.pop(key, None)
+
+        future = asyncio.ensure_future(run())
+        # Background refreshes may have no awaiter; don't log their errors as unretrieved
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        return future
+
+    async def get(self, key: str, loader: Callable[[], Awaitable], refresh: bool = False):
+        """
+        Get a cached value, loading it if missing
+
+        Args:
+            key: Cache key
+            loader: Coroutine function producing the value
+            refresh: Ignore the cached value and wait for a fresh load
+
+        Returns:
+            The (possibly stale) value
+
+        Raises:
+            Exception: The loader's error, also while the failure is cached
+        """
+        entry = self._entries.get(key)
+        if entry is None or refresh:
+            self.misses += 1
+            # shield: a cancelled caller must not cancel the load shared with others
+            return await asyncio.shield(self._load(key, loader))
+
+        expires_at, value, error = entry
+        if time.monotonic() < expires_at:
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+            self._load(key, loader)
+        if error is not None:
+            # Every waiter re-raises the cached instance: drop the previous traceback so
+            # it does not grow by one raise per hit
+            raise error.with_traceback(None)
+        return value
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop one key or all entries"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def get_stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "loads": self.loads,
+        }
+
+
+class ServiceDiscovery:
+    """Detects local VLM services and lists models, through a DiscoveryCache"""
+
+    def __init__(
+        self,
+        services=LOCAL_SERVICES,
+        ttl: float = 30.0,
+        probe_timeout: float = 1.0,
+        models_timeout: float = 5.0,
+    ):
+        """
+        Initialize discovery
+
+        Args:
+            services: Local services to probe (dicts with name, url, port and path)
+            ttl: Seconds a lookup is cached before it is refreshed in the background
+            probe_timeout: Timeout of a service probe in seconds
+            models_timeout: Timeout of a model list request in seconds
+        """
+        self.services = [dict(s) for s in services]
+        self.cache = DiscoveryCache(ttl=ttl)
+        self.probe_timeout = probe_timeout
+        self.models_timeout = models_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """HTTP session shared by all probes (created on first use)"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def _probe(self, service: dict) -> Optional[dict]:
+        """Check if a service is running by probing its endpoint"""
+        url = f"http://localhost:{service['port']}{service['path']}"
+        try:
+            timeout = aiohttp.ClientTimeout(total=self.probe_timeout)
+            async with self.session.get(url, timeout=timeout) as response:
+                if response.status in [200, 404]:  # 404 is ok, means server is running
+                    logger.info(f"Detected {service['name']} at {service['url']}")
+                    return service
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+        return None
+
+    async def _probe_all(self) -> List[dict]:
+        results = await asyncio.gather(*[self._probe(s) for s in self.services])
+        return [s for s in results if s is not None]
+
+    async def detect_services(self, refresh: bool = False) -> List[dict]:
+        """
+        Local services that are currently running, in order of preference
+
+        Args:
+            refresh: Probe now instead of using the cache
+
+        Returns:
+            List of service dicts
+        """
+        return await self.cache.get("services", self._probe_all, refresh=refresh)
+
+    async def _fetch_models(self, api_base: str, api_key: str) -> List[str]:
+        headers = {}
+        if api_key and api_key != "EMPTY":
+            headers["Authorization"] = f"Bearer {api_key}"
+        timeout = aiohttp.ClientTimeout(total=self.models_timeout)
+        async with self.session.get(
+            f"{api_base.rstrip('/')}/models", headers=headers, timeout=timeout
+        ) as resp:
+            if resp.status != 200:
+                text = await resp.text()
+                raise RuntimeError(f"HTTP {resp.status} from {api_base}/models: {text[:200]}")
+            data = await resp.json(content_type=None)
+        return [m.get("id", "") for m in data.get("data", [])]
+
+    async def list_models(
+        self, api_base: str, api_key: str = "EMPTY", refresh: bool = False
+    ) -> List[str]:
+        """
+        Model ids served by an OpenAI-compatible API
+
+        Args:
+            api_base: Base URL of the API
+            api_key: API key (only a hash is used in the cache key)
+            refresh: Query now instead of using the cache
+
+        Returns:
+            List of model ids
+
+        Raises:
+            Exception: If the API could not be queried (failures are cached briefly)
+        """
+        key_hash = hashlib.sha256((api_key or "").encode()).hexdigest()[:16]
+        key = f"models:{api_base.rstrip('/')}:{key_hash}"
+        return await self.cache.get(
+            key, lambda: self._fetch_models(api_base, api_key), refresh=refresh
+        )
+
+    async def detect_service_and_model(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Pick a local service and model, querying all services in parallel
+
+        The first service (in LOCAL_SERVICES order) that serves a model wins; vision
+        models are preferred.
+
+        Returns:
+            (api_base, model_name) or (None, None) if no service found
+        """
+
+        async def models_of(service):
+            try:
+                return await self.list_models(service["url"])
+            except Exception as e:
+                logger.debug(f"Service {service['name']} not available at {service['url']}: {e}")
+                return []
+
+        results = await asyncio.gather(*[models_of(s) for s in self.services])
+        for service, models in zip(self.services, results):
+            if not models:
+                continue
+            model_id = next(
+                (m for m in models if any(k in m.lower() for k in VISION_KEYWORDS)), None
+            )
+            logger.info(f"✅ Auto-detected {service['name']} at {service['url']}")
+            if model_id:
+                logger.info(f"   Selected model: {model_id}")
+            else:
+                model_id = models[0]
+                logger.info(f"   Selected model: {model_id} (vision model preferred but not found)")
+            return service["url"], model_id
+        return None, None
+
+    def prefetch(self) -> asyncio.Future:
+        """Fill the service cache in the background (e.g. on server startup)"""
+        return asyncio.ensure_future(self.detect_services())
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,196 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Fast Chat Client
+Low-overhead raw HTTP path for OpenAI-compatible chat completions with images.
+
+The OpenAI SDK path base64-encodes the JPEG, decodes it to str, embeds it in an
+f-string data URL, builds pydantic models and JSON-encodes the multi-hundred-KB
+body again. Here the small JSON envelope is serialized once with a placeholder,
+and the request body is streamed as (prefix, base64 bytes, suffix) chunks over a
+pooled httpx connection, so the image payload is never copied or escaped.
+"""
+
+import json
+import logging
+import time
+from typing import List, Optional, Sequence, Union
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Marker substituted by the raw base64 image bytes. Base64 never needs JSON
+# escaping, so the bytes can be spliced into the serialized envelope verbatim.
+IMAGE_PLACEHOLDER = "__LIVE_VLM_IMAGE_B64__"
+
+# One base64-encoded image, or several filling the placeholders in order
+EncodedImages = Union[bytes, Sequence[bytes]]
+
+
+class FastCompletion:
+    """Result of a fast-path chat completion"""
+
+    __slots__ = ("text", "usage", "serialize_time", "network_time")
+
+    def __init__(
+        self, text: str, usage: Optional[dict], serialize_time: float, network_time: float
+    ):
+        self.text = text
+        self.usage = usage or {}
+        self.serialize_time = serialize_time  # seconds spent building the request body
+        self.network_time = network_time  # seconds from send to parsed response
+
+
+async def _iter_chunks(chunks: List[bytes]):
+    """Async body stream over pre-built chunks (httpx.AsyncClient needs an async iterable)"""
+    for chunk in chunks:
+        yield chunk
+
+
+class FastChatClient:
+    """Raw httpx client for image chat completions against an OpenAI-compatible API"""
+
+    def __init__(
+        self,
+        api_base: str,
+        api_key: str = "EMPTY",
+        timeout: float = 600.0,
+        max_connections: int = 16,
+    ):
+        """
+        Initialize fast client
+
+        Args:
+            api_base: Base URL for the API (e.g., "http://localhost:8000/v1")
+            api_key: API key (use "EMPTY" for local servers)
+            timeout: Request timeout in seconds (matches the OpenAI SDK default)
+            max_connections: Maximum pooled keep-alive connections
+        """
+        self.api_base = api_base.rstrip("/")
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        if api_key and api_key != "EMPTY":
+            headers["Authorization"] = f"Bearer {api_key}"
+        self._client = httpx.AsyncClient(
+            base_url=self.api_base,
+            headers=headers,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+        )
+
+    @staticmethod
+    def build_body(request: dict, image_b64: EncodedImages) -> List[bytes]:
+        """
+        Serialize a chat completion request whose image URLs contain IMAGE_PLACEHOLDER
+
+        Args:
+            request: Request dict (model, messages, ...) with the placeholder in place of
+                the base64 image data
+            image_b64: Base64-encoded image bytes, or a list of them (one per
+                placeholder, in order)
+
+        Returns:
+            Body chunks (prefix, image_b64, suffix, or interleaved for several images)
+        """
+        images = [image_b64] if isinstance(image_b64, bytes) else list(image_b64)
+        envelope = json.dumps(request, separators=(",", ":")).encode("utf-8")
+        parts = envelope.split(IMAGE_PLACEHOLDER.encode("ascii"))
+        if len(parts) == 1:
+            raise ValueError("Request does not contain the image placeholder")
+        if len(parts) != len(images) + 1:
+            raise ValueError(f"Request has {len(parts) - 1} image placeholders for {len(images)}")
+        chunks = [parts[0]]
+        for image, part in zip(images, parts[1:]):
+            chunks += [image, part]
+        return chunks
+
+    async def create(
+        self,
+        model: str,
+        messages: list,
+        image_b64: EncodedImages,
+        max_tokens: int,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None,
+    ) -> FastCompletion:
+        """
+        Send a chat completion request
+
+        Args:
+            model: Model name
+            messages: OpenAI chat messages with IMAGE_PLACEHOLDER as the image data
+            image_b64: Base64-encoded JPEG image as bytes (or a list, one per placeholder)
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+            timeout: Per-request timeout in seconds (default: client timeout)
+
+        Returns:
+            FastCompletion with the generated text, usage and timing breakdown
+
+        Raises:
+            httpx.HTTPStatusError: If the backend answers with an HTTP error
+            httpx.HTTPError: On connection/timeout errors
+        """
+        serialize_start = time.perf_counter()
+        # The base64 bytes are streamed as-is, never copied into a str or JSON-escaped
+        chunks = self.build_body(
+            {
+                "model": model,
+                "messages": messages,
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+            },
+            image_b64,
+        )
+        content_length = sum(len(c) for c in chunks)
+        network_start = time.perf_counter()
+
+        kwargs = {} if timeout is None else {"timeout": timeout}
+        response = await self._client.post(
+            "/chat/completions",
+            content=_iter_chunks(chunks),
+            headers={"Content-Length": str(content_length)},
+            **kwargs,
+        )
+        if response.status_code >= 400:
+            message = response.text[:500]
+            raise httpx.HTTPStatusError(
+                f"HTTP {response.status_code} from {self.api_base}: {message}",
+                request=response.request,
+                response=response,
+            )
+
+        # Only pull out what we use - no model objects for the full response
+        data = response.json()
+        end = time.perf_counter()
+
+        try:
+            text = data["choices"][0]["message"]["content"] or ""
+        except (KeyError, IndexError, TypeError):
+            raise ValueError(f"Unexpected chat completion response: {str(data)[:200]}")
+
+        return FastCompletion(
+            text=text,
+            usage=data.get("usage"),
+            serialize_time=network_start - serialize_start,
+            network_time=end - network_start,
+        )
+
+    async def aclose(self) -> None:
+        """Close pooled connections"""
+        await self._client.aclose()
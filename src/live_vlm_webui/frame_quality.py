@@ -0,0 +1,163 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Frame Quality Gate
+Rejects sampled frames that are not worth a VLM request: motion-blurred, too
+dark or washed out (e.g. during an IR cut-filter switch), or decoded from a
+damaged bitstream (grey smears after packet loss).
+
+Sharpness is the variance of the Laplacian and brightness the mean luma, both
+measured on a small grayscale copy of the frame, so the check costs well under a
+millisecond and its thresholds do not depend on the camera resolution. A sampled
+frame that fails is not sent; the next acceptable frame is sent instead.
+"""
+
+import logging
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BLURRY = "blurry"
+DARK = "dark"
+BRIGHT = "bright"
+CORRUPT = "corrupt"
+REJECT_REASONS = (BLURRY, DARK, BRIGHT, CORRUPT)
+
+# Width of the grayscale copy the metrics are measured on
+ANALYSIS_WIDTH = 320
+
+# Marker set on frames decoded after a decode error, until the next keyframe
+_DAMAGED = "damaged"
+
+
+def mark_damaged(frame) -> None:
+    """Flag a decoded frame as damaged (its references were lost to a decode error)"""
+    try:
+        frame.opaque = _DAMAGED
+    except AttributeError:
+        pass  # Frame type without an opaque slot (e.g. PyAV < 12)
+
+
+def is_damaged(frame) -> bool:
+    """
+    Whether a frame is known to be damaged
+
+    Args:
+        frame: av.VideoFrame (flagged by mark_damaged() or by the decoder itself)
+
+    Returns:
+        True if the frame was marked damaged or the decoder flagged it corrupt
+    """
+    return getattr(frame, "opaque", None) == _DAMAGED or bool(getattr(frame, "is_corrupt", False))
+
+
+def measure(img: np.ndarray, width: int = ANALYSIS_WIDTH) -> dict:
+    """
+    Sharpness and brightness of a frame
+
+    Args:
+        img: BGR (or grayscale) image
+        width: Width of the grayscale copy the metrics are measured on
+
+    Returns:
+        Dict with sharpness (Laplacian variance) and luma (mean, 0-255)
+    """
+    gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    h, w = gray.shape[:2]
+    if w > width:
+        gray = cv2.resize(gray, (width, max(1, round(h * width / w))), interpolation=cv2.INTER_AREA)
+    _, stddev = cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_32F))
+    return {"sharpness": float(stddev[0][0]) ** 2, "luma": float(gray.mean())}
+
+
+class FrameQualityGate:
+    """Thresholds deciding whether a sampled frame is sent to the VLM"""
+
+    def __init__(
+        self,
+        min_sharpness: float = 0.0,
+        min_luma: float = 0.0,
+        max_luma: float = 255.0,
+        reject_corrupt: bool = True,
+        max_retry_frames: int = 15,
+    ):
+        """
+        Initialize gate (sharpness and luma checks are off by default)
+
+        Args:
+            min_sharpness: Minimum Laplacian variance (0 = no blur check)
+            min_luma: Minimum mean luma, 0-255 (0 = no darkness check)
+            max_luma: Maximum mean luma, 0-255 (255 = no overexposure check)
+            reject_corrupt: Reject frames flagged as damaged by the decoder
+            max_retry_frames: Frames checked after a rejected sample before the
+                sample is given up (bounds the conversion cost of a scene that
+                never passes, e.g. a camera at night)
+        """
+        self.min_sharpness = min_sharpness
+        self.min_luma = min_luma
+        self.max_luma = max_luma
+        self.reject_corrupt = reject_corrupt
+        self.max_retry_frames = max_retry_frames
+
+    @property
+    def measures(self) -> bool:
+        """Whether any threshold needs the pixel metrics"""
+        return self.min_sharpness > 0 or self.min_luma > 0 or self.max_luma < 255
+
+    def check_frame(self, frame) -> Optional[str]:
+        """
+        Cheap check of the decoded frame, before it is converted to pixels
+
+        Returns:
+            Rejection reason, or None if the frame may be sent
+        """
+        if self.reject_corrupt and is_damaged(frame):
+            return CORRUPT
+        return None
+
+    def check(self, img: np.ndarray) -> Tuple[Optional[str], Optional[dict]]:
+        """
+        Check the pixels of a frame against the thresholds
+
+        Args:
+            img: BGR image
+
+        Returns:
+            (rejection reason or None, measured metrics or None if nothing is measured)
+        """
+        if not self.measures:
+            return None, None
+        metrics = measure(img)
+        if self.min_luma > 0 and metrics["luma"] < self.min_luma:
+            return DARK, metrics
+        if self.max_luma < 255 and metrics["luma"] > self.max_luma:
+            return BRIGHT, metrics
+        # Dark frames also have little contrast, so blur is only judged when exposed well
+        if self.min_sharpness > 0 and metrics["sharpness"] < self.min_sharpness:
+            return BLURRY, metrics
+        return None, metrics
+
+    def get_config(self) -> dict:
+        return {
+            "min_sharpness": self.min_sharpness,
+            "min_luma": self.min_luma,
+            "max_luma": self.max_luma,
+            "reject_corrupt": self.reject_corrupt,
+            "max_retry_frames": self.max_retry_frames,
+        }
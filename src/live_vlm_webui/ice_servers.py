@@ -0,0 +1,83 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+ICE Servers
+STUN/TURN configuration shared by the server's peer connections and the page.
+
+The server only answers after ICE gathering completes, so an unreachable STUN
+server (air-gapped or LAN-only deployments) delays every connection setup by the
+STUN timeout. An empty list gathers host candidates only, which is all a LAN
+needs. Note that aiortc uses at most one STUN and one TURN server.
+"""
+
+from typing import List, Optional
+
+from aiortc import RTCIceServer
+
+# Public STUN servers used unless configured otherwise
+DEFAULT_ICE_SERVERS = ["stun:stun.l.google.com:19302", "stun:stun1.l.google.com:19302"]
+
+ICE_SCHEMES = ("stun:", "stuns:", "turn:", "turns:")
+
+
+def build_ice_servers(
+    urls: List[str], username: Optional[str] = None, credential: Optional[str] = None
+) -> List[RTCIceServer]:
+    """
+    ICE servers from command-line URLs
+
+    Args:
+        urls: stun:/turn:/turns: URLs (empty = host candidates only)
+        username: TURN username
+        credential: TURN password
+
+    Returns:
+        RTCIceServer list for RTCConfiguration
+
+    Raises:
+        ValueError: If a URL has another scheme or a TURN server lacks credentials
+    """
+    servers = []
+    for url in urls:
+        if not url.startswith(ICE_SCHEMES):
+            raise ValueError(f"Invalid ICE server '{url}' (expected stun:, turn: or turns:)")
+        if url.startswith("turn"):
+            if not (username and credential):
+                raise ValueError(f"TURN server '{url}' needs a username and credential")
+            servers.append(RTCIceServer(urls=[url], username=username, credential=credential))
+        else:
+            servers.append(RTCIceServer(urls=[url]))
+    return servers
+
+
+def ice_mode(servers: List[RTCIceServer]) -> str:
+    """Short label of an ICE configuration: "host", "stun" or "turn" """
+    urls = [url for server in servers for url in server.urls]
+    if any(url.startswith("turn") for url in urls):
+        return "turn"
+    return "stun" if urls else "host"
+
+
+def to_browser_config(servers: List[RTCIceServer]) -> List[dict]:
+    """ICE servers in the format of the browser's RTCPeerConnection configuration"""
+    config = []
+    for server in servers:
+        entry = {"urls": server.urls}
+        if server.username:
+            entry["username"] = server.username
+            entry["credential"] = server.credential
+        config.append(entry)
+    return config
@@ -0,0 +1,397 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Image Preprocessing Profiles
+Model-native resolution, patch-grid and tile-grid aware frame resizing.
+
+Backends resize every image to what their vision encoder expects anyway. Doing
+it here, on the BGR frame before color conversion and JPEG encoding, saves CPU,
+upload bytes and - for dynamic-resolution models - vision tokens, and lets us
+report the estimated vision token count per request.
+"""
+
+import logging
+import math
+from typing import Dict, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("passthrough", "fixed", "patch", "tile")
+
+
+class ImageProfile:
+    """How a model family wants its images sized"""
+
+    def __init__(
+        self,
+        name: str,
+        mode: str,
+        patterns: Sequence[str] = (),
+        size: Optional[Tuple[int, int]] = None,
+        patch_size: int = 14,
+        merge_size: int = 1,
+        max_side: Optional[int] = None,
+        max_pixels: Optional[int] = None,
+        tile_size: Optional[int] = None,
+        max_tiles: int = 1,
+        tokens_per_tile: Optional[int] = None,
+        thumbnail: bool = False,
+        extra_tokens: int = 0,
+        letterbox: bool = True,
+        description: str = "",
+    ):
+        """
+        Initialize profile
+
+        Args:
+            name: Preset name
+            mode: "passthrough" (send as is), "fixed" (one fixed canvas size),
+                "patch" (dynamic resolution on a patch grid) or "tile" (grid of tiles)
+            patterns: Lower-case substrings of model names this profile applies to
+            size: Canvas (width, height) in fixed mode
+            patch_size: Vision encoder patch size in pixels
+            merge_size: Patches merged into one token per side (e.g. 2 for Qwen2-VL)
+            max_side: Longest side limit in patch mode
+            max_pixels: Pixel budget in patch mode
+            tile_size: Tile side in tile mode
+            max_tiles: Maximum tiles in the grid
+            tokens_per_tile: Tokens per tile (tile mode) or per image (fixed mode);
+                default: derived from patch_size and merge_size
+            thumbnail: Tile mode adds a downscaled global tile when using >1 tile
+            extra_tokens: Constant tokens added per image (special/separator tokens)
+            letterbox: Pad to the canvas keeping the aspect ratio instead of stretching
+            description: Short human-readable note
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}' (expected one of {PROFILE_MODES})")
+        if mode == "fixed" and not size:
+            raise ValueError("Fixed profiles need a size")
+        if mode == "tile" and not tile_size:
+            raise ValueError("Tile profiles need a tile_size")
+
+        self.name = name
+        self.mode = mode
+        self.patterns = tuple(p.lower() for p in patterns)
+        self.size = size
+        self.patch_size = patch_size
+        self.merge_size = merge_size
+        self.max_side = max_side
+        self.max_pixels = max_pixels
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self.tokens_per_tile = tokens_per_tile
+        self.thumbnail = thumbnail
+        self.extra_tokens = extra_tokens
+        self.letterbox = letterbox
+        self.description = description
+
+    def _grid_tokens(self, width: int, height: int) -> int:
+        unit = self.patch_size * self.merge_size
+        return (width // unit) * (height // unit)
+
+    def _select_grid(self, width: int, height: int) -> Tuple[int, int]:
+        """Tile grid (cols, rows) keeping the most resolution with the least padding"""
+        best = (1, 1)
+        best_key = None
+        for cols in range(1, self.max_tiles + 1):
+            for rows in range(1, self.max_tiles // cols + 1):
+                canvas_w, canvas_h = cols * self.tile_size, rows * self.tile_size
+                scale = min(canvas_w / width, canvas_h / height)
+                effective = min(width * scale * height * scale, width * height)
+                waste = canvas_w * canvas_h - effective
+                key = (effective, -waste)
+                if best_key is None or key > best_key:
+                    best, best_key = (cols, rows), key
+        return best
+
+    def geometry(self, width: int, height: int) -> Tuple[int, int, int, int]:
+        """
+        Target geometry for a frame
+
+        Args:
+            width: Frame width
+            height: Frame height
+
+        Returns:
+            (canvas_width, canvas_height, content_width, content_height); the content
+            is centered on the canvas when letterboxing
+        """
+        if self.mode == "passthrough":
+            return width, height, width, height
+
+        if self.mode == "patch":
+            scale = 1.0  # never upscale
+            if self.max_side:
+                scale = min(scale, self.max_side / max(width, height))
+            if self.max_pixels:
+                scale = min(scale, math.sqrt(self.max_pixels / (width * height)))
+            unit = self.patch_size * self.merge_size
+            new_w = max(unit, round(width * scale / unit) * unit)
+            new_h = max(unit, round(height * scale / unit) * unit)
+            if self.max_pixels and new_w * new_h > self.max_pixels:
+                new_w = max(unit, math.floor(width * scale / unit) * unit)
+                new_h = max(unit, math.floor(height * scale / unit) * unit)
+            return new_w, new_h, new_w, new_h
+
+        if self.mode == "fixed":
+            canvas_w, canvas_h = self.size
+        else:
+            cols, rows = self._select_grid(width, height)
+            canvas_w, canvas_h = cols * self.tile_size, rows * self.tile_size
+
+        if not self.letterbox:
+            return canvas_w, canvas_h, canvas_w, canvas_h
+        scale = min(canvas_w / width, canvas_h / height)
+        content_w = min(canvas_w, max(1, round(width * scale)))
+        content_h = min(canvas_h, max(1, round(height * scale)))
+        return canvas_w, canvas_h, content_w, content_h
+
+    def estimate_tokens(self, width: int, height: int) -> Optional[int]:
+        """
+        Estimated vision tokens the backend spends on a frame of this size
+
+        Args:
+            width: Frame width (before or after prepare(); the result is the same)
+            height: Frame height
+
+        Returns:
+            Token estimate, or None for passthrough profiles
+        """
+        if self.mode == "passthrough":
+            return None
+
+        canvas_w, canvas_h, _, _ = self.geometry(width, height)
+        if self.mode == "patch":
+            return self._grid_tokens(canvas_w, canvas_h) + self.extra_tokens
+        if self.mode == "fixed":
+            per_image = self.tokens_per_tile or self._grid_tokens(canvas_w, canvas_h)
+            return per_image + self.extra_tokens
+
+        per_tile = self.tokens_per_tile or self._grid_tokens(self.tile_size, self.tile_size)
+        tiles = (canvas_w // self.tile_size) * (canvas_h // self.tile_size)
+        if self.thumbnail and tiles > 1:
+            tiles += 1
+        return tiles * per_tile + self.extra_tokens
+
+    def prepare(self, image: np.ndarray) -> np.ndarray:
+        """
+        Resize (and letterbox) a frame to the profile's target geometry
+
+        Args:
+            image: HxWxC uint8 frame (any channel order)
+
+        Returns:
+            The resized frame, or the input itself if it already has the target size
+        """
+        height, width = image.shape[:2]
+        canvas_w, canvas_h, content_w, content_h = self.geometry(width, height)
+        if (canvas_w, canvas_h) == (width, height) and (content_w, content_h) == (width, height):
+            return image
+
+        # INTER_AREA avoids aliasing but is only fast for integer factors: shrink by the
+        # largest integer factor with it, then finish with INTER_LINEAR (< 2x left)
+        factor = int(min(width / content_w, height / content_h))
+        if factor >= 2:
+            image = cv2.resize(
+                image, (width // factor, height // factor), interpolation=cv2.INTER_AREA
+            )
+        if image.shape[1] == content_w and image.shape[0] == content_h:
+            resized = image
+        else:
+            resized = cv2.resize(image, (content_w, content_h), interpolation=cv2.INTER_LINEAR)
+        if (content_w, content_h) == (canvas_w, canvas_h):
+            return resized
+
+        left = (canvas_w - content_w) // 2
+        top = (canvas_h - content_h) // 2
+        return cv2.copyMakeBorder(
+            resized,
+            top,
+            canvas_h - content_h - top,
+            left,
+            canvas_w - content_w - left,
+            cv2.BORDER_CONSTANT,
+            value=0,
+        )
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "mode": self.mode, "description": self.description}
+
+
+# Preset table. Token counts follow the models' reference preprocessors; backends may
+# differ slightly (e.g. separator tokens), so treat estimates as approximate.
+PROFILES: Dict[str, ImageProfile] = {
+    profile.name: profile
+    for profile in (
+        ImageProfile("none", "passthrough", description="Send frames at camera resolution"),
+        ImageProfile(
+            "qwen2-vl",
+            "patch",
+            patterns=("qwen2-vl", "qwen2.5-vl", "qwen2_5_vl", "qwen2.5vl", "qvq"),
+            patch_size=14,
+            merge_size=2,
+            max_pixels=1280 * 28 * 28,
+            extra_tokens=2,
+            description="Dynamic resolution, 28px grid, ~1280 token budget",
+        ),
+        ImageProfile(
+            "qwen3-vl",
+            "patch",
+            patterns=("qwen3-vl", "qwen3vl"),
+            patch_size=16,
+            merge_size=2,
+            max_pixels=1280 * 32 * 32,
+            extra_tokens=2,
+            description="Dynamic resolution, 32px grid, ~1280 token budget",
+        ),
+        ImageProfile(
+            "mistral3",
+            "patch",
+            patterns=(
+                "ministral-3",
+                "ministral3",
+                "mistral-small-3",
+                "mistral-small3",
+                "magistral",
+            ),
+            patch_size=14,
+            merge_size=2,
+            max_side=1540,
+            max_pixels=1024 * 28 * 28,
+            description="Pixtral-style encoder with 2x2 patch merge",
+        ),
+        ImageProfile(
+            "pixtral",
+            "patch",
+            patterns=("pixtral",),
+            patch_size=16,
+            max_side=1024,
+            max_pixels=1024 * 16 * 16,
+            description="Pixtral 12B, 16px patches",
+        ),
+        ImageProfile(
+            "llama3.2-vision",
+            "tile",
+            patterns=("llama-3.2", "llama3.2-vision", "llama3.2_vision", "llama-3.2-vision"),
+            tile_size=560,
+            max_tiles=4,
+            tokens_per_tile=1601,
+            description="Up to 4 tiles of 560px",
+        ),
+        ImageProfile(
+            "llama4",
+            "tile",
+            patterns=("llama-4", "llama4"),
+            tile_size=336,
+            max_tiles=16,
+            tokens_per_tile=144,
+            thumbnail=True,
+            description="Up to 16 tiles of 336px plus a global view",
+        ),
+        ImageProfile(
+            "llava-next",
+            "tile",
+            patterns=("llava-v1.6", "llava-next", "llava_next", "llava1.6", "llava:v1.6"),
+            tile_size=336,
+            max_tiles=4,
+            tokens_per_tile=576,
+            thumbnail=True,
+            description="AnyRes grid of 336px tiles plus a global view",
+        ),
+        ImageProfile(
+            "llava",
+            "fixed",
+            patterns=("llava", "bakllava"),
+            size=(336, 336),
+            patch_size=14,
+            description="336x336, 576 tokens",
+        ),
+        ImageProfile(
+            "gemma3",
+            "fixed",
+            patterns=("gemma-3", "gemma3"),
+            size=(896, 896),
+            tokens_per_tile=256,
+            description="896x896, 256 tokens",
+        ),
+        ImageProfile(
+            "internvl",
+            "tile",
+            patterns=("internvl",),
+            tile_size=448,
+            max_tiles=6,
+            tokens_per_tile=256,
+            thumbnail=True,
+            description="Up to 6 tiles of 448px plus a thumbnail",
+        ),
+        ImageProfile(
+            "phi-vision",
+            "tile",
+            patterns=("phi-3", "phi3", "phi-4-multimodal", "phi4-multimodal"),
+            tile_size=336,
+            max_tiles=16,
+            tokens_per_tile=144,
+            thumbnail=True,
+            description="Up to 16 crops of 336px plus a global view",
+        ),
+        ImageProfile(
+            "smolvlm",
+            "tile",
+            patterns=("smolvlm", "idefics3"),
+            tile_size=512,
+            max_tiles=4,
+            tokens_per_tile=64,
+            thumbnail=True,
+            description="512px tiles, 64 tokens each",
+        ),
+    )
+}
+
+
+def resolve_profile(setting: str, model: str) -> ImageProfile:
+    """
+    Pick the image profile for a model
+
+    Args:
+        setting: "auto" (match the model name against the preset patterns), "none",
+            or a preset name
+        model: Model name
+
+    Returns:
+        ImageProfile ("none" if nothing matches)
+
+    Raises:
+        ValueError: If setting is not "auto" or a known preset
+    """
+    if setting != "auto":
+        if setting not in PROFILES:
+            raise ValueError(
+                f"Unknown image profile '{setting}' (expected auto or one of {list(PROFILES)})"
+            )
+        return PROFILES[setting]
+
+    name = (model or "").lower()
+    # Longest matching pattern wins, so "llava-v1.6" beats "llava"
+    best = None
+    best_len = 0
+    for profile in PROFILES.values():
+        for pattern in profile.patterns:
+            if pattern in name and len(pattern) > best_len:
+                best, best_len = profile, len(pattern)
+    return best or PROFILES["none"]
@@ -0,0 +1,322 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Latency Metrics
+Sliding-window, constant-memory latency histograms and EWMA throughput.
+
+Histograms use HDR-style logarithmic buckets (about 2% relative error) and are
+split into time slices; slices older than the window are recycled, so memory is
+bounded by slices x buckets no matter how long the server runs.
+"""
+
+import math
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Bucket boundaries grow by this factor: 2^(1/16) gives ~4.4% wide buckets, so the
+# bucket midpoint is within ~2.2% of any value in it
+_GROWTH = 2 ** (1 / 16)
+_LOG_GROWTH = math.log(_GROWTH)
+MIN_VALUE = 1e-5  # 10 us; smaller values share the first bucket
+MAX_VALUE = 3600.0  # 1 h; larger values share the last bucket
+NUM_BUCKETS = int(math.ceil(math.log(MAX_VALUE / MIN_VALUE) / _LOG_GROWTH)) + 1
+
+DEFAULT_PERCENTILES = (50, 95, 99)
+
+
+def bucket_index(value: float) -> int:
+    """Logarithmic bucket of a value in seconds"""
+    if value <= MIN_VALUE:
+        return 0
+    return min(int(math.log(value / MIN_VALUE) / _LOG_GROWTH) + 1, NUM_BUCKETS - 1)
+
+
+def bucket_value(index: int) -> float:
+    """Representative (geometric midpoint) value of a bucket in seconds"""
+    if index == 0:
+        return MIN_VALUE
+    return MIN_VALUE * _GROWTH ** (index - 0.5)
+
+
+class SlidingHistogram:
+    """Latency histogram over a sliding time window"""
+
+    def __init__(self, window: float = 60.0, slices: int = 12):
+        """
+        Initialize histogram
+
+        Args:
+            window: Window length in seconds
+            slices: Number of time slices the window is split into; the window
+                advances in steps of window / slices
+        """
+        if window <= 0 or slices <= 0:
+            raise ValueError("window and slices must be positive")
+        self.window = window
+        self.slice_seconds = window / slices
+        # Sparse {bucket: count} per slice; at most NUM_BUCKETS entries each
+        self._slices: List[Dict[int, int]] = [{} for _ in range(slices)]
+        self._slice_ids = [-1] * slices  # Absolute slice number each slot holds
+        self._max = [0.0] * slices
+
+    def _slot(self, now: float) -> int:
+        slice_id = int(now // self.slice_seconds)
+        slot = slice_id % len(self._slices)
+        if self._slice_ids[slot] != slice_id:
+            # Slot holds an expired slice - recycle it
+            self._slices[slot].clear()
+            self._slice_ids[slot] = slice_id
+            self._max[slot] = 0.0
+        return slot
+
+    def record(self, value: float, now: Optional[float] = None) -> None:
+        """
+        Record a latency sample
+
+        Args:
+            value: Latency in seconds
+            now: Current time.monotonic() (default: now)
+        """
+        slot = self._slot(time.monotonic() if now is None else now)
+        counts = self._slices[slot]
+        index = bucket_index(value)
+        counts[index] = counts.get(index, 0) + 1
+        if value > self._max[slot]:
+            self._max[slot] = value
+
+    def _merged(
+        self, window: Optional[float], now: Optional[float]
+    ) -> Tuple[Dict[int, int], float]:
+        now = time.monotonic() if now is None else now
+        current = int(now // self.slice_seconds)
+        window = self.window if window is None else min(window, self.window)
+        oldest = current - max(int(math.ceil(window / self.slice_seconds)), 1) + 1
+
+        merged: Dict[int, int] = {}
+        max_value = 0.0
+        for slot, slice_id in enumerate(self._slice_ids):
+            if oldest <= slice_id <= current:
+                for index, count in self._slices[slot].items():
+                    merged[index] = merged.get(index, 0) + count
+                max_value = max(max_value, self._max[slot])
+        return merged, max_value
+
+    def snapshot(
+        self,
+        percentiles: Iterable[float] = DEFAULT_PERCENTILES,
+        window: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> dict:
+        """
+        Summarize the samples in the window
+
+        Args:
+            percentiles: Percentiles to report (0-100)
+            window: Seconds to look back (default/maximum: the histogram window)
+            now: Current time.monotonic() (default: now)
+
+        Returns:
+            Dict with count, mean_ms, max_ms and p<N>_ms for each percentile
+        """
+        merged, max_value = self._merged(window, now)
+        total = sum(merged.values())
+        result = {"count": total}
+        if total == 0:
+            result.update({"mean_ms": 0.0, "max_ms": 0.0})
+            result.update({f"p{p:g}_ms": 0.0 for p in percentiles})
+            return result
+
+        ordered = sorted(merged.items())
+        result["mean_ms"] = sum(bucket_value(i) * c for i, c in ordered) / total * 1000
+        result["max_ms"] = max_value * 1000
+        for p in percentiles:
+            rank = max(int(math.ceil(p / 100 * total)), 1)
+            seen = 0
+            for index, count in ordered:
+                seen += count
+                if seen >= rank:
+                    # Never report more than the exact maximum seen
+                    result[f"p{p:g}_ms"] = min(bucket_value(index), max_value) * 1000
+                    break
+        return result
+
+    def percentile(
+        self, p: float, window: Optional[float] = None, now: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        Single percentile in seconds, or None when the window holds no samples
+
+        Args:
+            p: Percentile (0-100)
+            window: Seconds to look back (default: the histogram window)
+            now: Current time.monotonic() (default: now)
+        """
+        stats = self.snapshot((p,), window, now)
+        if stats["count"] == 0:
+            return None
+        return stats[f"p{p:g}_ms"] / 1000
+
+    def mean_above(
+        self, threshold: float, window: Optional[float] = None, now: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        Conditional mean of the samples above a threshold, in seconds
+
+        Args:
+            threshold: Threshold in seconds
+            window: Seconds to look back (default: the histogram window)
+            now: Current time.monotonic() (default: now)
+
+        Returns:
+            Mean of the samples above the threshold, or None if there are none
+        """
+        merged, _ = self._merged(window, now)
+        first = bucket_index(threshold) + 1
+        count = 0
+        weighted = 0.0
+        for index, n in merged.items():
+            if index >= first:
+                count += n
+                weighted += bucket_value(index) * n
+        return weighted / count if count else None
+
+    def clear(self) -> None:
+        for counts in self._slices:
+            counts.clear()
+        self._slice_ids = [-1] * len(self._slices)
+        self._max = [0.0] * len(self._slices)
+
+
+class EWMARate:
+    """Exponentially weighted event rate (events/second), like Unix load averages"""
+
+    def __init__(self, window: float = 60.0, tick: float = 1.0):
+        """
+        Initialize rate meter
+
+        Args:
+            window: Time constant in seconds
+            tick: Update interval in seconds
+        """
+        self.window = window
+        self.tick = tick
+        self._alpha = 1 - math.exp(-tick / window)
+        self._rate = 0.0
+        self._pending = 0
+        self._initialized = False
+        self._last_tick = None
+
+    def _advance(self, now: float) -> None:
+        if self._last_tick is None:
+            self._last_tick = now
+            return
+        ticks = int((now - self._last_tick) // self.tick)
+        if ticks <= 0:
+            return
+        instant = self._pending / self.tick
+        if self._initialized:
+            self._rate += self._alpha * (instant - self._rate)
+        else:
+            self._rate = instant
+            self._initialized = True
+        # Remaining idle ticks decay the rate in closed form
+        self._rate *= (1 - self._alpha) ** (ticks - 1)
+        self._pending = 0
+        self._last_tick += ticks * self.tick
+
+    def mark(self, count: int = 1, now: Optional[float] = None) -> None:
+        """Count events"""
+        self._advance(time.monotonic() if now is None else now)
+        self._pending += count
+
+    def rate(self, now: Optional[float] = None) -> float:
+        """Current rate in events per second"""
+        self._advance(time.monotonic() if now is None else now)
+        return self._rate
+
+
+class LatencyMetrics:
+    """Latency histograms per pipeline stage plus completion throughput"""
+
+    def __init__(
+        self,
+        stages: Iterable[str],
+        window: float = 60.0,
+        slices: int = 12,
+        rate_windows: Iterable[float] = (10.0, 60.0, 300.0),
+        percentiles: Iterable[float] = DEFAULT_PERCENTILES,
+        cache_ttl: float = 1.0,
+    ):
+        """
+        Initialize metrics
+
+        Args:
+            stages: Names of the timed stages (e.g. "e2e", "encode")
+            window: Sliding window of the latency histograms in seconds
+            slices: Time slices per histogram window
+            rate_windows: EWMA time constants of the throughput meters in seconds
+            percentiles: Percentiles reported in snapshots
+            cache_ttl: Seconds a snapshot is reused before being recomputed
+        """
+        self.window = window
+        self.percentiles = tuple(percentiles)
+        self.cache_ttl = cache_ttl
+        self.histograms = {stage: SlidingHistogram(window, slices) for stage in stages}
+        self.throughput = {w: EWMARate(w) for w in rate_windows}
+        self._cache: Tuple[float, Optional[dict]] = (0.0, None)
+
+    def record(self, stage: str, seconds: float, now: Optional[float] = None) -> None:
+        """Record one sample for a stage"""
+        self.histograms[stage].record(seconds, now)
+
+    def mark_completed(self, count: int = 1, now: Optional[float] = None) -> None:
+        """Count completed requests for the throughput meters"""
+        for meter in self.throughput.values():
+            meter.mark(count, now)
+
+    def snapshot(self, window: Optional[float] = None, now: Optional[float] = None) -> dict:
+        """
+        Percentiles of every stage and EWMA throughput
+
+        The default-window snapshot is cached for cache_ttl seconds, since it is
+        requested for every video frame.
+
+        Args:
+            window: Seconds to look back (default: the configured window)
+            now: Current time.monotonic() (default: now)
+
+        Returns:
+            Dict with window_s, one percentile summary per stage and throughput_rps
+        """
+        now = time.monotonic() if now is None else now
+        cached_at, cached = self._cache
+        if window is None and cached is not None and now - cached_at < self.cache_ttl:
+            return cached
+
+        result = {"window_s": self.window if window is None else min(window, self.window)}
+        for stage, histogram in self.histograms.items():
+            result[stage] = histogram.snapshot(self.percentiles, window, now)
+        result["throughput_rps"] = {
+            f"{w:g}s": round(meter.rate(now), 3) for w, meter in self.throughput.items()
+        }
+        if window is None:
+            self._cache = (now, result)
+        return result
+
+    def clear(self) -> None:
+        for histogram in self.histograms.values():
+            histogram.clear()
+        self._cache = (0.0, None)
@@ -0,0 +1,180 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Motion Region Crop
+Sends only the part of a wide scene that changed.
+
+A running-average background model is kept on a small grayscale copy of the
+stream. For a sampled frame, the pixels that differ from the background give the
+bounding box of the moving region, which is padded and cropped from the full
+resolution frame. For patch-based models the crop costs fewer vision tokens than
+the whole frame while keeping full detail where something happens; an optional
+thumbnail of the whole frame can be sent along as a second image for context.
+"""
+
+import logging
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Width of the grayscale copy the background model runs on
+ANALYSIS_WIDTH = 160
+
+Box = Tuple[int, int, int, int]  # (x0, y0, x1, y1) in full-frame pixels
+
+
+def analysis_frame(frame, width: int = ANALYSIS_WIDTH) -> np.ndarray:
+    """
+    Small grayscale copy of a frame for the background model
+
+    Args:
+        frame: av.VideoFrame (scaled by libswscale, no full-size color conversion)
+            or BGR image
+        width: Width of the copy
+
+    Returns:
+        uint8 array of shape (height, width)
+    """
+    if isinstance(frame, np.ndarray):
+        h, w = frame.shape[:2]
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        size = (width, max(1, round(h * width / w)))
+        return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+    height = max(1, round(frame.height * width / frame.width))
+    return frame.reformat(width=width, height=height, format="gray").to_ndarray()
+
+
+class MotionCropper:
+    """Per-stream background model that finds the changed region of a frame"""
+
+    def __init__(
+        self,
+        learning_rate: float = 0.05,
+        threshold: int = 25,
+        min_area: float = 0.002,
+        max_area: float = 0.5,
+        padding: float = 0.25,
+        min_size: float = 0.2,
+        update_every: int = 5,
+    ):
+        """
+        Initialize cropper
+
+        Args:
+            learning_rate: Weight of a new frame in the running-average background
+            threshold: Gray-level difference (0-255) at which a pixel counts as changed
+            min_area: Changed share of the frame below which there is no motion
+                (the full frame is sent)
+            max_area: Crop share of the frame above which the full frame is sent
+                (cropping would save little)
+            padding: Margin added around the changed region, relative to its size
+            min_size: Minimum crop side, relative to the frame side
+            update_every: Feed every Nth frame into the background model
+        """
+        self.learning_rate = learning_rate
+        self.threshold = threshold
+        self.min_area = min_area
+        self.max_area = max_area
+        self.padding = padding
+        self.min_size = min_size
+        self.update_every = update_every
+        self.background: Optional[np.ndarray] = None
+        self._kernel = np.ones((3, 3), np.uint8)
+
+    def update(self, gray: np.ndarray) -> None:
+        """Blend a small grayscale frame into the background model"""
+        if self.background is None or self.background.shape != gray.shape:
+            self.background = gray.astype(np.float32)
+        else:
+            cv2.accumulateWeighted(gray, self.background, self.learning_rate)
+
+    def region(self, gray: np.ndarray) -> Optional[Tuple[float, float, float, float]]:
+        """
+        Bounding box of the pixels that differ from the background
+
+        Args:
+            gray: Small grayscale frame (as from analysis_frame())
+
+        Returns:
+            (x0, y0, x1, y1) as fractions of the frame, or None without motion (or
+            before the background model has a frame)
+        """
+        if self.background is None or self.background.shape != gray.shape:
+            return None
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self.background))
+        _, mask = cv2.threshold(diff, self.threshold, 255, cv2.THRESH_BINARY)
+        # Opening drops isolated noise pixels; dilation joins the parts of one object
+        mask = cv2.dilate(cv2.morphologyEx(mask, cv2.MORPH_OPEN, self._kernel), self._kernel)
+        points = cv2.findNonZero(mask)
+        if points is None or len(points) < self.min_area * mask.size:
+            return None
+        x, y, w, h = cv2.boundingRect(points)
+        height, width = mask.shape
+        return x / width, y / height, (x + w) / width, (y + h) / height
+
+    def crop_box(self, gray: np.ndarray, width: int, height: int) -> Optional[Box]:
+        """
+        Padded crop of the moving region for a frame of the given size
+
+        Args:
+            gray: Small grayscale copy of the frame
+            width: Full frame width
+            height: Full frame height
+
+        Returns:
+            Crop box in full-frame pixels, or None to send the full frame
+        """
+        region = self.region(gray)
+        if region is None:
+            return None
+        x0, y0, x1, y1 = region
+        pad_x = max((x1 - x0) * self.padding, (self.min_size - (x1 - x0)) / 2, 0.0)
+        pad_y = max((y1 - y0) * self.padding, (self.min_size - (y1 - y0)) / 2, 0.0)
+        # Shift a box that runs over an edge back inside instead of clipping it
+        x0, x1 = _fit(x0 - pad_x, x1 + pad_x)
+        y0, y1 = _fit(y0 - pad_y, y1 + pad_y)
+        if (x1 - x0) * (y1 - y0) > self.max_area:
+            return None
+        return round(x0 * width), round(y0 * height), round(x1 * width), round(y1 * height)
+
+
+def _fit(lo: float, hi: float) -> Tuple[float, float]:
+    """Move the interval [lo, hi] into [0, 1], clipping only if it is longer"""
+    if lo < 0:
+        lo, hi = 0.0, hi - lo
+    if hi > 1:
+        lo, hi = max(lo - (hi - 1), 0.0), 1.0
+    return lo, hi
+
+
+def thumbnail(img: np.ndarray, width: int) -> np.ndarray:
+    """
+    Downscaled copy of a full frame, sent next to a crop for context
+
+    Args:
+        img: BGR frame
+        width: Thumbnail width (never upscaled)
+
+    Returns:
+        BGR thumbnail
+    """
+    h, w = img.shape[:2]
+    if w <= width:
+        return img
+    return cv2.resize(img, (width, max(1, round(h * width / w))), interpolation=cv2.INTER_AREA)
@@ -0,0 +1,240 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Ollama Chat Client
+Native Ollama /api/chat adapter with keep_alive and server-side timings.
+
+Ollama's OpenAI-compatible endpoint neither accepts keep_alive (so an idle model
+is unloaded after 5 minutes and the next frame pays the load time) nor returns
+the server's timing breakdown. The native API does both: every response carries
+load, prompt evaluation and generation durations, which lets the client separate
+model time from network and queueing overhead.
+"""
+
+import logging
+import re
+import time
+from typing import Optional, Union
+
+import httpx
+
+from .fast_client import IMAGE_PLACEHOLDER, EncodedImages, FastChatClient, _iter_chunks
+
+logger = logging.getLogger(__name__)
+
+# Port Ollama listens on by default, used to pick the native API automatically
+OLLAMA_DEFAULT_PORT = 11434
+
+
+def native_api_base(api_base: str) -> str:
+    """
+    Ollama server root for an OpenAI-compatible API base
+
+    Args:
+        api_base: API base URL (e.g., "http://localhost:11434/v1")
+
+    Returns:
+        URL without the /v1 suffix (e.g., "http://localhost:11434")
+    """
+    return re.sub(r"/v1/?$", "", api_base.rstrip("/"))
+
+
+def normalize_keep_alive(value: Optional[Union[str, int, float]]) -> Optional[Union[str, float]]:
+    """
+    Normalize a keep_alive setting for the request body
+
+    Ollama accepts a number of seconds or a duration string ("10m", "1h"); a negative
+    value keeps the model loaded forever and 0 unloads it after the request.
+
+    Args:
+        value: keep_alive from the CLI or API (numeric strings become numbers)
+
+    Returns:
+        Value to send, or None to use the server default
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            if not re.fullmatch(r"-?\d+(\.\d+)?(ms|s|m|h)", value.strip()):
+                raise ValueError(f"Invalid keep_alive '{value}' (use seconds or e.g. '10m')")
+            return value.strip()
+    return float(value)
+
+
+class OllamaCompletion:
+    """Result of a native Ollama chat request"""
+
+    __slots__ = ("text", "usage", "timings", "serialize_time", "network_time")
+
+    def __init__(
+        self,
+        text: str,
+        usage: dict,
+        timings: dict,
+        serialize_time: float,
+        network_time: float,
+    ):
+        self.text = text
+        self.usage = usage  # OpenAI-style prompt/completion/total token counts
+        self.timings = timings  # Server-side durations in seconds
+        self.serialize_time = serialize_time  # seconds spent building the request body
+        self.network_time = network_time  # seconds from send to parsed response
+
+
+class OllamaChatClient:
+    """Raw httpx client for image chat requests against Ollama's native API"""
+
+    def __init__(
+        self,
+        api_base: str,
+        api_key: str = "EMPTY",
+        timeout: float = 600.0,
+        max_connections: int = 16,
+    ):
+        """
+        Initialize Ollama client
+
+        Args:
+            api_base: API base URL, with or without the OpenAI /v1 suffix
+            api_key: API key (for Ollama behind an authenticating proxy; "EMPTY" = none)
+            timeout: Request timeout in seconds
+            max_connections: Maximum pooled keep-alive connections
+        """
+        self.api_base = native_api_base(api_base)
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        if api_key and api_key != "EMPTY":
+            headers["Authorization"] = f"Bearer {api_key}"
+        self._client = httpx.AsyncClient(
+            base_url=self.api_base,
+            headers=headers,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+        )
+
+    @staticmethod
+    def parse_timings(data: dict) -> dict:
+        """
+        Server-side timing breakdown of a final /api/chat response
+
+        Args:
+            data: Response JSON (durations in nanoseconds)
+
+        Returns:
+            Dict with load, prompt_eval, eval and total durations in seconds
+        """
+        return {
+            phase: (data.get(f"{phase}_duration") or 0) / 1e9
+            for phase in ("load", "prompt_eval", "eval", "total")
+        }
+
+    async def create(
+        self,
+        model: str,
+        prompt: str,
+        image_b64: EncodedImages,
+        max_tokens: int,
+        temperature: float = 0.7,
+        keep_alive: Optional[Union[str, float]] = None,
+        context: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> OllamaCompletion:
+        """
+        Send a non-streaming /api/chat request with one image (or several)
+
+        Args:
+            model: Model name
+            prompt: Text prompt
+            image_b64: Base64-encoded JPEG image as bytes, or a list of them
+            max_tokens: Maximum tokens to generate (num_predict)
+            temperature: Sampling temperature
+            keep_alive: How long the model stays loaded after the request
+                (None = server default)
+            context: Optional volatile text appended after the prompt
+            timeout: Per-request timeout in seconds (default: client timeout)
+
+        Returns:
+            OllamaCompletion with the generated text, usage and timing breakdown
+
+        Raises:
+            httpx.HTTPStatusError: If the backend answers with an HTTP error
+            httpx.HTTPError: On connection/timeout errors
+        """
+        serialize_start = time.perf_counter()
+        count = 1 if isinstance(image_b64, bytes) else len(image_b64)
+        request = {
+            "model": model,
+            # Ollama places images before the text of a message, so context just follows
+            "messages": [
+                {
+                    "role": "user",
+                    "content": f"{prompt}\n\n{context}" if context else prompt,
+                    "images": [IMAGE_PLACEHOLDER] * count,
+                }
+            ],
+            "stream": False,
+            "options": {"num_predict": max_tokens, "temperature": temperature},
+        }
+        if keep_alive is not None:
+            request["keep_alive"] = keep_alive
+        chunks = FastChatClient.build_body(request, image_b64)
+        content_length = sum(len(c) for c in chunks)
+        network_start = time.perf_counter()
+
+        kwargs = {} if timeout is None else {"timeout": timeout}
+        response = await self._client.post(
+            "/api/chat",
+            content=_iter_chunks(chunks),
+            headers={"Content-Length": str(content_length)},
+            **kwargs,
+        )
+        if response.status_code >= 400:
+            message = response.text[:500]
+            raise httpx.HTTPStatusError(
+                f"HTTP {response.status_code} from {self.api_base}: {message}",
+                request=response.request,
+                response=response,
+            )
+
+        data = response.json()
+        end = time.perf_counter()
+
+        try:
+            text = data["message"]["content"] or ""
+        except (KeyError, TypeError):
+            raise ValueError(f"Unexpected Ollama chat response: {str(data)[:200]}")
+
+        prompt_tokens = data.get("prompt_eval_count") or 0
+        completion_tokens = data.get("eval_count") or 0
+        return OllamaCompletion(
+            text=text,
+            usage={
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+            timings=self.parse_timings(data),
+            serialize_time=network_start - serialize_start,
+            network_time=end - network_start,
+        )
+
+    async def aclose(self) -> None:
+        """Close pooled connections"""
+        await self._client.aclose()
@@ -0,0 +1,148 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Prometheus Exposition
+Minimal pull-based registry rendering the Prometheus text format.
+
+Components keep plain integer counters on their hot paths; collectors read
+them only when /metrics is scraped, so leaving telemetry on costs nothing per
+frame. No dependency on prometheus_client.
+"""
+
+import logging
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+METRIC_TYPES = ("counter", "gauge", "summary", "untyped")
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class MetricFamily:
+    """One metric name with its type, help text and labelled samples"""
+
+    def __init__(self, name: str, metric_type: str, help_text: str):
+        """
+        Initialize metric family
+
+        Args:
+            name: Metric name (counters should end in _total)
+            metric_type: One of METRIC_TYPES
+            help_text: Description shown in the HELP line
+        """
+        if metric_type not in METRIC_TYPES:
+            raise ValueError(f"Unknown metric type '{metric_type}'")
+        self.name = name
+        self.type = metric_type
+        self.help = help_text
+        self.samples: List[Tuple[Dict[str, str], float]] = []
+
+    def add(self, value: float, **labels) -> "MetricFamily":
+        """Add a sample; None values are skipped"""
+        if value is not None:
+            self.samples.append((labels, value))
+        return self
+
+    def render(self) -> List[str]:
+        """Exposition lines for this family"""
+        lines = [
+            f"# HELP {self.name} {self.help.replace(chr(10), ' ')}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        for labels, value in self.samples:
+            if labels:
+                label_str = ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+                lines.append(f"{self.name}{{{label_str}}} {_format_value(value)}")
+            else:
+                lines.append(f"{self.name} {_format_value(value)}")
+        return lines
+
+
+Collector = Callable[[], Iterable[MetricFamily]]
+
+
+class Registry:
+    """Collectors evaluated at scrape time"""
+
+    def __init__(self, prefix: str = ""):
+        """
+        Initialize registry
+
+        Args:
+            prefix: Prepended to every metric name (e.g. "live_vlm_")
+        """
+        self.prefix = prefix
+        self._collectors: List[Collector] = []
+
+    def register(self, collector: Collector) -> Collector:
+        """Register a collector (usable as a decorator)"""
+        self._collectors.append(collector)
+        return collector
+
+    def unregister(self, collector: Collector) -> None:
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    def collect(self) -> List[MetricFamily]:
+        """Run every collector; a failing collector is logged and skipped"""
+        families: List[MetricFamily] = []
+        for collector in self._collectors:
+            try:
+                families.extend(collector())
+            except Exception as e:
+                logger.warning(f"Metrics collector {collector.__name__} failed: {e}")
+        return families
+
+    def render(self, families: Optional[List[MetricFamily]] = None) -> str:
+        """
+        Render all metrics in the Prometheus text format
+
+        Families with the same name from different collectors are merged.
+
+        Returns:
+            Exposition text
+        """
+        merged: Dict[str, MetricFamily] = {}
+        for family in self.collect() if families is None else families:
+            name = self.prefix + family.name
+            if name in merged:
+                merged[name].samples.extend(family.samples)
+            else:
+                renamed = MetricFamily(name, family.type, family.help)
+                renamed.samples = list(family.samples)
+                merged[name] = renamed
+
+        lines = []
+        for family in merged.values():
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
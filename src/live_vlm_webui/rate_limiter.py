@@ -0,0 +1,275 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Rate Limiter
+Client-side requests/min and tokens/min quotas for cloud VLM endpoints.
+
+Requests wait in FIFO order until both token buckets have room, so bursts from
+several streams are spread out instead of answered with 429s. A Retry-After from
+the server pauses all requests sharing the quota. Limiters are shared per
+(API base, API key), like the quotas they model.
+"""
+
+import asyncio
+import email.utils
+import hashlib
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket that may go into debt for requests larger than its capacity"""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize token bucket (starts full)
+
+        Args:
+            rate: Refill rate in units per second
+            capacity: Maximum stored units (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.level = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until amount can be taken (0 = now)"""
+        self._refill(now)
+        # Oversized requests only need a full bucket and leave it in debt
+        missing = min(amount, self.capacity) - self.level
+        return max(missing / self.rate, 0.0)
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level -= amount
+
+    def give(self, amount: float, now: float) -> None:
+        """Return (or with a negative amount, charge) units after the fact"""
+        self._refill(now)
+        self.level = min(self.capacity, self.level + amount)
+
+
+class QuotaLimiter:
+    """Requests/min and tokens/min limiter with Retry-After support"""
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        burst: float = 2.0,
+    ):
+        """
+        Initialize limiter
+
+        Args:
+            requests_per_minute: Request quota (None = unlimited)
+            tokens_per_minute: Token quota, prompt + completion (None = unlimited)
+            burst: Seconds of quota that may be spent at once; small values spread
+                requests evenly
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.requests: Optional[TokenBucket] = None
+        self.tokens: Optional[TokenBucket] = None
+        if requests_per_minute:
+            rate = requests_per_minute / 60
+            self.requests = TokenBucket(rate, max(1.0, rate * burst))
+        if tokens_per_minute:
+            rate = tokens_per_minute / 60
+            self.tokens = TokenBucket(rate, rate * burst)
+
+        self.blocked_until = 0.0  # time.monotonic() set from Retry-After
+        self._lock = asyncio.Lock()  # FIFO order of waiting requests
+
+        # Statistics
+        self.total_requests = 0
+        self.total_waits = 0  # Requests that had to wait
+        self.total_wait_time = 0.0  # seconds
+        self.retry_after_events = 0
+
+    def _wait_time(self, tokens: float, now: float) -> float:
+        wait = max(self.blocked_until - now, 0.0)
+        if self.requests:
+            wait = max(wait, self.requests.wait_time(1, now))
+        if self.tokens:
+            wait = max(wait, self.tokens.wait_time(tokens, now))
+        return wait
+
+    async def acquire(self, tokens: float = 0) -> float:
+        """
+        Wait until a request of the given size fits the quota and reserve it
+
+        Cancelling the call while it waits reserves nothing.
+
+        Args:
+            tokens: Estimated tokens of the request (settle() corrects the estimate)
+
+        Returns:
+            Seconds spent waiting
+        """
+        start = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                wait = self._wait_time(tokens, now)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+
+            if self.requests:
+                self.requests.take(1, now)
+            if self.tokens:
+                self.tokens.take(tokens, now)
+
+        waited = time.monotonic() - start
+        self.total_requests += 1
+        if waited > 0.001:
+            self.total_waits += 1
+            self.total_wait_time += waited
+        return waited
+
+    def settle(self, reserved: float, used: Optional[float]) -> None:
+        """
+        Correct a token reservation once the actual usage is known
+
+        Args:
+            reserved: Tokens passed to acquire()
+            used: Tokens the server reported (None = keep the reservation)
+        """
+        if self.tokens and used is not None:
+            self.tokens.give(reserved - used, time.monotonic())
+
+    def penalize(self, retry_after: float) -> None:
+        """
+        Pause all requests after the server asked us to back off
+
+        Args:
+            retry_after: Seconds from the Retry-After header
+        """
+        self.retry_after_events += 1
+        until = time.monotonic() + retry_after
+        if until > self.blocked_until:
+            self.blocked_until = until
+            logger.warning(f"Rate limited by server, pausing requests for {retry_after:.1f}s")
+
+    def get_stats(self) -> dict:
+        """
+        Get quota configuration and statistics
+
+        Returns:
+            Dict with quotas, current bucket levels and wait statistics
+        """
+        now = time.monotonic()
+        stats = {
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "total_requests": self.total_requests,
+            "total_waits": self.total_waits,
+            "total_wait_s": self.total_wait_time,
+            "retry_after_events": self.retry_after_events,
+            "blocked_for_s": max(self.blocked_until - now, 0.0),
+        }
+        if self.requests:
+            self.requests._refill(now)
+            stats["available_requests"] = self.requests.level
+        if self.tokens:
+            self.tokens._refill(now)
+            stats["available_tokens"] = self.tokens.level
+        return stats
+
+
+_limiters: Dict[Tuple[str, str], QuotaLimiter] = {}
+
+
+def get_limiter(
+    api_base: str,
+    api_key: str,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+) -> QuotaLimiter:
+    """
+    Get the limiter shared by everything using the same API base and key
+
+    A limiter with different quotas replaces the existing one.
+
+    Args:
+        api_base: Base URL of the API
+        api_key: API key (only a hash is kept)
+        requests_per_minute: Request quota (None = unlimited)
+        tokens_per_minute: Token quota (None = unlimited)
+
+    Returns:
+        QuotaLimiter
+    """
+    key_hash = hashlib.sha256((api_key or "").encode()).hexdigest()[:16]
+    key = (api_base.rstrip("/"), key_hash)
+    limiter = _limiters.get(key)
+    if (
+        limiter is None
+        or limiter.requests_per_minute != requests_per_minute
+        or limiter.tokens_per_minute != tokens_per_minute
+    ):
+        limiter = QuotaLimiter(requests_per_minute, tokens_per_minute)
+        _limiters[key] = limiter
+    return limiter
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delay in seconds or an HTTP date)
+
+    Args:
+        value: Header value
+
+    Returns:
+        Seconds to wait, or None if missing or unparseable
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(date.timestamp() - time.time(), 0.0)
+
+
+def retry_after_of(error: Exception) -> Optional[float]:
+    """
+    Retry-After delay of a failed HTTP request (OpenAI SDK or httpx errors)
+
+    Args:
+        error: Exception raised by the request
+
+    Returns:
+        Seconds to wait, or None if the response had no usable header
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is None:
+        return None
+    return parse_retry_after(headers.get("retry-after"))
@@ -0,0 +1,114 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Regions of Interest
+Named zones of a camera view (a door, a pool edge, a loading bay) that are
+analyzed on their own instead of the whole frame.
+
+Boxes are fractions of the frame, so they survive resolution changes. Every
+sampled frame is sliced into its zones without copying; each crop then goes
+through the image profile at its own native detail, which a zone would never get
+as a small part of a downscaled full frame.
+"""
+
+from typing import List
+
+import numpy as np
+
+# Upper bound on zones per session (each zone is one request per sampled frame)
+MAX_ROIS = 8
+
+
+def normalize_rois(items) -> List[dict]:
+    """
+    Validate a list of regions of interest
+
+    Args:
+        items: List of {"name": str, "box": [x0, y0, x1, y1], "prompt": str (optional)}
+            dicts; box coordinates are fractions of the frame width and height
+
+    Returns:
+        List of {"name", "box", "prompt"} dicts (prompt None = the session's prompt)
+
+    Raises:
+        ValueError: If an entry is malformed, there are too many or names repeat
+    """
+    if not isinstance(items, list):
+        raise ValueError("Regions of interest must be a list")
+
+    rois = []
+    for i, item in enumerate(items, start=1):
+        if not isinstance(item, dict):
+            raise ValueError(f"Invalid region of interest: {item!r}")
+        name = str(item.get("name") or f"zone{i}").strip()
+        try:
+            x0, y0, x1, y1 = (float(v) for v in item.get("box") or ())
+        except (TypeError, ValueError):
+            raise ValueError(f"Region '{name}' needs a box [x0, y0, x1, y1]") from None
+        if not (0 <= x0 < x1 <= 1 and 0 <= y0 < y1 <= 1):
+            raise ValueError(
+                f"Region '{name}' box must satisfy 0 <= x0 < x1 <= 1 and 0 <= y0 < y1 <= 1"
+            )
+        prompt = str(item.get("prompt") or "").strip() or None
+        rois.append({"name": name, "box": [x0, y0, x1, y1], "prompt": prompt})
+
+    if len(rois) > MAX_ROIS:
+        raise ValueError(f"At most {MAX_ROIS} regions of interest")
+    names = [r["name"] for r in rois]
+    if len(set(names)) != len(names):
+        raise ValueError("Region names must be unique")
+    return rois
+
+
+def parse_roi(value: str) -> dict:
+    """
+    Parse a NAME=X0,Y0,X1,Y1[=PROMPT] command-line region
+
+    Args:
+        value: Region spec, e.g. "door=0.1,0.2,0.4,0.9=Is the door open?"
+
+    Returns:
+        Region dict for normalize_rois()
+
+    Raises:
+        ValueError: If the spec is malformed
+    """
+    name, sep, rest = value.partition("=")
+    box, _, prompt = rest.partition("=")
+    if not sep or not name.strip():
+        raise ValueError(f"Invalid region '{value}' (expected NAME=X0,Y0,X1,Y1[=PROMPT])")
+    return {"name": name, "box": box.split(","), "prompt": prompt}
+
+
+def crop_regions(img: np.ndarray, rois: List[dict]) -> List[np.ndarray]:
+    """
+    Slice a frame into its regions of interest
+
+    Args:
+        img: Frame (height, width, channels)
+        rois: Normalized regions
+
+    Returns:
+        One view into img per region (no pixels are copied)
+    """
+    height, width = img.shape[:2]
+    crops = []
+    for roi in rois:
+        x0, y0, x1, y1 = roi["box"]
+        left, top = int(x0 * width), int(y0 * height)
+        right, bottom = max(round(x1 * width), left + 1), max(round(y1 * height), top + 1)
+        crops.append(img[top:bottom, left:right])
+    return crops
@@ -17,12 +17,43 @@ from typing import Optional
 from aiortc import VideoStreamTrack
 from av import VideoFrame
 
+from .frame_quality import mark_damaged
+
 # Suppress verbose ffmpeg/libav logging (HEVC decoder errors are normal for IP cameras)
 # These POC/slice errors happen due to network packet loss but stream recovers automatically
 av.logging.set_level(av.logging.FATAL)  # Only show fatal errors that stop the stream
 
 logger = logging.getLogger(__name__)
 
+# NAL units of an Annex B H.264 bitstream (the format RTSP demuxing yields)
+_NAL_START = re.compile(rb"\x00\x00\x01(.)", re.DOTALL)
+H264_SPS = 7  # NAL unit type of a sequence parameter set
+
+
+def with_parameter_sets(packet: av.Packet, extradata: Optional[bytes]) -> av.Packet:
+    """
+    H.264 keyframe packet with the stream's SPS/PPS in front
+
+    Many cameras announce their parameter sets only in the RTSP session description,
+    while a browser decoding forwarded packets needs them in-band before a keyframe.
+
+    Args:
+        packet: Demuxed Annex B packet
+        extradata: Codec extradata of the stream (Annex B SPS/PPS)
+
+    Returns:
+        The packet itself, or a copy with the parameter sets prepended
+    """
+    if not (packet.is_keyframe and extradata and _NAL_START.search(extradata)):
+        return packet  # Not a keyframe, or avcC extradata that cannot be prepended
+    data = bytes(packet)
+    if any(nal[0] & 0x1F == H264_SPS for nal in _NAL_START.findall(data)):
+        return packet
+    copy = av.Packet(bytes(extradata) + data)
+    copy.pts, copy.dts, copy.time_base = packet.pts, packet.dts, packet.time_base
+    copy.is_keyframe = True
+    return copy
+
 
 class RTSPVideoTrack(VideoStreamTrack):
     """
@@ -36,6 +67,9 @@ class RTSPVideoTrack(VideoStreamTrack):
         frame = await track.recv()
     """
 
+    # Undecodable packets in a row after which the stream is reconnected
+    MAX_CONSECUTIVE_DECODE_ERRORS = 100
+
     def __init__(
         self,
         rtsp_url: str,
@@ -60,6 +94,15 @@ class RTSPVideoTrack(VideoStreamTrack):
         self.stream: Optional[av.video.VideoStream] = None
         self._stopped = False
         self._frame_count = 0
+        self.reconnects = 0  # Reconnections started after stream failures
+        self.reconnect_failures = 0  # Reconnections that gave up after all attempts
+        self.decode_errors = 0  # Demux/decode errors while reading frames
+        self.damaged_frames = 0  # Frames decoded after a decode error, before the next keyframe
+        self._damaged = False  # A decode error broke the reference chain until the next keyframe
+        self._consecutive_decode_errors = 0
+        # Callables receiving the encoded packets (passthrough viewers), on the event loop
+        self.packet_sinks = set()
+        self._pending_packets = []  # Demuxed since the last recv(), for packet_sinks
 
         # Thread lock to protect container access between executor thread and stop()
         self._container_lock = threading.Lock()
@@ -139,6 +182,7 @@ class RTSPVideoTrack(VideoStreamTrack):
             # Read frame from container (blocking operation, run in executor)
             loop = asyncio.get_event_loop()
             frame = await loop.run_in_executor(None, self._read_frame)
+            self._forward_packets()
 
             if frame is None:
                 if not self._stopped:
@@ -146,6 +190,7 @@ class RTSPVideoTrack(VideoStreamTrack):
                     await self._reconnect()
                     # Try again after reconnection
                     frame = await loop.run_in_executor(None, self._read_frame)
+                    self._forward_packets()
                     if frame is None:
                         raise StopAsyncIteration
                 else:
@@ -168,6 +213,21 @@ class RTSPVideoTrack(VideoStreamTrack):
                 await self._reconnect()
             raise
 
+    def _forward_packets(self):
+        """Hand the packets demuxed by the last read to the packet sinks"""
+        packets, self._pending_packets = self._pending_packets, []
+        if not packets or not self.stream:
+            return
+        extradata = self.stream.codec_context.extradata if self.codec == "h264" else None
+        for packet in packets:
+            if packet.pts is None:
+                packet.pts = packet.dts
+                if packet.pts is None:
+                    continue  # Cannot be timestamped for RTP
+            packet = with_parameter_sets(packet, extradata)
+            for sink in list(self.packet_sinks):
+                sink(packet)
+
     def _read_frame(self) -> Optional[VideoFrame]:
         """
         Read and decode next frame from RTSP stream (blocking).
@@ -194,8 +254,29 @@ class RTSPVideoTrack(VideoStreamTrack):
                     # Check stopped inside loop for fast exit
                     if self._stopped:
                         return None
-                    for frame in packet.decode():
+                    if self.packet_sinks and packet.size:
+                        self._pending_packets.append(packet)
+                    try:
+                        frames = packet.decode()
+                    except av.error.InvalidDataError as e:
+                        # A damaged packet (e.g. lost RTP data): skip it and flag the
+                        # frames predicted from it instead of reconnecting
+                        self.decode_errors += 1
+                        self._damaged = True
+                        self._consecutive_decode_errors += 1
+                        if self._consecutive_decode_errors >= self.MAX_CONSECUTIVE_DECODE_ERRORS:
+                            logger.error(f"Too many RTSP decode errors in a row: {e}")
+                            return None
+                        logger.debug(f"Skipping undecodable RTSP packet: {e}")
+                        continue
+                    self._consecutive_decode_errors = 0
+                    for frame in frames:
                         if isinstance(frame, VideoFrame):
+                            if frame.key_frame:
+                                self._damaged = False
+                            if self._damaged:
+                                self.damaged_frames += 1
+                                mark_damaged(frame)
                             return frame
 
                 # No more frames available (stream ended)
@@ -207,6 +288,7 @@ class RTSPVideoTrack(VideoStreamTrack):
                 return None
             except Exception as e:
                 if not self._stopped:  # Only log if not intentionally stopped
+                    self.decode_errors += 1
                     logger.error(f"Error decoding RTSP frame: {e}")
                 return None
 
@@ -218,6 +300,7 @@ class RTSPVideoTrack(VideoStreamTrack):
         """
         safe_url = self._sanitize_url(self.rtsp_url)
         logger.info(f"Attempting RTSP reconnection to {safe_url}...")
+        self.reconnects += 1
 
         # Clean up existing connection
         if self.container:
@@ -247,6 +330,7 @@ class RTSPVideoTrack(VideoStreamTrack):
             except Exception as e:
                 logger.warning(f"Reconnection attempt {attempt + 1} failed: {e}")
                 if attempt == self.reconnect_attempts - 1:
+                    self.reconnect_failures += 1
                     logger.error(
                         f"RTSP reconnection failed after {self.reconnect_attempts} attempts"
                     )
@@ -285,6 +369,11 @@ class RTSPVideoTrack(VideoStreamTrack):
         except Exception as e:
             logger.warning(f"Error in parent VideoStreamTrack.stop(): {e}")
 
+    @property
+    def codec(self) -> Optional[str]:
+        """Codec name of the stream (e.g. "h264"), None before connecting"""
+        return self.stream.codec_context.name if self.stream else None
+
     @property
     def is_connected(self) -> bool:
         """Check if RTSP stream is currently connected."""
@@ -301,6 +390,10 @@ class RTSPVideoTrack(VideoStreamTrack):
             "url": self._sanitize_url(self.rtsp_url),
             "connected": self.is_connected,
             "frames_received": self._frame_count,
+            "reconnects": self.reconnects,
+            "reconnect_failures": self.reconnect_failures,
+            "decode_errors": self.decode_errors,
+            "damaged_frames": self.damaged_frames,
             "stopped": self._stopped,
         }
 
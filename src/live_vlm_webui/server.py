@@ -25,20 +25,36 @@ import os
 import signal
 import socket
 import subprocess
-import aiohttp
+import time
+import uuid
+import weakref
+from typing import Optional
 from aiohttp import web
 from aiortc import (
     RTCPeerConnection,
+    RTCRtpSender,
     RTCSessionDescription,
     RTCConfiguration,
-    RTCIceServer,
 )
 from aiortc.contrib.media import MediaRelay
-
-from .vlm_service import VLMService
+from aiortc.mediastreams import MediaStreamError
+
+from .vlm_service import VLMService, API_FLAVORS, PROMPT_LAYOUTS, normalize_prompt_set
+from .backend_pool import ROUTING_STRATEGIES
+from .image_profiles import PROFILES as IMAGE_PROFILES
+from .circuit_breaker import CIRCUIT_STATES
+from .discovery import ServiceDiscovery
+from .calibration import CalibrationError, calibrate
+from .camera_registry import CameraRegistry
+from .capture_constraints import MIN_CAPTURE_FPS, capture_constraints
+from .frame_quality import FrameQualityGate
+from .ice_servers import DEFAULT_ICE_SERVERS, build_ice_servers, ice_mode, to_browser_config
+from .regions import normalize_rois, parse_roi
+from .snapshot_session import SnapshotSession
 from .video_processor import VideoProcessorTrack
 from .gpu_monitor import create_monitor
 from .rtsp_track import RTSPVideoTrack
+from .prometheus import CONTENT_TYPE as PROMETHEUS_CONTENT_TYPE, MetricFamily, Registry
 
 # Configure logging
 logging.basicConfig(
@@ -53,7 +69,28 @@ vlm_service = None
 websockets = set()  # Track active WebSocket connections
 gpu_monitor = None  # GPU monitoring instance
 gpu_monitor_task = None  # Background task for GPU monitoring
-rtsp_tracks = {}  # Track active RTSP streams {session_id: (rtsp_track, processor_track)}
+vlm_metrics_task = None  # Background task broadcasting latency percentiles and backend stats
+vlm_metrics_interval = 1.0  # Seconds between vlm_metrics WebSocket messages
+rtsp_tracks = {}  # Track active RTSP API sessions {session_id: Camera}
+# One connection, decode and analysis per RTSP URL, shared by all viewers
+camera_registry = CameraRegistry(lambda url, session_id: open_rtsp_camera(url, session_id))
+
+# Telemetry for /metrics - collectors read these only when scraped
+metrics_registry = Registry(prefix="live_vlm_")
+# All VideoProcessorTracks (webcam and RTSP) and SnapshotSessions
+processor_tracks = weakref.WeakSet()
+rtsp_sources = weakref.WeakKeyDictionary()  # {RTSPVideoTrack: session_id}
+pending_ws_sends = 0  # WebSocket messages queued but not yet written
+ws_send_errors = 0
+ws_messages_sent = 0
+last_gpu_stats = None  # Most recent GPU monitor reading (never polled at scrape time)
+discovery = ServiceDiscovery()  # Cached local service detection and model lists
+calibration_task = None  # Running capacity calibration
+last_calibration = None  # Report of the last capacity calibration
+startup_calibration_sessions = None  # Calibrate for this many streams on startup (--calibrate)
+min_capture_fps = MIN_CAPTURE_FPS  # Lowest camera frame rate requested (0 = no constraints)
+ice_servers = build_ice_servers(DEFAULT_ICE_SERVERS)  # STUN/TURN servers (empty = host only)
+rtsp_passthrough = False  # Forward H.264 camera packets to viewers instead of re-encoding
 
 
 def is_port_available(port, host="0.0.0.0"):
@@ -111,42 +148,12 @@ async def detect_local_service_and_model():
     Auto-detect available local VLM services and select a model
     Returns: (api_base, model_name) or (None, None) if no service found
     """
-    services = [
-        ("http://localhost:11434/v1", "Ollama"),
-        ("http://localhost:8000/v1", "vLLM"),
-        ("http://localhost:30000/v1", "SGLang"),
-    ]
-
-    for api_base, service_name in services:
-        try:
-            # Try to connect to the service
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=2)) as session:
-                async with session.get(f"{api_base}/models") as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        models = data.get("data", [])
-                        if models:
-                            # Prefer vision models
-                            vision_keywords = ["vision", "llava", "llama-3.2", "gemini"]
-                            for model in models:
-                                model_id = model.get("id", "")
-                                if any(keyword in model_id.lower() for keyword in vision_keywords):
-                                    logger.info(f"✅ Auto-detected {service_name} at {api_base}")
-                                    logger.info(f"   Selected model: {model_id}")
-                                    return (api_base, model_id)
-
-                            # If no vision model found, use the first one
-                            model_id = models[0].get("id", "")
-                            logger.info(f"✅ Auto-detected {service_name} at {api_base}")
-                            logger.info(
-                                f"   Selected model: {model_id} (vision model preferred but not found)"
-                            )
-                            return (api_base, model_id)
-        except Exception as e:
-            logger.debug(f"Service {service_name} not available at {api_base}: {e}")
-            continue
-
-    return (None, None)
+    try:
+        return await discovery.detect_service_and_model()
+    finally:
+        # Called from a short-lived event loop before the server starts; the cached
+        # results outlive the session
+        await discovery.aclose()
 
 
 async def index(request):
@@ -156,31 +163,32 @@ async def index(request):
 
 
 async def models(request):
-    """Return available models from the VLM API"""
+    """
+    Return available models from the VLM API (cached, ?refresh=1 to query now)
+
+    GET /models?api_base=URL&api_key=KEY&refresh=1
+    """
+    query = request.rel_url.query
+    refresh = query.get("refresh") in ("1", "true")
     try:
         # Check if custom API base and key are provided in query params
-        api_base = request.rel_url.query.get("api_base")
-        api_key = request.rel_url.query.get("api_key")
+        api_base = query.get("api_base")
+        api_key = query.get("api_key")
 
         if api_base:
             # Query models from the provided API endpoint
-            from openai import AsyncOpenAI
-
-            temp_client = AsyncOpenAI(base_url=api_base, api_key=api_key if api_key else "EMPTY")
-            models_response = await temp_client.models.list()
-            models_list = [
-                {"id": model.id, "name": model.id, "current": False}
-                for model in models_response.data
-            ]
+            model_ids = await discovery.list_models(api_base, api_key or "EMPTY", refresh=refresh)
+            models_list = [{"id": m, "name": m, "current": False} for m in model_ids]
             return web.Response(
                 content_type="application/json", text=json.dumps({"models": models_list})
             )
         elif vlm_service:
             # Use the server's VLM service
-            models_response = await vlm_service.client.models.list()
+            model_ids = await discovery.list_models(
+                vlm_service.api_base, vlm_service.api_key, refresh=refresh
+            )
             models_list = [
-                {"id": model.id, "name": model.id, "current": model.id == vlm_service.model}
-                for model in models_response.data
+                {"id": m, "name": m, "current": m == vlm_service.model} for m in model_ids
             ]
             return web.Response(
                 content_type="application/json", text=json.dumps({"models": models_list})
@@ -210,32 +218,13 @@ async def models(request):
 
 
 async def detect_services(request):
-    """Detect available local VLM services"""
-    services = [
-        {"name": "Ollama", "url": "http://localhost:11434/v1", "port": 11434, "path": "/api/tags"},
-        {"name": "vLLM", "url": "http://localhost:8000/v1", "port": 8000, "path": "/v1/models"},
-        {"name": "SGLang", "url": "http://localhost:30000/v1", "port": 30000, "path": "/v1/models"},
-    ]
-
-    detected = []
-
-    async def check_service(service):
-        """Check if a service is running by probing its endpoint"""
-        try:
-            timeout = aiohttp.ClientTimeout(total=1.0)  # 1 second timeout
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                url = f"http://localhost:{service['port']}{service['path']}"
-                async with session.get(url) as response:
-                    if response.status in [200, 404]:  # 404 is ok, means server is running
-                        logger.info(f"Detected {service['name']} at {service['url']}")
-                        return service
-        except (aiohttp.ClientError, asyncio.TimeoutError):
-            pass
-        return None
+    """
+    Detect available local VLM services (cached, ?refresh=1 to probe now)
 
-    # Check all services concurrently
-    results = await asyncio.gather(*[check_service(s) for s in services])
-    detected = [s for s in results if s is not None]
+    GET /detect-services
+    """
+    refresh = request.rel_url.query.get("refresh") in ("1", "true")
+    detected = list(await discovery.detect_services(refresh=refresh))
 
     # Default to NVIDIA API Catalog if no local services found
     if not detected:
@@ -255,6 +244,510 @@ async def detect_services(request):
     )
 
 
+async def backends_status(request):
+    """
+    Get per-backend routing, latency and error statistics.
+
+    GET /api/backends
+    """
+    if not vlm_service:
+        return web.Response(
+            status=503,
+            content_type="application/json",
+            text=json.dumps({"error": "VLM service not initialized"}),
+        )
+
+    pool = vlm_service.backend_pool
+    return web.Response(
+        content_type="application/json",
+        text=json.dumps(
+            {
+                "routing": pool.strategy,
+                "max_concurrent_requests": vlm_service.max_concurrent_requests,
+                "backends": pool.get_stats(),
+            }
+        ),
+    )
+
+
+async def vlm_metrics(request):
+    """
+    Get sliding-window latency percentiles and throughput of the VLM pipeline.
+
+    GET /api/vlm/metrics?window=SECONDS
+    """
+    if not vlm_service:
+        return web.Response(
+            status=503,
+            content_type="application/json",
+            text=json.dumps({"error": "VLM service not initialized"}),
+        )
+
+    window = request.rel_url.query.get("window")
+    try:
+        window = float(window) if window else None
+    except ValueError:
+        return web.Response(
+            status=400,
+            content_type="application/json",
+            text=json.dumps({"error": f"Invalid window: {window}"}),
+        )
+
+    # The snapshot may be the cached one shared with /metrics; do not modify it
+    snapshot = vlm_service.latency_metrics.snapshot(window=window)
+    stats = {**snapshot, "total_inferences": vlm_service.total_inferences}
+    return web.Response(content_type="application/json", text=json.dumps(stats))
+
+
+async def healthz(request):
+    """
+    Liveness probe with backend health and warm-up status.
+
+    Answers 200 whenever the server is up: an unreachable backend is not fixed by
+    restarting this process (use /readyz to take the instance out of rotation).
+    Backend health is the state tracked from requests and the background health
+    checks; the probe itself sends nothing to the backends.
+
+    GET /healthz
+    """
+    result = {"status": "ok", "backends": [], "warmup": None, "health_checks": False}
+    if vlm_service:
+        pool = vlm_service.backend_pool
+        result["backends"] = [
+            {
+                "api_base": backend.api_base,
+                "available": backend.is_available(),
+                "consecutive_failures": backend.consecutive_failures,
+                "error": backend.last_error,
+            }
+            for backend in pool.backends
+        ]
+        result["warmup"] = vlm_service.warmer.state
+        result["health_checks"] = pool.health_checks_running
+    return web.Response(content_type="application/json", text=json.dumps(result))
+
+
+async def readyz(request):
+    """
+    Readiness probe: 200 once the model is warmed up and a backend can take requests.
+
+    GET /readyz
+    """
+    if not vlm_service:
+        result = {"ready": False, "reasons": ["VLM service not initialized"]}
+        return web.Response(status=503, content_type="application/json", text=json.dumps(result))
+
+    warmer = vlm_service.warmer
+    reasons = []
+    if warmer.enabled and not warmer.is_ready():
+        reasons.append(f"Warm-up of {vlm_service.model} is {warmer.state}")
+    if vlm_service.circuit_breaker.is_open():
+        reasons.append("Circuit breaker is open")
+    if not any(backend.is_available() for backend in vlm_service.backend_pool.backends):
+        reasons.append("No backend available")
+
+    result = {
+        "ready": not reasons,
+        "reasons": reasons,
+        "model": vlm_service.model,
+        "warmup": warmer.state,
+        "circuit": vlm_service.circuit_breaker.state,
+    }
+    return web.Response(
+        status=503 if reasons else 200, content_type="application/json", text=json.dumps(result)
+    )
+
+
+def active_session_count() -> int:
+    """Number of live video and RTSP sessions"""
+    return sum(1 for track in processor_tracks if track.readyState == "live")
+
+
+def current_capture_constraints() -> Optional[dict]:
+    """Camera resolution and frame rate browsers should capture, or None to not constrain"""
+    if not vlm_service or min_capture_fps <= 0:
+        return None
+    return capture_constraints(
+        vlm_service.image_profile,
+        VideoProcessorTrack.process_every_n_frames,
+        min_fps=min_capture_fps,
+    )
+
+
+def broadcast_capture_constraints() -> None:
+    """Tell all pages the capture settings after the model or sampling rate changed"""
+    constraints = current_capture_constraints()
+    if constraints:
+        broadcast_message({"type": "capture_constraints", "capture": constraints})
+
+
+def apply_calibration(report: dict) -> None:
+    """Use a calibration's recommended sampling interval and in-flight limit"""
+    recommendation = report["recommendation"]
+    VideoProcessorTrack.process_every_n_frames = recommendation["process_every"]
+    vlm_service.set_max_in_flight(recommendation["max_in_flight"])
+    logger.info(
+        f"Applied calibration: process every {recommendation['process_every']} frames, "
+        f"max {recommendation['max_in_flight']} requests in flight"
+    )
+    broadcast_message(
+        {"type": "processing_updated", "process_every": recommendation["process_every"]}
+    )
+    broadcast_capture_constraints()
+
+
+async def run_calibration(sessions: Optional[int] = None, apply: bool = False, **kwargs) -> dict:
+    """
+    Calibrate the backend capacity after any running warm-up
+
+    Args:
+        sessions: Streams to compute the recommendation for (default: live sessions)
+        apply: Apply the recommendation to all sessions
+        **kwargs: Passed to calibration.calibrate()
+
+    Returns:
+        Calibration report
+    """
+    global last_calibration
+    await vlm_service.warmer.wait()
+    report = await calibrate(
+        vlm_service, sessions=sessions or active_session_count() or 1, **kwargs
+    )
+    report["applied"] = apply
+    last_calibration = report
+    if apply:
+        apply_calibration(report)
+    return report
+
+
+async def calibration_handler(request):
+    """
+    Run a capacity calibration, or get the last report.
+
+    POST /api/calibrate {"levels": [1, 2, 4, 8], "requests_per_level": 8, "sessions": 2,
+                         "fps": 30, "latency_slo_ms": 3000, "apply": true}
+    GET /api/calibrate
+    """
+    global calibration_task
+    if not vlm_service:
+        return web.Response(
+            status=503,
+            content_type="application/json",
+            text=json.dumps({"error": "VLM service not initialized"}),
+        )
+    if request.method == "GET":
+        if last_calibration is None:
+            return web.Response(
+                status=404,
+                content_type="application/json",
+                text=json.dumps({"error": "No calibration has run yet"}),
+            )
+        return web.Response(content_type="application/json", text=json.dumps(last_calibration))
+
+    if calibration_task is not None and not calibration_task.done():
+        return web.Response(
+            status=409,
+            content_type="application/json",
+            text=json.dumps({"error": "Calibration already running"}),
+        )
+    try:
+        body = await request.json() if request.can_read_body else {}
+        kwargs = {"apply": bool(body.get("apply", False))}
+        if "levels" in body:
+            levels = sorted({int(c) for c in body["levels"]})
+            if not levels or levels[0] < 1 or levels[-1] > 64:
+                raise ValueError("levels must be between 1 and 64")
+            kwargs["levels"] = levels
+        for key in ("requests_per_level", "sessions"):
+            if body.get(key) is not None:
+                kwargs[key] = max(int(body[key]), 1)
+        for key in ("fps", "latency_slo_ms"):
+            if body.get(key) is not None:
+                kwargs[key] = float(body[key])
+    except (ValueError, TypeError) as e:
+        return web.Response(
+            status=400,
+            content_type="application/json",
+            text=json.dumps({"error": f"Invalid calibration request: {e}"}),
+        )
+
+    calibration_task = asyncio.ensure_future(run_calibration(**kwargs))
+    try:
+        report = await asyncio.shield(calibration_task)
+    except CalibrationError as e:
+        return web.Response(
+            status=502, content_type="application/json", text=json.dumps({"error": str(e)})
+        )
+    return web.Response(content_type="application/json", text=json.dumps(report))
+
+
+async def startup_calibration(sessions: int) -> None:
+    """Calibrate once the server is up and apply the recommendation (--calibrate)"""
+    try:
+        await run_calibration(sessions=sessions, apply=True)
+    except CalibrationError as e:
+        logger.error(f"Startup calibration failed: {e}")
+
+
+@metrics_registry.register
+def collect_session_metrics():
+    """Per-session frame counters of video and RTSP tracks"""
+    received = MetricFamily("frames_received_total", "counter", "Frames received per session")
+    dropped = MetricFamily(
+        "frames_dropped_total", "counter", "Frames dropped for exceeding max latency"
+    )
+    converted = MetricFamily(
+        "frames_converted_total", "counter", "Frames converted to numpy for analysis"
+    )
+    submitted = MetricFamily("frames_submitted_total", "counter", "Frames handed to the VLM")
+    rejected = MetricFamily(
+        "frames_rejected_total", "counter", "Sampled frames rejected by the quality gate"
+    )
+    skipped = MetricFamily(
+        "samples_skipped_total", "counter", "Samples given up because no frame passed the gate"
+    )
+    cropped = MetricFamily(
+        "frames_cropped_total", "counter", "Submitted frames cropped to their moving region"
+    )
+    region_crops = MetricFamily(
+        "region_crops_total", "counter", "Region-of-interest crops sent to the VLM"
+    )
+    offer_answer = MetricFamily(
+        "session_offer_to_answer_seconds", "gauge", "WebRTC offer to answer (incl. ICE gathering)"
+    )
+    first_frame = MetricFamily(
+        "session_offer_to_first_frame_seconds", "gauge", "WebRTC offer to first received frame"
+    )
+    active = MetricFamily("sessions_active", "gauge", "Live video processing sessions")
+    live = 0
+    for track in list(processor_tracks):
+        stats = track.get_stats()
+        session = stats["session_id"]
+        received.add(stats["frames_received"], session=session)
+        dropped.add(stats["frames_dropped"], session=session)
+        converted.add(stats["frames_converted"], session=session)
+        submitted.add(stats["frames_submitted"], session=session)
+        for reason, count in stats["frames_rejected"].items():
+            rejected.add(count, session=session, reason=reason)
+        skipped.add(stats["samples_skipped"], session=session)
+        cropped.add(stats["frames_cropped"], session=session)
+        region_crops.add(stats["region_crops"], session=session)
+        if stats.get("offer_to_answer_ms") is not None:
+            offer_answer.add(stats["offer_to_answer_ms"] / 1000, session=session)
+        if stats.get("offer_to_first_frame_ms") is not None:
+            first_frame.add(stats["offer_to_first_frame_ms"] / 1000, session=session)
+        live += stats["active"]
+    active.add(live)
+
+    reconnects = MetricFamily("rtsp_reconnects_total", "counter", "RTSP reconnections started")
+    reconnect_failures = MetricFamily(
+        "rtsp_reconnect_failures_total", "counter", "RTSP reconnections that gave up"
+    )
+    decode_errors = MetricFamily("rtsp_decode_errors_total", "counter", "RTSP demux/decode errors")
+    damaged = MetricFamily(
+        "rtsp_damaged_frames_total", "counter", "RTSP frames decoded after a decode error"
+    )
+    connected = MetricFamily("rtsp_connected", "gauge", "Whether the RTSP stream is connected")
+    for rtsp_track, session in list(rtsp_sources.items()):
+        reconnects.add(rtsp_track.reconnects, session=session)
+        reconnect_failures.add(rtsp_track.reconnect_failures, session=session)
+        decode_errors.add(rtsp_track.decode_errors, session=session)
+        damaged.add(rtsp_track.damaged_frames, session=session)
+        connected.add(rtsp_track.is_connected, session=session)
+
+    return [
+        received,
+        dropped,
+        converted,
+        submitted,
+        rejected,
+        skipped,
+        cropped,
+        region_crops,
+        offer_answer,
+        first_frame,
+        active,
+        reconnects,
+        reconnect_failures,
+        decode_errors,
+        damaged,
+        connected,
+    ]
+
+
+@metrics_registry.register
+def collect_vlm_metrics():
+    """Inference counters, latency percentiles and backend state"""
+    if not vlm_service:
+        return []
+    service = vlm_service
+    families = [
+        MetricFamily("vlm_inferences_total", "counter", "Completed VLM requests").add(
+            service.total_inferences
+        ),
+        MetricFamily("vlm_inference_seconds_total", "counter", "Total VLM request time").add(
+            service.total_inference_time
+        ),
+        MetricFamily("vlm_failures_total", "counter", "VLM requests failing on all backends").add(
+            service.failed_inferences
+        ),
+        MetricFamily(
+            "vlm_busy_skips_total", "counter", "Frames skipped while the VLM was busy"
+        ).add(service.busy_skips),
+        MetricFamily(
+            "vlm_cancelled_requests_total", "counter", "Requests superseded by a newer answer"
+        ).add(service.cancelled_requests),
+        MetricFamily(
+            "vlm_expired_requests_total", "counter", "Requests cancelled for exceeding staleness"
+        ).add(service.expired_requests),
+        MetricFamily(
+            "vlm_discarded_responses_total", "counter", "Answers arriving after a newer one"
+        ).add(service.discarded_responses),
+        MetricFamily("vlm_in_flight", "gauge", "VLM requests in flight").add(service._in_flight),
+        MetricFamily(
+            "vlm_retries_total", "counter", "Requests retried after a transient failure"
+        ).add(service.retries),
+        MetricFamily(
+            "vlm_circuit_skips_total", "counter", "Frames skipped while the circuit was open"
+        ).add(service.circuit_skips),
+        MetricFamily("vlm_circuit_trips_total", "counter", "Times the circuit breaker opened").add(
+            service.circuit_breaker.trips
+        ),
+        MetricFamily(
+            "vlm_circuit_state", "gauge", "Circuit breaker state (0 closed, 1 half-open, 2 open)"
+        ).add(CIRCUIT_STATES.index(service.circuit_breaker.state)),
+        MetricFamily("vlm_ready", "gauge", "Whether the current model is warmed up").add(
+            int(service.warmer.is_ready())
+        ),
+        MetricFamily("vlm_warmups_total", "counter", "Completed model warm-ups").add(
+            service.warmer.warmups
+        ),
+        MetricFamily(
+            "vlm_warmup_skips_total", "counter", "Frames skipped while the model warmed up"
+        ).add(service.warmup_skips),
+        MetricFamily("vlm_keep_warm_pings_total", "counter", "Keep-warm requests sent").add(
+            service.warmer.pings
+        ),
+        MetricFamily(
+            "vlm_hedged_requests_total", "counter", "Requests duplicated on a second backend"
+        ).add(service.hedged_requests),
+        MetricFamily(
+            "vlm_hedge_wins_total", "counter", "Hedged requests answered first by the duplicate"
+        ).add(service.hedge_wins),
+        MetricFamily(
+            "vlm_hedge_saved_seconds_total", "counter", "Estimated latency saved by hedging"
+        ).add(service.hedge_time_saved),
+        MetricFamily(
+            "vlm_vision_tokens_total", "counter", "Estimated vision tokens sent to the VLM"
+        ).add(service.total_vision_tokens),
+        MetricFamily(
+            "vlm_image_upload_bytes_total", "counter", "Base64 image bytes sent to the VLM"
+        ).add(service.total_upload_bytes),
+    ]
+
+    snapshot = service.latency_metrics.snapshot()
+    quantiles = MetricFamily(
+        "vlm_latency_seconds",
+        "gauge",
+        f"Latency percentiles per stage over the last {snapshot['window_s']:g}s",
+    )
+    for stage in service.latency_metrics.histograms:
+        for p in service.latency_metrics.percentiles:
+            quantiles.add(
+                snapshot[stage][f"p{p:g}_ms"] / 1000, stage=stage, quantile=f"{p / 100:g}"
+            )
+    throughput = MetricFamily("vlm_throughput_rps", "gauge", "EWMA rate of completed VLM requests")
+    for window, rate in snapshot["throughput_rps"].items():
+        throughput.add(rate, window=window)
+    server_time = MetricFamily(
+        "vlm_server_seconds_total",
+        "counter",
+        "Backend-reported time per phase (Ollama native API), overhead = rest of the round trip",
+    )
+    for phase, seconds in service.server_time_totals.items():
+        server_time.add(seconds, phase=phase)
+    families.extend([quantiles, throughput, server_time])
+
+    requests = MetricFamily("backend_requests_total", "counter", "Requests per backend")
+    errors = MetricFamily("backend_errors_total", "counter", "Failed requests per backend")
+    outstanding = MetricFamily("backend_outstanding", "gauge", "In-flight requests per backend")
+    healthy = MetricFamily("backend_healthy", "gauge", "Whether the backend is in rotation")
+    ewma = MetricFamily("backend_latency_ewma_seconds", "gauge", "EWMA latency per backend")
+    quota_waits = MetricFamily(
+        "backend_rate_limit_waits_total", "counter", "Requests delayed by the client-side quota"
+    )
+    quota_wait_time = MetricFamily(
+        "backend_rate_limit_wait_seconds_total", "counter", "Time spent waiting for the quota"
+    )
+    retry_after = MetricFamily(
+        "backend_retry_after_total", "counter", "Responses asking to back off (Retry-After)"
+    )
+    now = time.monotonic()
+    for backend in service.backend_pool.backends:
+        requests.add(backend.total_requests, backend=backend.api_base)
+        errors.add(backend.total_errors, backend=backend.api_base)
+        outstanding.add(backend.outstanding, backend=backend.api_base)
+        healthy.add(backend.is_available(now), backend=backend.api_base)
+        ewma.add(backend.ewma_latency, backend=backend.api_base)
+        if backend.limiter:
+            quota_waits.add(backend.limiter.total_waits, backend=backend.api_base)
+            quota_wait_time.add(backend.limiter.total_wait_time, backend=backend.api_base)
+            retry_after.add(backend.limiter.retry_after_events, backend=backend.api_base)
+    families.extend(
+        [requests, errors, outstanding, healthy, ewma, quota_waits, quota_wait_time, retry_after]
+    )
+    return families
+
+
+@metrics_registry.register
+def collect_server_metrics():
+    """WebSocket clients, send queue depth, peer connections and GPU readings"""
+    families = [
+        MetricFamily("websocket_clients", "gauge", "Connected WebSocket clients").add(
+            len(websockets)
+        ),
+        MetricFamily(
+            "websocket_pending_sends", "gauge", "WebSocket messages queued but not yet sent"
+        ).add(pending_ws_sends),
+        MetricFamily("websocket_messages_sent_total", "counter", "WebSocket messages sent").add(
+            ws_messages_sent
+        ),
+        MetricFamily("websocket_send_errors_total", "counter", "WebSocket sends that failed").add(
+            ws_send_errors
+        ),
+        MetricFamily("peer_connections", "gauge", "Open WebRTC peer connections").add(len(pcs)),
+    ]
+
+    if last_gpu_stats:
+        gpu_labels = {"gpu": str(last_gpu_stats.get("gpu_name", "unknown"))}
+        for key, name, help_text, labels in (
+            ("gpu_percent", "gpu_utilization_percent", "GPU utilization", gpu_labels),
+            ("vram_used_gb", "gpu_memory_used_gigabytes", "GPU memory used", gpu_labels),
+            ("vram_total_gb", "gpu_memory_total_gigabytes", "GPU memory total", gpu_labels),
+            ("temp_c", "gpu_temperature_celsius", "GPU temperature", gpu_labels),
+            ("power_w", "gpu_power_watts", "GPU power draw", gpu_labels),
+            ("cpu_percent", "cpu_utilization_percent", "CPU utilization", {}),
+            ("ram_used_gb", "ram_used_gigabytes", "System memory used", {}),
+            ("ram_total_gb", "ram_total_gigabytes", "System memory total", {}),
+        ):
+            value = last_gpu_stats.get(key)
+            if isinstance(value, (int, float)):
+                families.append(MetricFamily(name, "gauge", help_text).add(value, **labels))
+    return families
+
+
+async def prometheus_metrics(request):
+    """
+    Export pipeline telemetry in the Prometheus text format.
+
+    GET /metrics
+    """
+    return web.Response(
+        body=metrics_registry.render().encode("utf-8"),
+        headers={"Content-Type": PROMETHEUS_CONTENT_TYPE},
+    )
+
+
 async def websocket_handler(request):
     """Handle WebSocket connections for text updates"""
     ws = web.WebSocketResponse()
@@ -262,6 +755,7 @@ async def websocket_handler(request):
 
     websockets.add(ws)
     logger.info(f"WebSocket client connected. Total clients: {len(websockets)}")
+    snapshot_session = None  # Set while this client sends JPEG snapshots
 
     try:
         # Send initial message with current server configuration
@@ -275,8 +769,13 @@ async def websocket_handler(request):
                     "model": vlm_service.model,
                     "api_base": vlm_service.api_base,
                     "prompt": vlm_service.prompt,
+                    "capture": current_capture_constraints(),
+                    "ice_servers": to_browser_config(ice_servers),
                 }
             )
+            await ws.send_json(
+                {"type": "backend_status", "circuit": vlm_service.circuit_breaker.get_stats()}
+            )
 
         # Keep connection alive and handle incoming messages
         async for msg in ws:
@@ -300,6 +799,163 @@ async def websocket_handler(request):
                                 }
                             )
 
+                    elif data.get("type") == "update_prompt_set":
+                        session_id = data.get("session_id")
+                        try:
+                            prompt_set = normalize_prompt_set(data.get("prompts") or [])
+                        except ValueError as e:
+                            logger.warning(f"Invalid prompt set: {e}")
+                            await ws.send_json({"type": "prompt_set_error", "error": str(e)})
+                            continue
+
+                        if session_id:
+                            # Per-session override
+                            tracks = [t for t in processor_tracks if t.session_id == session_id]
+                            if not tracks:
+                                await ws.send_json(
+                                    {
+                                        "type": "prompt_set_error",
+                                        "error": f"Unknown session: {session_id}",
+                                    }
+                                )
+                                continue
+                            for track in tracks:
+                                track.prompt_set = prompt_set
+                        else:
+                            VideoProcessorTrack.default_prompt_set = prompt_set
+                        logger.info(
+                            f"Prompt set updated ({session_id or 'all sessions'}): "
+                            f"{[p['name'] for p in prompt_set] or 'single prompt'}"
+                        )
+
+                        # Confirm to client
+                        await ws.send_json(
+                            {
+                                "type": "prompt_set_updated",
+                                "session_id": session_id,
+                                "prompts": prompt_set,
+                            }
+                        )
+
+                    elif data.get("type") == "update_rois":
+                        session_id = data.get("session_id")
+                        try:
+                            rois = normalize_rois(data.get("rois") or [])
+                        except ValueError as e:
+                            logger.warning(f"Invalid regions of interest: {e}")
+                            await ws.send_json({"type": "rois_error", "error": str(e)})
+                            continue
+
+                        if session_id:
+                            # Per-session override
+                            tracks = [t for t in processor_tracks if t.session_id == session_id]
+                            if not tracks:
+                                await ws.send_json(
+                                    {
+                                        "type": "rois_error",
+                                        "error": f"Unknown session: {session_id}",
+                                    }
+                                )
+                                continue
+                            for track in tracks:
+                                track.rois = rois
+                        else:
+                            VideoProcessorTrack.default_rois = rois
+                        logger.info(
+                            f"Regions of interest updated ({session_id or 'all sessions'}): "
+                            f"{[r['name'] for r in rois] or 'whole frame'}"
+                        )
+
+                        # Confirm to client
+                        await ws.send_json(
+                            {"type": "rois_updated", "session_id": session_id, "rois": rois}
+                        )
+
+                    elif data.get("type") == "capture_settings":
+                        # Settings the browser's camera actually applied
+                        session_id = data.get("session_id")
+                        try:
+                            frame_rate = float(data.get("frame_rate") or 0)
+                        except (TypeError, ValueError):
+                            frame_rate = 0.0
+                        for track in processor_tracks:
+                            if track.session_id == session_id and hasattr(track, "source_fps"):
+                                track.source_fps = frame_rate if frame_rate > 0 else None
+                                logger.info(
+                                    f"Session {session_id} captures "
+                                    f"{data.get('width')}x{data.get('height')} @ {frame_rate} fps "
+                                    f"(sampling every {track.get_sample_interval()} frames)"
+                                )
+
+                    elif data.get("type") == "start_snapshots":
+                        if not vlm_service:
+                            await ws.send_json(
+                                {"type": "snapshots_error", "error": "VLM service not ready"}
+                            )
+                            continue
+                        if snapshot_session:
+                            snapshot_session.stop()
+                        snapshot_session = SnapshotSession(
+                            vlm_service,
+                            text_callback=broadcast_text_update,
+                            session_id=data.get("session_id"),
+                            prompt_set_callback=broadcast_prompt_set_results,
+                            roi_callback=broadcast_roi_results,
+                        )
+                        processor_tracks.add(snapshot_session)
+                        try:
+                            width, height = int(data["width"]), int(data["height"])
+                            geometry = snapshot_session.target_geometry(width, height)
+                        except (KeyError, TypeError, ValueError):
+                            geometry = None  # Server resizes what it gets
+                        logger.info(
+                            f"Snapshot session {snapshot_session.session_id} started "
+                            f"(snapshot size: {geometry})"
+                        )
+
+                        # Confirm to client with the size to capture at
+                        await ws.send_json(
+                            {
+                                "type": "snapshots_started",
+                                "session_id": snapshot_session.session_id,
+                                "process_every": VideoProcessorTrack.process_every_n_frames,
+                                "geometry": geometry,
+                            }
+                        )
+
+                    elif data.get("type") == "stop_snapshots":
+                        if snapshot_session:
+                            snapshot_session.stop()
+                            logger.info(f"Snapshot session {snapshot_session.session_id} stopped")
+                            snapshot_session = None
+                        await ws.send_json({"type": "snapshots_stopped"})
+
+                    elif data.get("type") == "subscribe_camera":
+                        # Keep a shared RTSP camera (and its analysis) open for this client
+                        rtsp_url = (data.get("rtsp_url") or "").strip()
+                        if not vlm_service:
+                            await ws.send_json(
+                                {"type": "camera_error", "error": "VLM service not ready"}
+                            )
+                            continue
+                        if not rtsp_url:
+                            await ws.send_json(
+                                {"type": "camera_error", "error": "Missing rtsp_url"}
+                            )
+                            continue
+                        try:
+                            camera = camera_registry.acquire(rtsp_url, ws)
+                        except Exception as e:
+                            logger.error(f"Failed to open RTSP camera: {e}")
+                            await ws.send_json({"type": "camera_error", "error": str(e)})
+                            continue
+                        await ws.send_json({"type": "camera_subscribed", **camera.get_stats()})
+
+                    elif data.get("type") == "unsubscribe_camera":
+                        rtsp_url = data.get("rtsp_url") or ""
+                        await camera_registry.release(rtsp_url, ws)
+                        await ws.send_json({"type": "camera_unsubscribed"})
+
                     elif data.get("type") == "update_model":
                         new_model = data.get("model", "").strip()
                         api_base = data.get("api_base", "").strip()
@@ -318,6 +974,7 @@ async def websocket_handler(request):
                                 logger.info(f"Model updated: {new_model}, API: {api_base}")
                             else:
                                 logger.info(f"Model updated: {new_model}")
+                            vlm_service.warmer.schedule()
 
                             # Confirm to client
                             await ws.send_json(
@@ -327,14 +984,14 @@ async def websocket_handler(request):
                                     "api_base": vlm_service.api_base,
                                 }
                             )
+                            # The new model's image profile may need another capture size
+                            broadcast_capture_constraints()
 
                     elif data.get("type") == "update_processing":
                         process_every = data.get("process_every", 30)
                         try:
                             process_every = int(process_every)
                             if 1 <= process_every <= 3600:  # Up to 3600 frames (2 minutes @ 30fps)
-                                from .video_processor import VideoProcessorTrack
-
                                 old_value = VideoProcessorTrack.process_every_n_frames
                                 VideoProcessorTrack.process_every_n_frames = process_every
                                 logger.info(
@@ -345,6 +1002,7 @@ async def websocket_handler(request):
                                 await ws.send_json(
                                     {"type": "processing_updated", "process_every": process_every}
                                 )
+                                broadcast_capture_constraints()
                             else:
                                 logger.warning(
                                     f"Processing interval out of range (1-3600): {process_every}"
@@ -357,8 +1015,6 @@ async def websocket_handler(request):
                         try:
                             max_latency = float(max_latency)
                             if 0 <= max_latency <= 10.0:
-                                from .video_processor import VideoProcessorTrack
-
                                 old_value = VideoProcessorTrack.max_frame_latency
                                 VideoProcessorTrack.max_frame_latency = max_latency
                                 status = "disabled" if max_latency == 0 else f"{max_latency:.1f}s"
@@ -377,15 +1033,41 @@ async def websocket_handler(request):
                     logger.error("Invalid JSON from client")
                 except Exception as e:
                     logger.error(f"Error handling client message: {e}")
+            elif msg.type == web.WSMsgType.BINARY:
+                # JPEG snapshot of the client's camera
+                if snapshot_session:
+                    snapshot_session.submit(msg.data)
+                else:
+                    logger.debug("Ignoring binary message outside of a snapshot session")
             elif msg.type == web.WSMsgType.ERROR:
                 logger.error(f"WebSocket error: {ws.exception()}")
     finally:
+        if snapshot_session:
+            snapshot_session.stop()
         websockets.discard(ws)
         logger.info(f"WebSocket client disconnected. Total clients: {len(websockets)}")
+        await camera_registry.release_all(ws)
 
     return ws
 
 
+def _send_ws(ws, message: str) -> None:
+    """Queue a WebSocket send, tracking how many sends are still pending"""
+    global pending_ws_sends
+
+    def on_done(task):
+        global pending_ws_sends, ws_send_errors, ws_messages_sent
+        pending_ws_sends -= 1
+        if task.cancelled() or task.exception() is not None:
+            ws_send_errors += 1
+        else:
+            ws_messages_sent += 1
+
+    task = asyncio.create_task(ws.send_str(message))
+    pending_ws_sends += 1
+    task.add_done_callback(on_done)
+
+
 def broadcast_text_update(text: str, metrics: dict):
     """Broadcast text update and metrics to all connected WebSocket clients"""
     if not websockets:
@@ -398,7 +1080,7 @@ def broadcast_text_update(text: str, metrics: dict):
     for ws in websockets:
         try:
             # Use asyncio to send without blocking
-            asyncio.create_task(ws.send_str(message))
+            _send_ws(ws, message)
         except Exception as e:
             logger.error(f"Error sending to websocket: {e}")
             dead_websockets.add(ws)
@@ -407,6 +1089,68 @@ def broadcast_text_update(text: str, metrics: dict):
     websockets.difference_update(dead_websockets)
 
 
+def broadcast_prompt_set_results(session_id: str, results: list):
+    """Broadcast per-prompt answers and latencies of a prompt set frame"""
+    if not websockets:
+        return
+
+    message = json.dumps(
+        {"type": "prompt_set_response", "session_id": session_id, "results": results}
+    )
+
+    dead_websockets = set()
+    for ws in websockets:
+        try:
+            _send_ws(ws, message)
+        except Exception as e:
+            logger.error(f"Error sending prompt set results to websocket: {e}")
+            dead_websockets.add(ws)
+
+    websockets.difference_update(dead_websockets)
+
+
+def broadcast_backend_status(old_state: str, new_state: str):
+    """Broadcast circuit breaker transitions to all connected WebSocket clients"""
+    if not websockets or not vlm_service:
+        return
+
+    message = json.dumps(
+        {"type": "backend_status", "circuit": vlm_service.circuit_breaker.get_stats()}
+    )
+
+    dead_websockets = set()
+    for ws in websockets:
+        try:
+            _send_ws(ws, message)
+        except Exception as e:
+            logger.error(f"Error sending backend status to websocket: {e}")
+            dead_websockets.add(ws)
+
+    websockets.difference_update(dead_websockets)
+
+
+def broadcast_message(message: dict):
+    """Broadcast a message to all connected WebSocket clients"""
+    if not websockets:
+        return
+
+    text = json.dumps(message)
+    dead_websockets = set()
+    for ws in websockets:
+        try:
+            _send_ws(ws, text)
+        except Exception as e:
+            logger.error(f"Error sending {message.get('type')} to websocket: {e}")
+            dead_websockets.add(ws)
+
+    websockets.difference_update(dead_websockets)
+
+
+def broadcast_roi_results(session_id: str, results: list):
+    """Broadcast the per-zone answers of a frame's regions of interest"""
+    broadcast_message({"type": "roi_response", "session_id": session_id, "results": results})
+
+
 def broadcast_gpu_stats(stats: dict):
     """Broadcast GPU stats to all connected WebSocket clients"""
     if not websockets:
@@ -418,7 +1162,7 @@ def broadcast_gpu_stats(stats: dict):
     dead_websockets = set()
     for ws in websockets:
         try:
-            asyncio.create_task(ws.send_str(message))
+            _send_ws(ws, message)
         except Exception as e:
             logger.error(f"Error sending GPU stats to websocket: {e}")
             dead_websockets.add(ws)
@@ -427,9 +1171,25 @@ def broadcast_gpu_stats(stats: dict):
     websockets.difference_update(dead_websockets)
 
 
+async def vlm_metrics_loop():
+    """
+    Periodically broadcast the full VLM metrics (latency percentiles, backends)
+
+    Answers carry only the cheap counters (VLMService.get_counters()); the heavier
+    sections are built here at a fixed rate, and only while pages are connected.
+    """
+    try:
+        while True:
+            await asyncio.sleep(vlm_metrics_interval)
+            if websockets and vlm_service:
+                broadcast_message({"type": "vlm_metrics", "metrics": vlm_service.get_metrics()})
+    except asyncio.CancelledError:
+        logger.info("VLM metrics loop cancelled")
+
+
 async def gpu_monitor_loop():
     """Background task to periodically collect and broadcast GPU stats"""
-    global gpu_monitor
+    global gpu_monitor, last_gpu_stats
 
     if not gpu_monitor:
         logger.warning("GPU monitor not initialized, skipping monitoring")
@@ -442,6 +1202,8 @@ async def gpu_monitor_loop():
             # Get current stats
             stats = gpu_monitor.get_stats()
 
+            last_gpu_stats = dict(stats)
+
             # Update history with current stats
             gpu_monitor.update_history(stats)
 
@@ -459,33 +1221,55 @@ async def gpu_monitor_loop():
         logger.error(f"Error in GPU monitoring loop: {e}")
 
 
+async def consume_analysis_track(processor_track: VideoProcessorTrack) -> None:
+    """
+    Pull frames through a processor track that is not sent back to the browser
+
+    Without a return track nothing else reads the track, so this drives frame
+    sampling and VLM analysis until the incoming track ends.
+    """
+    try:
+        while True:
+            await processor_track.recv()
+    except MediaStreamError:
+        logger.info(f"Analysis-only session {processor_track.session_id} ended")
+    except asyncio.CancelledError:
+        pass
+    except Exception as e:
+        logger.error(f"Error consuming frames for {processor_track.session_id}: {e}")
+    finally:
+        processor_track.stop()
+
+
 async def offer(request):
     """Handle WebRTC offer from client (supports both webcam and RTSP)"""
+    offer_time = time.monotonic()
     params = await request.json()
     offer_sdp = RTCSessionDescription(sdp=params["sdp"], type=params["type"])
     rtsp_url = params.get("rtsp_url")  # Optional RTSP URL for IP camera mode
-
-    # Create RTCPeerConnection with STUN servers for Docker/NAT compatibility
-    config = RTCConfiguration(
-        iceServers=[
-            RTCIceServer(urls=["stun:stun.l.google.com:19302"]),
-            RTCIceServer(urls=["stun:stun1.l.google.com:19302"]),
-        ]
-    )
+    # Webcam only: analyze the browser's track without sending video back; the page
+    # shows its local preview, so the server never encodes a return stream
+    analysis_only = bool(params.get("analysis_only")) and not rtsp_url
+    session_id = uuid.uuid4().hex[:8]  # Lets the page report its capture settings
+
+    # Create RTCPeerConnection with the configured STUN/TURN servers (none = host
+    # candidates only, so a LAN setup never waits for an unreachable STUN server)
+    config = RTCConfiguration(iceServers=list(ice_servers))
     pc = RTCPeerConnection(configuration=config)
     pcs.add(pc)
+    session_tracks = []  # Processor tracks of this connection, for setup timings
 
-    # Store RTSP track for cleanup
-    rtsp_cleanup_track = None
+    analysis_tasks = []  # Frame consumers of analysis-only tracks
 
     @pc.on("connectionstatechange")
     async def on_connectionstatechange():
         logger.info(f"Connection state: {pc.connectionState}")
         if pc.connectionState in ["failed", "closed"]:
-            # Clean up RTSP track if exists
-            if rtsp_cleanup_track:
-                rtsp_cleanup_track.stop()
-                logger.info("RTSP track stopped on connection close")
+            # Drop this viewer; the camera closes with its last viewer
+            if rtsp_url and await camera_registry.release(rtsp_url, pc):
+                logger.info("RTSP camera stopped on connection close")
+            for task in analysis_tasks:
+                task.cancel()
             await pc.close()
             pcs.discard(pc)
 
@@ -502,26 +1286,44 @@ async def offer(request):
     # If RTSP URL provided, create RTSP track instead of waiting for browser track
     if rtsp_url:
         logger.info(f"Creating RTSP track for: {rtsp_url}")
+        viewer = None
         try:
-            rtsp_track = RTSPVideoTrack(rtsp_url)
-            rtsp_cleanup_track = rtsp_track  # Store for cleanup
-
-            # Wait for initial connection to get stream info
-            await asyncio.sleep(0.5)
-
-            # Wrap RTSP track with relay first (same pattern as webcam)
-            relayed_rtsp = relay.subscribe(rtsp_track)
-
-            processor_track = VideoProcessorTrack(
-                relayed_rtsp, vlm_service, text_callback=broadcast_text_update
+            opened = camera_registry.get(rtsp_url) is None
+            camera = camera_registry.acquire(rtsp_url, pc, session_id=session_id)
+            session_id = camera.session_id  # Viewers of a shared camera share its analysis
+            if opened:
+                camera.processor_track.offer_time = offer_time
+                session_tracks.append(camera.processor_track)
+                # Wait for initial connection to get stream info
+                await asyncio.sleep(0.5)
+
+            # The camera's own H.264 packets if the browser takes H.264, otherwise
+            # the frames of its single decode and analysis (encoded per viewer)
+            passthrough = rtsp_passthrough and camera.can_passthrough and "H264/" in offer_sdp.sdp
+            viewer = camera.subscribe(passthrough=passthrough)
+            sender = pc.addTrack(viewer)
+            if passthrough:
+                transceiver = next(t for t in pc.getTransceivers() if t.sender is sender)
+                transceiver.setCodecPreferences(
+                    [
+                        codec
+                        for codec in RTCRtpSender.getCapabilities("video").codecs
+                        if codec.mimeType == "video/H264"
+                    ]
+                )
+            logger.info(
+                f"Added RTSP camera {session_id} to peer connection "
+                f"({camera.ref_count} holder(s), {'passthrough' if passthrough else 'transcoded'})"
             )
 
-            # Add processor directly to peer connection
-            pc.addTrack(processor_track)
-            logger.info("Added RTSP processor track to peer connection")
-
         except Exception as e:
             logger.error(f"Failed to create RTSP track: {e}")
+            # This connection is never negotiated, so its close handler will not run
+            if viewer:
+                viewer.stop()
+            await camera_registry.release(rtsp_url, pc)
+            pcs.discard(pc)
+            await pc.close()
             return web.Response(
                 status=500,
                 content_type="application/json",
@@ -536,12 +1338,27 @@ async def offer(request):
             if track.kind == "video":
                 # Create processor track with VLM service and text callback
                 processor_track = VideoProcessorTrack(
-                    relay.subscribe(track), vlm_service, text_callback=broadcast_text_update
+                    relay.subscribe(track),
+                    vlm_service,
+                    text_callback=broadcast_text_update,
+                    session_id=session_id,
+                    prompt_set_callback=broadcast_prompt_set_results,
+                    roi_callback=broadcast_roi_results,
                 )
-
-                # Add processed track back to connection
-                pc.addTrack(processor_track)
-                logger.info("Added processed video track back to peer connection")
+                processor_track.offer_time = offer_time
+                processor_tracks.add(processor_track)
+                session_tracks.append(processor_track)
+
+                if analysis_only:
+                    # Receive-only: no send track is negotiated, so consume frames here
+                    analysis_tasks.append(
+                        asyncio.create_task(consume_analysis_track(processor_track))
+                    )
+                    logger.info("Analyzing video track without a return stream")
+                else:
+                    # Add processed track back to connection
+                    pc.addTrack(processor_track)
+                    logger.info("Added processed video track back to peer connection")
 
             @track.on("ended")
             async def on_ended():
@@ -555,10 +1372,24 @@ async def offer(request):
     await pc.setLocalDescription(answer)
 
     logger.info(f"Created answer with {len(pc.getTransceivers())} transceivers")
+    # Answering includes ICE gathering, which waits for STUN/TURN servers
+    offer_to_answer = time.monotonic() - offer_time
+    for track in session_tracks:
+        track.offer_to_answer = offer_to_answer
+    logger.info(
+        f"Session {session_id}: answer {1000 * offer_to_answer:.0f} ms after the offer "
+        f"(ICE: {ice_mode(ice_servers)})"
+    )
 
     return web.Response(
         content_type="application/json",
-        text=json.dumps({"sdp": pc.localDescription.sdp, "type": pc.localDescription.type}),
+        text=json.dumps(
+            {
+                "sdp": pc.localDescription.sdp,
+                "type": pc.localDescription.type,
+                "session_id": session_id,
+            }
+        ),
     )
 
 
@@ -593,9 +1424,9 @@ async def rtsp_start(request):
 
         logger.info(f"Starting RTSP stream for session {session_id}")
 
-        # Create RTSP video track
+        # Open the camera, or join it if a viewer already has it open
         try:
-            rtsp_track = RTSPVideoTrack(rtsp_url)
+            camera = camera_registry.acquire(rtsp_url, f"api:{session_id}", session_id=session_id)
         except Exception as e:
             logger.error(f"Failed to create RTSP track: {e}")
             return web.Response(
@@ -604,35 +1435,10 @@ async def rtsp_start(request):
                 text=json.dumps({"error": f"Failed to connect to RTSP stream: {str(e)}"}),
             )
 
-        # Create processor track (same as WebRTC path)
-        processor_track = VideoProcessorTrack(
-            rtsp_track, vlm_service, text_callback=broadcast_text_update
-        )
-
-        # Start background task to consume frames
-        async def consume_frames():
-            """Background task to continuously pull frames from processor track"""
-            try:
-                while not rtsp_track._stopped:
-                    try:
-                        _ = await processor_track.recv()
-                        # Frame is processed, just discard it (VLM analysis happens in recv())
-                    except StopAsyncIteration:
-                        logger.info(f"RTSP stream {session_id} ended")
-                        break
-                    except Exception as e:
-                        logger.error(f"Error consuming RTSP frame for {session_id}: {e}")
-                        break
-            finally:
-                logger.info(f"Frame consumption stopped for {session_id}")
-
-        frame_task = asyncio.create_task(consume_frames())
-
-        # Store reference with frame task
-        rtsp_tracks[session_id] = (rtsp_track, processor_track, frame_task)
+        rtsp_tracks[session_id] = camera
 
         # Get stream stats
-        stats = rtsp_track.get_stats()
+        stats = camera.rtsp_track.get_stats()
 
         logger.info(
             f"RTSP stream started: {session_id} - {stats.get('codec')} "
@@ -641,7 +1447,14 @@ async def rtsp_start(request):
 
         return web.Response(
             content_type="application/json",
-            text=json.dumps({"status": "started", "session_id": session_id, "stream_info": stats}),
+            text=json.dumps(
+                {
+                    "status": "started",
+                    "session_id": session_id,
+                    "camera": camera.get_stats(),
+                    "stream_info": stats,
+                }
+            ),
         )
 
     except Exception as e:
@@ -685,13 +1498,20 @@ async def rtsp_status(request):
     try:
         status_list = []
 
-        for session_id, (rtsp_track, processor_track, frame_task) in rtsp_tracks.items():
-            stats = rtsp_track.get_stats()
+        for session_id, camera in rtsp_tracks.items():
+            stats = camera.rtsp_track.get_stats()
+            processor_stats = camera.processor_track.get_stats()
             status_list.append(
                 {
                     "session_id": session_id,
                     "connected": stats.get("connected"),
                     "frames_received": stats.get("frames_received"),
+                    "decode_errors": stats.get("decode_errors"),
+                    "damaged_frames": stats.get("damaged_frames"),
+                    "frames_rejected": processor_stats["frames_rejected"],
+                    "samples_skipped": processor_stats["samples_skipped"],
+                    "last_quality": processor_stats["last_quality"],
+                    "camera": camera.get_stats(),
                     "stream_info": {
                         "codec": stats.get("codec"),
                         "width": stats.get("width"),
@@ -703,7 +1523,13 @@ async def rtsp_status(request):
 
         return web.Response(
             content_type="application/json",
-            text=json.dumps({"active_streams": len(rtsp_tracks), "streams": status_list}),
+            text=json.dumps(
+                {
+                    "active_streams": len(rtsp_tracks),
+                    "open_cameras": len(camera_registry),
+                    "streams": status_list,
+                }
+            ),
         )
 
     except Exception as e:
@@ -713,62 +1539,39 @@ async def rtsp_status(request):
         )
 
 
+def open_rtsp_camera(url: str, session_id: Optional[str] = None):
+    """Connect to an RTSP camera and set up its analysis (CameraRegistry factory)"""
+    rtsp_track = RTSPVideoTrack(url)
+    processor_track = VideoProcessorTrack(
+        rtsp_track,
+        vlm_service,
+        text_callback=broadcast_text_update,
+        session_id=session_id,
+        prompt_set_callback=broadcast_prompt_set_results,
+        roi_callback=broadcast_roi_results,
+    )
+    processor_tracks.add(processor_track)
+    rtsp_sources[rtsp_track] = processor_track.session_id
+    return rtsp_track, processor_track
+
+
 async def _stop_rtsp_session(session_id: str):
-    """Helper function to stop an RTSP session"""
+    """Helper function to stop an RTSP session (the camera stays open for other viewers)"""
     if session_id in rtsp_tracks:
-        rtsp_track, processor_track, frame_task = rtsp_tracks[session_id]
-
+        camera = rtsp_tracks.pop(session_id)
         logger.info(f"Stopping RTSP session {session_id}...")
-
-        # Step 1: Stop RTSP track first (sets _stopped=True, breaks consume_frames loop)
-        try:
-            rtsp_track.stop()
-            logger.debug(f"RTSP track stopped for {session_id}")
-        except Exception as e:
-            logger.error(f"Error stopping RTSP track: {e}", exc_info=True)
-
-        # Step 2: Give the loop a moment to exit gracefully
-        await asyncio.sleep(0.1)
-
-        # Step 3: Cancel frame consumption task if still running
-        if frame_task and not frame_task.done():
-            logger.debug(f"Cancelling frame task for {session_id}")
-            frame_task.cancel()
-            try:
-                await asyncio.wait_for(frame_task, timeout=2.0)
-            except asyncio.CancelledError:
-                logger.debug(f"Frame task cancelled for {session_id}")
-            except asyncio.TimeoutError:
-                logger.warning(f"Frame task cancellation timeout for {session_id}")
-            except Exception as e:
-                logger.warning(f"Error waiting for frame task: {e}")
-
-        # Step 4: Stop processor track
-        try:
-            processor_track.stop()
-            logger.debug(f"Processor track stopped for {session_id}")
-        except Exception as e:
-            logger.warning(f"Error stopping processor track: {e}")
-
-        # Step 5: Final cleanup - ensure container is closed
-        try:
-            if hasattr(rtsp_track, 'container') and rtsp_track.container:
-                rtsp_track.container.close()
-                rtsp_track.container = None
-                rtsp_track.stream = None
-        except Exception as e:
-            logger.warning(f"Error in final container cleanup: {e}")
-
-        # Remove from tracking
-        del rtsp_tracks[session_id]
-        logger.info(f"RTSP stream stopped successfully: {session_id}")
+        closed = await camera_registry.release(camera.url, f"api:{session_id}")
+        logger.info(
+            f"RTSP stream stopped successfully: {session_id}"
+            + ("" if closed else f" (camera still has {camera.ref_count} holder(s))")
+        )
     else:
         logger.warning(f"RTSP session {session_id} not found")
 
 
 async def on_startup(app):
     """Initialize resources on server startup"""
-    global gpu_monitor, gpu_monitor_task
+    global gpu_monitor, gpu_monitor_task, vlm_metrics_task, calibration_task
 
     # Initialize GPU monitor
     try:
@@ -783,10 +1586,28 @@ async def on_startup(app):
         gpu_monitor_task = asyncio.create_task(gpu_monitor_loop())
         logger.info("GPU monitoring task started")
 
+    # Latency percentiles and backend stats for the pages
+    vlm_metrics_task = asyncio.create_task(vlm_metrics_loop())
+
+    # Start backend health probes when load balancing across replicas
+    if vlm_service and len(vlm_service.backend_pool) > 1:
+        vlm_service.backend_pool.start_health_checks()
+
+    # Load the model before the first frame arrives
+    if vlm_service:
+        vlm_service.warmer.start()
+
+    # Probe local services now, so the first page load does not wait on dead ports
+    discovery.prefetch()
+
+    # Measure backend capacity and set the sampling interval (--calibrate)
+    if vlm_service and startup_calibration_sessions:
+        calibration_task = asyncio.create_task(startup_calibration(startup_calibration_sessions))
+
 
 async def on_shutdown(app):
     """Cleanup on server shutdown"""
-    global gpu_monitor, gpu_monitor_task
+    global gpu_monitor, gpu_monitor_task, vlm_metrics_task
 
     logger.info("Shutting down server...")
 
@@ -799,19 +1620,35 @@ async def on_shutdown(app):
             pass
         logger.info("GPU monitoring task stopped")
 
+    if vlm_metrics_task:
+        vlm_metrics_task.cancel()
+        try:
+            await vlm_metrics_task
+        except asyncio.CancelledError:
+            pass
+        vlm_metrics_task = None
+
     # Cleanup GPU monitor
     if gpu_monitor:
         gpu_monitor.cleanup()
         logger.info("GPU monitor cleaned up")
 
+    # Stop calibration, warm-up, backend health probes and close pooled connections
+    if calibration_task and not calibration_task.done():
+        calibration_task.cancel()
+    if vlm_service:
+        await vlm_service.warmer.stop()
+        await vlm_service.backend_pool.aclose()
+    await discovery.aclose()
+
     # Close all websockets
     for ws in list(websockets):
         await ws.close()
     websockets.clear()
 
-    # Close all RTSP streams
-    for session_id in list(rtsp_tracks.keys()):
-        await _stop_rtsp_session(session_id)
+    # Close all RTSP cameras, whoever still holds them
+    rtsp_tracks.clear()
+    await camera_registry.close_all()
     logger.info("RTSP streams closed")
 
     # Close all peer connections
@@ -837,6 +1674,13 @@ async def create_app(test_mode=False):
     app.router.add_get("/", index)
     app.router.add_get("/models", models)
     app.router.add_get("/detect-services", detect_services)
+    app.router.add_get("/api/backends", backends_status)
+    app.router.add_get("/api/vlm/metrics", vlm_metrics)
+    app.router.add_get("/metrics", prometheus_metrics)
+    app.router.add_get("/healthz", healthz)
+    app.router.add_get("/readyz", readyz)
+    app.router.add_get("/api/calibrate", calibration_handler)
+    app.router.add_post("/api/calibrate", calibration_handler)
     app.router.add_get("/ws", websocket_handler)
     app.router.add_post("/offer", offer)
 
@@ -866,6 +1710,9 @@ async def create_app(test_mode=False):
     else:
         logger.warning(f"⚠️  Favicon directory not found: {favicon_dir}")
 
+    if vlm_service:
+        vlm_service.circuit_breaker.on_state_change = broadcast_backend_status
+
     if not test_mode:
         app.on_startup.append(on_startup)
         app.on_shutdown.append(on_shutdown)
@@ -974,6 +1821,25 @@ def main():
     parser.add_argument(
         "--api-base", help="VLM API base URL (optional, will auto-detect or use NVIDIA NGC)"
     )
+    parser.add_argument(
+        "--backend",
+        action="append",
+        default=[],
+        metavar="URL",
+        help="Additional API base URL of a replica serving the same model, "
+        "for load balancing and failover (repeatable)",
+    )
+    parser.add_argument(
+        "--routing",
+        choices=ROUTING_STRATEGIES,
+        default="least_outstanding",
+        help="Routing strategy across backends (default: least_outstanding)",
+    )
+    parser.add_argument(
+        "--fast-path",
+        action="store_true",
+        help="Send image requests over a low-overhead raw HTTP client instead of the OpenAI SDK",
+    )
     parser.add_argument(
         "--api-key",
         default="EMPTY",
@@ -984,6 +1850,225 @@ def main():
         default="Describe what you see in this image in one sentence.",
         help="Prompt to send to VLM (default: 'Describe what you see...')",
     )
+    parser.add_argument(
+        "--prompt-set",
+        action="append",
+        default=[],
+        metavar="NAME=PROMPT",
+        help="Answer several prompts per sampled frame (repeatable), e.g. "
+        "--prompt-set 'safety=Is anyone in danger?' --prompt-set 'count=How many people?'",
+    )
+    parser.add_argument(
+        "--roi",
+        action="append",
+        default=[],
+        metavar="NAME=X0,Y0,X1,Y1[=PROMPT]",
+        help="Analyze this region of every sampled frame on its own instead of the whole "
+        "frame (repeatable; coordinates are fractions of the frame), e.g. "
+        "--roi 'door=0.05,0.2,0.35,0.95=Is the door open?'",
+    )
+    parser.add_argument(
+        "--prompt-layout",
+        choices=PROMPT_LAYOUTS,
+        default="inline",
+        help="Contextual prompt layout: 'prefix_cache' keeps a stable instruction prefix "
+        "and puts frame history after the image for vLLM/SGLang prefix caching (default: inline)",
+    )
+    parser.add_argument(
+        "--max-staleness",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="Cancel VLM requests whose frame is older than this (default: 0 = disabled)",
+    )
+    parser.add_argument(
+        "--metrics-window",
+        type=float,
+        default=60.0,
+        metavar="SECONDS",
+        help="Sliding window for latency percentiles (default: 60)",
+    )
+    parser.add_argument(
+        "--image-profile",
+        choices=["auto"] + list(IMAGE_PROFILES),
+        default="auto",
+        help="Resize frames to the model's native resolution/patch grid before encoding: "
+        "'auto' picks a preset from the model name, 'none' sends camera resolution "
+        "(default: auto)",
+    )
+    parser.add_argument(
+        "--request-timeout",
+        type=float,
+        default=30.0,
+        metavar="SECONDS",
+        help="Timeout of a single VLM request, 0 = none (default: 30)",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=1,
+        help="Retries of a VLM request after a timeout, connection error, 429 or 5xx; "
+        "replicas (--backend) fail over instead (default: 1)",
+    )
+    parser.add_argument(
+        "--circuit-threshold",
+        type=int,
+        default=3,
+        help="Consecutive failed VLM requests before frames are skipped and the backend is "
+        "probed with exponential backoff, 0 = disabled (default: 3)",
+    )
+    parser.add_argument(
+        "--circuit-max-backoff",
+        type=float,
+        default=60.0,
+        metavar="SECONDS",
+        help="Longest wait between probes of a failing backend (default: 60)",
+    )
+    parser.add_argument(
+        "--rate-limit-rpm",
+        type=float,
+        default=None,
+        metavar="N",
+        help="Client-side requests/min quota per API base and key, e.g. for cloud endpoints "
+        "(default: unlimited)",
+    )
+    parser.add_argument(
+        "--rate-limit-tpm",
+        type=float,
+        default=None,
+        metavar="N",
+        help="Client-side tokens/min quota per API base and key (default: unlimited)",
+    )
+    parser.add_argument(
+        "--hedge-percentile",
+        type=float,
+        default=0.0,
+        metavar="P",
+        help="With replicas (--backend), duplicate a request on another backend once it runs "
+        "longer than this percentile of recent latency, e.g. 95 (default: 0 = disabled)",
+    )
+    parser.add_argument(
+        "--api-flavor",
+        type=str,
+        default="openai",
+        choices=list(API_FLAVORS),
+        help="Request API: openai (/v1/chat/completions), ollama (native /api/chat with "
+        "keep_alive and server timings) or auto (ollama on port 11434) (default: openai)",
+    )
+    parser.add_argument(
+        "--ollama-keep-alive",
+        type=str,
+        default=None,
+        metavar="DURATION",
+        help="How long Ollama keeps the model loaded between frames with the native API, "
+        "e.g. 30m or -1 for forever (default: Ollama's 5m)",
+    )
+    parser.add_argument(
+        "--no-warmup",
+        action="store_true",
+        help="Do not send a synthetic frame to warm up the model on startup and model change",
+    )
+    parser.add_argument(
+        "--warmup-timeout",
+        type=float,
+        default=120.0,
+        metavar="SECONDS",
+        help="Timeout of a warm-up request, including model loading (default: 120)",
+    )
+    parser.add_argument(
+        "--keep-warm",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="Ping a backend with a synthetic frame after it was idle this long, e.g. 240 "
+        "to keep Ollama from unloading the model (default: 0 = disabled)",
+    )
+    parser.add_argument(
+        "--calibrate",
+        type=int,
+        nargs="?",
+        const=1,
+        default=None,
+        metavar="STREAMS",
+        help="On startup, measure backend capacity with a ramp of concurrent requests and set "
+        "--process-every and the in-flight limit for this many streams (default: 1)",
+    )
+    parser.add_argument(
+        "--min-sharpness",
+        type=float,
+        default=0.0,
+        help="Skip sampled frames whose sharpness (Laplacian variance at 320px width) is below "
+        "this, e.g. 50 for motion blur; the next sharp frame is sent instead (default: 0 = off)",
+    )
+    parser.add_argument(
+        "--min-luma",
+        type=float,
+        default=0.0,
+        help="Skip sampled frames darker than this mean luma, 0-255 (default: 0 = off)",
+    )
+    parser.add_argument(
+        "--max-luma",
+        type=float,
+        default=255.0,
+        help="Skip sampled frames brighter than this mean luma, 0-255 (default: 255 = off)",
+    )
+    parser.add_argument(
+        "--quality-retry-frames",
+        type=int,
+        default=15,
+        help="Frames checked for a replacement after a sampled frame is rejected, before the "
+        "sample is skipped (default: 15)",
+    )
+    parser.add_argument(
+        "--motion-crop",
+        action="store_true",
+        help="Send only the moving region of a sampled frame (padded crop found with a "
+        "background model), or the full frame when nothing or most of it moves",
+    )
+    parser.add_argument(
+        "--motion-threshold",
+        type=int,
+        default=25,
+        help="Gray-level difference (0-255) at which a pixel counts as moving (default: 25)",
+    )
+    parser.add_argument(
+        "--crop-thumbnail",
+        type=int,
+        default=0,
+        metavar="WIDTH",
+        help="With --motion-crop, also send a full-frame thumbnail of this width as a second "
+        "image (needs a multi-image model; default: 0 = crop only)",
+    )
+    parser.add_argument(
+        "--min-capture-fps",
+        type=float,
+        default=MIN_CAPTURE_FPS,
+        help="Lowest frame rate browser cameras are asked to capture at; pages get a capture "
+        "size for the model's image profile and a frame rate just above the sampling rate "
+        f"(default: {MIN_CAPTURE_FPS}, 0 = let the browser choose)",
+    )
+    parser.add_argument(
+        "--ice-server",
+        action="append",
+        default=[],
+        metavar="URL",
+        help="STUN or TURN server for WebRTC, e.g. stun:stun.example.com:3478 or "
+        "turn:turn.example.com:3478?transport=udp (repeatable; default: public Google STUN)",
+    )
+    parser.add_argument("--ice-username", help="Username for the --ice-server TURN servers")
+    parser.add_argument("--ice-credential", help="Password for the --ice-server TURN servers")
+    parser.add_argument(
+        "--lan",
+        action="store_true",
+        help="Use no STUN/TURN servers (host candidates only): faster connection setup on "
+        "LAN-only and air-gapped networks",
+    )
+    parser.add_argument(
+        "--rtsp-passthrough",
+        action="store_true",
+        help="Send H.264 RTSP cameras to the browser as received, without re-encoding "
+        "(no text overlay on the video; responses still show in the page)",
+    )
     # Get default SSL cert paths (platform-specific)
     default_config_dir = get_app_config_dir()
     default_cert_path = str(default_config_dir / "cert.pem")
@@ -1045,19 +2130,92 @@ def main():
                 logger.warning("   Or use WebUI to configure API settings after starting")
 
     # Initialize VLM service
-    global vlm_service
-    vlm_service = VLMService(model=model, api_base=api_base, api_key=api_key, prompt=args.prompt)
+    global vlm_service, startup_calibration_sessions, min_capture_fps, ice_servers, rtsp_passthrough
+    vlm_service = VLMService(
+        model=model,
+        api_base=api_base,
+        api_key=api_key,
+        prompt=args.prompt,
+        backends=args.backend,
+        routing=args.routing,
+        fast_path=args.fast_path,
+        prompt_layout=args.prompt_layout,
+        max_staleness=args.max_staleness,
+        metrics_window=args.metrics_window,
+        image_profile=args.image_profile,
+        request_timeout=args.request_timeout,
+        max_retries=args.max_retries,
+        circuit_threshold=args.circuit_threshold,
+        circuit_max_backoff=args.circuit_max_backoff,
+        rate_limit_rpm=args.rate_limit_rpm,
+        rate_limit_tpm=args.rate_limit_tpm,
+        hedge_percentile=args.hedge_percentile,
+        api_flavor=args.api_flavor,
+        ollama_keep_alive=args.ollama_keep_alive,
+        warmup=not args.no_warmup,
+        warmup_timeout=args.warmup_timeout,
+        keep_warm_interval=args.keep_warm,
+    )
 
     # Log initialization with better formatting
     service_name = "Local" if "localhost" in api_base or "127.0.0.1" in api_base else "Cloud"
     logger.info("Initialized VLM service:")
     logger.info(f"  Model: {model}")
     logger.info(f"  API: {api_base} ({service_name})")
+    for replica in args.backend:
+        logger.info(f"  Replica: {replica}")
     logger.info(f"  Prompt: {args.prompt}")
+    logger.info(f"  Image profile: {vlm_service.image_profile.name}")
 
     # Update frame processing rate in VideoProcessorTrack if needed
     # (This is a bit hacky but works for this demo)
     VideoProcessorTrack.process_every_n_frames = args.process_every
+    VideoProcessorTrack.quality_gate = FrameQualityGate(
+        min_sharpness=args.min_sharpness,
+        min_luma=args.min_luma,
+        max_luma=args.max_luma,
+        max_retry_frames=args.quality_retry_frames,
+    )
+    if VideoProcessorTrack.quality_gate.measures:
+        logger.info(f"  Quality gate: {VideoProcessorTrack.quality_gate.get_config()}")
+    if args.motion_crop:
+        VideoProcessorTrack.motion_crop = {"threshold": args.motion_threshold}
+        VideoProcessorTrack.crop_thumbnail_width = args.crop_thumbnail
+        thumbnail_note = f", {args.crop_thumbnail}px thumbnail" if args.crop_thumbnail else ""
+        logger.info(f"  Motion crop: threshold {args.motion_threshold}{thumbnail_note}")
+    startup_calibration_sessions = args.calibrate
+    min_capture_fps = args.min_capture_fps
+    rtsp_passthrough = args.rtsp_passthrough
+    if rtsp_passthrough:
+        logger.info("  RTSP passthrough: H.264 cameras are forwarded without re-encoding")
+    if args.lan and args.ice_server:
+        parser.error("--lan and --ice-server are mutually exclusive")
+    if args.lan or args.ice_server:
+        try:
+            ice_servers = build_ice_servers(args.ice_server, args.ice_username, args.ice_credential)
+        except ValueError as e:
+            parser.error(f"--ice-server: {e}")
+    logger.info(f"  ICE: {ice_mode(ice_servers)} {[s.urls[0] for s in ice_servers]}")
+
+    if args.prompt_set:
+        entries = []
+        for entry in args.prompt_set:
+            name, sep, prompt = entry.partition("=")
+            entries.append({"name": name, "prompt": prompt} if sep else {"prompt": entry})
+        try:
+            VideoProcessorTrack.default_prompt_set = normalize_prompt_set(entries)
+        except ValueError as e:
+            parser.error(f"--prompt-set: {e}")
+        for item in VideoProcessorTrack.default_prompt_set:
+            logger.info(f"  Prompt set [{item['name']}]: {item['prompt']}")
+
+    if args.roi:
+        try:
+            VideoProcessorTrack.default_rois = normalize_rois([parse_roi(r) for r in args.roi])
+        except ValueError as e:
+            parser.error(f"--roi: {e}")
+        for roi in VideoProcessorTrack.default_rois:
+            logger.info(f"  Region [{roi['name']}]: {roi['box']} {roi['prompt'] or ''}")
 
     # Create web application using create_app
     app = asyncio.run(create_app(test_mode=False))
@@ -0,0 +1,247 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Snapshot Ingest
+Webcam sessions where the browser sends JPEG snapshots instead of a video stream.
+
+In WebRTC mode the server decodes the full real-time stream (and encodes it again
+for the return video) just to analyze one frame in N. In snapshot mode the page
+grabs frames from its local video element at the analysis rate, already scaled to
+the model's input geometry, and sends them as binary WebSocket messages. A
+snapshot of the expected size is forwarded to the VLM as-is: no video decode, no
+color conversion and no JPEG re-encode on the server.
+"""
+
+import asyncio
+import io
+import logging
+import time
+import uuid
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image, UnidentifiedImageError
+
+from .frame_quality import CORRUPT, REJECT_REASONS
+from .regions import crop_regions
+from .video_processor import VideoProcessorTrack
+from .vlm_service import VLMService
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot:
+    """
+    JPEG frame sent by the browser
+
+    Only the header is parsed; VLMService forwards the original bytes instead of
+    encoding the image again.
+    """
+
+    def __init__(self, jpeg: bytes):
+        """
+        Args:
+            jpeg: JPEG file contents
+
+        Raises:
+            ValueError: If the data is not a JPEG image
+        """
+        try:
+            with Image.open(io.BytesIO(jpeg)) as image:
+                if image.format != "JPEG":
+                    raise ValueError(f"Expected a JPEG snapshot, got {image.format}")
+                self.size: Tuple[int, int] = image.size
+        except (UnidentifiedImageError, OSError) as e:
+            raise ValueError(f"Invalid snapshot: {e}") from None
+        self.jpeg = jpeg
+
+    def decode(self) -> np.ndarray:
+        """Decode to an RGB array (only needed to resize or crop)"""
+        with Image.open(io.BytesIO(self.jpeg)) as image:
+            return np.asarray(image.convert("RGB"))
+
+
+class SnapshotSession:
+    """
+    Analysis session fed with browser snapshots
+
+    Mirrors the parts of VideoProcessorTrack the server uses (session_id,
+    readyState, prompt_set, rois, get_stats()), so snapshot sessions share the
+    per-session WebSocket messages and metrics of video sessions.
+    """
+
+    def __init__(
+        self,
+        vlm_service: VLMService,
+        text_callback=None,
+        session_id: Optional[str] = None,
+        prompt_set_callback=None,
+        roi_callback=None,
+    ):
+        self.vlm_service = vlm_service
+        self.text_callback = text_callback  # Called with (response, metrics) per answer
+        self.session_id = session_id or uuid.uuid4().hex[:8]
+        self.prompt_set: Optional[list] = None  # Per-session override of default_prompt_set
+        self.prompt_set_callback = prompt_set_callback
+        self.rois: Optional[list] = None  # Per-session override of default_rois
+        self.roi_callback = roi_callback
+        self.readyState = "live"
+        self.frame_count = 0  # Snapshots received
+        self.converted_frames = 0  # Snapshots decoded (resized or cropped on the server)
+        self.submitted_frames = 0  # Snapshots handed to the VLM service
+        self.rejected_frames = {reason: 0 for reason in REJECT_REASONS}  # Undecodable data
+        self.region_crops = 0  # Region-of-interest crops sent to the VLM
+        self.received_bytes = 0
+
+    def target_geometry(self, width: int, height: int) -> dict:
+        """
+        Snapshot size the browser should send for a camera resolution
+
+        Args:
+            width: Camera frame width
+            height: Camera frame height
+
+        Returns:
+            {"width", "height"} of the canvas and {"content_width", "content_height"}
+            of the frame centered on it (smaller when the profile letterboxes)
+        """
+        canvas_w, canvas_h, content_w, content_h = self.vlm_service.image_profile.geometry(
+            width, height
+        )
+        return {
+            "width": canvas_w,
+            "height": canvas_h,
+            "content_width": content_w,
+            "content_height": content_h,
+        }
+
+    def submit(self, data: bytes) -> bool:
+        """
+        Queue a snapshot for analysis (non-blocking)
+
+        Args:
+            data: JPEG file contents from a binary WebSocket message
+
+        Returns:
+            False if the data is not a JPEG image
+        """
+        self.frame_count += 1
+        self.received_bytes += len(data)
+        frame_time = time.monotonic()
+        try:
+            snapshot = Snapshot(data)
+        except ValueError as e:
+            self.rejected_frames[CORRUPT] += 1
+            logger.warning(f"Session {self.session_id}: {e}")
+            return False
+
+        rois = self.get_rois()
+        if rois:
+            img = snapshot.decode()
+            self.converted_frames += 1
+            prepare = self.vlm_service.image_profile.prepare
+            regions = [
+                {
+                    "name": roi["name"],
+                    "image": Image.fromarray(prepare(crop)),
+                    "prompt": roi["prompt"],
+                }
+                for roi, crop in zip(rois, crop_regions(img, rois))
+            ]
+            self.region_crops += len(regions)
+            asyncio.create_task(self._process_regions(regions, frame_time))
+        else:
+            image = self._fit_to_profile(snapshot)
+            prompt_set = self.get_prompt_set()
+            if prompt_set:
+                asyncio.create_task(self._process_prompt_set(image, prompt_set, frame_time))
+            else:
+                asyncio.create_task(self._process_frame(image, frame_time))
+        self.submitted_frames += 1
+        return True
+
+    def _fit_to_profile(self, snapshot: Snapshot):
+        """Snapshot as sent if it has the profile's geometry, else a resized PIL Image"""
+        width, height = snapshot.size
+        canvas_w, canvas_h, _, _ = self.vlm_service.image_profile.geometry(width, height)
+        if (canvas_w, canvas_h) == (width, height):
+            return snapshot
+        # The page did not scale the snapshot (e.g. the model changed since it asked)
+        self.converted_frames += 1
+        return Image.fromarray(self.vlm_service.image_profile.prepare(snapshot.decode()))
+
+    def get_prompt_set(self) -> list:
+        """Prompt set of this session (falls back to the video sessions' default)"""
+        if self.prompt_set is not None:
+            return self.prompt_set
+        return VideoProcessorTrack.default_prompt_set
+
+    def get_rois(self) -> list:
+        """Regions of interest of this session (falls back to the video sessions' default)"""
+        if self.rois is not None:
+            return self.rois
+        return VideoProcessorTrack.default_rois
+
+    async def _process_frame(self, image, frame_time: float):
+        await self.vlm_service.process_frame(image, frame_time=frame_time)
+        self._send_text()
+
+    async def _process_prompt_set(self, image, prompts: list, frame_time: float):
+        results = await self.vlm_service.process_prompt_set(image, prompts, frame_time=frame_time)
+        if results is not None and self.prompt_set_callback:
+            self.prompt_set_callback(self.session_id, results)
+        self._send_text()
+
+    async def _process_regions(self, regions: list, frame_time: float):
+        results = await self.vlm_service.process_regions(regions, frame_time=frame_time)
+        if results is not None and self.roi_callback:
+            self.roi_callback(self.session_id, results)
+        self._send_text()
+
+    def _send_text(self) -> None:
+        """Report the current answer (a video session does this on every frame)"""
+        if self.text_callback and self.readyState == "live":
+            response, _ = self.vlm_service.get_current_response()
+            self.text_callback(response, self.vlm_service.get_counters())
+
+    def stop(self) -> None:
+        """End the session; answers still in flight are no longer reported"""
+        self.readyState = "ended"
+
+    def get_stats(self) -> dict:
+        """
+        Get per-session frame counters (same keys as VideoProcessorTrack.get_stats())
+
+        Returns:
+            Dictionary with snapshot statistics
+        """
+        return {
+            "session_id": self.session_id,
+            "mode": "snapshot",
+            "frames_received": self.frame_count,
+            "frames_dropped": 0,
+            "frames_converted": self.converted_frames,
+            "frames_submitted": self.submitted_frames,
+            "frames_rejected": dict(self.rejected_frames),
+            "samples_skipped": 0,
+            "last_quality": None,
+            "frames_cropped": 0,
+            "mean_crop_share": None,
+            "last_crop": None,
+            "region_crops": self.region_crops,
+            "received_bytes": self.received_bytes,
+            "active": self.readyState == "live",
+        }
@@ -0,0 +1,740 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+VLM Stub Server
+OpenAI-compatible fake VLM backend for load testing the pipeline without a GPU.
+
+Implements /v1/models and /v1/chat/completions (including streaming), plus the
+Ollama-native /api/tags and /api/chat (with keep_alive and load time), with
+configurable latency distributions, time-to-first-token, tokens/sec, error and
+429 injection, concurrency limits and vLLM-style prefix cache accounting.
+
+Usage:
+    live-vlm-stub-server --port 8000 --ttft-ms 150 --tokens-per-sec 40
+    python -m live_vlm_webui.stub_server --error-rate 0.05 --max-concurrency 4
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import time
+import uuid
+from typing import List, Optional
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+
+# Words used to build deterministic-looking responses
+_RESPONSE_WORDS = (
+    "A person stands near a desk with a laptop while light from a window falls across "
+    "the room and a chair sits beside a shelf of books"
+).split()
+
+
+class StubConfig:
+    """Behavior of the stub backend (mutable at runtime via POST /stub/config)"""
+
+    def __init__(
+        self,
+        models: Optional[List[str]] = None,
+        ttft_ms: float = 100.0,
+        ttft_jitter_ms: float = 0.0,
+        latency_distribution: str = "fixed",
+        tokens_per_sec: float = 50.0,
+        output_tokens: int = 24,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        max_concurrency: int = 0,
+        overload: str = "queue",
+        healthy: bool = True,
+        block_size: int = 16,
+        image_tokens: int = 256,
+        response_text: Optional[str] = None,
+        echo: bool = False,
+        load_ms: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize stub configuration
+
+        Args:
+            models: Model IDs served (default: ["stub-vlm"])
+            ttft_ms: Mean time to first token in milliseconds
+            ttft_jitter_ms: Spread of the TTFT distribution (std dev / half-width) in ms
+            latency_distribution: TTFT distribution, one of LATENCY_DISTRIBUTIONS
+            tokens_per_sec: Decode speed after the first token (0 = instant)
+            output_tokens: Tokens generated per response (capped by max_tokens)
+            error_rate: Fraction of requests failing with HTTP 500
+            rate_limit_rate: Fraction of requests rejected with HTTP 429 + Retry-After
+            retry_after: Retry-After value in seconds for injected 429s
+            max_concurrency: Maximum requests processed at once (0 = unlimited)
+            overload: What to do above max_concurrency: "queue" or "reject" (HTTP 429)
+            healthy: When False every endpoint answers HTTP 503
+            block_size: KV cache block size for prefix cache accounting
+            image_tokens: Vision tokens counted per image
+            response_text: Fixed response text (default: generated words)
+            echo: Answer with the first text part of the last message (overrides
+                response_text), handy for telling concurrent requests apart
+            load_ms: Model load time paid by /api/chat when the model is not loaded
+                (Ollama-style keep_alive, 5 minutes by default)
+            seed: Random seed for reproducible runs
+        """
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution '{latency_distribution}' "
+                f"(expected one of {LATENCY_DISTRIBUTIONS})"
+            )
+        if overload not in ("queue", "reject"):
+            raise ValueError(f"Unknown overload behavior '{overload}'")
+
+        self.models = models or ["stub-vlm"]
+        self.ttft_ms = ttft_ms
+        self.ttft_jitter_ms = ttft_jitter_ms
+        self.latency_distribution = latency_distribution
+        self.tokens_per_sec = tokens_per_sec
+        self.output_tokens = output_tokens
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.max_concurrency = max_concurrency
+        self.overload = overload
+        self.healthy = healthy
+        self.block_size = block_size
+        self.image_tokens = image_tokens
+        self.response_text = response_text
+        self.echo = echo
+        self.load_ms = load_ms
+        self.seed = seed
+
+    def to_dict(self) -> dict:
+        """Current configuration as a JSON-serializable dict"""
+        return dict(vars(self))
+
+    def update(self, values: dict) -> None:
+        """
+        Update configuration fields
+
+        Args:
+            values: Field name -> new value (unknown fields raise ValueError)
+        """
+        for key, value in values.items():
+            if not hasattr(self, key):
+                raise ValueError(f"Unknown stub config field '{key}'")
+            setattr(self, key, value)
+
+
+def tokenize_messages(messages: list, image_tokens: int = 256) -> List[str]:
+    """
+    Approximate the prompt tokens of chat messages
+
+    Text is split into words and punctuation; every image counts as image_tokens
+    tokens that are unique to its data, so different frames never share them.
+
+    Args:
+        messages: OpenAI chat messages
+        image_tokens: Tokens per image
+
+    Returns:
+        List of token strings
+    """
+    tokens = []
+    for message in messages:
+        tokens.append(f"<|{message.get('role', 'user')}|>")
+        content = message.get("content") or ""
+        if isinstance(content, str):
+            content = [{"type": "text", "text": content}]
+        for part in content:
+            if part.get("type") == "text":
+                tokens.extend(re.findall(r"\w+|[^\w\s]", part.get("text", "")))
+            elif part.get("type") == "image_url":
+                url = part.get("image_url", {}).get("url", "")
+                digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+                tokens.extend(f"<img:{digest}:{i}>" for i in range(image_tokens))
+    return tokens
+
+
+class PrefixCache:
+    """Block-level automatic prefix cache accounting, like vLLM/SGLang"""
+
+    def __init__(self, max_blocks: int = 100000):
+        self.max_blocks = max_blocks
+        self._blocks = {}  # chained block hash -> None (insertion ordered, LRU-ish)
+
+    def lookup_and_insert(self, tokens: List[str], block_size: int) -> int:
+        """
+        Count cached prompt tokens and insert the new full blocks
+
+        Args:
+            tokens: Prompt tokens
+            block_size: Tokens per KV cache block
+
+        Returns:
+            Number of leading tokens served from the cache
+        """
+        cached = 0
+        parent = ""
+        hit = True
+        for start in range(0, len(tokens) - block_size + 1, block_size):
+            block = "|".join(tokens[start : start + block_size])
+            parent = hashlib.sha1(f"{parent}/{block}".encode("utf-8")).hexdigest()
+            if hit and parent in self._blocks:
+                cached += block_size
+                self._blocks.pop(parent)
+            else:
+                hit = False
+            self._blocks[parent] = None
+
+        while len(self._blocks) > self.max_blocks:
+            self._blocks.pop(next(iter(self._blocks)))
+        return cached
+
+    def clear(self) -> None:
+        self._blocks.clear()
+
+
+class StubState:
+    """Runtime state and counters of a stub server"""
+
+    def __init__(self, config: StubConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.prefix_cache = PrefixCache()
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.semaphore_size = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset counters and the prefix cache"""
+        self.requests = 0
+        self.completed = 0
+        self.streamed = 0
+        self.errors_injected = 0
+        self.rate_limited = 0
+        self.rejected = 0
+        self.aborted = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+        self.model_loads = 0  # /api/chat requests that had to load the model
+        self.loaded_until = 0.0  # time.monotonic() the model is unloaded at
+        self.prefix_cache.clear()
+
+    def get_semaphore(self) -> Optional[asyncio.Semaphore]:
+        """Concurrency limiter matching the current max_concurrency (None = unlimited)"""
+        size = self.config.max_concurrency
+        if size <= 0:
+            return None
+        if self.semaphore is None or self.semaphore_size != size:
+            self.semaphore = asyncio.Semaphore(size)
+            self.semaphore_size = size
+        return self.semaphore
+
+    def sample_ttft(self) -> float:
+        """Sample the time to first token in seconds"""
+        config = self.config
+        mean = max(config.ttft_ms, 0.0)
+        jitter = max(config.ttft_jitter_ms, 0.0)
+        dist = config.latency_distribution
+
+        if dist == "uniform":
+            value = self.rng.uniform(mean - jitter, mean + jitter)
+        elif dist == "normal":
+            value = self.rng.gauss(mean, jitter)
+        elif dist == "lognormal" and mean > 0:
+            # Parameterized so the distribution has the requested mean and std dev
+            sigma2 = math.log(1 + (jitter / mean) ** 2)
+            value = self.rng.lognormvariate(math.log(mean) - sigma2 / 2, math.sqrt(sigma2))
+        elif dist == "exponential" and mean > 0:
+            value = self.rng.expovariate(1.0 / mean)
+        else:
+            value = mean
+        return max(value, 0.0) / 1000.0
+
+    def get_stats(self) -> dict:
+        """Counters as a JSON-serializable dict"""
+        return {
+            "requests": self.requests,
+            "completed": self.completed,
+            "streamed": self.streamed,
+            "errors_injected": self.errors_injected,
+            "rate_limited": self.rate_limited,
+            "rejected": self.rejected,
+            "aborted": self.aborted,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "completion_tokens": self.completion_tokens,
+            "model_loads": self.model_loads,
+        }
+
+
+STUB_STATE = web.AppKey("stub_state", StubState)
+
+
+def _error(status: int, message: str, headers: Optional[dict] = None) -> web.Response:
+    return web.json_response(
+        {"error": {"message": message, "type": "stub_error", "code": status}},
+        status=status,
+        headers=headers,
+    )
+
+
+def _echo_text(messages: list) -> str:
+    content = messages[-1].get("content") if messages else ""
+    if isinstance(content, str):
+        return content
+    for part in content or []:
+        if part.get("type") == "text":
+            return part.get("text", "")
+    return ""
+
+
+def _response_tokens(
+    config: StubConfig, count: int, offset: int = 0, messages: Optional[list] = None
+) -> List[str]:
+    """Response split into tokens; generated text starts at a per-request word offset"""
+    if config.echo:
+        words = _echo_text(messages or []).split()
+    elif config.response_text is not None:
+        words = config.response_text.split()
+    else:
+        words = [_RESPONSE_WORDS[(offset + i) % len(_RESPONSE_WORDS)] for i in range(count)]
+    return [word if i == 0 else f" {word}" for i, word in enumerate(words)]
+
+
+async def models_handler(request: web.Request) -> web.Response:
+    """GET /v1/models"""
+    state = request.app[STUB_STATE]
+    if not state.config.healthy:
+        return _error(503, "Stub backend is unhealthy")
+    return web.json_response(
+        {
+            "object": "list",
+            "data": [
+                {"id": model, "object": "model", "created": 0, "owned_by": "stub"}
+                for model in state.config.models
+            ],
+        }
+    )
+
+
+async def chat_completions_handler(request: web.Request) -> web.StreamResponse:
+    """POST /v1/chat/completions"""
+    return await _handle_chat(request, _generate)
+
+
+async def ollama_chat_handler(request: web.Request) -> web.StreamResponse:
+    """POST /api/chat - Ollama native chat"""
+    return await _handle_chat(request, _generate_ollama)
+
+
+async def ollama_tags_handler(request: web.Request) -> web.Response:
+    """GET /api/tags - Ollama model list"""
+    state = request.app[STUB_STATE]
+    if not state.config.healthy:
+        return _error(503, "Stub backend is unhealthy")
+    return web.json_response(
+        {
+            "models": [
+                {"name": model, "model": model, "size": 0, "digest": "", "details": {}}
+                for model in state.config.models
+            ]
+        }
+    )
+
+
+async def _handle_chat(request: web.Request, generate) -> web.StreamResponse:
+    """Health, validation, fault injection and concurrency limits shared by both APIs"""
+    state = request.app[STUB_STATE]
+    config = state.config
+    state.requests += 1
+
+    if not config.healthy:
+        return _error(503, "Stub backend is unhealthy")
+
+    try:
+        body = await request.json()
+    except json.JSONDecodeError:
+        return _error(400, "Invalid JSON body")
+
+    model = body.get("model")
+    if model not in config.models:
+        return _error(404, f"The model '{model}' does not exist")
+
+    # Fault injection happens before any simulated work, like a real gateway
+    roll = state.rng.random()
+    if roll < config.rate_limit_rate:
+        state.rate_limited += 1
+        return _error(429, "Rate limit exceeded", headers={"Retry-After": str(config.retry_after)})
+    if roll < config.rate_limit_rate + config.error_rate:
+        state.errors_injected += 1
+        return _error(500, "Injected server error")
+
+    semaphore = state.get_semaphore()
+    if semaphore is not None and semaphore.locked() and config.overload == "reject":
+        state.rejected += 1
+        return _error(429, "Too many concurrent requests", headers={"Retry-After": "1"})
+
+    if semaphore is not None:
+        await semaphore.acquire()
+    state.in_flight += 1
+    state.max_in_flight = max(state.max_in_flight, state.in_flight)
+    try:
+        return await generate(request, state, body)
+    except (asyncio.CancelledError, ConnectionResetError):
+        state.aborted += 1
+        raise
+    finally:
+        state.in_flight -= 1
+        if semaphore is not None:
+            semaphore.release()
+
+
+async def _generate(request: web.Request, state: StubState, body: dict) -> web.StreamResponse:
+    config = state.config
+    messages = body.get("messages") or []
+
+    prompt_tokens = tokenize_messages(messages, config.image_tokens)
+    cached = state.prefix_cache.lookup_and_insert(prompt_tokens, config.block_size)
+    max_tokens = body.get("max_tokens") or body.get("max_completion_tokens") or config.output_tokens
+    tokens = _response_tokens(
+        config, min(config.output_tokens, int(max_tokens)), offset=state.requests, messages=messages
+    )
+
+    usage = {
+        "prompt_tokens": len(prompt_tokens),
+        "completion_tokens": len(tokens),
+        "total_tokens": len(prompt_tokens) + len(tokens),
+        "prompt_tokens_details": {"cached_tokens": cached},
+    }
+    state.prompt_tokens += len(prompt_tokens)
+    state.cached_tokens += cached
+    state.completion_tokens += len(tokens)
+
+    created = int(time.time())
+    completion_id = f"chatcmpl-stub-{uuid.uuid4().hex[:12]}"
+    token_interval = 1.0 / config.tokens_per_sec if config.tokens_per_sec > 0 else 0.0
+
+    await asyncio.sleep(state.sample_ttft())
+
+    if not body.get("stream"):
+        # Remaining tokens after the first one are decoded at tokens_per_sec
+        await asyncio.sleep(token_interval * max(len(tokens) - 1, 0))
+        state.completed += 1
+        return web.json_response(
+            {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": body["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "".join(tokens)},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
+            }
+        )
+
+    response = web.StreamResponse(
+        headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"}
+    )
+    await response.prepare(request)
+
+    def chunk(delta: dict, finish_reason: Optional[str] = None, **extra) -> bytes:
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": body["model"],
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        payload.update(extra)
+        return f"data: {json.dumps(payload)}\n\n".encode("utf-8")
+
+    await response.write(chunk({"role": "assistant", "content": ""}))
+    for i, token in enumerate(tokens):
+        if i > 0:
+            await asyncio.sleep(token_interval)
+        await response.write(chunk({"content": token}))
+    await response.write(chunk({}, finish_reason="stop"))
+
+    if (body.get("stream_options") or {}).get("include_usage"):
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": body["model"],
+            "choices": [],
+            "usage": usage,
+        }
+        await response.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+
+    await response.write(b"data: [DONE]\n\n")
+    await response.write_eof()
+    state.completed += 1
+    state.streamed += 1
+    return response
+
+
+def keep_alive_seconds(value) -> float:
+    """
+    Parse an Ollama keep_alive value (seconds or a duration like "10m"; negative = forever)
+
+    Args:
+        value: keep_alive from the request (None = Ollama's default of 5 minutes)
+
+    Returns:
+        Seconds to keep the model loaded (inf = forever)
+    """
+    if value is None:
+        return 300.0
+    if isinstance(value, str):
+        match = re.fullmatch(r"(-?\d+(?:\.\d+)?)(ms|s|m|h)?", value.strip())
+        if not match:
+            raise ValueError(f"Invalid keep_alive '{value}'")
+        scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, None: 1}[match.group(2)]
+        value = float(match.group(1)) * scale
+    return math.inf if value < 0 else float(value)
+
+
+async def _generate_ollama(
+    request: web.Request, state: StubState, body: dict
+) -> web.StreamResponse:
+    config = state.config
+    try:
+        keep_alive = keep_alive_seconds(body.get("keep_alive"))
+    except ValueError as e:
+        return _error(400, str(e))
+
+    # Convert to OpenAI-style content parts for token accounting
+    messages = []
+    for message in body.get("messages") or []:
+        parts = [{"type": "text", "text": message.get("content") or ""}]
+        parts.extend(
+            {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{image}"}}
+            for image in message.get("images") or []
+        )
+        messages.append({"role": message.get("role", "user"), "content": parts})
+    prompt_tokens = tokenize_messages(messages, config.image_tokens)
+    max_tokens = (body.get("options") or {}).get("num_predict") or config.output_tokens
+    tokens = _response_tokens(
+        config, min(config.output_tokens, int(max_tokens)), offset=state.requests, messages=messages
+    )
+    state.prompt_tokens += len(prompt_tokens)
+    state.completion_tokens += len(tokens)
+
+    start = time.monotonic()
+    if start >= state.loaded_until:
+        state.model_loads += 1
+        await asyncio.sleep(config.load_ms / 1000)
+    load_end = time.monotonic()
+    await asyncio.sleep(state.sample_ttft())
+    prompt_end = time.monotonic()
+    token_interval = 1.0 / config.tokens_per_sec if config.tokens_per_sec > 0 else 0.0
+
+    def ns(seconds: float) -> int:
+        return int(seconds * 1e9)
+
+    def final(content: str) -> dict:
+        end = time.monotonic()
+        state.loaded_until = end + keep_alive
+        state.completed += 1
+        return {
+            "model": body["model"],
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "message": {"role": "assistant", "content": content},
+            "done": True,
+            "done_reason": "stop",
+            "total_duration": ns(end - start),
+            "load_duration": ns(load_end - start),
+            "prompt_eval_count": len(prompt_tokens),
+            "prompt_eval_duration": ns(prompt_end - load_end),
+            "eval_count": len(tokens),
+            "eval_duration": ns(end - prompt_end),
+        }
+
+    if body.get("stream") is False:
+        await asyncio.sleep(token_interval * max(len(tokens) - 1, 0))
+        return web.json_response(final("".join(tokens)))
+
+    # Ollama streams newline-delimited JSON by default
+    response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+    await response.prepare(request)
+    for i, token in enumerate(tokens):
+        if i > 0:
+            await asyncio.sleep(token_interval)
+        chunk = {"model": body["model"], "message": {"role": "assistant", "content": token}}
+        await response.write(json.dumps({**chunk, "done": False}).encode("utf-8") + b"\n")
+    await response.write(json.dumps(final("")).encode("utf-8") + b"\n")
+    await response.write_eof()
+    state.streamed += 1
+    return response
+
+
+async def stats_handler(request: web.Request) -> web.Response:
+    """GET /stub/stats - request counters"""
+    return web.json_response(request.app[STUB_STATE].get_stats())
+
+
+async def config_handler(request: web.Request) -> web.Response:
+    """GET/POST /stub/config - inspect or change the stub behavior at runtime"""
+    state = request.app[STUB_STATE]
+    if request.method == "POST":
+        try:
+            state.config.update(await request.json())
+        except (ValueError, json.JSONDecodeError) as e:
+            return _error(400, str(e))
+    return web.json_response(state.config.to_dict())
+
+
+async def reset_handler(request: web.Request) -> web.Response:
+    """POST /stub/reset - reset counters and the prefix cache"""
+    request.app[STUB_STATE].reset()
+    return web.json_response({"status": "reset"})
+
+
+def create_stub_app(config: Optional[StubConfig] = None) -> web.Application:
+    """
+    Create the stub backend application
+
+    Args:
+        config: Stub behavior (default: StubConfig())
+
+    Returns:
+        aiohttp application; its StubState is available as app[STUB_STATE]
+    """
+    # Cancel handlers when clients disconnect so aborted requests are counted
+    app = web.Application(handler_args={"handler_cancellation": True})
+    app[STUB_STATE] = StubState(config or StubConfig())
+    app.router.add_get("/v1/models", models_handler)
+    app.router.add_post("/v1/chat/completions", chat_completions_handler)
+    app.router.add_post("/api/chat", ollama_chat_handler)
+    app.router.add_get("/api/tags", ollama_tags_handler)
+    app.router.add_get("/stub/stats", stats_handler)
+    app.router.add_get("/stub/config", config_handler)
+    app.router.add_post("/stub/config", config_handler)
+    app.router.add_post("/stub/reset", reset_handler)
+    return app
+
+
+def main():
+    """Console entry point: live-vlm-stub-server"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="OpenAI-compatible VLM stub server for load testing live-vlm-webui",
+        epilog="Example:\n"
+        "  live-vlm-stub-server --port 8000 --ttft-ms 200 --ttft-jitter-ms 80 "
+        "--latency-distribution lognormal --tokens-per-sec 40 --max-concurrency 4",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind to (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind to (default: 8000)")
+    parser.add_argument(
+        "--model",
+        action="append",
+        dest="models",
+        metavar="NAME",
+        help="Model ID to serve (repeatable, default: stub-vlm)",
+    )
+    parser.add_argument("--ttft-ms", type=float, default=100.0, help="Mean time to first token")
+    parser.add_argument(
+        "--ttft-jitter-ms", type=float, default=0.0, help="TTFT spread (std dev or half-width)"
+    )
+    parser.add_argument(
+        "--latency-distribution",
+        choices=LATENCY_DISTRIBUTIONS,
+        default="fixed",
+        help="TTFT distribution (default: fixed)",
+    )
+    parser.add_argument(
+        "--tokens-per-sec", type=float, default=50.0, help="Decode speed (0 = instant)"
+    )
+    parser.add_argument(
+        "--output-tokens", type=int, default=24, help="Tokens per response (default: 24)"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of requests failing with 500"
+    )
+    parser.add_argument(
+        "--rate-limit-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests rejected with 429",
+    )
+    parser.add_argument(
+        "--retry-after", type=float, default=1.0, help="Retry-After seconds for injected 429s"
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=0,
+        help="Maximum concurrent requests (default: 0 = unlimited)",
+    )
+    parser.add_argument(
+        "--overload",
+        choices=("queue", "reject"),
+        default="queue",
+        help="Above max concurrency: queue requests or reject with 429 (default: queue)",
+    )
+    parser.add_argument(
+        "--load-ms",
+        type=float,
+        default=0.0,
+        help="Model load time for Ollama /api/chat requests after keep_alive expired",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    config = StubConfig(
+        models=args.models,
+        ttft_ms=args.ttft_ms,
+        ttft_jitter_ms=args.ttft_jitter_ms,
+        latency_distribution=args.latency_distribution,
+        tokens_per_sec=args.tokens_per_sec,
+        output_tokens=args.output_tokens,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        max_concurrency=args.max_concurrency,
+        overload=args.overload,
+        load_ms=args.load_ms,
+        seed=args.seed,
+    )
+    logger.info(f"Stub VLM backend at http://{args.host}:{args.port}/v1 serving {config.models}")
+    web.run_app(create_stub_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -26,8 +26,13 @@ from aiortc import VideoStreamTrack
 from typing import Optional
 import logging
 import time
+import uuid
 import av
 
+from .capture_constraints import sample_interval
+from .frame_quality import REJECT_REASONS, FrameQualityGate
+from .motion_crop import MotionCropper, analysis_frame, thumbnail
+from .regions import crop_regions
 from .vlm_service import VLMService
 
 # Enable swscaler warnings to track hardware acceleration status
@@ -47,18 +52,59 @@ class VideoProcessorTrack(VideoStreamTrack):
     process_every_n_frames = 30
     # Max allowed latency before dropping frames (in seconds, 0 = disabled)
     max_frame_latency = 0.0
-
-    def __init__(self, track: VideoStreamTrack, vlm_service: VLMService, text_callback=None):
+    # Prompts answered for every sampled frame; empty = the service's single prompt
+    default_prompt_set = []
+    # Regions of interest analyzed instead of the whole frame; empty = whole frame
+    default_rois = []
+    # Quality checks of sampled frames (only damaged frames are rejected by default)
+    quality_gate = FrameQualityGate()
+    # MotionCropper settings to send only the moving region of a frame (None = full frames)
+    motion_crop: Optional[dict] = None
+    # Width of a full-frame thumbnail sent along with a crop (0 = crop only)
+    crop_thumbnail_width = 0
+
+    def __init__(
+        self,
+        track: VideoStreamTrack,
+        vlm_service: VLMService,
+        text_callback=None,
+        session_id: Optional[str] = None,
+        prompt_set_callback=None,
+        roi_callback=None,
+    ):
         super().__init__()
         self.track = track
         self.vlm_service = vlm_service
         self.text_callback = text_callback  # Callback to send text updates
+        self.session_id = session_id or uuid.uuid4().hex[:8]  # Label for per-session metrics
+        self.prompt_set: Optional[list] = None  # Per-session override of default_prompt_set
+        self.prompt_set_callback = prompt_set_callback  # Called with (session_id, results)
+        self.rois: Optional[list] = None  # Per-session override of default_rois
+        self.roi_callback = roi_callback  # Called with (session_id, per-zone results)
+        # Capture frame rate reported by the browser; None = process_every counts frames
+        self.source_fps: Optional[float] = None
         self.last_frame: Optional[np.ndarray] = None
         self.frame_count = 0
         self.dropped_frames = 0
+        self.converted_frames = 0  # Frames converted to numpy (first frame + sampled frames)
+        self.submitted_frames = 0  # Frames handed to the VLM service
+        self.rejected_frames = {reason: 0 for reason in REJECT_REASONS}  # By the quality gate
+        self.skipped_samples = 0  # Samples given up because no frame passed the gate in time
+        self.last_quality: Optional[dict] = None  # Metrics of the last checked frame
+        self._retry_frames = 0  # Frames left to find a replacement for a rejected sample
+        settings = self.__class__.motion_crop
+        self.motion_cropper = MotionCropper(**settings) if settings is not None else None
+        self.cropped_frames = 0  # Submitted frames cropped to their moving region
+        self.crop_share_total = 0.0  # Sum of the cropped share of the frame area
+        self.last_crop: Optional[tuple] = None  # (x0, y0, x1, y1) of the last crop
+        self.region_crops = 0  # Region-of-interest crops sent to the VLM
         self.first_frame_pts = None  # Track first frame PTS to calculate relative time
         self.first_frame_time = None  # Wall clock time of first frame
         self.frame_time_base = None  # Time base for PTS conversion (e.g., 1/90000)
+        # Connection setup (WebRTC sessions): time.monotonic() when the offer arrived
+        self.offer_time: Optional[float] = None
+        self.offer_to_answer: Optional[float] = None  # Seconds until the answer was sent
+        self.offer_to_first_frame: Optional[float] = None  # Seconds until the first frame
 
     async def recv(self):
         """
@@ -68,6 +114,13 @@ class VideoProcessorTrack(VideoStreamTrack):
             # Get frame from incoming track
             frame = await self.track.recv()
 
+            if self.offer_to_first_frame is None and self.offer_time is not None:
+                self.offer_to_first_frame = time.monotonic() - self.offer_time
+                logger.info(
+                    f"Session {self.session_id}: first frame "
+                    f"{1000 * self.offer_to_first_frame:.0f} ms after the offer"
+                )
+
             # Initialize timing on first frame
             if self.first_frame_pts is None and frame.pts is not None:
                 self.first_frame_pts = frame.pts
@@ -136,14 +189,29 @@ class VideoProcessorTrack(VideoStreamTrack):
 
             # Only convert to numpy when needed (for VLM processing or first frame)
             # This avoids expensive CPU color conversion on every frame
-            interval = self.__class__.process_every_n_frames
-            need_conversion = (self.frame_count % interval == 0) or (self.frame_count == 1)
+            interval = self.get_sample_interval()
+            gate = self.__class__.quality_gate
+            # A rejected sample is replaced by the next frame that passes the gate
+            sample = self.frame_count % interval == 0 or self._retry_frames > 0
+            if sample and gate is not None:
+                reason = gate.check_frame(frame)
+                if reason:
+                    self._reject(reason, gate)
+                    sample = False
+            need_conversion = sample or (self.frame_count == 1)
+
+            # Small grayscale copy for the motion crop's background model
+            cropper = self.motion_cropper
+            gray = None
+            if cropper is not None and (sample or self.frame_count % cropper.update_every == 0):
+                gray = analysis_frame(frame)
 
             if need_conversion:
                 t1 = time.time()
                 # Convert to numpy array (expensive: YUV→BGR color conversion on CPU)
                 img = frame.to_ndarray(format="bgr24")
                 t2 = time.time()
+                self.converted_frames += 1
                 self.last_frame = img.copy()
                 t3 = time.time()
 
@@ -157,19 +225,65 @@ class VideoProcessorTrack(VideoStreamTrack):
                 if self.frame_count == 1:
                     logger.info(f"First frame received: {img.shape}")
 
+                if sample and gate is not None:
+                    reason, quality = gate.check(img)
+                    if quality is not None:
+                        self.last_quality = quality
+                    if reason:
+                        self._reject(reason, gate)
+                        sample = False
+                    else:
+                        self._retry_frames = 0
+
                 # Send frame to VLM for analysis (async, non-blocking)
-                if self.frame_count % interval == 0:
-                    # Convert to PIL Image for VLM
-                    pil_img = Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+                rois = self.get_rois() if sample else None
+                if rois:
+                    frame_time = time.monotonic() - max(frame_latency, 0.0)
+                    regions = [
+                        {
+                            "name": roi["name"],
+                            "image": self._to_vlm_image(crop),
+                            "prompt": roi["prompt"],
+                        }
+                        for roi, crop in zip(rois, crop_regions(img, rois))
+                    ]
+                    asyncio.create_task(self._process_regions(regions, frame_time))
+                    self.submitted_frames += 1
+                    self.region_crops += len(regions)
+                    logger.info(
+                        f"Frame {self.frame_count}: Sending {len(regions)} regions to VLM "
+                        f"(interval={interval})"
+                    )
+                elif sample:
+                    vlm_img, pil_thumb = img, None
+                    if gray is not None:
+                        vlm_img, pil_thumb = self._crop_to_motion(img, gray)
+                    pil_img = self._to_vlm_image(vlm_img)
                     # Fire and forget - don't wait for result
-                    asyncio.create_task(self.vlm_service.process_frame(pil_img))
+                    # Capture time lets the service drop the request once the frame is stale
+                    frame_time = time.monotonic() - max(frame_latency, 0.0)
+                    prompt_set = self.get_prompt_set()
+                    if prompt_set:
+                        asyncio.create_task(
+                            self._process_prompt_set(pil_img, prompt_set, frame_time, pil_thumb)
+                        )
+                    else:
+                        asyncio.create_task(
+                            self.vlm_service.process_frame(
+                                pil_img, frame_time=frame_time, thumbnail=pil_thumb
+                            )
+                        )
+                    self.submitted_frames += 1
                     logger.info(f"Frame {self.frame_count}: Sending to VLM (interval={interval})")
 
+            if gray is not None:
+                cropper.update(gray)
+
             # Get current response (may be old if VLM is still processing)
             response, is_processing = self.vlm_service.get_current_response()
 
-            # Get metrics
-            metrics = self.vlm_service.get_metrics()
+            # Per-frame counters (percentiles and backend stats go out as vlm_metrics)
+            metrics = self.vlm_service.get_counters()
 
             # Send text update via callback (for WebSocket)
             if self.text_callback:
@@ -183,6 +297,116 @@ class VideoProcessorTrack(VideoStreamTrack):
             logger.error(f"Error processing frame: {e}", exc_info=True)
             raise
 
+    def get_sample_interval(self) -> int:
+        """Frames between samples (scaled to a negotiated capture frame rate)"""
+        if self.source_fps:
+            return sample_interval(self.__class__.process_every_n_frames, self.source_fps)
+        return self.__class__.process_every_n_frames
+
+    def _reject(self, reason: str, gate: FrameQualityGate) -> None:
+        """Count a sampled frame rejected by the quality gate and keep looking"""
+        self.rejected_frames[reason] += 1
+        if self._retry_frames > 0:
+            self._retry_frames -= 1
+            if self._retry_frames == 0:
+                self.skipped_samples += 1
+                logger.info(f"Frame {self.frame_count}: No frame passed the quality gate, skipping")
+        else:
+            # First rejection of this sample: check the following frames
+            self._retry_frames = gate.max_retry_frames
+            if self._retry_frames == 0:
+                self.skipped_samples += 1
+            logger.debug(f"Frame {self.frame_count}: Rejected as {reason}, waiting for next frame")
+
+    def _to_vlm_image(self, img: np.ndarray) -> Image.Image:
+        """Resize a BGR frame (or crop) for the model and convert it to an RGB PIL Image"""
+        # Resize to the model's native geometry first, so color conversion
+        # and JPEG encoding only touch the pixels the model will see
+        vlm_img = self.vlm_service.image_profile.prepare(img)
+        return Image.fromarray(cv2.cvtColor(vlm_img, cv2.COLOR_BGR2RGB))
+
+    def _crop_to_motion(self, img: np.ndarray, gray: np.ndarray):
+        """
+        Crop a sampled frame to its moving region
+
+        Returns:
+            (BGR image to send, PIL thumbnail of the full frame or None)
+        """
+        height, width = img.shape[:2]
+        box = self.motion_cropper.crop_box(gray, width, height)
+        if box is None:
+            return img, None
+        x0, y0, x1, y1 = box
+        self.cropped_frames += 1
+        self.crop_share_total += (x1 - x0) * (y1 - y0) / (width * height)
+        self.last_crop = box
+        thumb_width = self.__class__.crop_thumbnail_width
+        pil_thumb = None
+        if thumb_width > 0:
+            thumb = thumbnail(img, thumb_width)
+            pil_thumb = Image.fromarray(cv2.cvtColor(thumb, cv2.COLOR_BGR2RGB))
+        return img[y0:y1, x0:x1], pil_thumb
+
+    def get_rois(self) -> list:
+        """Regions of interest of this session (falls back to the class default)"""
+        if self.rois is not None:
+            return self.rois
+        return self.__class__.default_rois
+
+    async def _process_regions(self, regions: list, frame_time: float):
+        """Analyze the regions of interest of a frame and report the per-zone results"""
+        results = await self.vlm_service.process_regions(regions, frame_time=frame_time)
+        if results is not None and self.roi_callback:
+            self.roi_callback(self.session_id, results)
+
+    def get_prompt_set(self) -> list:
+        """Prompt set of this session (falls back to the class default)"""
+        if self.prompt_set is not None:
+            return self.prompt_set
+        return self.__class__.default_prompt_set
+
+    async def _process_prompt_set(
+        self,
+        image: Image.Image,
+        prompts: list,
+        frame_time: float,
+        thumbnail: Optional[Image.Image] = None,
+    ):
+        """Run a prompt set on a frame and report the per-prompt results"""
+        results = await self.vlm_service.process_prompt_set(
+            image, prompts, frame_time=frame_time, thumbnail=thumbnail
+        )
+        if results is not None and self.prompt_set_callback:
+            self.prompt_set_callback(self.session_id, results)
+
+    def get_stats(self) -> dict:
+        """
+        Get per-session frame counters
+
+        Returns:
+            Dictionary with frame statistics
+        """
+        return {
+            "session_id": self.session_id,
+            "frames_received": self.frame_count,
+            "frames_dropped": self.dropped_frames,
+            "frames_converted": self.converted_frames,
+            "frames_submitted": self.submitted_frames,
+            "frames_rejected": dict(self.rejected_frames),
+            "samples_skipped": self.skipped_samples,
+            "last_quality": self.last_quality,
+            "frames_cropped": self.cropped_frames,
+            "mean_crop_share": (
+                self.crop_share_total / self.cropped_frames if self.cropped_frames else None
+            ),
+            "last_crop": self.last_crop,
+            "region_crops": self.region_crops,
+            "source_fps": self.source_fps,
+            "offer_to_answer_ms": _ms(self.offer_to_answer),
+            "offer_to_first_frame_ms": _ms(self.offer_to_first_frame),
+            "active": self.readyState == "live",
+        }
+
     def _add_text_overlay(self, img: np.ndarray, text: str, status: str = "") -> np.ndarray:
         """
         Add text overlay to image
@@ -257,3 +481,7 @@ class VideoProcessorTrack(VideoStreamTrack):
             y_position += line_height
 
         return img_copy
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(1000 * seconds, 1)
@@ -23,13 +23,132 @@ import asyncio
 import base64
 import io
 import time
-from openai import AsyncOpenAI
+from urllib.parse import urlparse
 from PIL import Image
-from typing import Optional
+from typing import Awaitable, Iterable, List, Optional, Sequence, Tuple, Union
 import logging
 
+import httpx
+import openai
+
+from .backend_pool import Backend, BackendPool
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .fast_client import IMAGE_PLACEHOLDER, EncodedImages
+from .image_profiles import ImageProfile, resolve_profile
+from .metrics import LatencyMetrics
+from .ollama_client import OLLAMA_DEFAULT_PORT, normalize_keep_alive
+from .rate_limiter import get_limiter, retry_after_of
+from .warmup import ModelWarmer
+
 logger = logging.getLogger(__name__)
 
+# Prompt layouts:
+#   inline       - history is embedded in the prompt text, before the image
+#   prefix_cache - stable instructions first, image, then the volatile history last,
+#                  so backends with automatic prefix caching (vLLM, SGLang) can reuse
+#                  the KV cache of the instruction prefix across frames
+PROMPT_LAYOUTS = ("inline", "prefix_cache")
+
+# Request APIs:
+#   openai - OpenAI-compatible /v1/chat/completions (SDK or fast path)
+#   ollama - Ollama's native /api/chat with keep_alive and server-side timings
+#   auto   - ollama for backends on Ollama's default port, openai otherwise
+API_FLAVORS = ("openai", "ollama", "auto")
+
+# Fixed instruction appended to the base prompt in prefix_cache layout
+PREFIX_CONTEXT_INSTRUCTIONS = (
+    "Descriptions of previous frames may follow the image under [Previous Frame Context]. "
+    "Use them to describe any changes or continuation of actions in the current frame."
+)
+
+
+# Upper bound on prompts answered per frame in a prompt set
+MAX_PROMPT_SET_SIZE = 8
+
+# Vision tokens assumed for rate limiting when the image profile gives no estimate
+UNKNOWN_IMAGE_TOKENS = 1000
+
+# Seconds a replaced backend pool waits for its requests when request_timeout is 0
+POOL_RETIRE_GRACE = 30.0
+
+
+def normalize_prompt_set(items) -> List[dict]:
+    """
+    Validate a prompt set
+
+    Args:
+        items: List of prompt strings or {"name": str, "prompt": str} dicts
+
+    Returns:
+        List of {"name", "prompt"} dicts; empty prompts are dropped and missing names
+        default to "prompt<N>"
+
+    Raises:
+        ValueError: If the set is malformed, too large or has duplicate names
+    """
+    if not isinstance(items, list):
+        raise ValueError("Prompt set must be a list")
+
+    prompts = []
+    for i, item in enumerate(items, start=1):
+        if isinstance(item, str):
+            item = {"prompt": item}
+        if not isinstance(item, dict):
+            raise ValueError(f"Invalid prompt set entry: {item!r}")
+        prompt = str(item.get("prompt") or "").strip()
+        if not prompt:
+            continue
+        name = str(item.get("name") or f"prompt{i}").strip()
+        prompts.append({"name": name, "prompt": prompt})
+
+    if len(prompts) > MAX_PROMPT_SET_SIZE:
+        raise ValueError(f"At most {MAX_PROMPT_SET_SIZE} prompts per set")
+    names = [p["name"] for p in prompts]
+    if len(set(names)) != len(names):
+        raise ValueError("Prompt names must be unique")
+    return prompts
+
+
+async def _gather_answers(requests: Iterable[Awaitable[dict]]) -> List[dict]:
+    """
+    Run per-prompt/per-region requests concurrently
+
+    Every request finishes (a half-open probe among them still reports its outcome)
+    before a circuit breaker refusal is re-raised, skipping the whole frame.
+    """
+    results = await asyncio.gather(*requests, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return list(results)
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Check whether a request error is worth retrying
+
+    Args:
+        error: Exception raised by a backend request
+
+    Returns:
+        True for timeouts, connection errors, 408/409/429 and 5xx responses
+    """
+    if isinstance(error, (TimeoutError, openai.APIConnectionError, httpx.TransportError)):
+        return True
+    status = error_status(error)
+    if status is None:
+        return False
+    return status in (408, 409, 429) or status >= 500
+
+
+def error_status(error: Exception) -> Optional[int]:
+    """HTTP status code of a failed request, None for non-HTTP errors"""
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code
+    return None
+
 
 class VLMService:
     """Service for analyzing images using VLM via OpenAI-compatible API"""
@@ -43,6 +162,29 @@ class VLMService:
         max_tokens: int = 512,
         enable_context: bool = True,
         max_history: int = 4,
+        backends: Optional[List[str]] = None,
+        routing: str = "least_outstanding",
+        max_concurrent_requests: Optional[int] = None,
+        fast_path: bool = False,
+        prompt_layout: str = "inline",
+        max_staleness: float = 0.0,
+        metrics_window: float = 60.0,
+        image_profile: str = "auto",
+        request_timeout: float = 30.0,
+        max_retries: int = 1,
+        retry_backoff: float = 0.5,
+        circuit_threshold: int = 3,
+        circuit_backoff: float = 2.0,
+        circuit_max_backoff: float = 60.0,
+        rate_limit_rpm: Optional[float] = None,
+        rate_limit_tpm: Optional[float] = None,
+        hedge_percentile: float = 0.0,
+        hedge_min_samples: int = 20,
+        api_flavor: str = "openai",
+        ollama_keep_alive: Optional[str] = None,
+        warmup: bool = True,
+        warmup_timeout: float = 120.0,
+        keep_warm_interval: float = 0.0,
     ):
         """
         Initialize VLM service
@@ -55,58 +197,243 @@ class VLMService:
             max_tokens: Maximum tokens to generate
             enable_context: Enable contextual analysis with frame history (default: True)
             max_history: Maximum number of previous responses to keep (default: 4)
+            backends: Additional API base URLs of equivalent replicas serving the same model
+            routing: Backend routing strategy ("least_outstanding" or "latency_weighted")
+            max_concurrent_requests: Maximum requests in flight across all backends
+                (default: one per backend)
+            fast_path: Send requests over the raw HTTP fast path instead of the OpenAI SDK
+            prompt_layout: Message layout for contextual prompts ("inline" or "prefix_cache")
+            max_staleness: Cancel requests whose frame is older than this many seconds
+                (default: 0 = disabled)
+            metrics_window: Sliding window of the latency percentiles in seconds
+            image_profile: Image preprocessing profile ("auto" picks one from the model
+                name, "none" sends frames at camera resolution, or a preset name)
+            request_timeout: Timeout of a single backend request in seconds (0 = none)
+            max_retries: Retries of a request that failed with a transient error (timeout,
+                connection error, 429, 5xx); only without replicas, which fail over instead
+            retry_backoff: Delay before the first retry in seconds, doubled per retry
+            circuit_threshold: Consecutive failed requests that open the circuit breaker
+                (0 = disabled)
+            circuit_backoff: Seconds the circuit stays open after the first trip
+            circuit_max_backoff: Upper bound of the open time in seconds
+            rate_limit_rpm: Client-side requests/min quota, shared by all services using
+                the same API base and key (default: unlimited)
+            rate_limit_tpm: Client-side tokens/min quota (prompt + image + max_tokens
+                reserved up front, corrected by the reported usage)
+            hedge_percentile: Duplicate a request on another backend once it runs longer
+                than this percentile of recent backend latency (0 = disabled)
+            hedge_min_samples: Backend latency samples needed before hedging starts
+            api_flavor: Request API ("openai", "ollama" or "auto" = ollama for backends on
+                port 11434)
+            ollama_keep_alive: How long Ollama keeps the model loaded after a request
+                (seconds or a duration like "30m", negative = forever; default: server's)
+            warmup: Send a synthetic frame to every backend when the warmer is started
+                and after a model change; frames are skipped until it finished
+            warmup_timeout: Timeout of a warm-up request in seconds
+            keep_warm_interval: Ping a backend after it was idle this many seconds
+                (0 = disabled)
         """
+        if prompt_layout not in PROMPT_LAYOUTS:
+            raise ValueError(
+                f"Unknown prompt layout '{prompt_layout}' (expected one of {PROMPT_LAYOUTS})"
+            )
+        if api_flavor not in API_FLAVORS:
+            raise ValueError(f"Unknown API flavor '{api_flavor}' (expected one of {API_FLAVORS})")
+        resolve_profile(image_profile, model)  # Validate the setting early
+
         self.model = model
         self.api_base = api_base
         self.api_key = api_key if api_key else "EMPTY"
         self.prompt = prompt
         self.max_tokens = max_tokens
-        self.client = AsyncOpenAI(base_url=api_base, api_key=api_key)
+        self.routing = routing
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.rate_limit_rpm = rate_limit_rpm
+        self.rate_limit_tpm = rate_limit_tpm
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.api_flavor = api_flavor
+        self.ollama_keep_alive = normalize_keep_alive(ollama_keep_alive)
+        self.backend_pool = self._create_pool([api_base] + list(backends or []))
+        self._closing_pools = set()  # Tasks closing pools replaced by update_api_settings
+        # None = one request in flight per backend (follows pool size changes)
+        self._concurrency_per_backend = max_concurrent_requests is None
+        self.max_concurrent_requests = max_concurrent_requests or len(self.backend_pool)
+        self.fast_path = fast_path
         self.current_response = "Initializing..."
         self.is_processing = False
-        self._processing_lock = asyncio.Lock()
+        self._in_flight = 0  # Requests currently being processed
+        self._jpeg_buffer = io.BytesIO()  # Reused across frames for JPEG encoding
+        self.image_profile_setting = image_profile
+        self._image_profile_cache = (None, None)  # ((setting, model), ImageProfile)
+
+        # Request deadlines and cancellation of superseded frames
+        self.max_staleness = max_staleness
+        self._frame_seq = 0  # Sequence number of the last submitted frame
+        self._latest_response_seq = 0  # Sequence number of the frame in current_response
+        self._pending_requests = {}  # {seq: asyncio.Task} of in-flight requests
+        self._superseded_requests = set()  # seqs cancelled because a newer answer arrived
 
         # Context tracking for video understanding
         self.enable_context = enable_context
         self.max_history = max_history
         self.response_history = []  # Store previous frame analyses
         self._history_lock = asyncio.Lock()  # Protect history access
+        self.prompt_layout = prompt_layout
+        self._history_version = 0  # Bumped on every history change
+        self._context_cache = (None, "")  # (history version, rendered context lines)
+        self._prompt_cache = (None, None)  # (cache key, rendered prompt parts)
 
         # Metrics tracking
         self.last_inference_time = 0.0  # seconds
         self.total_inferences = 0
         self.total_inference_time = 0.0
+        self.last_encode_time = 0.0  # JPEG + base64 encoding
+        self.last_serialize_time = 0.0  # Building the request body
+        self.last_network_time = 0.0  # Send to parsed response
+        self.cancelled_requests = 0  # Aborted because a newer frame was answered first
+        self.expired_requests = 0  # Aborted because the frame exceeded max_staleness
+        self.discarded_responses = 0  # Finished after a newer frame's answer, not shown
+        self.busy_skips = 0  # Frames skipped because max_concurrent_requests were in flight
+        self.failed_inferences = 0  # Requests that ended in an error on every backend
+        self.retries = 0  # Requests retried after a transient failure
+        self.circuit_skips = 0  # Frames skipped because the circuit breaker was open
+        self.warmup_skips = 0  # Frames skipped while the model was warming up
+        self.calibrating = False  # Set while a capacity calibration ramp runs
+        self.calibration_skips = 0  # Frames skipped while calibrating
+        self.total_requests = 0  # Completion requests, without retries and hedges
+        self.hedged_requests = 0  # Requests duplicated on a second backend
+        self.hedge_wins = 0  # Hedged requests answered first by the duplicate
+        self.hedge_time_saved = 0.0  # Estimated seconds saved by winning hedges
+        self.last_hedge_delay: Optional[float] = None  # seconds
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=circuit_threshold,
+            backoff=circuit_backoff,
+            max_backoff=circuit_max_backoff,
+        )
+        self.warmer = ModelWarmer(
+            self, enabled=warmup, keep_warm_interval=keep_warm_interval, timeout=warmup_timeout
+        )
+        self.last_image_size = (0, 0)  # Size of the last encoded image
+        self.last_thumbnail_size: Optional[tuple] = None  # Size of its thumbnail, if any
+        self.last_upload_bytes = 0  # Base64 image bytes of the last encoded image
+        self.last_vision_tokens: Optional[int] = None  # Estimate, None if unknown
+        self.total_vision_tokens = 0  # Estimated vision tokens over all requests
+        self.total_upload_bytes = 0  # Base64 image bytes over all requests
+        self.last_server_timings: Optional[dict] = None  # Ollama breakdown of the last request
+        self.server_time_totals = {"load": 0.0, "prompt_eval": 0.0, "eval": 0.0, "overhead": 0.0}
+        # e2e: frame capture to answer, queue_wait: frame capture to request start,
+        # rate_limit: wait for the client-side quota, backend: successful backend round trip,
+        # server: model time reported by the backend (Ollama native API only)
+        self.latency_metrics = LatencyMetrics(
+            ("e2e", "queue_wait", "encode", "rate_limit", "backend", "server"),
+            window=metrics_window,
+        )
 
         if self.enable_context:
             logger.info(
                 f"Context-aware mode enabled: keeping {self.max_history} frame history"
             )
+        if len(self.backend_pool) > 1:
+            logger.info(
+                f"Backend pool: {len(self.backend_pool)} backends, routing={routing}, "
+                f"max in flight={self.max_concurrent_requests}"
+            )
 
-    async def _build_contextual_prompt(self, base_prompt: str) -> str:
+    def _create_pool(
+        self, api_bases: List[str], template: Optional[BackendPool] = None
+    ) -> BackendPool:
         """
-        Build a context-aware prompt by including previous frame analyses.
-
-        This helps small VLMs understand temporal relationships in video streams.
-        Thread-safe with async lock protection.
+        Create the backend pool for the given API base URLs
 
         Args:
-            base_prompt: The base prompt template
+            api_bases: API base URLs, the first one is the primary backend
+            template: Existing pool whose ejection/health-check settings are kept
 
         Returns:
-            Enhanced prompt with historical context if available
+            New BackendPool
         """
-        # If context is disabled or no history yet, return base prompt
-        if not self.enable_context or not self.response_history:
-            return base_prompt
+        # Retries and timeouts are handled by _create_completion, not the SDK
+        backends = [Backend(base, self.api_key, max_retries=0) for base in api_bases]
+        if self.rate_limit_rpm or self.rate_limit_tpm:
+            for backend in backends:
+                backend.limiter = get_limiter(
+                    backend.api_base, self.api_key, self.rate_limit_rpm, self.rate_limit_tpm
+                )
+        if template is None:
+            return BackendPool(backends, strategy=self.routing)
+        return BackendPool(
+            backends,
+            strategy=self.routing,
+            max_failures=template.max_failures,
+            ejection_time=template.ejection_time,
+            health_check_interval=template.health_check_interval,
+            health_check_timeout=template.health_check_timeout,
+        )
+
+    @property
+    def image_profile(self) -> ImageProfile:
+        """Image preprocessing profile for the current model (follows model changes)"""
+        key = (self.image_profile_setting, self.model)
+        if self._image_profile_cache[0] != key:
+            profile = resolve_profile(self.image_profile_setting, self.model)
+            logger.info(f"Image profile for {self.model}: {profile.name} ({profile.description})")
+            self._image_profile_cache = (key, profile)
+        return self._image_profile_cache[1]
+
+    def uses_ollama_api(self, backend: Backend) -> bool:
+        """Whether requests to a backend go to Ollama's native API"""
+        if self.api_flavor == "auto":
+            return urlparse(backend.api_base).port == OLLAMA_DEFAULT_PORT
+        return self.api_flavor == "ollama"
+
+    def _record_server_timings(self, timings: dict, usage: dict, network_time: float) -> None:
+        """Track the server-side breakdown of a native Ollama request"""
+        model_time = timings["prompt_eval"] + timings["eval"]
+        # Everything the server did not spend loading or running the model: transfer,
+        # HTTP handling, queueing in the server and image decoding
+        overhead = max(network_time - timings["load"] - model_time, 0.0)
+        eval_tokens = usage["completion_tokens"]
+        self.last_server_timings = {
+            "load_ms": timings["load"] * 1000,
+            "prompt_eval_ms": timings["prompt_eval"] * 1000,
+            "eval_ms": timings["eval"] * 1000,
+            "total_ms": timings["total"] * 1000,
+            "overhead_ms": overhead * 1000,
+            "prompt_tokens": usage["prompt_tokens"],
+            "eval_tokens": eval_tokens,
+            "tokens_per_s": eval_tokens / timings["eval"] if timings["eval"] > 0 else None,
+        }
+        self.server_time_totals["load"] += timings["load"]
+        self.server_time_totals["prompt_eval"] += timings["prompt_eval"]
+        self.server_time_totals["eval"] += timings["eval"]
+        self.server_time_totals["overhead"] += overhead
+        self.latency_metrics.record("server", model_time)
+
+    @property
+    def client(self):
+        """OpenAI client of the primary backend"""
+        return self.backend_pool.primary.client
+
+    async def _render_context_text(self) -> str:
+        """
+        Render the history lines, reusing the cached text until the history changes.
+
+        Returns:
+            Context lines (most recent first), or an empty string if there is no history
+        """
+        version, text = self._context_cache
+        if version == self._history_version:
+            return text
 
         # Build context section from history (thread-safe)
         async with self._history_lock:
+            version = self._history_version
             # Get recent history (reversed so most recent is first)
             recent_history = list(reversed(self.response_history[-self.max_history:]))
 
-        if not recent_history:
-            return base_prompt
-
         # Build context text
         context_lines = []
         for i, response in enumerate(recent_history, 1):
@@ -114,7 +441,30 @@ class VLMService:
             truncated = response[:150] + "..." if len(response) > 150 else response
             context_lines.append(f"  {i} frame(s) ago: {truncated}")
 
-        context_text = "\n".join(context_lines)
+        text = "\n".join(context_lines)
+        self._context_cache = (version, text)
+        return text
+
+    async def _build_contextual_prompt(self, base_prompt: str) -> str:
+        """
+        Build a context-aware prompt by including previous frame analyses.
+
+        This helps small VLMs understand temporal relationships in video streams.
+        Thread-safe with async lock protection.
+
+        Args:
+            base_prompt: The base prompt template
+
+        Returns:
+            Enhanced prompt with historical context if available
+        """
+        # If context is disabled or no history yet, return base prompt
+        if not self.enable_context or not self.response_history:
+            return base_prompt
+
+        context_text = await self._render_context_text()
+        if not context_text:
+            return base_prompt
 
         # Construct enhanced prompt
         contextual_prompt = f"""{base_prompt}
@@ -127,50 +477,108 @@ Based on the above context, analyze the current frame and describe any changes o
 
         return contextual_prompt
 
-    async def analyze_image(self, image: Image.Image, prompt: Optional[str] = None) -> str:
+    async def _build_prompt_parts(self, base_prompt: str) -> tuple[str, Optional[str]]:
+        """
+        Build the prompt text for the configured layout.
+
+        The rendered parts are cached and only rebuilt when the history, the base
+        prompt, the layout or the context mode changes.
+
+        Args:
+            base_prompt: The base prompt template
+
+        Returns:
+            Tuple of (prompt placed before the image, context placed after the image or None)
+        """
+        key = (self._history_version, base_prompt, self.prompt_layout, self.enable_context)
+        cached_key, parts = self._prompt_cache
+        if cached_key == key:
+            return parts
+
+        if self.prompt_layout == "prefix_cache":
+            if self.enable_context:
+                # Instructions stay identical across frames, only the trailing part changes
+                instructions = f"{base_prompt}\n\n{PREFIX_CONTEXT_INSTRUCTIONS}"
+                context_text = await self._render_context_text()
+                context = f"[Previous Frame Context]\n{context_text}" if context_text else None
+                parts = (instructions, context)
+            else:
+                parts = (base_prompt, None)
+        else:
+            parts = (await self._build_contextual_prompt(base_prompt), None)
+
+        self._prompt_cache = (key, parts)
+        return parts
+
+    async def analyze_image(
+        self,
+        image: Image.Image,
+        prompt: Optional[str] = None,
+        thumbnail: Optional[Image.Image] = None,
+    ) -> str:
         """
         Analyze an image using the VLM model
 
         Args:
             image: PIL Image to analyze
             prompt: Prompt for the VLM (uses default if None)
+            thumbnail: Optional overview of the full frame, sent as a second image
+                when image is a crop of it
 
         Returns:
             Generated response string
         """
-        if prompt is None:
-            prompt = self.prompt
-
-        # Build context-aware prompt if enabled
-        contextual_prompt = await self._build_contextual_prompt(prompt)
-
         try:
             start_time = time.perf_counter()
 
             # Convert PIL Image to base64
-            img_byte_arr = io.BytesIO()
-            image.save(img_byte_arr, format="JPEG")
-            img_byte_arr = img_byte_arr.getvalue()
-            img_base64 = base64.b64encode(img_byte_arr).decode("utf-8")
+            img_base64 = self._encode_frame(image, thumbnail)
+            self.last_encode_time = time.perf_counter() - start_time
+            self.latency_metrics.record("encode", self.last_encode_time)
+        except Exception as e:
+            self.failed_inferences += 1
+            logger.error(f"Error analyzing image: {e}")
+            return f"Error: {str(e)}"
 
-            # Create message with image
-            messages = [
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": contextual_prompt},
-                        {
-                            "type": "image_url",
-                            "image_url": {"url": f"data:image/jpeg;base64,{img_base64}"},
-                        },
-                    ],
-                }
-            ]
+        return await self._analyze_encoded(img_base64, prompt, start_time)
 
-            # Call API
-            response = await self.client.chat.completions.create(
-                model=self.model, messages=messages, max_tokens=self.max_tokens, temperature=0.7
-            )
+    async def _analyze_encoded(
+        self,
+        img_base64: EncodedImages,
+        prompt: Optional[str] = None,
+        start_time: Optional[float] = None,
+        use_context: bool = True,
+    ) -> str:
+        """
+        Run one prompt against an already encoded image
+
+        Args:
+            img_base64: Base64-encoded JPEG (or the frame and its thumbnail)
+            prompt: Prompt for the VLM (uses default if None)
+            start_time: perf_counter() the latency is measured from (default: now)
+            use_context: Include and extend the frame history (if context is enabled)
+
+        Returns:
+            Generated response string
+
+        Raises:
+            CircuitOpenError: If the circuit breaker refused the request (not an error
+                answer: the frame is skipped)
+        """
+        if prompt is None:
+            prompt = self.prompt
+        if start_time is None:
+            start_time = time.perf_counter()
+
+        try:
+            # Build context-aware prompt if enabled
+            if use_context:
+                contextual_prompt, context = await self._build_prompt_parts(prompt)
+            else:
+                contextual_prompt, context = prompt, None
+
+            # Call API, failing over to the next backend on error
+            result = await self._create_completion(contextual_prompt, img_base64, context)
 
             # Calculate latency
             end_time = time.perf_counter()
@@ -181,44 +589,823 @@ Based on the above context, analyze the current frame and describe any changes o
             self.total_inferences += 1
             self.total_inference_time += inference_time
 
-            result = response.choices[0].message.content.strip()
+            result = result.strip()
+            self.latency_metrics.mark_completed()
 
             # Save to history if context is enabled (thread-safe)
-            if self.enable_context and result and not result.startswith("Error"):
+            if use_context and self.enable_context and result and not result.startswith("Error"):
                 async with self._history_lock:
                     self.response_history.append(result)
                     # Keep only the most recent N responses to avoid memory growth
                     if len(self.response_history) > self.max_history * 2:
                         self.response_history = self.response_history[-self.max_history:]
+                    self._history_version += 1
 
             logger.info(f"VLM response: {result} (latency: {inference_time*1000:.0f}ms)")
             return result
 
+        except CircuitOpenError:
+            raise
         except Exception as e:
+            self.failed_inferences += 1
             logger.error(f"Error analyzing image: {e}")
             return f"Error: {str(e)}"
 
-    async def process_frame(self, image: Image.Image, prompt: Optional[str] = None) -> None:
+    async def analyze_prompt_set(
+        self, image: Image.Image, prompts: List[dict], thumbnail: Optional[Image.Image] = None
+    ) -> List[dict]:
+        """
+        Answer several prompts about one image, encoding it only once
+
+        The prompts are dispatched concurrently and share the same encoded bytes.
+        Only the first prompt uses and extends the frame history; the others are
+        answered on their own.
+
+        Args:
+            image: PIL Image to analyze
+            prompts: List of {"name": str, "prompt": str}
+            thumbnail: Optional overview of the full frame (see analyze_image)
+
+        Returns:
+            One {"name", "prompt", "text", "latency_ms", "error"} dict per prompt, in order
+
+        Raises:
+            CircuitOpenError: If the circuit breaker refused one of the prompts
+        """
+        encode_start = time.perf_counter()
+        try:
+            img_base64 = self._encode_frame(image, thumbnail, requests=len(prompts))
+        except Exception as e:
+            self.failed_inferences += 1
+            logger.error(f"Error encoding image for prompt set: {e}")
+            return [
+                {
+                    "name": item["name"],
+                    "prompt": item["prompt"],
+                    "text": f"Error: {str(e)}",
+                    "latency_ms": 0.0,
+                    "error": True,
+                }
+                for item in prompts
+            ]
+        self.last_encode_time = time.perf_counter() - encode_start
+        self.latency_metrics.record("encode", self.last_encode_time)
+
+        async def run(index: int, item: dict) -> dict:
+            start = time.perf_counter()
+            text = await self._analyze_encoded(
+                img_base64, item["prompt"], start, use_context=index == 0
+            )
+            return {
+                "name": item["name"],
+                "prompt": item["prompt"],
+                "text": text,
+                "latency_ms": (time.perf_counter() - start) * 1000,
+                "error": text.startswith("Error"),
+            }
+
+        return await _gather_answers(run(i, item) for i, item in enumerate(prompts))
+
+    async def analyze_regions(self, regions: List[dict]) -> List[dict]:
+        """
+        Answer a prompt about each region of interest of a frame, concurrently
+
+        Regions are answered without the frame history, which describes whole frames.
+
+        Args:
+            regions: List of {"name": str, "image": PIL Image, "prompt": str or None}
+                (None = the current prompt)
+
+        Returns:
+            One {"name", "prompt", "text", "latency_ms", "error"} dict per region, in order
+
+        Raises:
+            CircuitOpenError: If the circuit breaker refused one of the regions
+        """
+        encode_start = time.perf_counter()
+        try:
+            encoded = [self._encode_frame(region["image"]) for region in regions]
+        except Exception as e:
+            self.failed_inferences += 1
+            logger.error(f"Error encoding regions: {e}")
+            return [
+                {
+                    "name": region["name"],
+                    "prompt": region["prompt"] or self.prompt,
+                    "text": f"Error: {str(e)}",
+                    "latency_ms": 0.0,
+                    "error": True,
+                }
+                for region in regions
+            ]
+        self.last_encode_time = time.perf_counter() - encode_start
+        self.latency_metrics.record("encode", self.last_encode_time)
+
+        async def run(region: dict, img_base64: bytes) -> dict:
+            start = time.perf_counter()
+            prompt = region["prompt"] or self.prompt
+            text = await self._analyze_encoded(img_base64, prompt, start, use_context=False)
+            return {
+                "name": region["name"],
+                "prompt": prompt,
+                "text": text,
+                "latency_ms": (time.perf_counter() - start) * 1000,
+                "error": text.startswith("Error"),
+            }
+
+        return await _gather_answers(run(r, b) for r, b in zip(regions, encoded))
+
+    def _encode_image(self, image: Image.Image) -> bytes:
+        """
+        JPEG-encode an image into the reusable buffer and base64 it once
+
+        Args:
+            image: PIL Image to encode, or an already encoded frame with the JPEG
+                file in .jpeg (snapshot_session.Snapshot), which is sent as-is
+
+        Returns:
+            Base64-encoded JPEG as bytes
+        """
+        if not isinstance(image, Image.Image):
+            return base64.b64encode(image.jpeg)
+        buffer = self._jpeg_buffer
+        buffer.seek(0)
+        buffer.truncate()
+        image.save(buffer, format="JPEG")
+        # Encode straight from the buffer memory, without copying out the JPEG first
+        with buffer.getbuffer() as jpeg:
+            return base64.b64encode(jpeg)
+
+    def _encode_frame(
+        self, image: Image.Image, thumbnail: Optional[Image.Image] = None, requests: int = 1
+    ) -> EncodedImages:
+        """
+        Encode a frame (and its thumbnail) and record the image statistics
+
+        Args:
+            image: PIL Image to encode
+            thumbnail: Optional second image sent after the frame
+            requests: Requests the encoded image is sent with
+
+        Returns:
+            Base64-encoded JPEG, or [frame, thumbnail] if a thumbnail is given
+        """
+        img_base64 = self._encode_image(image)
+        self._record_image_stats(image, img_base64, requests=requests)
+        self.last_thumbnail_size = None
+        if thumbnail is None:
+            return img_base64
+        thumb_base64 = self._encode_image(thumbnail)
+        self.last_thumbnail_size = thumbnail.size
+        self.last_upload_bytes += len(thumb_base64)
+        self.total_upload_bytes += len(thumb_base64) * requests
+        thumb_tokens = self.image_profile.estimate_tokens(*thumbnail.size)
+        if self.last_vision_tokens and thumb_tokens:
+            self.last_vision_tokens += thumb_tokens
+            self.total_vision_tokens += thumb_tokens * requests
+        return [img_base64, thumb_base64]
+
+    def _estimate_request_tokens(self, prompt: str, context: Optional[str] = None) -> int:
+        """Rough token count of a request for the tokens/min quota"""
+        text_chars = len(prompt) + len(context or "")
+        image_tokens = self.last_vision_tokens or UNKNOWN_IMAGE_TOKENS
+        return text_chars // 4 + image_tokens + self.max_tokens
+
+    def _record_image_stats(self, image: Image.Image, img_base64: bytes, requests: int = 1):
+        """Track size, upload bytes and estimated vision tokens of an encoded image"""
+        self.last_image_size = image.size
+        self.last_upload_bytes = len(img_base64)
+        self.last_vision_tokens = self.image_profile.estimate_tokens(*image.size)
+        self.total_upload_bytes += len(img_base64) * requests
+        if self.last_vision_tokens:
+            self.total_vision_tokens += self.last_vision_tokens * requests
+
+    @staticmethod
+    def _build_messages(
+        prompt: str, image_url: Union[str, Sequence[str]], context: Optional[str] = None
+    ) -> list:
+        """
+        Build the chat messages for an image request
+
+        Args:
+            prompt: Text prompt placed before the image
+            image_url: Image URL (usually a base64 data URL), or several in order
+            context: Optional volatile text placed after the image
+
+        Returns:
+            OpenAI chat messages
+        """
+        urls = [image_url] if isinstance(image_url, str) else image_url
+        content = [{"type": "text", "text": prompt}]
+        content += [{"type": "image_url", "image_url": {"url": url}} for url in urls]
+        if context:
+            content.append({"type": "text", "text": context})
+        return [{"role": "user", "content": content}]
+
+    async def _send_request(
+        self,
+        backend: Backend,
+        prompt: str,
+        img_base64: EncodedImages,
+        context: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        record: bool = True,
+    ) -> Tuple[str, Optional[int]]:
+        """
+        Send one chat completion request to a backend
+
+        Updates last_serialize_time and last_network_time. On the SDK path the SDK's own
+        JSON encoding happens inside the call and is counted as network time. Backends
+        using Ollama's native API also report their server-side timings.
+
+        Args:
+            backend: Backend to send the request to
+            prompt: Text prompt
+            img_base64: Base64-encoded JPEG, or a list of them
+            context: Optional volatile text placed after the image
+            max_tokens: Maximum tokens to generate (default: self.max_tokens)
+            record: Update the timing metrics (False for warm-up requests)
+
+        Returns:
+            Tuple of (generated text, total tokens reported by the server or None)
+        """
+        serialize_start = time.perf_counter()
+        max_tokens = max_tokens or self.max_tokens
+        images = [img_base64] if isinstance(img_base64, bytes) else img_base64
+
+        if self.uses_ollama_api(backend):
+            completion = await backend.ollama_client.create(
+                model=self.model,
+                prompt=prompt,
+                image_b64=img_base64,
+                max_tokens=max_tokens,
+                temperature=0.7,
+                keep_alive=self.ollama_keep_alive,
+                context=context,
+            )
+            if record:
+                self.last_serialize_time = completion.serialize_time
+                self.last_network_time = completion.network_time
+                self._record_server_timings(
+                    completion.timings, completion.usage, completion.network_time
+                )
+            return completion.text, completion.usage["total_tokens"]
+
+        if self.fast_path:
+            messages = self._build_messages(
+                prompt, [f"data:image/jpeg;base64,{IMAGE_PLACEHOLDER}"] * len(images), context
+            )
+            build_time = time.perf_counter() - serialize_start
+            completion = await backend.fast_client.create(
+                model=self.model,
+                messages=messages,
+                image_b64=img_base64,
+                max_tokens=max_tokens,
+                temperature=0.7,
+            )
+            if record:
+                self.last_serialize_time = build_time + completion.serialize_time
+                self.last_network_time = completion.network_time
+            return completion.text, completion.usage.get("total_tokens")
+
+        messages = self._build_messages(
+            prompt, [f"data:image/jpeg;base64,{image.decode('ascii')}" for image in images], context
+        )
+        network_start = time.perf_counter()
+        response = await backend.client.chat.completions.create(
+            model=self.model, messages=messages, max_tokens=max_tokens, temperature=0.7
+        )
+        if record:
+            self.last_serialize_time = network_start - serialize_start
+            self.last_network_time = time.perf_counter() - network_start
+        usage = response.usage.total_tokens if response.usage else None
+        return response.choices[0].message.content or "", usage
+
+    async def _create_completion(
+        self, prompt: str, img_base64: EncodedImages, context: Optional[str] = None
+    ) -> str:
+        """
+        Send a chat completion request through the circuit breaker, with retries
+
+        With a single backend, a request that failed with a transient error is retried
+        up to max_retries times with exponential backoff (with replicas, failing over is
+        the retry). The final outcome is reported to the circuit breaker.
+
+        Args:
+            prompt: Text prompt
+            img_base64: Base64-encoded JPEG, or a list of them
+            context: Optional volatile text placed after the image
+
+        Returns:
+            Generated text
+
+        Raises:
+            CircuitOpenError: If the circuit breaker refuses the request
+            Exception: The last backend error if every attempt failed
+        """
+        breaker = self.circuit_breaker
+        permit = breaker.allow()
+        if permit is None:
+            raise CircuitOpenError(
+                f"VLM backend unavailable, retrying in {breaker.get_stats()['retry_in_s']:.0f}s"
+            )
+
+        self.total_requests += 1
+        max_retries = self.max_retries if len(self.backend_pool) == 1 else 0
+        attempt = 0
+        try:
+            while True:
+                try:
+                    result = await self._complete_on_pool(prompt, img_base64, context)
+                    break
+                except Exception as e:
+                    if attempt >= max_retries or not is_transient_error(e):
+                        raise
+                    delay = self.retry_backoff * (2**attempt)
+                    attempt += 1
+                    self.retries += 1
+                    logger.warning(
+                        f"VLM request failed ({e}), retry {attempt}/{max_retries} "
+                        f"in {delay:.1f}s"
+                    )
+                    await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            breaker.release(permit)
+            raise
+        except Exception as e:
+            if error_status(e) == 429:
+                # Quota exhaustion is handled by the rate limiter, the backend is up
+                breaker.release(permit)
+            else:
+                breaker.record_failure(e, permit)
+            raise
+
+        breaker.record_success(permit)
+        return result
+
+    async def _complete_on_pool(
+        self, prompt: str, img_base64: EncodedImages, context: Optional[str] = None
+    ) -> str:
+        """
+        Send a chat completion request to the pool, failing over between backends
+
+        Each backend is tried at most once. Backend statistics are updated for every
+        attempt so failing replicas get ejected from rotation. With hedging enabled, a
+        request still running after the hedge delay is duplicated on another backend.
+
+        Args:
+            prompt: Text prompt
+            img_base64: Base64-encoded JPEG, or a list of them
+            context: Optional volatile text placed after the image
+
+        Returns:
+            Generated text
+
+        Raises:
+            Exception: The last backend error if every backend failed
+        """
+        pool = self.backend_pool  # Keep failing over within it if the settings change
+        tried = []
+        last_error: Optional[Exception] = None
+
+        while True:
+            backend = pool.select(exclude=tried)
+            if backend is None:
+                break
+            tried.append(backend)
+
+            try:
+                if self.hedge_percentile > 0 and len(tried) < len(pool):
+                    return await self._hedged_attempt(
+                        pool, backend, tried, prompt, img_base64, context
+                    )
+                return await self._attempt(pool, backend, prompt, img_base64, context)
+            except Exception as e:
+                last_error = e
+                if len(tried) < len(pool):
+                    logger.warning(f"Backend {backend.api_base} failed ({e}), failing over")
+
+        raise last_error
+
+    async def _attempt(
+        self,
+        pool: BackendPool,
+        backend: Backend,
+        prompt: str,
+        img_base64: EncodedImages,
+        context: Optional[str] = None,
+    ) -> str:
+        """
+        Send one request to one backend, with quota, timeout and statistics
+
+        Args:
+            pool: Pool of the backend (records the outcome)
+            backend: Backend to send the request to
+            prompt: Text prompt
+            img_base64: Base64-encoded JPEG, or a list of them
+            context: Optional volatile text placed after the image
+
+        Returns:
+            Generated text
+
+        Raises:
+            Exception: The backend error (recorded on the backend)
+        """
+        reserved = self._estimate_request_tokens(prompt, context)
+        if backend.limiter:
+            waited = await backend.limiter.acquire(reserved)
+            self.latency_metrics.record("rate_limit", waited)
+        # In flight on the backend only once the quota let the request through
+        backend.outstanding += 1
+        used_tokens, answered = None, False
+        try:
+            request_start = time.perf_counter()
+            request = self._send_request(backend, prompt, img_base64, context)
+            if self.request_timeout > 0:
+                try:
+                    result, used_tokens = await asyncio.wait_for(
+                        request, timeout=self.request_timeout
+                    )
+                except asyncio.TimeoutError:
+                    raise TimeoutError(
+                        f"No response from {backend.api_base} within {self.request_timeout:g}s"
+                    ) from None
+            else:
+                result, used_tokens = await request
+            answered = True
+        except Exception as e:
+            retry_after = retry_after_of(e)
+            if retry_after is not None and backend.limiter:
+                backend.limiter.penalize(retry_after)
+            pool.record_failure(backend, e)
+            raise
+        finally:
+            backend.outstanding -= 1
+            self._settle_quota(backend, reserved, used_tokens, answered)
+
+        backend_time = time.perf_counter() - request_start
+        pool.record_success(backend, backend_time)
+        self.latency_metrics.record("backend", backend_time)
+        return result
+
+    async def send_synthetic_request(
+        self, backend: Backend, image: Image.Image, timeout: float, max_tokens: int = 1
+    ) -> str:
+        """
+        Send a request for a synthetic frame to one backend (warm-up, calibration)
+
+        Goes through the backend's quota but bypasses the circuit breaker, failover and
+        latency metrics, so a slow model load does not show up as backend latency.
+
+        Args:
+            backend: Backend to send the request to
+            image: Frame to send (already resized by the image profile), or an encoded
+                frame with the JPEG file in .jpeg, which is sent as-is
+            timeout: Timeout in seconds (0 = none)
+            max_tokens: Maximum tokens to generate
+
+        Returns:
+            Generated text
+        """
+        img_base64 = self._encode_image(image)
+        prompt = "Describe this image in one word."
+        reserved = self._estimate_request_tokens(prompt)
+        if backend.limiter:
+            await backend.limiter.acquire(reserved)
+        backend.outstanding += 1
+        used_tokens, answered = None, False
+        try:
+            request = self._send_request(
+                backend, prompt, img_base64, max_tokens=max_tokens, record=False
+            )
+            if timeout > 0:
+                try:
+                    text, used_tokens = await asyncio.wait_for(request, timeout=timeout)
+                except asyncio.TimeoutError:
+                    raise TimeoutError(
+                        f"No response from {backend.api_base} within {timeout:g}s"
+                    ) from None
+            else:
+                text, used_tokens = await request
+            answered = True
+        finally:
+            backend.outstanding -= 1
+            backend.last_used = time.monotonic()
+            self._settle_quota(backend, reserved, used_tokens, answered)
+        return text
+
+    def _settle_quota(
+        self, backend: Backend, reserved: int, used_tokens: Optional[int], answered: bool
+    ) -> None:
+        """
+        Correct a request's token reservation on the backend's quota
+
+        A request that failed or was cancelled generated no completion: the reserved
+        max_tokens are given back, its prompt stays counted.
+        """
+        if not backend.limiter:
+            return
+        if not answered:
+            used_tokens = max(reserved - self.max_tokens, 0)
+        backend.limiter.settle(reserved, used_tokens)
+
+    def _hedge_delay(self) -> Optional[float]:
+        """Seconds after which a request is hedged, None until enough samples exist"""
+        stats = self.latency_metrics.histograms["backend"].snapshot((self.hedge_percentile,))
+        if stats["count"] < self.hedge_min_samples:
+            return None
+        return stats[f"p{self.hedge_percentile:g}_ms"] / 1000
+
+    async def _hedged_attempt(
+        self,
+        pool: BackendPool,
+        backend: Backend,
+        tried: List[Backend],
+        prompt: str,
+        img_base64: EncodedImages,
+        context: Optional[str] = None,
+    ) -> str:
+        """
+        Run an attempt and, if it is slower than the hedge delay, race a duplicate
+        on another backend; the first answer wins and the other request is cancelled
+
+        Args:
+            pool: Pool of the backends
+            backend: Backend of the first request
+            tried: Backends used so far (the hedge backend is appended)
+            prompt: Text prompt
+            img_base64: Base64-encoded JPEG, or a list of them
+            context: Optional volatile text placed after the image
+
+        Returns:
+            Generated text of the first successful request
+
+        Raises:
+            Exception: The last error if both requests failed
+        """
+        start = time.perf_counter()
+        primary = asyncio.ensure_future(self._attempt(pool, backend, prompt, img_base64, context))
+        delay = self._hedge_delay()
+        if delay is None:
+            return await primary
+        self.last_hedge_delay = delay
+
+        pending = {primary}
+        last_error: Optional[Exception] = None
+        try:
+            # asyncio.wait never cancels: the finally block aborts whatever is left
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+
+            hedge_backend = pool.select(exclude=tried)
+            if hedge_backend is None or not hedge_backend.is_available():
+                return await primary
+            tried.append(hedge_backend)
+            self.hedged_requests += 1
+            logger.debug(
+                f"Hedging request on {hedge_backend.api_base} after {delay * 1000:.0f}ms "
+                f"on {backend.api_base}"
+            )
+            hedge = asyncio.ensure_future(
+                self._attempt(pool, hedge_backend, prompt, img_base64, context)
+            )
+            pending.add(hedge)
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        continue
+                    if task is hedge:
+                        self.hedge_wins += 1
+                        # The cancelled request had already taken `elapsed`: expect the
+                        # mean latency of requests slower than that
+                        elapsed = time.perf_counter() - start
+                        expected = self.latency_metrics.histograms["backend"].mean_above(elapsed)
+                        if expected is not None:
+                            self.hedge_time_saved += max(expected - elapsed, 0.0)
+                    return task.result()
+            raise last_error
+        finally:
+            for task in pending:
+                if not task.done():
+                    task.cancel()
+
+    async def process_frame(
+        self,
+        image: Image.Image,
+        prompt: Optional[str] = None,
+        frame_time: Optional[float] = None,
+        thumbnail: Optional[Image.Image] = None,
+    ) -> None:
         """
         Process a frame asynchronously. Updates self.current_response when done.
-        If already processing, this call is skipped.
+        If max_concurrent_requests are already in flight, this call is skipped.
+
+        The request is cancelled (aborting the HTTP call) once the frame is older than
+        max_staleness, or when the answer for a newer frame arrives first. An answer
+        never overwrites the answer of a newer frame.
 
         Args:
             image: PIL Image to process
             prompt: Optional custom prompt (uses default if None)
+            frame_time: Capture time of the frame on the time.monotonic() clock
+                (default: now)
+            thumbnail: Optional overview of the full frame when image is a crop
         """
-        # Non-blocking check if we're already processing
-        if self._processing_lock.locked():
-            logger.debug("VLM busy, skipping frame")
+        if frame_time is None:
+            frame_time = time.monotonic()
+
+        response = await self._run_frame_request(
+            lambda: self.analyze_image(image, prompt, thumbnail),
+            frame_time,
+            failed=lambda response: response.startswith("Error"),
+        )
+        if response is None:
             return
 
-        async with self._processing_lock:
-            self.is_processing = True
-            try:
-                response = await self.analyze_image(image, prompt)
-                self.current_response = response
-            finally:
-                self.is_processing = False
+        if not response.startswith("Error"):
+            self.latency_metrics.record("e2e", max(time.monotonic() - frame_time, 0.0))
+        self.current_response = response
+
+    async def process_prompt_set(
+        self,
+        image: Image.Image,
+        prompts: List[dict],
+        frame_time: Optional[float] = None,
+        thumbnail: Optional[Image.Image] = None,
+    ) -> Optional[List[dict]]:
+        """
+        Process a frame with several prompts (see analyze_prompt_set)
+
+        Skipping, deadlines and supersession work as in process_frame; the whole set
+        counts as one request in flight. The first prompt's answer becomes
+        self.current_response.
+
+        Args:
+            image: PIL Image to process
+            prompts: List of {"name": str, "prompt": str}
+            frame_time: Capture time of the frame on the time.monotonic() clock
+                (default: now)
+            thumbnail: Optional overview of the full frame when image is a crop
+
+        Returns:
+            Per-prompt results, or None if the frame was skipped, expired or superseded
+        """
+        if not prompts:
+            await self.process_frame(image, frame_time=frame_time, thumbnail=thumbnail)
+            return None
+        if frame_time is None:
+            frame_time = time.monotonic()
+
+        results = await self._run_frame_request(
+            lambda: self.analyze_prompt_set(image, prompts, thumbnail),
+            frame_time,
+            failed=lambda results: results[0]["error"],
+        )
+        if results is None:
+            return None
+
+        if not results[0]["error"]:
+            self.latency_metrics.record("e2e", max(time.monotonic() - frame_time, 0.0))
+        self.current_response = results[0]["text"]
+        return results
+
+    async def process_regions(
+        self, regions: List[dict], frame_time: Optional[float] = None
+    ) -> Optional[List[dict]]:
+        """
+        Process the regions of interest of a frame (see analyze_regions)
+
+        Skipping, deadlines and supersession work as in process_frame; all regions
+        count as one request in flight. The per-zone answers, tagged with the zone
+        name, become self.current_response.
+
+        Args:
+            regions: List of {"name": str, "image": PIL Image, "prompt": str or None}
+            frame_time: Capture time of the frame on the time.monotonic() clock
+                (default: now)
+
+        Returns:
+            Per-region results, or None if the frame was skipped, expired or superseded
+        """
+        if frame_time is None:
+            frame_time = time.monotonic()
+
+        results = await self._run_frame_request(
+            lambda: self.analyze_regions(regions),
+            frame_time,
+            failed=lambda results: any(r["error"] for r in results),
+        )
+        if results is None:
+            return None
+
+        if not any(r["error"] for r in results):
+            self.latency_metrics.record("e2e", max(time.monotonic() - frame_time, 0.0))
+        self.current_response = "\n".join(f"[{r['name']}] {r['text']}" for r in results)
+        return results
+
+    async def _run_frame_request(self, make_request, frame_time: float, failed):
+        """
+        Run a frame's request with busy skipping, deadline and supersession handling
+
+        Args:
+            make_request: Callable returning the request coroutine (only called if the
+                frame is not skipped)
+            frame_time: Capture time of the frame on the time.monotonic() clock
+            failed: Callable telling whether a result is an error answer; errors never
+                supersede older requests
+
+        Returns:
+            The request's result, or None if the frame was skipped, the request expired
+            or was superseded, a newer frame was answered first, or it failed while an
+            older request can still answer
+        """
+        # While the circuit is open, skip before spending anything on the frame
+        if self.circuit_breaker.is_open():
+            self.circuit_skips += 1
+            return None
+
+        # The first requests to a loading model are slow; let the warm-up absorb that
+        # until a backend answered it (routing avoids the backends still warming)
+        if self.warmer.blocking:
+            self.warmup_skips += 1
+            return None
+        if self.calibrating:
+            self.calibration_skips += 1
+            return None
+
+        # Non-blocking check if we're already at capacity
+        if self._in_flight >= self.max_concurrent_requests:
+            self.busy_skips += 1
+            logger.debug("VLM busy, skipping frame")
+            return None
+
+        self._frame_seq += 1
+        seq = self._frame_seq
+
+        self._in_flight += 1
+        self.is_processing = True
+        self.latency_metrics.record("queue_wait", max(time.monotonic() - frame_time, 0.0))
+        request = asyncio.ensure_future(make_request())
+        self._pending_requests[seq] = request
+        try:
+            if self.max_staleness > 0:
+                deadline = frame_time + self.max_staleness
+                # wait_for cancels the request when the deadline passes
+                response = await asyncio.wait_for(
+                    request, timeout=max(deadline - time.monotonic(), 0.0)
+                )
+            else:
+                response = await request
+        except CircuitOpenError:
+            # The circuit opened, or a half-open probe is running, since the check above
+            self.circuit_skips += 1
+            return None
+        except asyncio.TimeoutError:
+            self.expired_requests += 1
+            logger.info(
+                f"VLM request for frame #{seq} cancelled: frame older than "
+                f"{self.max_staleness:.1f}s"
+            )
+            return None
+        except asyncio.CancelledError:
+            if seq in self._superseded_requests:
+                # Cancelled by us because a newer frame's answer arrived
+                return None
+            request.cancel()
+            raise
+        finally:
+            self._pending_requests.pop(seq, None)
+            self._superseded_requests.discard(seq)
+            self._in_flight -= 1
+            self.is_processing = self._in_flight > 0
+
+        if seq < self._latest_response_seq:
+            # A newer frame was answered while this one was finishing
+            self.discarded_responses += 1
+            return None
+
+        if failed(response):
+            # An older request may still succeed; keep its answer rather than this error
+            if any(older_seq < seq for older_seq in self._pending_requests):
+                self.discarded_responses += 1
+                return None
+            return response
+
+        self._latest_response_seq = seq
+
+        # Older requests can only produce outdated answers now - abort them
+        for older_seq, older_request in list(self._pending_requests.items()):
+            if older_seq < seq and not older_request.done():
+                self._superseded_requests.add(older_seq)
+                older_request.cancel()
+                self.cancelled_requests += 1
+                logger.debug(f"Cancelled VLM request for frame #{older_seq} (superseded)")
+
+        return response
 
     def get_current_response(self) -> tuple[str, bool]:
         """
@@ -229,12 +1416,14 @@ Based on the above context, analyze the current frame and describe any changes o
         """
         return self.current_response, self.is_processing
 
-    def get_metrics(self) -> dict:
+    def get_counters(self) -> dict:
         """
-        Get current performance metrics
+        Get the cheap per-frame metrics: last/average latency and request counters
+
+        Sent with every answer; get_metrics() adds the percentiles and backend stats.
 
         Returns:
-            Dict with latency and throughput metrics
+            Dict of scalar metrics
         """
         avg_latency = (
             self.total_inference_time / self.total_inferences if self.total_inferences > 0 else 0.0
@@ -243,8 +1432,58 @@ Based on the above context, analyze the current frame and describe any changes o
         return {
             "last_latency_ms": self.last_inference_time * 1000,
             "avg_latency_ms": avg_latency * 1000,
+            "last_encode_ms": self.last_encode_time * 1000,
+            "last_serialize_ms": self.last_serialize_time * 1000,
+            "last_network_ms": self.last_network_time * 1000,
             "total_inferences": self.total_inferences,
             "is_processing": self.is_processing,
+            "in_flight": self._in_flight,
+            "cancelled_requests": self.cancelled_requests,
+            "expired_requests": self.expired_requests,
+            "discarded_responses": self.discarded_responses,
+            "busy_skips": self.busy_skips,
+            "retries": self.retries,
+            "circuit_skips": self.circuit_skips,
+            "warmup_skips": self.warmup_skips,
+            "calibration_skips": self.calibration_skips,
+        }
+
+    def get_metrics(self) -> dict:
+        """
+        Get current performance metrics
+
+        Returns:
+            Dict with the counters of get_counters(), latency percentiles, circuit,
+            warm-up, hedging, image and per-backend statistics
+        """
+        return {
+            **self.get_counters(),
+            "circuit": self.circuit_breaker.get_stats(),
+            "warmup": self.warmer.get_stats(),
+            "hedging": {
+                "percentile": self.hedge_percentile,
+                "delay_ms": (
+                    self.last_hedge_delay * 1000 if self.last_hedge_delay is not None else None
+                ),
+                "hedged_requests": self.hedged_requests,
+                "hedge_wins": self.hedge_wins,
+                "hedge_rate": (
+                    self.hedged_requests / self.total_requests if self.total_requests else 0.0
+                ),
+                "saved_ms_total": self.hedge_time_saved * 1000,
+            },
+            "image": {
+                "profile": self.image_profile.name,
+                "width": self.last_image_size[0],
+                "height": self.last_image_size[1],
+                "thumbnail": self.last_thumbnail_size,
+                "upload_kb": self.last_upload_bytes / 1024,
+                "vision_tokens": self.last_vision_tokens,
+                "total_vision_tokens": self.total_vision_tokens,
+            },
+            "server_timings": self.last_server_timings,
+            "latency": self.latency_metrics.snapshot(),
+            "backends": self.backend_pool.get_stats(),
         }
 
     def update_prompt(self, new_prompt: str, max_tokens: Optional[int] = None) -> None:
@@ -270,6 +1509,7 @@ Based on the above context, analyze the current frame and describe any changes o
         async with self._history_lock:
             count = len(self.response_history)
             self.response_history.clear()
+            self._history_version += 1
             if count > 0:
                 logger.info(f"Cleared {count} frames from history")
 
@@ -289,6 +1529,18 @@ Based on the above context, analyze the current frame and describe any changes o
                 "history": list(self.response_history[-self.max_history:]) if self.response_history else []
             }
 
+    def set_max_in_flight(self, limit: int) -> None:
+        """
+        Set the limit of frame requests in flight
+
+        The limit is kept when the backend pool changes (instead of following its size).
+
+        Args:
+            limit: Maximum concurrent frame requests (at least 1)
+        """
+        self.max_concurrent_requests = max(int(limit), 1)
+        self._concurrency_per_backend = False
+
     def set_context_mode(self, enable: bool) -> None:
         """
         Enable or disable context-aware analysis.
@@ -307,19 +1559,43 @@ Based on the above context, analyze the current frame and describe any changes o
         self, api_base: Optional[str] = None, api_key: Optional[str] = None
     ) -> None:
         """
-        Update API base URL and/or API key, recreating the client
+        Update API base URL and/or API key, recreating the backend clients
+
+        Switching to a different API base replaces the whole backend pool with that
+        single backend (the old replicas serve a different service/model).
 
         Args:
             api_base: New API base URL (optional)
             api_key: New API key (optional, use empty string for local services)
         """
+        api_bases = [b.api_base for b in self.backend_pool.backends]
+        if api_base and api_base.rstrip("/") != self.backend_pool.primary.api_base:
+            if len(api_bases) > 1:
+                logger.info(f"API base changed, dropping {len(api_bases) - 1} replica backend(s)")
+            api_bases = [api_base]
         if api_base:
             self.api_base = api_base
         if api_key is not None:  # Allow empty string
             self.api_key = api_key if api_key else "EMPTY"
 
-        # Recreate the client with new settings
-        self.client = AsyncOpenAI(base_url=self.api_base, api_key=self.api_key)
+        # Recreate the clients with new settings; the new backend starts with a clean slate.
+        # Requests still running on the old pool report to the breaker they started with.
+        self.circuit_breaker = self.circuit_breaker.renewed()
+        old_pool = self.backend_pool
+        self.backend_pool = self._create_pool(api_bases, template=old_pool)
+        if self._concurrency_per_backend:
+            self.max_concurrent_requests = len(self.backend_pool)
+        if old_pool.health_checks_running and len(self.backend_pool) > 1:
+            self.backend_pool.start_health_checks()
+        # Stop the old pool's health checks, close its HTTP clients after its requests
+        try:
+            grace = self.request_timeout or POOL_RETIRE_GRACE
+            task = asyncio.get_running_loop().create_task(old_pool.retire(grace))
+        except RuntimeError:  # No event loop (called from synchronous code)
+            asyncio.run(old_pool.aclose())
+        else:
+            self._closing_pools.add(task)
+            task.add_done_callback(self._closing_pools.discard)
 
         masked_key = (
             "***" + self.api_key[-4:]
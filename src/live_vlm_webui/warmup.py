@@ -0,0 +1,309 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Model Warm-up
+Sends a synthetic frame to every backend when the service starts or the model
+changes, and keeps idle backends warm with periodic pings.
+
+The first request to a freshly started or switched model pays for loading weights,
+compiling graphs and allocating the KV cache. Warm-up absorbs that cost before
+real frames arrive (frames are skipped until a backend answered it, and backends
+still warming get no traffic), so it never shows up in the latency percentiles.
+Readiness (/readyz) is reported once warm-up succeeded.
+"""
+
+import asyncio
+import io
+import logging
+import time
+from typing import TYPE_CHECKING, Optional
+
+import cv2
+import numpy as np
+from PIL import Image
+
+if TYPE_CHECKING:
+    from .vlm_service import VLMService
+
+logger = logging.getLogger(__name__)
+
+COLD = "cold"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+WARMUP_STATES = (COLD, WARMING, READY, FAILED)
+
+# Typical camera resolution; the image profile then resizes it like a real frame
+SYNTHETIC_FRAME_SIZE = (1280, 720)
+
+
+def synthetic_frame(width: int = 1280, height: int = 720) -> np.ndarray:
+    """
+    Deterministic BGR test frame with gradients and a few shapes
+
+    A blank image can take shortcuts in some vision encoders (and compresses to
+    almost nothing); this one exercises the same path as a camera frame.
+
+    Args:
+        width: Frame width in pixels
+        height: Frame height in pixels
+
+    Returns:
+        uint8 array of shape (height, width, 3)
+    """
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[..., 0] = x[None, :]
+    frame[..., 1] = y[:, None]
+    frame[..., 2] = (x[None, :] + y[:, None]) / 2
+    # Solid blocks give the encoder some edges to look at
+    for i in range(4):
+        x0, y0 = width * (i + 1) // 6, height * (i % 2 + 1) // 4
+        frame[y0 : y0 + height // 8, x0 : x0 + width // 10] = (40 * i, 255 - 60 * i, 128)
+    return frame
+
+
+def synthetic_image(profile) -> Image.Image:
+    """
+    Synthetic camera frame resized by an image profile, ready to be encoded
+
+    Args:
+        profile: ImageProfile of the current model
+
+    Returns:
+        RGB PIL Image
+    """
+    frame = profile.prepare(synthetic_frame(*SYNTHETIC_FRAME_SIZE))
+    return Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+
+class EncodedFrame:
+    """Image JPEG-encoded once; VLMService sends .jpeg as-is (like a browser Snapshot)"""
+
+    def __init__(self, image: Image.Image):
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG")
+        self.size = image.size
+        self.jpeg = buffer.getvalue()
+
+
+class ModelWarmer:
+    """Warm-up and keep-warm pings for the backends of a VLMService"""
+
+    def __init__(
+        self,
+        service: "VLMService",
+        enabled: bool = True,
+        keep_warm_interval: float = 0.0,
+        timeout: float = 120.0,
+    ):
+        """
+        Initialize warmer
+
+        Args:
+            service: VLM service whose backends are warmed
+            enabled: Warm up on start() and schedule() (pings work independently)
+            keep_warm_interval: Ping a backend after it was idle this many seconds
+                (0 = disabled)
+            timeout: Timeout of a warm-up request in seconds (loading a model can take
+                much longer than a regular request)
+        """
+        self.service = service
+        self.enabled = enabled
+        self.keep_warm_interval = keep_warm_interval
+        self.timeout = timeout
+
+        self.state = COLD
+        self.model: Optional[str] = None  # Model the current state refers to
+        self.last_duration: Optional[float] = None  # seconds of the last warm-up
+        self.last_error: Optional[str] = None
+        self.backends = {}  # {api_base: {"ok": bool, "latency_ms": float, "error": str}}
+        self._task: Optional[asyncio.Task] = None
+        self._keep_warm_task: Optional[asyncio.Task] = None
+        self._run: Optional[object] = None  # Token of the latest warm-up run
+        self._answered = False  # A backend answered the latest warm-up run
+        self._frame_cache = (None, None)  # ((model, profile), encoded synthetic frame)
+
+        # Statistics
+        self.warmups = 0  # Completed warm-up runs
+        self.pings = 0  # Keep-warm requests sent
+        self.ping_failures = 0
+
+    @property
+    def warming(self) -> bool:
+        return self.state == WARMING
+
+    @property
+    def blocking(self) -> bool:
+        """Whether frames must wait: warming up and no backend has answered yet"""
+        return self.warming and not self._answered
+
+    def _synthetic_frame(self) -> EncodedFrame:
+        """Synthetic frame of the current model's profile, encoded once per profile"""
+        key = (self.service.model, self.service.image_profile)
+        if self._frame_cache[0] != key:
+            self._frame_cache = (key, EncodedFrame(synthetic_image(key[1])))
+        return self._frame_cache[1]
+
+    def is_ready(self) -> bool:
+        """Whether the current model was warmed up successfully"""
+        return self.state == READY and self.model == self.service.model
+
+    async def warm_up(self) -> bool:
+        """
+        Send a synthetic frame to every backend of the pool concurrently
+
+        Each backend gets traffic again as soon as its own warm-up request finished.
+
+        Returns:
+            True if at least one backend answered
+        """
+        service = self.service
+        model = service.model
+        backends = list(service.backend_pool.backends)
+        self.state = WARMING
+        self.model = model
+        run = self._run = object()
+        self._answered = False
+        for backend in backends:
+            backend.warming = True
+        logger.info(f"Warming up {model} on {len(backends)} backend(s)")
+
+        image = self._synthetic_frame()
+        start = time.monotonic()
+
+        async def warm(backend) -> dict:
+            request_start = time.monotonic()
+            try:
+                await service.send_synthetic_request(backend, image, self.timeout)
+            except Exception as e:
+                return {"ok": False, "latency_ms": None, "error": str(e) or type(e).__name__}
+            finally:
+                # A newer run owns the flags of its backends
+                if self._run is run:
+                    backend.warming = False
+            if self._run is run:
+                self._answered = True
+            return {"ok": True, "latency_ms": (time.monotonic() - request_start) * 1000}
+
+        try:
+            results = await asyncio.gather(*[warm(b) for b in backends])
+        except asyncio.CancelledError:
+            # Replaced by a newer warm-up (which owns the state now) or stopped
+            if self._task is asyncio.current_task():
+                self.state = COLD
+            raise
+        self.last_duration = time.monotonic() - start
+        self.backends = {b.api_base: r for b, r in zip(backends, results)}
+        self.warmups += 1
+
+        errors = [r["error"] for r in results if not r["ok"]]
+        self.last_error = errors[-1] if errors else None
+        ok = len(errors) < len(results)
+        self.state = READY if ok else FAILED
+        if ok:
+            logger.info(f"Warm-up of {model} finished in {self.last_duration:.1f}s")
+        else:
+            logger.warning(f"Warm-up of {model} failed: {self.last_error}")
+        return ok
+
+    def schedule(self) -> Optional[asyncio.Task]:
+        """
+        Start a warm-up in the background, replacing one that is still running
+
+        Returns:
+            The warm-up task, or None if warm-up is disabled
+        """
+        if not self.enabled:
+            return None
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = asyncio.ensure_future(self.warm_up())
+        return self._task
+
+    async def wait(self) -> None:
+        """Wait until a running warm-up has finished (returns at once if none is running)"""
+        if self._task is not None and not self._task.done():
+            await asyncio.wait([self._task])
+
+    async def _keep_warm_loop(self) -> None:
+        interval = self.keep_warm_interval
+        logger.info(f"Keep-warm pings after {interval:.0f}s idle")
+        try:
+            while True:
+                await asyncio.sleep(max(interval / 4, 0.05))
+                if self.warming:
+                    continue
+                now = time.monotonic()
+                idle = [
+                    b
+                    for b in self.service.backend_pool.backends
+                    if b.is_available(now) and b.outstanding == 0 and now - b.last_used >= interval
+                ]
+                if idle:
+                    await asyncio.gather(*[self._ping(b) for b in idle])
+        except asyncio.CancelledError:
+            logger.info("Keep-warm pings stopped")
+
+    async def _ping(self, backend) -> None:
+        self.pings += 1
+        try:
+            await self.service.send_synthetic_request(
+                backend, self._synthetic_frame(), self.timeout
+            )
+        except Exception as e:
+            self.ping_failures += 1
+            logger.warning(f"Keep-warm ping to {backend.api_base} failed: {e}")
+
+    def start(self) -> None:
+        """Start warm-up and keep-warm pings (requires a running event loop)"""
+        self.schedule()
+        if self.keep_warm_interval > 0 and self._keep_warm_task is None:
+            self._keep_warm_task = asyncio.create_task(self._keep_warm_loop())
+
+    async def stop(self) -> None:
+        """Cancel a running warm-up and the keep-warm pings"""
+        for task in (self._task, self._keep_warm_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+        self._keep_warm_task = None
+
+    def get_stats(self) -> dict:
+        """
+        Get warm-up state and statistics
+
+        Returns:
+            Dict with state, readiness, last warm-up duration and per-backend results
+        """
+        return {
+            "enabled": self.enabled,
+            "state": self.state,
+            "model": self.model,
+            "ready": self.is_ready(),
+            "duration_ms": self.last_duration * 1000 if self.last_duration is not None else None,
+            "last_error": self.last_error,
+            "backends": self.backends,
+            "warmups": self.warmups,
+            "keep_warm_interval_s": self.keep_warm_interval,
+            "pings": self.pings,
+            "ping_failures": self.ping_failures,
+        }
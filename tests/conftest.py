@@ -1,9 +1,14 @@
 """Shared pytest fixtures and configuration for all tests."""
 
+import copy
+
 import pytest
 from pathlib import Path
 from unittest.mock import Mock, AsyncMock
 
+from aiohttp.test_utils import TestServer
+
+from live_vlm_webui.stub_server import StubConfig, create_stub_app
 from tests.utils.performance import PerformanceMetrics
 
 # Test data directory
@@ -76,6 +81,42 @@ async def test_server():
     await app.cleanup()
 
 
+@pytest.fixture
+async def stub_backend():
+    """Factory starting local stub VLM backends, closed after the test.
+
+    stub_backend(config) returns (server, api_base). stub_backend(config, count=n) starts
+    n backends with copies of config and stub_backend([config, ...]) one per config; both
+    return ([servers], [api_bases]). host and middlewares are passed to the server/app.
+    """
+    servers = []
+
+    async def start(config=None, count=None, host="127.0.0.1", middlewares=()):
+        if isinstance(config, list):
+            configs = config
+        else:
+            config = config or StubConfig()
+            configs = [config] if count is None else [copy.deepcopy(config) for _ in range(count)]
+
+        started = []
+        for stub_config in configs:
+            app = create_stub_app(stub_config)
+            app.middlewares.extend(middlewares)
+            server = TestServer(app, host=host)
+            await server.start_server()
+            servers.append(server)
+            started.append(server)
+
+        api_bases = [str(server.make_url("/v1")) for server in started]
+        if isinstance(config, list) or count is not None:
+            return started, api_bases
+        return started[0], api_bases[0]
+
+    yield start
+    for server in servers:
+        await server.close()
+
+
 @pytest.fixture
 def mock_video_processor():
     """Mock video processor for testing."""
@@ -0,0 +1,150 @@
+"""Integration tests for VLMService load balancing against local stub servers."""
+
+import asyncio
+
+import pytest
+from PIL import Image
+
+from live_vlm_webui.stub_server import STUB_STATE, StubConfig
+from tests.utils.services import make_service
+
+
+@pytest.fixture
+async def stub_backends(stub_backend):
+    """Three local stub backends: (servers, api_bases)."""
+    return await stub_backend(
+        [
+            StubConfig(response_text=f"answer from replica{i}", ttft_ms=50, tokens_per_sec=0)
+            for i in range(3)
+        ]
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_spread_across_backends(stub_backends):
+    """Concurrent frames are load balanced over all replicas."""
+    servers, api_bases = stub_backends
+    service = make_service(api_bases)
+    image = Image.new("RGB", (64, 64), "gray")
+
+    await asyncio.gather(*[service.process_frame(image) for _ in range(3)])
+
+    assert [s.app[STUB_STATE].requests for s in servers] == [1, 1, 1]
+    assert service.current_response.startswith("answer from replica")
+    stats = service.get_metrics()["backends"]
+    assert all(b["total_requests"] == 1 and b["total_errors"] == 0 for b in stats)
+
+
+@pytest.mark.asyncio
+async def test_failover_to_healthy_backend(stub_backends):
+    """A failing backend is transparently retried on another replica and ejected."""
+    servers, api_bases = stub_backends
+    servers[0].app[STUB_STATE].config.healthy = False
+    service = make_service(api_bases, max_concurrent_requests=1)
+    service.backend_pool.max_failures = 1
+    image = Image.new("RGB", (64, 64), "gray")
+
+    for _ in range(6):
+        result = await service.analyze_image(image)
+        assert result in ("answer from replica1", "answer from replica2")
+
+    primary = service.backend_pool.primary
+    assert primary.total_errors == 1  # ejected after the first failure
+    assert primary.get_stats()["ejected"]
+
+
+@pytest.mark.asyncio
+async def test_all_backends_down_returns_error(stub_backends):
+    """When every replica fails, the error is reported instead of raised."""
+    servers, api_bases = stub_backends
+    for server in servers:
+        server.app[STUB_STATE].config.healthy = False
+    service = make_service(api_bases)
+
+    result = await service.analyze_image(Image.new("RGB", (64, 64), "gray"))
+
+    assert result.startswith("Error:")
+    assert sum(b["total_errors"] for b in service.backend_pool.get_stats()) == 3
+
+
+@pytest.mark.asyncio
+async def test_health_check_ejects_and_reinstates(stub_backends):
+    """Active /models probes mark dead replicas unhealthy and bring them back."""
+    servers, api_bases = stub_backends
+    service = make_service(api_bases)
+    pool = service.backend_pool
+    servers[1].app[STUB_STATE].config.healthy = False
+
+    try:
+        assert await pool.check_all() == [True, False, True]
+        assert not pool.backends[1].is_available()
+        assert all(pool.select() is not pool.backends[1] for _ in range(6))
+
+        servers[1].app[STUB_STATE].config.healthy = True
+        assert await pool.check_all() == [True, True, True]
+        assert pool.backends[1].is_available()
+    finally:
+        await pool.stop_health_checks()
+
+
+@pytest.mark.asyncio
+async def test_settings_change_closes_old_pool(stub_backends):
+    """Replacing the pool stops its health checks and closes its HTTP clients."""
+    _, api_bases = stub_backends
+    service = make_service(api_bases)
+    old_pool = service.backend_pool
+    old_pool.start_health_checks()
+    await service.process_frame(Image.new("RGB", (64, 64)))
+
+    service.update_api_settings(api_bases[1])
+    assert service.backend_pool is not old_pool
+    await asyncio.gather(*service._closing_pools)
+
+    assert not old_pool.health_checks_running
+    assert all(backend.client.is_closed() for backend in old_pool.backends)
+    assert not service._closing_pools
+    await service.backend_pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_settings_change_lets_old_requests_finish(stub_backends):
+    """The old pool is closed only after its in-flight request answered."""
+    servers, api_bases = stub_backends
+    servers[0].app[STUB_STATE].config.ttft_ms = 300
+    service = make_service(api_bases[:1])
+    old_pool = service.backend_pool
+    frame = asyncio.create_task(service.process_frame(Image.new("RGB", (64, 64))))
+    await asyncio.sleep(0.1)
+
+    service.update_api_settings(api_bases[1])
+    await asyncio.sleep(0.1)
+    assert not old_pool.backends[0].client.is_closed()
+    await frame
+    await asyncio.gather(*service._closing_pools)
+
+    assert service.current_response == "answer from replica0"
+    assert old_pool.backends[0].client.is_closed()
+    with pytest.raises(RuntimeError):
+        old_pool.backends[0].fast_client
+    await service.backend_pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_old_request_failure_stays_on_old_breaker(stub_backends):
+    """A request of the replaced pool that fails does not trip the new circuit."""
+    servers, api_bases = stub_backends
+    servers[0].app[STUB_STATE].config.ttft_ms = 500
+    service = make_service(api_bases[:1], request_timeout=0.2, max_retries=0, circuit_threshold=1)
+    old_breaker = service.circuit_breaker
+    frame = asyncio.create_task(service.process_frame(Image.new("RGB", (64, 64))))
+    await asyncio.sleep(0.05)
+
+    service.update_api_settings(api_bases[1])
+    await frame
+    await asyncio.gather(*service._closing_pools)
+
+    assert old_breaker.trips == 1
+    assert service.circuit_breaker is not old_breaker
+    assert service.circuit_breaker.state == "closed"
+    assert service.circuit_breaker.consecutive_failures == 0
+    await service.backend_pool.aclose()
@@ -0,0 +1,91 @@
+"""Integration tests for capacity calibration against the stub backend."""
+
+import asyncio
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from live_vlm_webui import server as server_module
+from live_vlm_webui.calibration import calibrate
+from live_vlm_webui.stub_server import STUB_STATE, StubConfig
+from live_vlm_webui.video_processor import VideoProcessorTrack
+from live_vlm_webui.vlm_service import VLMService
+
+
+@pytest.fixture
+async def stub(stub_backend):
+    # A backend that serves 2 requests at a time, 100 ms each: ~20 req/s at most
+    config = StubConfig(ttft_ms=100, tokens_per_sec=0, max_concurrency=2, overload="queue")
+    return await stub_backend(config)
+
+
+@pytest.mark.asyncio
+async def test_ramp_finds_backend_concurrency(stub):
+    server, api_base = stub
+    service = VLMService(model="stub-vlm", api_base=api_base, warmup=False)
+    report = await calibrate(service, levels=(1, 2, 4, 8), requests_per_level=8, sessions=2)
+
+    levels = report["levels"]
+    # Stops once more concurrency no longer adds throughput
+    assert [lvl["concurrency"] for lvl in levels][:3] == [1, 2, 4]
+    assert len(levels) < 4 or levels[3]["throughput_rps"] < 1.2 * levels[1]["throughput_rps"]
+    assert levels[1]["throughput_rps"] > 1.6 * levels[0]["throughput_rps"]
+    assert levels[2]["p95_ms"] > levels[1]["p95_ms"]
+
+    rec = report["recommendation"]
+    assert rec["max_in_flight"] == 2
+    assert 14 < rec["capacity_rps"] < 21
+    assert rec["process_every"] in (3, 4, 5)  # 2 streams at 30 fps: every ~0.1 s
+    assert server.app[STUB_STATE].max_in_flight == 2
+    # Calibration requests stay out of the latency metrics
+    assert service.latency_metrics.histograms["backend"].snapshot()["count"] == 0
+    assert not service.calibrating
+
+
+@pytest.mark.asyncio
+async def test_calibrate_endpoint_applies_recommendation(stub, monkeypatch):
+    _, api_base = stub
+    service = VLMService(model="stub-vlm", api_base=api_base, warmup=False)
+    monkeypatch.setattr(server_module, "vlm_service", service)
+    monkeypatch.setattr(server_module, "last_calibration", None)
+    monkeypatch.setattr(VideoProcessorTrack, "process_every_n_frames", 30)
+    app = await server_module.create_app(test_mode=True)
+
+    async with TestClient(TestServer(app)) as client:
+        assert (await client.get("/api/calibrate")).status == 404
+        resp = await client.post("/api/calibrate", json={"levels": [0]})
+        assert resp.status == 400
+
+        resp = await client.post(
+            "/api/calibrate",
+            json={"levels": [1, 2], "requests_per_level": 6, "fps": 10, "apply": True},
+        )
+        assert resp.status == 200
+        report = await resp.json()
+        assert report["applied"] is True
+        assert report["recommendation"]["sessions"] == 1
+        assert service.max_concurrent_requests == report["recommendation"]["max_in_flight"]
+        assert VideoProcessorTrack.process_every_n_frames == 1
+
+        resp = await client.get("/api/calibrate")
+        assert resp.content_type == "application/json"
+        assert (await resp.json())["levels"] == report["levels"]
+
+    # The applied limit survives a backend change
+    service.update_api_settings(api_base, api_key="other")
+    assert service.max_concurrent_requests == report["recommendation"]["max_in_flight"]
+    await asyncio.gather(*service._closing_pools)
+
+
+@pytest.mark.asyncio
+async def test_calibration_fails_without_backend(stub, monkeypatch):
+    server, api_base = stub
+    server.app[STUB_STATE].config.update({"healthy": False})
+    service = VLMService(model="stub-vlm", api_base=api_base, warmup=False)
+    monkeypatch.setattr(server_module, "vlm_service", service)
+    app = await server_module.create_app(test_mode=True)
+
+    async with TestClient(TestServer(app)) as client:
+        resp = await client.post("/api/calibrate", json={"levels": [1, 2]})
+        assert resp.status == 502
+        assert "No calibration request succeeded" in (await resp.json())["error"]
@@ -0,0 +1,64 @@
+"""Integration tests for publishing capture constraints over the WebSocket."""
+
+import asyncio
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from live_vlm_webui import server as server_module
+from live_vlm_webui.video_processor import VideoProcessorTrack
+from live_vlm_webui.vlm_service import VLMService
+
+
+@pytest.mark.asyncio
+async def test_constraints_follow_model_and_sampling_rate(monkeypatch):
+    """Pages get the capture settings on connect and whenever they change."""
+    service = VLMService(model="llava-1.5-7b", api_base="http://127.0.0.1:1/v1")
+    service.warmer.schedule = lambda: None
+    track = VideoProcessorTrack(None, service, session_id="cam1")
+    monkeypatch.setattr(server_module, "vlm_service", service)
+    monkeypatch.setattr(server_module, "processor_tracks", {track})
+    monkeypatch.setattr(VideoProcessorTrack, "process_every_n_frames", 60)
+    app = await server_module.create_app(test_mode=True)
+
+    async def receive(ws, message_type):
+        while True:
+            message = await asyncio.wait_for(ws.receive_json(), timeout=5)
+            if message["type"] == message_type:
+                return message
+
+    async with TestClient(TestServer(app)) as client:
+        ws = await client.ws_connect("/ws")
+        config = await receive(ws, "server_config")
+        assert config["capture"] == {"width": 336, "height": 189, "frame_rate": 5}
+
+        await ws.send_json({"type": "update_processing", "process_every": 3})
+        assert (await receive(ws, "capture_constraints"))["capture"]["frame_rate"] == 10
+
+        await ws.send_json({"type": "update_model", "model": "pixtral-12b"})
+        capture = (await receive(ws, "capture_constraints"))["capture"]
+        assert (capture["width"], capture["height"]) == (672, 384)
+
+        await ws.send_json(
+            {
+                "type": "capture_settings",
+                "session_id": "cam1",
+                "width": 672,
+                "height": 384,
+                "frame_rate": 10,
+            }
+        )
+        for _ in range(50):
+            if track.source_fps:
+                break
+            await asyncio.sleep(0.01)
+        assert track.source_fps == 10 and track.get_sample_interval() == 1
+        await ws.close()
+
+
+@pytest.mark.asyncio
+async def test_no_constraints_when_disabled(monkeypatch):
+    service = VLMService(model="llava-1.5-7b", api_base="http://127.0.0.1:1/v1")
+    monkeypatch.setattr(server_module, "vlm_service", service)
+    monkeypatch.setattr(server_module, "min_capture_fps", 0)
+    assert server_module.current_capture_constraints() is None
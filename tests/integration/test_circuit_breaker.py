@@ -0,0 +1,146 @@
+"""Integration tests for timeouts, retries and the circuit breaker of VLMService."""
+
+import asyncio
+import time
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from PIL import Image
+
+from live_vlm_webui import server as server_module
+from live_vlm_webui.stub_server import STUB_STATE, StubConfig
+from live_vlm_webui.vlm_service import VLMService
+
+
+@pytest.fixture
+async def stub(stub_backend):
+    return await stub_backend(StubConfig(ttft_ms=10, tokens_per_sec=0))
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_skips_frames_until_backend_recovers(stub):
+    """Failing frames open the circuit, later frames cost no request, a probe closes it."""
+    server, api_base = stub
+    state = server.app[STUB_STATE]
+    state.config.healthy = False
+    service = VLMService(
+        model="stub-vlm",
+        api_base=api_base,
+        max_retries=0,
+        circuit_threshold=2,
+        circuit_backoff=0.2,
+    )
+    image = Image.new("RGB", (32, 32))
+
+    for _ in range(5):
+        await service.process_frame(image)
+
+    assert service.circuit_breaker.state == "open"
+    assert state.requests == 2
+    assert service.circuit_skips == 3
+    metrics = service.get_metrics()
+    assert metrics["circuit"]["state"] == "open"
+    assert metrics["circuit_skips"] == 3
+
+    # The probe after the backoff fails again: longer backoff
+    await asyncio.sleep(0.25)
+    await service.process_frame(image)
+    assert state.requests == 3
+    assert service.circuit_breaker.backoff == pytest.approx(0.4)
+
+    state.config.healthy = True
+    await asyncio.sleep(0.45)
+    await service.process_frame(image)
+    assert service.circuit_breaker.state == "closed"
+    assert not service.current_response.startswith("Error")
+
+
+@pytest.mark.asyncio
+async def test_requests_refused_during_probe_skip_the_frame(stub):
+    """Prompts refused while the half-open probe runs skip the frame without an error."""
+    server, api_base = stub
+    state = server.app[STUB_STATE]
+    state.config.healthy = False
+    service = VLMService(
+        model="stub-vlm",
+        api_base=api_base,
+        max_retries=0,
+        circuit_threshold=1,
+        circuit_backoff=0.1,
+    )
+    image = Image.new("RGB", (32, 32))
+    await service.process_frame(image)
+    assert service.circuit_breaker.state == "open"
+
+    state.config.healthy = True
+    await asyncio.sleep(0.15)
+    prompts = [{"name": f"p{i}", "prompt": "Describe"} for i in range(3)]
+    assert await service.process_prompt_set(image, prompts) is None
+
+    assert state.requests == 2  # only the probe was sent
+    assert service.circuit_breaker.state == "closed"
+    assert service.circuit_skips == 1
+    assert service.failed_inferences == 1
+
+
+@pytest.mark.asyncio
+async def test_request_timeout_and_retry(stub):
+    """A slow backend times out per request and transient failures are retried."""
+    server, api_base = stub
+    server.app[STUB_STATE].config.ttft_ms = 500
+    service = VLMService(
+        model="stub-vlm",
+        api_base=api_base,
+        request_timeout=0.1,
+        max_retries=1,
+        retry_backoff=0.01,
+        circuit_threshold=0,
+    )
+
+    start = time.perf_counter()
+    result = await service.analyze_image(Image.new("RGB", (32, 32)))
+
+    assert result.startswith("Error: No response from")
+    assert time.perf_counter() - start < 0.4
+    assert service.retries == 1
+    assert server.app[STUB_STATE].requests == 2
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried(stub):
+    """Non-transient errors (e.g. 404 unknown model) fail immediately."""
+    server, api_base = stub
+    service = VLMService(model="unknown-model", api_base=api_base, max_retries=2)
+
+    result = await service.analyze_image(Image.new("RGB", (32, 32)))
+
+    assert "404" in result
+    assert service.retries == 0
+    assert server.app[STUB_STATE].requests == 1
+
+
+@pytest.mark.asyncio
+async def test_circuit_transitions_are_broadcast(stub, monkeypatch):
+    """WebSocket clients get backend_status on connect and on every transition."""
+    server, api_base = stub
+    service = VLMService(model="stub-vlm", api_base=api_base, max_retries=0, circuit_threshold=1)
+    monkeypatch.setattr(server_module, "vlm_service", service)
+    app = await server_module.create_app(test_mode=True)
+
+    async def receive(ws, message_type):
+        while True:
+            message = await asyncio.wait_for(ws.receive_json(), timeout=5)
+            if message["type"] == message_type:
+                return message
+
+    async with TestClient(TestServer(app)) as client:
+        ws = await client.ws_connect("/ws")
+        assert (await receive(ws, "backend_status"))["circuit"]["state"] == "closed"
+
+        server.app[STUB_STATE].config.healthy = False
+        await service.process_frame(Image.new("RGB", (32, 32)))
+        status = await receive(ws, "backend_status")
+        assert status["circuit"]["state"] == "open"
+        assert status["circuit"]["retry_in_s"] > 0
+
+        await ws.close()
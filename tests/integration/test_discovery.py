@@ -0,0 +1,91 @@
+"""Integration tests for cached service discovery and the /models endpoint."""
+
+import socket
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from live_vlm_webui import server as server_module
+from live_vlm_webui.discovery import ServiceDiscovery
+from live_vlm_webui.stub_server import StubConfig
+
+
+def unused_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+async def stub(stub_backend):
+    calls = []
+
+    @web.middleware
+    async def count_model_lists(request, handler):
+        if request.path.endswith("/models"):
+            calls.append(request.path)
+        return await handler(request)
+
+    server, _ = await stub_backend(
+        StubConfig(models=["tiny-text", "stub-vision"]),
+        host="localhost",
+        middlewares=[count_model_lists],
+    )
+    return server, calls
+
+
+def services_for(server):
+    dead = unused_port()
+    return [
+        {"name": "Dead", "url": f"http://localhost:{dead}/v1", "port": dead, "path": "/v1/models"},
+        {
+            "name": "Stub",
+            "url": f"http://localhost:{server.port}/v1",
+            "port": server.port,
+            "path": "/v1/models",
+        },
+    ]
+
+
+@pytest.mark.asyncio
+async def test_detection_probes_in_parallel_and_prefers_vision(stub):
+    server, calls = stub
+    discovery = ServiceDiscovery(services=services_for(server))
+    try:
+        api_base, model = await discovery.detect_service_and_model()
+        assert api_base == f"http://localhost:{server.port}/v1"
+        assert model == "stub-vision"
+
+        detected = await discovery.detect_services()
+        assert [s["name"] for s in detected] == ["Stub"]
+        # The model list of the detection is reused
+        assert await discovery.list_models(api_base) == ["tiny-text", "stub-vision"]
+        assert len(calls) == 2  # one detection listing + one service probe
+    finally:
+        await discovery.aclose()
+
+
+@pytest.mark.asyncio
+async def test_models_endpoint_is_cached(stub, monkeypatch):
+    server, calls = stub
+    discovery = ServiceDiscovery(services=services_for(server))
+    monkeypatch.setattr(server_module, "discovery", discovery)
+    monkeypatch.setattr(server_module, "vlm_service", None)
+    app = await server_module.create_app(test_mode=True)
+    api_base = f"http://localhost:{server.port}/v1"
+
+    async with TestClient(TestServer(app)) as client:
+        for _ in range(3):
+            resp = await client.get("/models", params={"api_base": api_base})
+            data = await resp.json()
+            assert [m["id"] for m in data["models"]] == ["tiny-text", "stub-vision"]
+        assert len(calls) == 1
+
+        await client.get("/models", params={"api_base": api_base, "refresh": "1"})
+        assert len(calls) == 2
+
+        resp = await client.get("/detect-services")
+        data = await resp.json()
+        assert data["default"]["name"] == "Stub"
+    await discovery.aclose()
@@ -0,0 +1,119 @@
+"""Integration tests for the raw HTTP fast path."""
+
+import base64
+import io
+import json
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from PIL import Image
+
+from live_vlm_webui.fast_client import IMAGE_PLACEHOLDER, FastChatClient
+from live_vlm_webui.vlm_service import VLMService
+
+REQUESTS = web.AppKey("requests", list)
+
+
+def make_echo_app(status=200):
+    """Backend that records parsed request bodies and answers with the image size."""
+    received = []
+
+    async def chat_completions(request):
+        body = await request.read()
+        data = json.loads(body)
+        received.append({"data": data, "content_length": request.content_length})
+        if status != 200:
+            return web.json_response({"error": {"message": "overloaded"}}, status=status)
+        url = data["messages"][0]["content"][1]["image_url"]["url"]
+        jpeg = base64.b64decode(url.split(",", 1)[1])
+        width, height = Image.open(io.BytesIO(jpeg)).size
+        return web.json_response(
+            {
+                "choices": [{"message": {"role": "assistant", "content": f" {width}x{height} "}}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+            }
+        )
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    app[REQUESTS] = received
+    return app
+
+
+@pytest.fixture
+async def echo_server():
+    server = TestServer(make_echo_app())
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+def test_build_body_is_valid_json():
+    """Spliced chunks form the same JSON document the SDK would send."""
+    request = {
+        "model": "m",
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": 'say "hi"\n'},
+                    {
+                        "type": "image_url",
+                        "image_url": {"url": f"data:image/jpeg;base64,{IMAGE_PLACEHOLDER}"},
+                    },
+                ],
+            }
+        ],
+    }
+    chunks = FastChatClient.build_body(request, b"QUJD")
+
+    data = json.loads(b"".join(chunks))
+
+    assert chunks[1] == b"QUJD"
+    assert data["messages"][0]["content"][0]["text"] == 'say "hi"\n'
+    assert data["messages"][0]["content"][1]["image_url"]["url"] == "data:image/jpeg;base64,QUJD"
+
+
+@pytest.mark.asyncio
+async def test_fast_path_matches_sdk_path(echo_server):
+    """Both request paths deliver the same image and prompt to the backend."""
+    image = Image.new("RGB", (320, 240), "green")
+    results = []
+
+    for fast_path in (False, True):
+        service = VLMService(
+            model="stub-vlm",
+            api_base=str(echo_server.make_url("/v1")),
+            enable_context=False,
+            fast_path=fast_path,
+        )
+        results.append(await service.analyze_image(image, prompt="size?"))
+        metrics = service.get_metrics()
+        assert metrics["last_network_ms"] > 0
+        assert metrics["last_serialize_ms"] >= 0
+
+    assert results == ["320x240", "320x240"]
+    sdk_request, fast_request = [r["data"] for r in echo_server.app[REQUESTS]]
+    assert sdk_request["messages"] == fast_request["messages"]
+    # Fast path sends a sized body rather than chunked transfer encoding
+    assert echo_server.app[REQUESTS][1]["content_length"] is not None
+
+
+@pytest.mark.asyncio
+async def test_fast_path_http_error_reported():
+    """HTTP errors surface as an "Error:" response like the SDK path."""
+    server = TestServer(make_echo_app(status=429))
+    await server.start_server()
+    try:
+        service = VLMService(
+            model="stub-vlm",
+            api_base=str(server.make_url("/v1")),
+            enable_context=False,
+            fast_path=True,
+        )
+        result = await service.analyze_image(Image.new("RGB", (64, 64)))
+        assert result.startswith("Error:")
+        assert "429" in result
+    finally:
+        await server.close()
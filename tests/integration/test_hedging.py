@@ -0,0 +1,91 @@
+"""Integration tests for hedged requests across replicas."""
+
+import asyncio
+import time
+
+import pytest
+from PIL import Image
+
+from live_vlm_webui.stub_server import STUB_STATE, StubConfig
+from tests.utils.services import make_service
+
+
+@pytest.fixture
+async def slow_and_fast(stub_backend):
+    """A slow (400 ms) and a fast (20 ms) replica."""
+    return await stub_backend(
+        [
+            StubConfig(response_text="slow", ttft_ms=400, tokens_per_sec=0),
+            StubConfig(response_text="fast", ttft_ms=20, tokens_per_sec=0),
+        ]
+    )
+
+
+def make_hedged_service(api_bases, **kwargs):
+    service = make_service(api_bases, hedge_percentile=95, **kwargs)
+    # Recent history: mostly 50 ms, with a slow tail
+    histogram = service.latency_metrics.histograms["backend"]
+    for _ in range(60):
+        histogram.record(0.05)
+    for _ in range(2):
+        histogram.record(0.4)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged_and_loser_cancelled(slow_and_fast):
+    """Past the p95 delay a duplicate goes to the other replica and wins."""
+    servers, api_bases = slow_and_fast
+    service = make_hedged_service(api_bases)
+    slow, fast = service.backend_pool.backends
+    fast.outstanding = 5  # route the first request to the slow replica
+
+    start = time.perf_counter()
+    result = await service.analyze_image(Image.new("RGB", (32, 32)))
+    elapsed = time.perf_counter() - start
+
+    assert result == "fast"
+    assert elapsed < 0.3
+    assert service.hedged_requests == 1
+    assert service.hedge_wins == 1
+    assert service.hedge_time_saved > 0.2
+
+    hedging = service.get_metrics()["hedging"]
+    assert hedging["hedge_rate"] == 1.0
+    assert hedging["delay_ms"] == pytest.approx(50, rel=0.1)
+
+    # The losing request is aborted: the slow replica sees the disconnect
+    for _ in range(50):
+        if servers[0].app[STUB_STATE].aborted:
+            break
+        await asyncio.sleep(0.01)
+    assert servers[0].app[STUB_STATE].aborted == 1
+    assert slow.outstanding == 0
+    assert slow.total_errors == 0  # a cancelled loser is not a backend failure
+
+
+@pytest.mark.asyncio
+async def test_fast_request_is_not_hedged(slow_and_fast):
+    """Requests finishing within the hedge delay send no duplicate."""
+    servers, api_bases = slow_and_fast
+    service = make_hedged_service(api_bases)
+    service.latency_metrics.histograms["backend"].clear()
+    for _ in range(60):
+        service.latency_metrics.histograms["backend"].record(0.2)
+    slow, fast = service.backend_pool.backends
+    slow.outstanding = 5  # route to the fast replica
+
+    assert await service.analyze_image(Image.new("RGB", (32, 32))) == "fast"
+    assert service.hedged_requests == 0
+    assert servers[0].app[STUB_STATE].requests == 0
+
+
+@pytest.mark.asyncio
+async def test_no_hedging_without_enough_samples(slow_and_fast):
+    """Hedging waits for a latency history to derive the delay from."""
+    servers, api_bases = slow_and_fast
+    service = make_hedged_service(api_bases, hedge_min_samples=1000)
+    service.backend_pool.backends[1].outstanding = 5
+
+    assert await service.analyze_image(Image.new("RGB", (32, 32))) == "slow"
+    assert service.hedged_requests == 0
@@ -0,0 +1,59 @@
+"""Integration tests for VLMService latency percentiles and the metrics endpoint."""
+
+import time
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from PIL import Image
+
+from live_vlm_webui import server as server_module
+from live_vlm_webui.stub_server import StubConfig
+from live_vlm_webui.vlm_service import VLMService
+
+
+@pytest.fixture
+async def stub_api_base(stub_backend):
+    _, api_base = await stub_backend(StubConfig(ttft_ms=50, tokens_per_sec=0))
+    return api_base
+
+
+@pytest.mark.asyncio
+async def test_stage_percentiles_in_metrics(stub_api_base):
+    """Processed frames populate e2e, queue wait, encode and backend histograms."""
+    service = VLMService(model="stub-vlm", api_base=stub_api_base, enable_context=False)
+    service.latency_metrics.cache_ttl = 0.0
+    image = Image.new("RGB", (64, 64), "gray")
+
+    for _ in range(5):
+        # Frame captured 20 ms before it reaches the service
+        await service.process_frame(image, frame_time=time.monotonic() - 0.02)
+
+    latency = service.get_metrics()["latency"]
+    for stage in ("e2e", "queue_wait", "encode", "backend"):
+        assert latency[stage]["count"] == 5
+    assert latency["queue_wait"]["p50_ms"] >= 19
+    assert latency["backend"]["p50_ms"] >= 49
+    assert latency["e2e"]["p99_ms"] >= latency["backend"]["p50_ms"] + 19
+
+
+@pytest.mark.asyncio
+async def test_vlm_metrics_endpoint(stub_api_base, monkeypatch):
+    """GET /api/vlm/metrics serves the snapshot, optionally for a shorter window."""
+    service = VLMService(model="stub-vlm", api_base=stub_api_base, enable_context=False)
+    await service.process_frame(Image.new("RGB", (32, 32)))
+    monkeypatch.setattr(server_module, "vlm_service", service)
+    app = await server_module.create_app(test_mode=True)
+
+    async with TestClient(TestServer(app)) as client:
+        resp = await client.get("/api/vlm/metrics")
+        data = await resp.json()
+        assert data["e2e"]["count"] == 1
+        assert data["total_inferences"] == 1
+        assert "10s" in data["throughput_rps"]
+        assert "total_inferences" not in service.latency_metrics.snapshot()
+
+        resp = await client.get("/api/vlm/metrics", params={"window": "5"})
+        assert (await resp.json())["window_s"] == 5.0
+
+        resp = await client.get("/api/vlm/metrics", params={"window": "soon"})
+        assert resp.status == 400
@@ -0,0 +1,76 @@
+"""Integration tests for motion crops and thumbnails against the stub backend."""
+
+import asyncio
+
+import av
+import pytest
+from PIL import Image
+
+from live_vlm_webui.stub_server import STUB_STATE, StubConfig
+from live_vlm_webui.video_processor import VideoProcessorTrack
+from live_vlm_webui.vlm_service import VLMService
+from live_vlm_webui.warmup import synthetic_frame
+
+
+@pytest.fixture
+async def stub(stub_backend):
+    return await stub_backend(StubConfig(ttft_ms=0, tokens_per_sec=0, image_tokens=256))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "options", [{}, {"fast_path": True}, {"api_flavor": "ollama"}], ids=["sdk", "fast", "ollama"]
+)
+async def test_thumbnail_is_sent_as_second_image(stub, options):
+    """Every request path delivers the thumbnail as an extra image."""
+    server, api_base = stub
+    service = VLMService(model="stub-vlm", api_base=api_base, enable_context=False, **options)
+    image = Image.new("RGB", (64, 64), "gray")
+
+    await service.analyze_image(image)
+    single = server.app[STUB_STATE].prompt_tokens
+    await service.analyze_image(image, thumbnail=Image.new("RGB", (32, 18)))
+
+    assert server.app[STUB_STATE].prompt_tokens - single == single + 256
+    assert service.get_metrics()["image"]["thumbnail"] == (32, 18)
+
+
+class FrameSource:
+    def __init__(self, frames):
+        self.frames = iter(frames)
+
+    async def recv(self):
+        return next(self.frames)
+
+
+@pytest.mark.asyncio
+async def test_track_sends_crop_and_thumbnail(stub, monkeypatch):
+    """Once something moves, the VLM gets the moving region plus a thumbnail."""
+    _, api_base = stub
+    service = VLMService(
+        model="stub-vlm", api_base=api_base, enable_context=False, image_profile="none"
+    )
+    monkeypatch.setattr(VideoProcessorTrack, "process_every_n_frames", 10)
+    monkeypatch.setattr(VideoProcessorTrack, "motion_crop", {"update_every": 2})
+    monkeypatch.setattr(VideoProcessorTrack, "crop_thumbnail_width", 320)
+
+    still = synthetic_frame(1280, 720)
+    moved = still.copy()
+    moved[300:420, 600:700] = 255
+    frames = [av.VideoFrame.from_ndarray(still, format="bgr24") for _ in range(9)]
+    frames.append(av.VideoFrame.from_ndarray(moved, format="bgr24"))
+
+    track = VideoProcessorTrack(FrameSource(frames), service, session_id="cam1")
+    for _ in frames:
+        await track.recv()
+    while service.total_inferences < 1:
+        await asyncio.sleep(0.01)
+
+    width, height = service.last_image_size
+    assert width < 640 and height < 360
+    assert service.last_thumbnail_size == (320, 180)
+    stats = track.get_stats()
+    assert stats["frames_cropped"] == 1
+    assert stats["mean_crop_share"] < 0.25
+    x0, y0, x1, y1 = stats["last_crop"]
+    assert x0 < 600 and y0 < 300 and x1 > 700 and y1 > 420
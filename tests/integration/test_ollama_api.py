@@ -0,0 +1,78 @@
+"""Integration tests for the native Ollama API path against the stub backend."""
+
+import pytest
+from PIL import Image
+
+from live_vlm_webui.stub_server import STUB_STATE, StubConfig
+from live_vlm_webui.vlm_service import VLMService
+
+
+@pytest.fixture
+async def stub(stub_backend):
+    return await stub_backend(
+        StubConfig(ttft_ms=20, tokens_per_sec=200, output_tokens=10, load_ms=50)
+    )
+
+
+@pytest.mark.asyncio
+async def test_native_request_reports_server_timings(stub):
+    """Ollama timings are split into load, prompt eval, eval and overhead."""
+    server, api_base = stub
+    service = VLMService(model="stub-vlm", api_base=api_base, api_flavor="ollama")
+    image = Image.new("RGB", (64, 64))
+
+    first = await service.analyze_image(image)
+    assert first and not first.startswith("Error")
+    timings = service.get_metrics()["server_timings"]
+    assert timings["load_ms"] >= 45
+    assert timings["prompt_eval_ms"] >= 15
+    assert timings["eval_tokens"] == 10
+    assert timings["prompt_tokens"] > 0
+    assert timings["overhead_ms"] >= 0
+    assert timings["total_ms"] <= service.last_network_time * 1000 + 1
+
+    # Model stays loaded (default keep_alive): no load time on the next request
+    await service.analyze_image(image)
+    assert service.get_metrics()["server_timings"]["load_ms"] < 5
+    assert server.app[STUB_STATE].model_loads == 1
+    assert service.latency_metrics.histograms["server"].snapshot()["count"] == 2
+    await service.backend_pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_keep_alive_zero_unloads_the_model(stub):
+    server, api_base = stub
+    service = VLMService(
+        model="stub-vlm", api_base=api_base, api_flavor="ollama", ollama_keep_alive="0"
+    )
+    image = Image.new("RGB", (64, 64))
+    for _ in range(3):
+        await service.analyze_image(image)
+    assert server.app[STUB_STATE].model_loads == 3
+    await service.backend_pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_openai_flavor_has_no_server_timings(stub):
+    _, api_base = stub
+    service = VLMService(model="stub-vlm", api_base=api_base)
+    result = await service.analyze_image(Image.new("RGB", (64, 64)))
+    assert not result.startswith("Error")
+    assert service.get_metrics()["server_timings"] is None
+
+
+def test_auto_flavor_picks_ollama_by_port():
+    service = VLMService(
+        model="llava",
+        api_base="http://localhost:11434/v1",
+        backends=["http://localhost:8000/v1"],
+        api_flavor="auto",
+    )
+    ollama, vllm = service.backend_pool.backends
+    assert service.uses_ollama_api(ollama)
+    assert not service.uses_ollama_api(vllm)
+
+
+def test_unknown_flavor_rejected():
+    with pytest.raises(ValueError):
+        VLMService(model="stub-vlm", api_flavor="grpc")
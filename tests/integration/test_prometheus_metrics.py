@@ -0,0 +1,85 @@
+"""Integration tests for the Prometheus /metrics endpoint."""
+
+import re
+import weakref
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from aiortc import VideoStreamTrack
+from PIL import Image
+
+from live_vlm_webui import server as server_module
+from live_vlm_webui.stub_server import StubConfig
+from live_vlm_webui.video_processor import VideoProcessorTrack
+from live_vlm_webui.vlm_service import VLMService
+
+SAMPLE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})? (\S+)$")
+
+
+def parse(text):
+    """Parse exposition text into {(name, labels): value}, validating every line."""
+    samples = {}
+    for line in text.strip().split("\n"):
+        if line.startswith("#"):
+            assert re.match(r"^# (HELP|TYPE) \S+ .+$", line), line
+            continue
+        match = SAMPLE.match(line)
+        assert match, line
+        samples[(match.group(1), match.group(2) or "")] = float(match.group(3))
+    return samples
+
+
+@pytest.fixture
+async def stub_service(stub_backend):
+    _, api_base = await stub_backend(StubConfig(ttft_ms=10, tokens_per_sec=0))
+    return VLMService(model="stub-vlm", api_base=api_base)
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exports_pipeline(stub_service, monkeypatch):
+    """Sessions, VLM counters, backends, WebSocket and GPU readings are exported."""
+    await stub_service.process_frame(Image.new("RGB", (32, 32)))
+    stub_service.busy_skips = 2
+
+    track = VideoProcessorTrack(VideoStreamTrack(), stub_service, session_id="cam1")
+    track.frame_count = 90
+    track.converted_frames = 4
+    tracks = weakref.WeakSet([track])
+
+    monkeypatch.setattr(server_module, "vlm_service", stub_service)
+    monkeypatch.setattr(server_module, "processor_tracks", tracks)
+    monkeypatch.setattr(
+        server_module, "last_gpu_stats", {"gpu_name": "Test GPU", "gpu_percent": 42.0}
+    )
+    app = await server_module.create_app(test_mode=True)
+
+    async with TestClient(TestServer(app)) as client:
+        resp = await client.get("/metrics")
+        assert resp.status == 200
+        assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        samples = parse(await resp.text())
+
+    assert samples[("live_vlm_frames_received_total", '{session="cam1"}')] == 90
+    assert samples[("live_vlm_frames_converted_total", '{session="cam1"}')] == 4
+    assert samples[("live_vlm_sessions_active", "")] == 1
+    assert samples[("live_vlm_vlm_inferences_total", "")] == 1
+    assert samples[("live_vlm_vlm_busy_skips_total", "")] == 2
+    assert samples[("live_vlm_vlm_latency_seconds", '{stage="e2e",quantile="0.95"}')] > 0
+    backend = stub_service.backend_pool.primary.api_base
+    assert samples[("live_vlm_backend_requests_total", f'{{backend="{backend}"}}')] == 1
+    assert samples[("live_vlm_websocket_clients", "")] == 0
+    assert samples[("live_vlm_gpu_utilization_percent", '{gpu="Test GPU"}')] == 42.0
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_without_service(monkeypatch):
+    """Without a VLM service only server-level metrics are exported."""
+    monkeypatch.setattr(server_module, "vlm_service", None)
+    monkeypatch.setattr(server_module, "last_gpu_stats", None)
+    app = await server_module.create_app(test_mode=True)
+
+    async with TestClient(TestServer(app)) as client:
+        samples = parse(await (await client.get("/metrics")).text())
+
+    assert ("live_vlm_websocket_clients", "") in samples
+    assert not any(name.startswith("live_vlm_vlm_") for name, _ in samples)
@@ -0,0 +1,158 @@
+"""Integration tests for answering several prompts per frame."""
+
+import asyncio
+import time
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from PIL import Image
+
+from live_vlm_webui import server as server_module
+from live_vlm_webui.stub_server import STUB_STATE, StubConfig
+from live_vlm_webui.video_processor import VideoProcessorTrack
+from live_vlm_webui.vlm_service import VLMService, normalize_prompt_set
+
+PROMPTS = [
+    {"name": "describe", "prompt": "Describe the scene"},
+    {"name": "safety", "prompt": "Is anyone in danger"},
+    {"name": "count", "prompt": "How many people are there"},
+]
+
+
+@pytest.fixture
+async def echo_stub(stub_backend):
+    """Stub answering with the request's prompt after 100 ms."""
+    return await stub_backend(StubConfig(ttft_ms=100, tokens_per_sec=0, echo=True))
+
+
+@pytest.mark.asyncio
+async def test_prompts_share_one_encode_and_run_concurrently(echo_stub):
+    """The frame is encoded once and all prompts are in flight at the same time."""
+    server, api_base = echo_stub
+    service = VLMService(model="stub-vlm", api_base=api_base, enable_context=False)
+    encodes = 0
+    encode = service._encode_image
+
+    def counting_encode(image):
+        nonlocal encodes
+        encodes += 1
+        return encode(image)
+
+    service._encode_image = counting_encode
+
+    start = time.perf_counter()
+    results = await service.process_prompt_set(Image.new("RGB", (64, 64)), PROMPTS)
+    elapsed = time.perf_counter() - start
+
+    assert encodes == 1
+    assert [r["name"] for r in results] == ["describe", "safety", "count"]
+    assert [r["text"] for r in results] == [p["prompt"] for p in PROMPTS]
+    assert all(r["latency_ms"] >= 100 and not r["error"] for r in results)
+    assert server.app[STUB_STATE].max_in_flight == 3
+    assert elapsed < 0.25  # concurrent, not 3 x 100 ms
+    assert service.current_response == "Describe the scene"
+
+
+@pytest.mark.asyncio
+async def test_only_first_prompt_uses_history(echo_stub):
+    """Secondary prompts neither see nor extend the frame history."""
+    _, api_base = echo_stub
+    service = VLMService(model="stub-vlm", api_base=api_base, enable_context=True)
+
+    await service.process_prompt_set(Image.new("RGB", (64, 64)), PROMPTS)
+    results = await service.process_prompt_set(Image.new("RGB", (64, 64)), PROMPTS)
+
+    assert len(service.response_history) == 2
+    assert results[0]["text"] != PROMPTS[0]["prompt"]  # prompt carried the history
+    assert results[1]["text"] == PROMPTS[1]["prompt"]
+
+
+@pytest.mark.asyncio
+async def test_prompt_set_counts_as_one_frame_in_flight(echo_stub):
+    """A second frame arriving while a set is running is skipped as busy."""
+    _, api_base = echo_stub
+    service = VLMService(model="stub-vlm", api_base=api_base, enable_context=False)
+    image = Image.new("RGB", (64, 64))
+
+    first = asyncio.create_task(service.process_prompt_set(image, PROMPTS))
+    await asyncio.sleep(0.02)
+    assert await service.process_prompt_set(image, PROMPTS) is None
+    assert len(await first) == 3
+    assert service.busy_skips == 1
+
+
+def test_normalize_prompt_set():
+    """Strings get default names, empty prompts are dropped, duplicates rejected."""
+    assert normalize_prompt_set(["a", {"name": "b", "prompt": " x "}, ""]) == [
+        {"name": "prompt1", "prompt": "a"},
+        {"name": "b", "prompt": "x"},
+    ]
+    with pytest.raises(ValueError):
+        normalize_prompt_set([{"name": "a", "prompt": "x"}, {"name": "a", "prompt": "y"}])
+    with pytest.raises(ValueError):
+        normalize_prompt_set(["p"] * 20)
+
+
+@pytest.mark.asyncio
+async def test_websocket_prompt_set_update_and_results(echo_stub, monkeypatch):
+    """update_prompt_set configures sessions; results are broadcast per prompt."""
+    _, api_base = echo_stub
+    service = VLMService(model="stub-vlm", api_base=api_base, enable_context=False)
+    track = VideoProcessorTrack(
+        None,
+        service,
+        session_id="cam1",
+        prompt_set_callback=server_module.broadcast_prompt_set_results,
+    )
+    monkeypatch.setattr(server_module, "vlm_service", service)
+    monkeypatch.setattr(server_module, "processor_tracks", {track})
+    monkeypatch.setattr(VideoProcessorTrack, "default_prompt_set", [])
+    app = await server_module.create_app(test_mode=True)
+
+    async def receive(ws, message_type):
+        while True:
+            message = await asyncio.wait_for(ws.receive_json(), timeout=5)
+            if message["type"] == message_type:
+                return message
+
+    async with TestClient(TestServer(app)) as client:
+        ws = await client.ws_connect("/ws")
+
+        await ws.send_json({"type": "update_prompt_set", "session_id": "cam1", "prompts": PROMPTS})
+        updated = await receive(ws, "prompt_set_updated")
+        assert [p["name"] for p in updated["prompts"]] == ["describe", "safety", "count"]
+        assert track.get_prompt_set() == PROMPTS
+        assert VideoProcessorTrack.default_prompt_set == []
+
+        await ws.send_json({"type": "update_prompt_set", "session_id": "nope", "prompts": []})
+        assert "Unknown session" in (await receive(ws, "prompt_set_error"))["error"]
+
+        await track._process_prompt_set(Image.new("RGB", (64, 64)), PROMPTS, time.monotonic())
+        response = await receive(ws, "prompt_set_response")
+        assert response["session_id"] == "cam1"
+        assert [r["text"] for r in response["results"]] == [p["prompt"] for p in PROMPTS]
+
+        await ws.close()
+
+
+@pytest.mark.asyncio
+async def test_websocket_prompt_set_default_for_all_sessions(echo_stub, monkeypatch):
+    """update_prompt_set without a session_id sets the default of every session."""
+    _, api_base = echo_stub
+    service = VLMService(model="stub-vlm", api_base=api_base, enable_context=False)
+    monkeypatch.setattr(server_module, "vlm_service", service)
+    monkeypatch.setattr(server_module, "processor_tracks", set())
+    monkeypatch.setattr(VideoProcessorTrack, "default_prompt_set", [])
+    app = await server_module.create_app(test_mode=True)
+
+    async with TestClient(TestServer(app)) as client:
+        ws = await client.ws_connect("/ws")
+        await ws.send_json({"type": "update_prompt_set", "prompts": PROMPTS})
+        while True:
+            message = await asyncio.wait_for(ws.receive_json(), timeout=5)
+            if message["type"] == "prompt_set_updated":
+                break
+
+        assert message["session_id"] is None
+        assert VideoProcessorTrack.default_prompt_set == PROMPTS
+        await ws.close()
@@ -0,0 +1,99 @@
+"""Integration tests for client-side quotas and Retry-After handling."""
+
+import asyncio
+import time
+
+import pytest
+from PIL import Image
+
+from live_vlm_webui.stub_server import STUB_STATE, StubConfig
+from live_vlm_webui.vlm_service import VLMService
+
+
+@pytest.fixture
+async def stub(stub_backend):
+    return await stub_backend(StubConfig(ttft_ms=5, tokens_per_sec=0))
+
+
+@pytest.mark.asyncio
+async def test_sessions_share_the_quota(stub):
+    """Services with the same API base and key draw from one quota."""
+    server, api_base = stub
+    services = [
+        VLMService(model="stub-vlm", api_base=api_base, api_key="k", rate_limit_rpm=300)
+        for _ in range(2)
+    ]
+    limiter = services[0].backend_pool.primary.limiter
+    assert services[1].backend_pool.primary.limiter is limiter
+
+    image = Image.new("RGB", (32, 32))
+    start = time.monotonic()
+    # 5 requests/s with a 10 request burst: 14 requests need ~0.8 s
+    results = await asyncio.gather(*[services[i % 2].analyze_image(image) for i in range(14)])
+    elapsed = time.monotonic() - start
+
+    assert not any(r.startswith("Error") for r in results)
+    assert 0.6 < elapsed < 1.5
+    assert server.app[STUB_STATE].max_in_flight <= 11
+    assert limiter.total_waits >= 4
+    assert services[0].latency_metrics.snapshot()["rate_limit"]["max_ms"] > 500
+
+
+@pytest.mark.asyncio
+async def test_retry_after_pauses_requests(stub):
+    """A 429 with Retry-After delays the retry and does not trip the circuit."""
+    server, api_base = stub
+    state = server.app[STUB_STATE]
+    state.config.update({"rate_limit_rate": 1.0, "retry_after": 1})
+    service = VLMService(
+        model="stub-vlm",
+        api_base=api_base,
+        api_key="retry-after",
+        rate_limit_rpm=6000,
+        max_retries=1,
+        retry_backoff=0.01,
+        circuit_threshold=1,
+    )
+
+    start = time.monotonic()
+    result = await service.analyze_image(Image.new("RGB", (32, 32)))
+
+    assert "429" in result
+    assert time.monotonic() - start >= 0.95  # the retry waited for Retry-After
+    assert state.rate_limited == 2
+    limiter = service.backend_pool.primary.limiter
+    assert limiter.retry_after_events == 2
+    assert service.backend_pool.get_stats()[0]["rate_limit"]["blocked_for_s"] > 0
+    assert service.circuit_breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_no_limiter_without_quota(stub):
+    """Backends get a limiter only when a quota is configured."""
+    _, api_base = stub
+    service = VLMService(model="stub-vlm", api_base=api_base)
+    assert service.backend_pool.primary.limiter is None
+    result = await service.analyze_image(Image.new("RGB", (32, 32)))
+    assert not result.startswith("Error")
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_returns_its_completion_reservation(stub):
+    """A request cancelled while waiting for the answer gives back max_tokens."""
+    server, api_base = stub
+    server.app[STUB_STATE].config.ttft_ms = 500
+    service = VLMService(model="stub-vlm", api_base=api_base, api_key="cancel", rate_limit_tpm=600)
+    backend = service.backend_pool.primary
+    bucket = backend.limiter.tokens
+    request = asyncio.create_task(service.analyze_image(Image.new("RGB", (32, 32))))
+    await asyncio.sleep(0.1)
+    assert backend.outstanding == 1
+    level = bucket.level
+
+    request.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await request
+
+    assert backend.outstanding == 0
+    # 10 tokens/s refill: the rest is the returned reservation
+    assert bucket.level == pytest.approx(level + service.max_tokens, abs=5)
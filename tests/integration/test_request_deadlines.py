@@ -0,0 +1,165 @@
+"""Integration tests for request deadlines and cancellation of stale frames."""
+
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from PIL import Image
+
+from live_vlm_webui.vlm_service import VLMService
+
+STATE = web.AppKey("state", dict)
+
+
+def make_slow_app(delays, failures=()):
+    """Backend whose n-th request takes delays[n] seconds; records aborted requests.
+
+    Requests whose index is in failures are answered with an HTTP 400 error.
+    """
+    state = {"requests": 0, "completed": 0, "aborted": 0}
+
+    async def chat_completions(request):
+        index = state["requests"]
+        state["requests"] += 1
+        await request.json()
+        try:
+            await asyncio.sleep(delays[min(index, len(delays) - 1)])
+        except asyncio.CancelledError:
+            # aiohttp cancels the handler when the client drops the connection
+            state["aborted"] += 1
+            raise
+        state["completed"] += 1
+        if index in failures:
+            return web.json_response({"error": {"message": "bad request"}}, status=400)
+        return web.json_response(
+            {"choices": [{"message": {"role": "assistant", "content": f"answer {index}"}}]}
+        )
+
+    app = web.Application(handler_args={"handler_cancellation": True})
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    app[STATE] = state
+    return app
+
+
+async def start(delays, failures=()):
+    server = TestServer(make_slow_app(delays, failures))
+    await server.start_server()
+    return server
+
+
+def make_service(server, **kwargs):
+    return VLMService(
+        model="stub-vlm",
+        api_base=str(server.make_url("/v1")),
+        enable_context=False,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_stale_frame_request_is_cancelled():
+    """A request still running past max_staleness is aborted and not applied."""
+    server = await start([1.0])
+    try:
+        service = make_service(server, max_staleness=0.2)
+
+        await service.process_frame(Image.new("RGB", (64, 64)))
+        await asyncio.sleep(0.1)  # let the server notice the dropped connection
+
+        metrics = service.get_metrics()
+        assert metrics["expired_requests"] == 1
+        assert service.current_response == "Initializing..."
+        assert server.app[STATE]["completed"] == 0
+        assert server.app[STATE]["aborted"] == 1
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_already_old_frame_expires_immediately():
+    """A frame captured before the staleness bound is never sent."""
+    server = await start([0.0])
+    try:
+        service = make_service(server, max_staleness=0.5)
+
+        await service.process_frame(Image.new("RGB", (64, 64)), frame_time=time.monotonic() - 1)
+
+        assert service.expired_requests == 1
+        assert server.app[STATE]["completed"] == 0
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_newer_answer_cancels_older_request():
+    """When a newer frame is answered first, the older in-flight request is aborted."""
+    server = await start([1.0, 0.05])
+    try:
+        service = make_service(server, max_concurrent_requests=2)
+        image = Image.new("RGB", (64, 64))
+
+        older = asyncio.create_task(service.process_frame(image))
+        await asyncio.sleep(0.05)
+        await service.process_frame(image)
+        await older
+
+        assert service.current_response == "answer 1"
+        assert service.get_metrics()["cancelled_requests"] == 1
+        assert service.expired_requests == 0
+        assert service.get_metrics()["in_flight"] == 0
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_newer_failure_keeps_older_request():
+    """An error on a newer frame neither cancels nor replaces an older request's answer."""
+    server = await start([0.5, 0.05], failures={1})
+    try:
+        service = make_service(server, max_concurrent_requests=2)
+        image = Image.new("RGB", (64, 64))
+
+        older = asyncio.create_task(service.process_frame(image))
+        await asyncio.sleep(0.05)
+        await service.process_frame(image)
+        assert service.current_response == "Initializing..."
+        await older
+
+        assert service.current_response == "answer 0"
+        metrics = service.get_metrics()
+        assert metrics["cancelled_requests"] == 0
+        assert server.app[STATE]["aborted"] == 0
+        assert metrics["in_flight"] == 0
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_failure_without_older_requests_is_reported():
+    """With nothing older in flight, the error still becomes the current response."""
+    server = await start([0.0], failures={0})
+    try:
+        service = make_service(server)
+
+        await service.process_frame(Image.new("RGB", (64, 64)))
+
+        assert service.current_response.startswith("Error")
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_deadline_disabled_by_default():
+    """Without max_staleness slow answers are still applied."""
+    server = await start([0.3])
+    try:
+        service = make_service(server)
+
+        await service.process_frame(Image.new("RGB", (64, 64)), frame_time=time.monotonic() - 60)
+
+        assert service.current_response == "answer 0"
+        assert service.expired_requests == 0
+    finally:
+        await server.close()
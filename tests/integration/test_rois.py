@@ -0,0 +1,133 @@
+"""Integration tests for regions of interest against the stub backend."""
+
+import asyncio
+
+import av
+import numpy as np
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from PIL import Image
+
+from live_vlm_webui import server as server_module
+from live_vlm_webui.regions import normalize_rois
+from live_vlm_webui.stub_server import STUB_STATE, StubConfig
+from live_vlm_webui.video_processor import VideoProcessorTrack
+from live_vlm_webui.vlm_service import VLMService
+
+ROIS = normalize_rois(
+    [
+        {"name": "door", "box": [0, 0, 0.25, 1], "prompt": "Is the door open"},
+        {"name": "bay", "box": [0.5, 0.5, 1, 1]},
+    ]
+)
+
+
+@pytest.fixture
+async def echo_stub(stub_backend):
+    """Stub answering with the request's prompt after 100 ms."""
+    return await stub_backend(StubConfig(ttft_ms=100, tokens_per_sec=0, echo=True))
+
+
+@pytest.mark.asyncio
+async def test_regions_are_answered_concurrently_and_tagged(echo_stub):
+    """Each zone is one request; answers carry the zone name and its prompt."""
+    server, api_base = echo_stub
+    service = VLMService(
+        model="stub-vlm", api_base=api_base, prompt="Describe the bay", enable_context=True
+    )
+    regions = [
+        {"name": r["name"], "image": Image.new("RGB", (64, 64)), "prompt": r["prompt"]}
+        for r in ROIS
+    ]
+
+    results = await service.process_regions(regions)
+
+    assert [(r["name"], r["text"]) for r in results] == [
+        ("door", "Is the door open"),
+        ("bay", "Describe the bay"),
+    ]
+    assert server.app[STUB_STATE].max_in_flight == 2
+    assert service.current_response == "[door] Is the door open\n[bay] Describe the bay"
+    assert service.response_history == []  # zones never feed the frame history
+
+
+class FrameSource:
+    def __init__(self, frames):
+        self.frames = iter(frames)
+
+    async def recv(self):
+        return next(self.frames)
+
+
+@pytest.mark.asyncio
+async def test_track_sends_each_zone_at_native_detail(echo_stub, monkeypatch):
+    """A sampled frame is cut into its zones, which are reported per session."""
+    _, api_base = echo_stub
+    service = VLMService(
+        model="stub-vlm", api_base=api_base, enable_context=False, image_profile="none"
+    )
+    monkeypatch.setattr(VideoProcessorTrack, "process_every_n_frames", 2)
+    received = []
+    sizes = []
+    encode = service._encode_image
+
+    def recording_encode(image):
+        sizes.append(image.size)
+        return encode(image)
+
+    service._encode_image = recording_encode
+    frame = np.zeros((720, 1280, 3), np.uint8)
+    frames = [av.VideoFrame.from_ndarray(frame, format="bgr24") for _ in range(2)]
+    track = VideoProcessorTrack(
+        FrameSource(frames), service, session_id="cam1", roi_callback=lambda *a: received.append(a)
+    )
+    track.rois = ROIS
+    for _ in frames:
+        await track.recv()
+    while not received:
+        await asyncio.sleep(0.01)
+
+    session_id, results = received[0]
+    assert session_id == "cam1" and [r["name"] for r in results] == ["door", "bay"]
+    assert sizes == [(320, 720), (640, 360)]
+    assert track.get_stats()["region_crops"] == 2
+
+
+@pytest.mark.asyncio
+async def test_websocket_roi_update(echo_stub, monkeypatch):
+    """update_rois configures one session or the default for all."""
+    _, api_base = echo_stub
+    service = VLMService(model="stub-vlm", api_base=api_base, enable_context=False)
+    track = VideoProcessorTrack(None, service, session_id="cam1")
+    monkeypatch.setattr(server_module, "vlm_service", service)
+    monkeypatch.setattr(server_module, "processor_tracks", {track})
+    monkeypatch.setattr(VideoProcessorTrack, "default_rois", [])
+    app = await server_module.create_app(test_mode=True)
+
+    async def receive(ws, message_type):
+        while True:
+            message = await asyncio.wait_for(ws.receive_json(), timeout=5)
+            if message["type"] == message_type:
+                return message
+
+    async with TestClient(TestServer(app)) as client:
+        ws = await client.ws_connect("/ws")
+
+        await ws.send_json({"type": "update_rois", "session_id": "cam1", "rois": ROIS})
+        updated = await receive(ws, "rois_updated")
+        assert [r["name"] for r in updated["rois"]] == ["door", "bay"]
+        assert track.get_rois() == ROIS
+        assert VideoProcessorTrack.default_rois == []
+
+        await ws.send_json({"type": "update_rois", "rois": [{"name": "x", "box": [1, 0, 0, 1]}]})
+        assert "box" in (await receive(ws, "rois_error"))["error"]
+
+        await ws.send_json({"type": "update_rois", "rois": ROIS[:1]})
+        await receive(ws, "rois_updated")
+        assert VideoProcessorTrack.default_rois == ROIS[:1]
+
+        server_module.broadcast_roi_results("cam1", [{"name": "door", "text": "yes"}])
+        response = await receive(ws, "roi_response")
+        assert response["session_id"] == "cam1" and response["results"][0]["name"] == "door"
+
+        await ws.close()
@@ -0,0 +1,117 @@
+"""Integration tests for snapshot ingest over the WebSocket."""
+
+import asyncio
+import base64
+import io
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from PIL import Image
+
+from live_vlm_webui import server as server_module
+from live_vlm_webui.frame_quality import CORRUPT
+from live_vlm_webui.snapshot_session import Snapshot, SnapshotSession
+from live_vlm_webui.stub_server import STUB_STATE, StubConfig
+from live_vlm_webui.vlm_service import VLMService
+
+
+def jpeg(width, height):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "gray").save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+async def stub(stub_backend):
+    return await stub_backend(StubConfig(ttft_ms=0, tokens_per_sec=0))
+
+
+def test_snapshot_reads_only_the_header():
+    data = jpeg(448, 252)
+    snapshot = Snapshot(data)
+    assert snapshot.size == (448, 252) and snapshot.jpeg is data
+    assert snapshot.decode().shape == (252, 448, 3)
+    png = io.BytesIO()
+    Image.new("RGB", (8, 8)).save(png, format="PNG")
+    for bad in (b"not an image", png.getvalue()):
+        with pytest.raises(ValueError):
+            Snapshot(bad)
+
+
+@pytest.mark.asyncio
+async def test_snapshot_of_model_size_is_sent_as_is(stub):
+    """A correctly scaled snapshot reaches the backend without being re-encoded."""
+    server, api_base = stub
+    service = VLMService(
+        model="stub-vlm", api_base=api_base, enable_context=False, image_profile="qwen2-vl"
+    )
+    session = SnapshotSession(service, session_id="cam1")
+    geometry = session.target_geometry(1280, 720)
+    data = jpeg(geometry["width"], geometry["height"])
+
+    assert session.submit(data)
+    while service.total_inferences < 1:
+        await asyncio.sleep(0.01)
+    assert service.last_upload_bytes == len(base64.b64encode(data))
+    assert service.last_image_size == (geometry["width"], geometry["height"])
+
+    # Unscaled snapshots are resized on the server; garbage is counted and dropped
+    assert session.submit(jpeg(1280, 720))
+    while service.total_inferences < 2:
+        await asyncio.sleep(0.01)
+    assert service.last_image_size == (geometry["width"], geometry["height"])
+    assert not session.submit(b"\xff\xd8 truncated")
+
+    stats = session.get_stats()
+    assert stats["frames_received"] == 3 and stats["frames_submitted"] == 2
+    assert stats["frames_converted"] == 1
+    assert stats["frames_rejected"][CORRUPT] == 1
+    assert server.app[STUB_STATE].requests == 2
+
+
+@pytest.mark.asyncio
+async def test_websocket_snapshot_session(stub, monkeypatch):
+    """start_snapshots returns the capture size; binary messages are analyzed."""
+    _, api_base = stub
+    service = VLMService(
+        model="stub-vlm", api_base=api_base, enable_context=False, image_profile="qwen2-vl"
+    )
+    tracks = server_module.weakref.WeakSet()
+    monkeypatch.setattr(server_module, "vlm_service", service)
+    monkeypatch.setattr(server_module, "processor_tracks", tracks)
+    monkeypatch.setattr(server_module, "vlm_metrics_interval", 0.05)
+    app = await server_module.create_app(test_mode=True)
+
+    async def receive(ws, message_type):
+        while True:
+            message = await asyncio.wait_for(ws.receive_json(), timeout=5)
+            if message["type"] == message_type:
+                return message
+
+    async with TestClient(TestServer(app)) as client:
+        ws = await client.ws_connect("/ws")
+        await ws.send_json(
+            {"type": "start_snapshots", "session_id": "laptop", "width": 1280, "height": 720}
+        )
+        started = await receive(ws, "snapshots_started")
+        geometry = started["geometry"]
+        assert started["session_id"] == "laptop" and started["process_every"] >= 1
+        assert geometry["width"] % 28 == 0 and geometry["height"] % 28 == 0
+
+        await ws.send_bytes(jpeg(geometry["width"], geometry["height"]))
+        response = await receive(ws, "vlm_response")
+        assert response["metrics"]["total_inferences"] == 1
+        assert "backends" not in response["metrics"]  # sent as vlm_metrics instead
+        metrics_loop = asyncio.create_task(server_module.vlm_metrics_loop())
+        metrics = (await receive(ws, "vlm_metrics"))["metrics"]
+        metrics_loop.cancel()
+        assert metrics["image"]["width"] == geometry["width"]
+
+        metrics = await (await client.get("/metrics")).text()
+        assert 'live_vlm_frames_submitted_total{session="laptop"} 1' in metrics
+        assert "live_vlm_sessions_active 1" in metrics
+
+        await ws.send_json({"type": "stop_snapshots"})
+        await receive(ws, "snapshots_stopped")
+        assert not any(session.get_stats()["active"] for session in tracks)
+        await ws.close()
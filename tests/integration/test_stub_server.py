@@ -0,0 +1,168 @@
+"""Integration tests for the OpenAI-compatible stub server."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from openai import AsyncOpenAI
+from PIL import Image
+
+from live_vlm_webui import server as server_module
+from live_vlm_webui.stub_server import STUB_STATE, StubConfig
+from live_vlm_webui.vlm_service import VLMService
+
+
+@pytest.fixture
+def start_stub(stub_backend):
+    """Start a stub server with the given StubConfig options: (server, api_base)."""
+
+    async def start(**kwargs):
+        return await stub_backend(StubConfig(**kwargs))
+
+    return start
+
+
+def user_message(text="Describe the scene"):
+    return [{"role": "user", "content": [{"type": "text", "text": text}]}]
+
+
+@pytest.mark.asyncio
+async def test_vlm_service_against_stub(start_stub):
+    """VLMService talks to the stub like to a real OpenAI-compatible backend."""
+    server, api_base = await start_stub(ttft_ms=0, tokens_per_sec=0, response_text="a gray box")
+    service = VLMService(model="stub-vlm", api_base=api_base, prompt="What is this?")
+
+    result = await service.analyze_image(Image.new("RGB", (64, 64), "gray"))
+
+    assert result == "a gray box"
+    stats = server.app[STUB_STATE].get_stats()
+    assert stats["requests"] == stats["completed"] == 1
+    assert stats["prompt_tokens"] > 256  # text plus image tokens
+
+
+@pytest.mark.asyncio
+async def test_streaming_matches_non_streaming(start_stub):
+    """SSE streaming delivers the same text plus a usage chunk when requested."""
+    _, api_base = await start_stub(ttft_ms=0, tokens_per_sec=0, response_text="one two three")
+    client = AsyncOpenAI(base_url=api_base, api_key="EMPTY")
+
+    completion = await client.chat.completions.create(model="stub-vlm", messages=user_message())
+    stream = await client.chat.completions.create(
+        model="stub-vlm",
+        messages=user_message(),
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    parts, usage = [], None
+    async for chunk in stream:
+        if chunk.choices:
+            parts.append(chunk.choices[0].delta.content or "")
+        if chunk.usage:
+            usage = chunk.usage
+
+    assert "".join(parts) == completion.choices[0].message.content == "one two three"
+    assert usage.completion_tokens == 3
+
+
+@pytest.mark.asyncio
+async def test_ttft_and_decode_speed(start_stub):
+    """The first token arrives after TTFT, the rest at tokens_per_sec."""
+    _, api_base = await start_stub(ttft_ms=100, tokens_per_sec=100, output_tokens=11)
+    client = AsyncOpenAI(base_url=api_base, api_key="EMPTY")
+
+    start = time.perf_counter()
+    stream = await client.chat.completions.create(
+        model="stub-vlm", messages=user_message(), stream=True
+    )
+    first_token = None
+    async for chunk in stream:
+        if first_token is None and chunk.choices and chunk.choices[0].delta.content:
+            first_token = time.perf_counter() - start
+    total = time.perf_counter() - start
+
+    assert first_token >= 0.1
+    assert total >= 0.1 + 10 * 0.01
+
+
+@pytest.mark.asyncio
+async def test_injected_errors_and_rate_limits(start_stub):
+    """Error and 429 injection produce the documented status codes and headers."""
+    server, api_base = await start_stub(rate_limit_rate=1.0, retry_after=2)
+    body = {"model": "stub-vlm", "messages": user_message()}
+
+    async with httpx.AsyncClient(base_url=api_base) as client:
+        response = await client.post("/chat/completions", json=body)
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "2"
+
+        server.app[STUB_STATE].config.update({"rate_limit_rate": 0.0, "error_rate": 1.0})
+        response = await client.post("/chat/completions", json=body)
+        assert response.status_code == 500
+
+    service = VLMService(model="stub-vlm", api_base=api_base, prompt="x", max_retries=0)
+    result = await service.analyze_image(Image.new("RGB", (32, 32)))
+    assert result.startswith("Error:")
+    assert server.app[STUB_STATE].errors_injected == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("overload", ["queue", "reject"])
+async def test_concurrency_limit(start_stub, overload):
+    """Above max_concurrency requests are queued or rejected with 429."""
+    server, api_base = await start_stub(
+        ttft_ms=100, tokens_per_sec=0, max_concurrency=1, overload=overload
+    )
+    body = {"model": "stub-vlm", "messages": user_message()}
+
+    async with httpx.AsyncClient(base_url=api_base) as client:
+        responses = await asyncio.gather(
+            *[client.post("/chat/completions", json=body) for _ in range(3)]
+        )
+
+    statuses = sorted(r.status_code for r in responses)
+    stats = server.app[STUB_STATE].get_stats()
+    assert stats["max_in_flight"] == 1
+    if overload == "queue":
+        assert statuses == [200, 200, 200]
+    else:
+        assert statuses == [200, 429, 429]
+        assert stats["rejected"] == 2
+
+
+@pytest.mark.asyncio
+async def test_runtime_config_and_stats_endpoints(start_stub):
+    """Stub behavior can be inspected and changed over HTTP."""
+    server, _ = await start_stub()
+
+    async with TestClient(server) as client:
+        resp = await client.post("/stub/config", json={"healthy": False})
+        assert (await resp.json())["healthy"] is False
+        resp = await client.get("/v1/models")
+        assert resp.status == 503
+
+        resp = await client.post("/stub/config", json={"no_such_field": 1})
+        assert resp.status == 400
+
+        resp = await client.get("/stub/stats")
+        assert (await resp.json())["requests"] == 0
+
+
+@pytest.mark.asyncio
+async def test_server_models_endpoint_against_stub(start_stub, monkeypatch):
+    """server.py's /models lists the stub's models, both via query and the global service."""
+    _, api_base = await start_stub(models=["stub-a", "stub-b"])
+    monkeypatch.setattr(
+        server_module, "vlm_service", VLMService(model="stub-b", api_base=api_base, prompt="x")
+    )
+    app = await server_module.create_app(test_mode=True)
+
+    async with TestClient(TestServer(app)) as client:
+        resp = await client.get("/models")
+        models = (await resp.json())["models"]
+        assert [m["id"] for m in models] == ["stub-a", "stub-b"]
+        assert [m["current"] for m in models] == [False, True]
+
+        resp = await client.get("/models", params={"api_base": api_base})
+        assert [m["id"] for m in (await resp.json())["models"]] == ["stub-a", "stub-b"]
@@ -0,0 +1,164 @@
+"""Integration tests for model warm-up, keep-warm pings and the health probes."""
+
+import asyncio
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from PIL import Image
+
+from live_vlm_webui import server as server_module
+from live_vlm_webui.stub_server import STUB_STATE, StubConfig
+from live_vlm_webui.vlm_service import VLMService
+
+
+@pytest.fixture
+async def stub(stub_backend):
+    return await stub_backend(StubConfig(ttft_ms=100, tokens_per_sec=0))
+
+
+@pytest.mark.asyncio
+async def test_warmup_absorbs_the_first_request(stub):
+    """Frames are skipped while warming, and warm-up latency is not recorded."""
+    server, api_base = stub
+    replica = api_base.replace("127.0.0.1", "localhost")
+    service = VLMService(model="stub-vlm", api_base=api_base, backends=[replica])
+    task = service.warmer.schedule()
+    await asyncio.sleep(0.02)
+    assert service.warmer.warming
+    assert await service.process_frame(Image.new("RGB", (32, 32))) is None
+    assert service.warmup_skips == 1
+
+    assert await task is True
+    stats = service.get_metrics()["warmup"]
+    assert stats["state"] == "ready" and stats["ready"]
+    assert [b["ok"] for b in stats["backends"].values()] == [True, True]
+    assert stats["duration_ms"] >= 90
+    assert server.app[STUB_STATE].requests == 2  # one per backend
+    assert service.latency_metrics.histograms["backend"].snapshot()["count"] == 0
+
+    await service.process_frame(Image.new("RGB", (32, 32)))
+    assert service.total_inferences == 1
+    await service.backend_pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_slow_replica_does_not_block_frames(stub_backend):
+    """Once a backend answered the warm-up, frames flow to it; the slow one gets none."""
+    servers, api_bases = await stub_backend(
+        [
+            StubConfig(response_text="slow", ttft_ms=800, tokens_per_sec=0),
+            StubConfig(response_text="fast", ttft_ms=20, tokens_per_sec=0),
+        ]
+    )
+    service = VLMService(model="stub-vlm", api_base=api_bases[0], backends=api_bases[1:])
+    task = service.warmer.schedule()
+    await asyncio.sleep(0.2)
+    assert service.warmer.warming
+    assert service.backend_pool.backends[0].warming
+
+    for _ in range(3):
+        await service.process_frame(Image.new("RGB", (32, 32)))
+    assert service.warmup_skips == 0
+    assert service.current_response == "fast"
+    assert servers[0].app[STUB_STATE].requests == 1  # only its warm-up request
+
+    assert await task is True
+    assert not service.backend_pool.backends[0].warming
+    await service.backend_pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_model_change_needs_new_warmup(stub):
+    _, api_base = stub
+    service = VLMService(model="stub-vlm", api_base=api_base)
+    assert await service.warmer.schedule()
+    assert service.warmer.is_ready()
+
+    service.model = "missing-model"
+    assert not service.warmer.is_ready()
+    assert await service.warmer.schedule() is False
+    assert service.warmer.state == "failed"
+    assert "does not exist" in service.warmer.last_error
+
+
+@pytest.mark.asyncio
+async def test_replaced_warmup_keeps_state(stub):
+    """Cancelling a running warm-up for a newer one does not reset the new one's state."""
+    _, api_base = stub
+    service = VLMService(model="stub-vlm", api_base=api_base)
+    first = service.warmer.schedule()
+    await asyncio.sleep(0.02)
+    second = service.warmer.schedule()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert service.warmer.warming
+    assert await second
+    assert service.warmer.state == "ready"
+
+    service.warmer.schedule()
+    await asyncio.sleep(0.02)
+    await service.warmer.stop()
+    assert service.warmer.state == "cold"
+
+
+@pytest.mark.asyncio
+async def test_keep_warm_pings_idle_backends(stub):
+    server, api_base = stub
+    server.app[STUB_STATE].config.update({"ttft_ms": 5})
+    service = VLMService(model="stub-vlm", api_base=api_base, warmup=False, keep_warm_interval=0.2)
+    service.warmer.start()
+    await asyncio.sleep(0.5)
+    await service.warmer.stop()
+    assert 1 <= service.warmer.pings <= 3
+    assert service.warmer.ping_failures == 0
+    assert server.app[STUB_STATE].requests == service.warmer.pings
+
+
+@pytest.mark.asyncio
+async def test_health_endpoints(stub, monkeypatch):
+    server, api_base = stub
+    service = VLMService(model="stub-vlm", api_base=api_base)
+    monkeypatch.setattr(server_module, "vlm_service", service)
+    app = await server_module.create_app(test_mode=True)
+
+    async with TestClient(TestServer(app)) as client:
+        resp = await client.get("/readyz")
+        assert resp.status == 503
+        assert "Warm-up of stub-vlm is cold" in (await resp.json())["reasons"]
+
+        await service.warmer.schedule()
+        resp = await client.get("/readyz")
+        assert resp.status == 200
+        assert (await resp.json())["ready"] is True
+
+        resp = await client.get("/healthz")
+        data = await resp.json()
+        assert resp.status == 200
+        assert data["backends"][0]["available"] is True
+        assert data["backends"][0]["error"] is None
+        assert data["warmup"] == "ready"
+
+        # A failed health check is reported but does not fail liveness
+        server.app[STUB_STATE].config.update({"healthy": False})
+        assert await service.backend_pool.check_all() == [False]
+        resp = await client.get("/healthz")
+        data = await resp.json()
+        assert resp.status == 200
+        assert "503" in data["backends"][0]["error"]
+
+        # The liveness probe only reports tracked state; it never calls the backends
+        async def no_probe(backend):
+            raise AssertionError("/healthz probed a backend")
+
+        monkeypatch.setattr(service.backend_pool, "check_health", no_probe)
+        assert (await client.get("/healthz")).status == 200
+    await service.backend_pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_readyz_without_service(monkeypatch):
+    monkeypatch.setattr(server_module, "vlm_service", None)
+    app = await server_module.create_app(test_mode=True)
+    async with TestClient(TestServer(app)) as client:
+        assert (await client.get("/readyz")).status == 503
+        assert (await client.get("/healthz")).status == 200
@@ -0,0 +1,93 @@
+"""Integration tests for webcam WebRTC sessions through the offer handler."""
+
+import asyncio
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from aiortc import RTCPeerConnection, RTCSessionDescription, VideoStreamTrack
+
+from live_vlm_webui import server as server_module
+from live_vlm_webui.vlm_service import VLMService
+
+
+async def connect(client, analysis_only):
+    """Offer a synthetic webcam the way the page does and apply the answer"""
+    pc = RTCPeerConnection()
+    received = []
+    pc.on("track", received.append)
+    if analysis_only:
+        pc.addTransceiver(VideoStreamTrack(), direction="sendonly")
+    else:
+        pc.addTrack(VideoStreamTrack())
+    await pc.setLocalDescription(await pc.createOffer())
+    resp = await client.post(
+        "/offer",
+        json={"sdp": pc.localDescription.sdp, "type": "offer", "analysis_only": analysis_only},
+    )
+    answer = await resp.json()
+    await pc.setRemoteDescription(RTCSessionDescription(answer["sdp"], answer["type"]))
+    return pc, answer, received
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("analysis_only", [True, False], ids=["analysis-only", "overlay"])
+async def test_webcam_session_modes(monkeypatch, analysis_only):
+    """Analysis-only sessions negotiate no return video but still analyze frames."""
+    service = VLMService(model="stub-vlm", api_base="http://127.0.0.1:1/v1")
+    tracks = server_module.weakref.WeakSet()
+    monkeypatch.setattr(server_module, "vlm_service", service)
+    monkeypatch.setattr(server_module, "processor_tracks", tracks)
+    monkeypatch.setattr(server_module, "pcs", set())
+    app = await server_module.create_app(test_mode=True)
+
+    async with TestClient(TestServer(app)) as client:
+        pc, answer, received = await connect(client, analysis_only)
+        sdp = answer["sdp"]
+        assert ("a=recvonly" in sdp) == analysis_only
+        assert ("a=sendrecv" in sdp) != analysis_only
+
+        for _ in range(100):
+            await asyncio.sleep(0.05)
+            if tracks and next(iter(tracks)).frame_count >= 5:
+                break
+        (track,) = tracks
+        assert track.frame_count >= 5
+        assert track.session_id == answer["session_id"]
+        assert bool(received) != analysis_only
+
+        await pc.close()
+        for server_pc in list(server_module.pcs):
+            await server_pc.close()
+        await asyncio.sleep(0.1)
+        assert track.readyState == "ended"
+
+
+@pytest.mark.asyncio
+async def test_lan_mode_reports_setup_latency(monkeypatch):
+    """Host-only ICE answers without STUN; setup timings are kept per session."""
+    service = VLMService(model="stub-vlm", api_base="http://127.0.0.1:1/v1")
+    tracks = server_module.weakref.WeakSet()
+    monkeypatch.setattr(server_module, "vlm_service", service)
+    monkeypatch.setattr(server_module, "processor_tracks", tracks)
+    monkeypatch.setattr(server_module, "pcs", set())
+    monkeypatch.setattr(server_module, "ice_servers", [])
+    app = await server_module.create_app(test_mode=True)
+
+    async with TestClient(TestServer(app)) as client:
+        pc, answer, _ = await connect(client, analysis_only=True)
+        assert "typ srflx" not in answer["sdp"] and "typ host" in answer["sdp"]
+        for _ in range(100):
+            await asyncio.sleep(0.05)
+            if tracks and next(iter(tracks)).offer_to_first_frame is not None:
+                break
+        stats = next(iter(tracks)).get_stats()
+        assert 0 < stats["offer_to_answer_ms"] <= stats["offer_to_first_frame_ms"]
+
+        metrics = await (await client.get("/metrics")).text()
+        session = answer["session_id"]
+        assert f'live_vlm_session_offer_to_answer_seconds{{session="{session}"}}' in metrics
+        assert f'live_vlm_session_offer_to_first_frame_seconds{{session="{session}"}}' in metrics
+
+        await pc.close()
+        for server_pc in list(server_module.pcs):
+            await server_pc.close()
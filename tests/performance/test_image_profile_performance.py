@@ -0,0 +1,46 @@
+"""Performance tests for resizing frames to the model's native geometry."""
+
+import time
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from live_vlm_webui.image_profiles import PROFILES
+from live_vlm_webui.vlm_service import VLMService
+
+
+def frame_to_request(service, profile, frame):
+    """Resize, convert and encode one frame the way VideoProcessorTrack does."""
+    prepared = profile.prepare(frame)
+    return service._encode_image(Image.fromarray(cv2.cvtColor(prepared, cv2.COLOR_BGR2RGB)))
+
+
+@pytest.mark.performance
+def test_native_resize_cuts_encode_time_and_bytes():
+    """Resizing a 1080p frame before encoding is cheaper than encoding it whole."""
+    service = VLMService(model="stub", api_base="http://localhost:1/v1")
+    rng = np.random.default_rng(0)
+    # Smooth gradient plus noise so JPEG sizes resemble camera frames
+    gradient = np.linspace(0, 200, 1920, dtype=np.uint8)[None, :, None]
+    frame = (gradient + rng.integers(0, 40, (1080, 1920, 3), dtype=np.uint8)).astype(np.uint8)
+
+    results = {}
+    for name in ("none", "qwen2-vl", "llama3.2-vision", "llava"):
+        profile = PROFILES[name]
+        frame_to_request(service, profile, frame)  # warm up
+        start = time.perf_counter()
+        for _ in range(5):
+            payload = frame_to_request(service, profile, frame)
+        results[name] = ((time.perf_counter() - start) / 5 * 1000, len(payload))
+
+    print("\n🖼️  Frame preparation (1920x1080)")
+    for name, (ms, size) in results.items():
+        tokens = PROFILES[name].estimate_tokens(1920, 1080)
+        print(f"   {name:16s} {ms:6.1f} ms  {size / 1024:7.1f} KB  tokens={tokens}")
+
+    full_ms, full_bytes = results["none"]
+    assert results["qwen2-vl"][1] < full_bytes
+    assert results["llava"][1] < full_bytes / 5
+    assert results["llava"][0] < full_ms
@@ -0,0 +1,40 @@
+"""Performance tests for the per-frame cost of latency metrics."""
+
+import time
+
+import pytest
+
+from live_vlm_webui.metrics import LatencyMetrics
+from tests.utils.performance import PerformanceConstraints
+
+
+@pytest.mark.performance
+class TestLatencyMetricsOverhead:
+    """Metrics are recorded and read on the frame path, so they must be cheap."""
+
+    def test_record_and_snapshot_cost(self):
+        """Recording is microseconds; cached snapshots add nothing per frame."""
+        metrics = LatencyMetrics(("e2e", "queue_wait", "encode", "backend"))
+        n = 20000
+
+        start = time.perf_counter()
+        for i in range(n):
+            metrics.record("e2e", 0.05 + (i % 100) / 1000)
+        record_us = (time.perf_counter() - start) / n * 1e6
+
+        start = time.perf_counter()
+        metrics.snapshot(now=time.monotonic())
+        uncached_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            metrics.snapshot()
+        cached_us = (time.perf_counter() - start) / 1000 * 1e6
+
+        print("\n📈 Latency metrics overhead")
+        print(f"   record():           {record_us:.2f} us")
+        print(f"   snapshot (fresh):   {uncached_ms:.3f} ms")
+        print(f"   snapshot (cached):  {cached_us:.2f} us")
+
+        assert record_us < 50
+        assert uncached_ms < PerformanceConstraints.FRAME_PROCESSING_BUDGET
@@ -0,0 +1,55 @@
+"""Benchmark prefill savings of the prefix-cache prompt layout."""
+
+import pytest
+from PIL import Image
+
+from live_vlm_webui.stub_server import STUB_STATE, StubConfig
+from live_vlm_webui.vlm_service import VLMService
+
+IMAGE_TOKENS = 256  # Vision tokens per image (never shared between frames)
+
+
+async def run_layout(stub_backend, layout, frames=12):
+    # Block-level prefix cache accounting with vLLM's default block size
+    config = StubConfig(ttft_ms=0, tokens_per_sec=0, block_size=16, image_tokens=IMAGE_TOKENS)
+    server, api_base = await stub_backend(config)
+    service = VLMService(
+        model="stub-vlm",
+        api_base=api_base,
+        prompt="You are monitoring a warehouse entrance. Describe people, vehicles and "
+        "packages you see, and mention anything unusual in one sentence.",
+        prompt_layout=layout,
+    )
+    for i in range(frames):
+        image = Image.new("RGB", (64, 64), (i * 20 % 256, 80, 120))
+        result = await service.analyze_image(image)
+        assert not result.startswith("Error"), result
+    return server.app[STUB_STATE].get_stats()
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_prefix_cache_layout_reduces_prefill(stub_backend):
+    """Stable-prefix layout recomputes fewer prompt tokens than the inline layout."""
+    results = {
+        layout: await run_layout(stub_backend, layout) for layout in ("inline", "prefix_cache")
+    }
+
+    print("\n🧠 Prefill against a prefix-caching backend stub (12 frames, 4-frame history)")
+    for layout, stats in results.items():
+        prefill = stats["prompt_tokens"] - stats["cached_tokens"]
+        text_prefill = prefill - stats["requests"] * IMAGE_TOKENS
+        hit_rate = stats["cached_tokens"] / stats["prompt_tokens"]
+        print(
+            f"   {layout:13s} prompt={stats['prompt_tokens']:5d} cached={stats['cached_tokens']:5d} "
+            f"prefill={prefill:5d} (text {text_prefill:4d}) hit rate={hit_rate:.1%}"
+        )
+
+    inline = results["inline"]["prompt_tokens"] - results["inline"]["cached_tokens"]
+    prefix = results["prefix_cache"]["prompt_tokens"] - results["prefix_cache"]["cached_tokens"]
+    print(f"   Prefill tokens saved: {inline - prefix} ({(inline - prefix) / inline:.1%})")
+    text_inline = inline - results["inline"]["requests"] * IMAGE_TOKENS
+    text_prefix = prefix - results["prefix_cache"]["requests"] * IMAGE_TOKENS
+    print(f"   Text prefill saved:   {(text_inline - text_prefix) / text_inline:.1%}")
+
+    assert prefix < inline
@@ -0,0 +1,92 @@
+"""Performance test: server CPU per webcam session with and without a return video."""
+
+import asyncio
+import fractions
+import time
+
+import av
+import numpy as np
+import pytest
+
+from aiortc.codecs import CODECS, depayload, get_decoder, get_encoder
+from aiortc.jitterbuffer import JitterFrame
+
+from live_vlm_webui.image_profiles import PROFILES
+from live_vlm_webui.video_processor import VideoProcessorTrack
+from live_vlm_webui.warmup import synthetic_frame
+
+FPS = 30
+TIME_BASE = fractions.Fraction(1, 90000)
+VP8 = next(codec for codec in CODECS["video"] if codec.mimeType == "video/VP8")
+
+
+class FakeService:
+    image_profile = PROFILES["none"]
+
+    async def process_frame(self, image, frame_time=None, thumbnail=None):
+        pass
+
+    def get_current_response(self):
+        return "", False
+
+    def get_counters(self):
+        return {}
+
+
+class DecodedSource:
+    """Decodes the browser's VP8 frames, as the RTCRtpReceiver does for a session"""
+
+    def __init__(self, encoded):
+        self.decoder = get_decoder(VP8)
+        self.encoded = iter(encoded)
+
+    async def recv(self):
+        data, timestamp = next(self.encoded)
+        (frame,) = self.decoder.decode(JitterFrame(data, timestamp))
+        frame.pts, frame.time_base = timestamp, TIME_BASE
+        return frame
+
+
+def camera_stream(width, height, count):
+    """VP8 frames of a moving scene, encoded the way the browser sends them"""
+    encoder = get_encoder(VP8)
+    base = synthetic_frame(width, height)
+    encoded = []
+    for i in range(count):
+        img = np.roll(base, 8 * i, axis=1)
+        frame = av.VideoFrame.from_ndarray(img, format="bgr24")
+        frame.pts, frame.time_base = i * 90000 // FPS, TIME_BASE
+        payloads, timestamp = encoder.encode(frame)
+        encoded.append((b"".join(depayload(VP8, p) for p in payloads), timestamp))
+    return encoded
+
+
+async def session_cpu_per_frame(encoded, return_video):
+    """Process CPU seconds per frame for one session's server-side work"""
+    track = VideoProcessorTrack(DecodedSource(encoded), FakeService(), session_id="bench")
+    encoder = get_encoder(VP8) if return_video else None
+    start = time.process_time()
+    for _ in encoded:
+        frame = await track.recv()
+        if encoder:
+            # What the RTCRtpSender does with the returned track
+            encoder.encode(frame)
+    return (time.process_time() - start) / len(encoded)
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_analysis_only_session_saves_return_encode(monkeypatch):
+    """Without the return track, a session costs only decode and sampling."""
+    monkeypatch.setattr(VideoProcessorTrack, "process_every_n_frames", 30)
+    encoded = camera_stream(1280, 720, 90)
+
+    overlay = await session_cpu_per_frame(encoded, return_video=True)
+    analysis_only = await session_cpu_per_frame(encoded, return_video=False)
+    await asyncio.sleep(0)
+
+    print("\n🎥 Server CPU per webcam session (1280x720 @ 30 fps, VP8)")
+    for name, cpu in (("overlay", overlay), ("analysis-only", analysis_only)):
+        print(f"   {name:14s} {cpu * 1000:6.1f} ms/frame  {cpu * FPS * 100:5.1f}% of a core")
+
+    assert analysis_only < overlay * 0.7
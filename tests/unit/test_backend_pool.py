@@ -0,0 +1,109 @@
+"""Unit tests for backend pool routing and ejection."""
+
+import time
+
+import pytest
+
+from live_vlm_webui.backend_pool import Backend, BackendPool
+
+
+def make_pool(n=3, **kwargs):
+    backends = [Backend(f"http://replica{i}:8000/v1") for i in range(n)]
+    return BackendPool(backends, **kwargs), backends
+
+
+class TestRouting:
+    """Test backend selection strategies."""
+
+    def test_least_outstanding_picks_idle_backend(self):
+        """The backend with the fewest in-flight requests wins."""
+        pool, (a, b, c) = make_pool()
+        a.outstanding = 2
+        b.outstanding = 0
+        c.outstanding = 1
+
+        assert pool.select() is b
+
+    def test_least_outstanding_spreads_ties(self):
+        """Idle backends are used in rotation rather than always the first one."""
+        pool, backends = make_pool()
+        picked = {id(pool.select()) for _ in range(len(backends))}
+
+        assert len(picked) == len(backends)
+
+    def test_latency_weighted_prefers_fast_backend(self):
+        """Under equal load, the backend with lower latency wins."""
+        pool, (a, b, c) = make_pool(strategy="latency_weighted")
+        a.record_success(1.0)
+        b.record_success(0.2)
+        c.record_success(0.5)
+
+        assert pool.select() is b
+
+    def test_latency_weighted_accounts_for_load(self):
+        """A fast backend that is busy loses to a slower idle one."""
+        pool, (a, b) = make_pool(n=2, strategy="latency_weighted")
+        a.record_success(0.2)
+        a.outstanding = 4  # expected 1.0s
+        b.record_success(0.5)  # expected 0.5s
+
+        assert pool.select() is b
+
+    def test_exclude_for_failover(self):
+        """Already tried backends are never selected again."""
+        pool, (a, b) = make_pool(n=2)
+
+        first = pool.select()
+        second = pool.select(exclude=[first])
+
+        assert second is not first
+        assert pool.select(exclude=[a, b]) is None
+
+    def test_unknown_strategy_rejected(self):
+        """Invalid routing strategy names raise ValueError."""
+        with pytest.raises(ValueError):
+            make_pool(strategy="random")
+
+
+class TestEjection:
+    """Test ejection of failing backends."""
+
+    def test_backend_ejected_after_consecutive_failures(self):
+        """A backend is removed from rotation after max_failures errors."""
+        pool, (a, b) = make_pool(n=2, max_failures=2, ejection_time=60.0)
+
+        for _ in range(2):
+            pool.record_failure(a, RuntimeError("boom"))
+
+        assert not a.is_available()
+        assert all(pool.select() is b for _ in range(4))
+        assert a.get_stats()["ejected"]
+        assert a.get_stats()["total_errors"] == 2
+
+    def test_success_resets_failures(self):
+        """A success in between failures prevents ejection."""
+        pool, (a, _) = make_pool(n=2, max_failures=2)
+
+        pool.record_failure(a, RuntimeError("boom"))
+        pool.record_success(a, 0.1)
+        pool.record_failure(a, RuntimeError("boom"))
+
+        assert a.is_available()
+
+    def test_all_ejected_fails_open(self):
+        """When every backend is ejected, the one recovering first is still used."""
+        pool, (a, b) = make_pool(n=2, max_failures=1)
+        pool.record_failure(a, RuntimeError("boom"))
+        pool.record_failure(b, RuntimeError("boom"))
+        a.ejected_until = time.monotonic() + 5
+        b.ejected_until = time.monotonic() + 50
+
+        assert pool.select() is a
+
+    def test_single_backend_never_ejected(self):
+        """With nothing to fail over to, the only backend stays in rotation."""
+        pool, (a,) = make_pool(n=1, max_failures=1)
+        pool.record_failure(a, RuntimeError("boom"))
+
+        assert a.is_available()
+        assert pool.select() is a
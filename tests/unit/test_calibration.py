@@ -0,0 +1,35 @@
+"""Unit tests for deriving settings from a calibration ramp."""
+
+import pytest
+
+from live_vlm_webui.calibration import CalibrationError, recommend
+
+
+def level(concurrency, rps, p95_ms=500.0, errors=0):
+    return {"concurrency": concurrency, "throughput_rps": rps, "p95_ms": p95_ms, "errors": errors}
+
+
+def test_knee_is_lowest_concurrency_near_peak():
+    levels = [level(1, 2.0), level(2, 3.8), level(4, 4.0, 1000), level(8, 4.1, 2000)]
+    rec = recommend(levels, sessions=2, fps=30)
+    assert rec["max_in_flight"] == 2
+    assert rec["capacity_rps"] == 3.8
+    assert rec["interval_s"] == pytest.approx(2 / 3.8)
+    assert rec["process_every"] == 16  # ceil(0.526 s * 30 fps)
+
+
+def test_latency_slo_and_errors_exclude_levels():
+    levels = [level(1, 2.0, 400), level(2, 3.0, 900), level(4, 6.0, 800, errors=1)]
+    assert recommend(levels, sessions=1, latency_slo_ms=500)["max_in_flight"] == 1
+    assert recommend(levels, sessions=1)["max_in_flight"] == 2
+
+
+def test_sessions_scale_the_interval():
+    levels = [level(1, 1.0)]
+    assert recommend(levels, sessions=0)["interval_s"] == 1.0
+    assert recommend(levels, sessions=4, fps=15)["process_every"] == 60
+
+
+def test_no_successful_request():
+    with pytest.raises(CalibrationError):
+        recommend([level(1, 0.0, None, errors=4)], sessions=1)
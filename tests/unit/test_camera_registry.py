@@ -0,0 +1,93 @@
+"""Unit tests for the shared RTSP camera registry."""
+
+import asyncio
+
+import pytest
+from aiortc import VideoStreamTrack
+from aiortc.mediastreams import MediaStreamError
+
+from live_vlm_webui.camera_registry import CameraRegistry
+
+
+class FakeProcessor(VideoStreamTrack):
+    """Stands in for a VideoProcessorTrack reading a camera"""
+
+    def __init__(self, session_id, frames=None):
+        super().__init__()
+        self.session_id = session_id
+        self.frames = frames  # Frames to deliver before the stream ends (None = endless)
+        self.frame_count = 0
+
+    async def recv(self):
+        if self.frames is not None and self.frame_count >= self.frames:
+            raise StopAsyncIteration
+        self.frame_count += 1
+        return await super().recv()
+
+
+def make_registry(frames=None):
+    opened = []
+
+    def open_camera(url, session_id):
+        source = VideoStreamTrack()
+        processor = FakeProcessor(session_id or f"cam{len(opened)}", frames)
+        opened.append((url, source, processor))
+        return source, processor
+
+    return CameraRegistry(open_camera), opened
+
+
+@pytest.mark.asyncio
+async def test_one_camera_per_url():
+    """Holders of the same URL share one connection; the last release closes it."""
+    registry, opened = make_registry()
+    first = registry.acquire("rtsp://cam/1", "a", session_id="lobby")
+    second = registry.acquire(" rtsp://cam/1 ", "b", session_id="ignored")
+    other = registry.acquire("rtsp://cam/2", "a")
+
+    assert first is second
+    assert len(opened) == 2 and len(registry) == 2
+    assert first.session_id == "lobby" and first.ref_count == 2
+
+    assert not await registry.release("rtsp://cam/1", "a")
+    assert not await registry.release("rtsp://cam/1", "a")  # Not held anymore
+    assert first.ref_count == 1 and first.processor_track.readyState == "live"
+
+    assert await registry.release("rtsp://cam/1", "b")
+    assert registry.get("rtsp://cam/1") is None
+    assert first.processor_track.readyState == "ended"
+    assert first.rtsp_track.readyState == "ended"
+
+    await registry.release_all("a")
+    assert len(registry) == 0 and other.processor_track.readyState == "ended"
+
+
+@pytest.mark.asyncio
+async def test_viewers_share_one_decode():
+    """Every viewer gets the frames of the single analysis pass."""
+    registry, _ = make_registry()
+    camera = registry.acquire("rtsp://cam/1", "pc1")
+    viewers = [camera.subscribe(), camera.subscribe()]
+
+    frames = [await asyncio.wait_for(v.recv(), timeout=2.0) for v in viewers]
+    assert frames[0].pts is not None and frames[1].pts is not None
+    assert camera.get_stats()["viewers"] == 2
+
+    viewers[0].stop()
+    assert camera.get_stats()["viewers"] == 1
+    await registry.close_all()
+
+
+@pytest.mark.asyncio
+async def test_stream_end_ends_viewers():
+    """Viewers see the end of the camera stream instead of waiting forever."""
+    registry, _ = make_registry(frames=2)
+    camera = registry.acquire("rtsp://cam/1", "pc1")
+    viewer = camera.subscribe()
+
+    with pytest.raises(MediaStreamError):
+        for _ in range(5):
+            await asyncio.wait_for(viewer.recv(), timeout=2.0)
+    assert viewer.readyState == "ended"
+    assert not camera.get_stats()["running"]
+    await registry.close_all()
@@ -0,0 +1,73 @@
+"""Unit tests for browser capture constraints."""
+
+import asyncio
+
+import av
+import numpy as np
+import pytest
+
+from live_vlm_webui.capture_constraints import capture_constraints, sample_interval
+from live_vlm_webui.image_profiles import PROFILES
+from live_vlm_webui.video_processor import VideoProcessorTrack
+
+
+def test_capture_size_follows_the_profile():
+    llava = capture_constraints(PROFILES["llava"], 30)
+    assert (llava["width"], llava["height"]) == (336, 189)
+    pixtral = capture_constraints(PROFILES["pixtral"], 30)
+    assert (pixtral["width"], pixtral["height"]) == (672, 384)
+    # Never more than the page would capture anyway
+    qwen = capture_constraints(PROFILES["qwen2-vl"], 30)
+    assert (qwen["width"], qwen["height"]) == (1280, 720)
+    assert capture_constraints(PROFILES["none"], 30)["width"] is None
+
+
+@pytest.mark.parametrize(
+    "process_every, min_fps, frame_rate",
+    [(60, 5, 5), (30, 5, 5), (3, 5, 10), (1, 5, 30), (90, 1, 1), (4, 0, 8)],
+)
+def test_frame_rate_stays_above_the_sampling_rate(process_every, min_fps, frame_rate):
+    constraints = capture_constraints(PROFILES["llava"], process_every, min_fps=min_fps)
+    assert constraints["frame_rate"] == frame_rate
+
+
+def test_sample_interval_keeps_seconds():
+    assert sample_interval(30, 30) == 30
+    assert sample_interval(60, 5) == 10
+    assert sample_interval(30, 5) == 5
+    assert sample_interval(2, 5) == 1
+
+
+class FakeService:
+    image_profile = PROFILES["none"]
+
+    def __init__(self):
+        self.frames = 0
+
+    async def process_frame(self, image, frame_time=None, thumbnail=None):
+        self.frames += 1
+
+    def get_current_response(self):
+        return "", False
+
+    def get_counters(self):
+        return {}
+
+
+class FrameSource:
+    async def recv(self):
+        return av.VideoFrame.from_ndarray(np.zeros((48, 64, 3), np.uint8), format="bgr24")
+
+
+@pytest.mark.asyncio
+async def test_track_samples_by_time_at_negotiated_frame_rate(monkeypatch):
+    """At 5 fps, process_every=30 samples every 5th frame (once per second)."""
+    monkeypatch.setattr(VideoProcessorTrack, "process_every_n_frames", 30)
+    service = FakeService()
+    track = VideoProcessorTrack(FrameSource(), service)
+    track.source_fps = 5
+    for _ in range(20):
+        await track.recv()
+    await asyncio.sleep(0)
+    assert track.get_sample_interval() == 5
+    assert service.frames == 4
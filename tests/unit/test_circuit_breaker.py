@@ -0,0 +1,116 @@
+"""Unit tests for the circuit breaker state machine."""
+
+import time
+
+from live_vlm_webui.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def test_opens_after_threshold_and_short_circuits():
+    """Consecutive failures open the circuit; requests are refused while backing off."""
+    transitions = []
+    breaker = CircuitBreaker(
+        failure_threshold=3, backoff=10, on_state_change=lambda *t: transitions.append(t)
+    )
+
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure(RuntimeError("down"))
+    assert breaker.state == CLOSED
+
+    assert breaker.allow()
+    breaker.record_failure(RuntimeError("down"))
+
+    assert breaker.state == OPEN
+    assert breaker.is_open()
+    assert not breaker.allow()
+    assert breaker.get_stats()["short_circuited"] == 1
+    assert breaker.get_stats()["retry_in_s"] > 9
+    assert breaker.get_stats()["last_error"] == "down"
+    assert transitions == [(CLOSED, OPEN)]
+
+
+def test_success_resets_failure_count():
+    """Only consecutive failures count."""
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_half_open_probe_and_exponential_backoff():
+    """After the backoff one probe goes through; failed probes double the backoff."""
+    breaker = CircuitBreaker(failure_threshold=1, backoff=1, max_backoff=3)
+    breaker.record_failure()
+    later = time.monotonic() + 1.5
+
+    assert breaker.allow(later)  # the probe
+    assert breaker.state == HALF_OPEN
+    assert breaker.is_open(later)  # a second request waits for the probe
+    assert not breaker.allow(later)
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.backoff == 2
+    breaker.open_until = 0  # skip the wait
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.backoff == 3  # capped
+
+    breaker.open_until = 0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.backoff == 1
+    assert breaker.trips == 1
+
+
+def test_cancelled_probe_frees_the_slot():
+    """A probe that ends without an outcome lets the next request probe."""
+    breaker = CircuitBreaker(failure_threshold=1, backoff=0)
+    breaker.record_failure()
+    probe = breaker.allow()
+    assert probe.probe
+    breaker.release(probe)
+    assert breaker.allow()
+
+
+def test_only_the_probe_frees_the_slot():
+    """Requests sent before the circuit opened do not end the running probe."""
+    breaker = CircuitBreaker(failure_threshold=1, backoff=0)
+    earlier = breaker.allow()
+    assert not earlier.probe
+    breaker.record_failure()
+
+    probe = breaker.allow()
+    breaker.release(earlier)
+    assert breaker.probe_in_flight
+    assert breaker.allow() is None
+
+    breaker.record_success(probe)
+    assert breaker.state == CLOSED and not breaker.probe_in_flight
+
+
+def test_disabled_breaker_never_opens():
+    """A threshold of 0 disables the breaker."""
+    breaker = CircuitBreaker(failure_threshold=0)
+    for _ in range(10):
+        breaker.record_failure()
+    assert breaker.allow()
+
+
+def test_renewed_breaker_is_closed_and_detached():
+    """The replacement starts closed with the old statistics; the old one stops notifying."""
+    transitions = []
+    breaker = CircuitBreaker(
+        failure_threshold=1, backoff=10, on_state_change=lambda *t: transitions.append(t)
+    )
+    breaker.allow()
+    breaker.record_failure(RuntimeError("down"))
+
+    renewed = breaker.renewed()
+    breaker.record_failure(RuntimeError("late"))
+
+    assert renewed.state == CLOSED and renewed.allow()
+    assert renewed.trips == 1
+    assert transitions == [(CLOSED, OPEN), (OPEN, CLOSED)]
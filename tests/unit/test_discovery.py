@@ -0,0 +1,81 @@
+"""Unit tests for the discovery cache."""
+
+import asyncio
+
+import pytest
+
+from live_vlm_webui.discovery import DiscoveryCache
+
+
+class Loader:
+    def __init__(self, delay=0.05, fail=False):
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("connection refused")
+        return f"value-{self.calls}"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_load():
+    cache = DiscoveryCache(ttl=10)
+    loader = Loader()
+    results = await asyncio.gather(*[cache.get("k", loader) for _ in range(5)])
+    assert results == ["value-1"] * 5
+    assert loader.calls == 1
+    assert await cache.get("k", loader) == "value-1"
+    assert cache.get_stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_value_is_served_while_refreshing():
+    cache = DiscoveryCache(ttl=0.05)
+    loader = Loader(delay=0.1)
+    assert await cache.get("k", loader) == "value-1"
+    await asyncio.sleep(0.06)
+
+    # Expired: answered immediately from the stale entry, refreshed in the background
+    start = asyncio.get_running_loop().time()
+    assert await cache.get("k", loader) == "value-1"
+    assert await cache.get("k", loader) == "value-1"
+    assert asyncio.get_running_loop().time() - start < 0.05
+    await asyncio.sleep(0.15)
+    assert loader.calls == 2
+    assert await cache.get("k", loader) == "value-2"
+
+
+@pytest.mark.asyncio
+async def test_failures_are_cached_briefly():
+    cache = DiscoveryCache(ttl=10, error_ttl=10)
+    loader = Loader(delay=0, fail=True)
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            await cache.get("k", loader)
+    assert loader.calls == 1
+
+    depths = []
+    for _ in range(3):
+        with pytest.raises(ConnectionError) as info:
+            await cache.get("k", loader)
+        depths.append(len(info.traceback))
+    assert depths[0] == depths[1] == depths[2]  # the cached error's traceback does not grow
+
+    loader.fail = False
+    assert await cache.get("k", loader, refresh=True) == "value-2"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_load():
+    cache = DiscoveryCache()
+    loader = Loader(delay=0.05)
+    first = asyncio.ensure_future(cache.get("k", loader))
+    second = asyncio.ensure_future(cache.get("k", loader))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    assert await second == "value-1"
+    assert loader.calls == 1
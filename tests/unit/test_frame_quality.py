@@ -0,0 +1,183 @@
+"""Unit tests for the frame quality gate."""
+
+import asyncio
+
+import av
+import cv2
+import numpy as np
+import pytest
+
+from live_vlm_webui.frame_quality import (
+    BLURRY,
+    BRIGHT,
+    CORRUPT,
+    DARK,
+    FrameQualityGate,
+    is_damaged,
+    mark_damaged,
+    measure,
+)
+from live_vlm_webui.image_profiles import PROFILES
+from live_vlm_webui.rtsp_track import RTSPVideoTrack
+from live_vlm_webui.video_processor import VideoProcessorTrack
+from live_vlm_webui.warmup import synthetic_frame
+
+
+def sharp_frame():
+    rng = np.random.default_rng(0)
+    frame = synthetic_frame(640, 360)
+    frame[::8] = rng.integers(0, 255, frame[::8].shape, dtype=np.uint8)  # fine texture
+    return frame
+
+
+def blurred(frame):
+    return cv2.GaussianBlur(frame, (31, 31), 10)
+
+
+def test_measure_separates_sharp_blurry_and_exposure():
+    """Blur lowers the Laplacian variance; luma follows brightness."""
+    sharp = measure(sharp_frame())
+    blur = measure(blurred(sharp_frame()))
+    assert sharp["sharpness"] > 10 * blur["sharpness"]
+    assert measure(np.full((360, 640, 3), 10, np.uint8))["luma"] == pytest.approx(10)
+    assert measure(np.full((360, 640, 3), 10, np.uint8))["sharpness"] == 0
+
+
+def test_measure_is_resolution_independent():
+    """Metrics are taken at a fixed width, so thresholds hold across resolutions."""
+    small = measure(cv2.resize(sharp_frame(), (320, 180), interpolation=cv2.INTER_AREA))
+    large = measure(cv2.resize(sharp_frame(), (1280, 720), interpolation=cv2.INTER_CUBIC))
+    assert large["sharpness"] == pytest.approx(small["sharpness"], rel=0.5)
+
+
+def test_gate_reasons():
+    gate = FrameQualityGate(min_sharpness=50, min_luma=30, max_luma=230)
+    assert gate.check(sharp_frame())[0] is None
+    assert gate.check(blurred(sharp_frame()))[0] == BLURRY
+    assert gate.check(sharp_frame() // 10)[0] == DARK
+    assert gate.check(np.full((90, 160, 3), 250, np.uint8))[0] == BRIGHT
+
+
+def test_default_gate_only_rejects_damaged_frames():
+    """Without thresholds nothing is measured; flagged frames are still rejected."""
+    gate = FrameQualityGate()
+    assert not gate.measures
+    assert gate.check(np.zeros((90, 160, 3), np.uint8)) == (None, None)
+
+    frame = av.VideoFrame(64, 48, "yuv420p")
+    assert not is_damaged(frame) and gate.check_frame(frame) is None
+    mark_damaged(frame)
+    assert is_damaged(frame) and gate.check_frame(frame) == CORRUPT
+    assert FrameQualityGate(reject_corrupt=False).check_frame(frame) is None
+
+
+class FakeService:
+    image_profile = PROFILES["none"]
+
+    def __init__(self):
+        self.frames = []
+
+    async def process_frame(self, image, frame_time=None, thumbnail=None):
+        self.frames.append(image)
+
+    def get_current_response(self):
+        return "", False
+
+    def get_counters(self):
+        return {}
+
+
+class FrameSource:
+    def __init__(self, frames):
+        self.frames = iter(frames)
+
+    async def recv(self):
+        return next(self.frames)
+
+
+def video_frame(img, damaged=False):
+    frame = av.VideoFrame.from_ndarray(img, format="bgr24")
+    if damaged:
+        mark_damaged(frame)
+    return frame
+
+
+@pytest.mark.asyncio
+async def test_rejected_sample_is_replaced_by_next_good_frame(monkeypatch):
+    """A blurry or damaged sampled frame defers the sample to the next good frame."""
+    monkeypatch.setattr(VideoProcessorTrack, "process_every_n_frames", 3)
+    monkeypatch.setattr(
+        VideoProcessorTrack, "quality_gate", FrameQualityGate(min_sharpness=50, max_retry_frames=2)
+    )
+    good, blur = sharp_frame(), blurred(sharp_frame())
+    frames = [
+        video_frame(good),
+        video_frame(good),
+        video_frame(blur),  # 3: sampled, rejected as blurry
+        video_frame(good, damaged=True),  # 4: rejected without conversion
+        video_frame(good),  # 5: replaces the sample
+        video_frame(good),  # 6: regular sample
+        video_frame(good),
+        video_frame(good),
+        video_frame(blur),  # 9: rejected
+        video_frame(blur),  # 10
+        video_frame(blur),  # 11: retries used up, sample skipped
+        video_frame(good),  # 12: regular sample
+    ]
+    service = FakeService()
+    track = VideoProcessorTrack(FrameSource(frames), service, session_id="cam1")
+    for _ in frames:
+        await track.recv()
+    await asyncio.sleep(0)
+
+    stats = track.get_stats()
+    assert stats["frames_submitted"] == len(service.frames) == 3
+    assert stats["frames_rejected"] == {BLURRY: 4, DARK: 0, BRIGHT: 0, CORRUPT: 1}
+    assert stats["samples_skipped"] == 1
+    assert stats["frames_converted"] == 1 + 7  # first frame + every checked frame but #4
+    assert stats["last_quality"]["sharpness"] > 50
+
+
+class FakePacket:
+    def __init__(self, frame=None, error=False):
+        self.frame = frame
+        self.error = error
+
+    def decode(self):
+        if self.error:
+            raise av.error.InvalidDataError(1094995529, "Invalid data found when processing input")
+        return [self.frame]
+
+
+class FakeContainer:
+    def __init__(self, packets):
+        self.packets = iter(packets)
+
+    def demux(self, stream):
+        return self.packets
+
+
+def test_rtsp_decode_error_flags_frames_until_keyframe(monkeypatch):
+    """An undecodable packet is skipped; following frames are damaged until a keyframe."""
+    monkeypatch.setattr(RTSPVideoTrack, "_connect", lambda self: None)
+    track = RTSPVideoTrack("rtsp://camera/stream")
+
+    def frame(key):
+        f = av.VideoFrame(64, 48, "yuv420p")
+        f.key_frame = key
+        return f
+
+    track.stream = object()
+    track.container = FakeContainer(
+        [
+            FakePacket(frame(True)),
+            FakePacket(error=True),
+            FakePacket(frame(False)),
+            FakePacket(frame(True)),
+        ]
+    )
+    results = [track._read_frame() for _ in range(3)]
+
+    assert [is_damaged(f) for f in results] == [False, True, False]
+    assert track.decode_errors == 1
+    assert track.damaged_frames == 1
@@ -0,0 +1,36 @@
+"""Unit tests for the ICE server configuration."""
+
+import pytest
+
+from live_vlm_webui.ice_servers import (
+    DEFAULT_ICE_SERVERS,
+    build_ice_servers,
+    ice_mode,
+    to_browser_config,
+)
+
+
+def test_modes():
+    assert ice_mode(build_ice_servers(DEFAULT_ICE_SERVERS)) == "stun"
+    assert ice_mode(build_ice_servers([])) == "host"
+    turn = build_ice_servers(
+        ["stun:stun.lan:3478", "turn:turn.lan:3478?transport=udp"], "user", "secret"
+    )
+    assert ice_mode(turn) == "turn"
+
+
+def test_turn_credentials_reach_the_browser_config():
+    servers = build_ice_servers(["stun:stun.lan:3478", "turns:turn.lan:5349"], "user", "secret")
+    assert to_browser_config(servers) == [
+        {"urls": ["stun:stun.lan:3478"]},
+        {"urls": ["turns:turn.lan:5349"], "username": "user", "credential": "secret"},
+    ]
+
+
+@pytest.mark.parametrize(
+    "urls, username",
+    [(["http://stun.lan"], None), (["turn:turn.lan:3478"], None), (["stun.lan:3478"], "u")],
+)
+def test_invalid_servers(urls, username):
+    with pytest.raises(ValueError):
+        build_ice_servers(urls, username, "secret" if username else None)
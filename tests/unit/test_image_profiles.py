@@ -0,0 +1,107 @@
+"""Unit tests for model-native image preprocessing profiles."""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from live_vlm_webui.image_profiles import PROFILES, ImageProfile, resolve_profile
+from live_vlm_webui.vlm_service import VLMService
+
+
+class TestResolveProfile:
+    """Test picking a profile from the model name."""
+
+    @pytest.mark.parametrize(
+        "model,expected",
+        [
+            ("Qwen/Qwen2.5-VL-7B-Instruct", "qwen2-vl"),
+            ("llama3.2-vision:11b", "llama3.2-vision"),
+            ("meta/llama-3.2-11b-vision-instruct", "llama3.2-vision"),
+            ("llava:v1.6", "llava-next"),
+            ("llava:7b", "llava"),
+            ("gemma3:4b", "gemma3"),
+            ("mistralai/Ministral-3-3B-Instruct-2512", "mistral3"),
+            ("gpt-4o", "none"),
+        ],
+    )
+    def test_auto(self, model, expected):
+        """The longest matching pattern wins; unknown models pass through."""
+        assert resolve_profile("auto", model).name == expected
+
+    def test_explicit_and_unknown(self):
+        """An explicit preset ignores the model; unknown presets are rejected."""
+        assert resolve_profile("none", "llava:7b").name == "none"
+        with pytest.raises(ValueError):
+            resolve_profile("nope", "llava:7b")
+
+
+class TestGeometry:
+    """Test target sizes and token estimates."""
+
+    def test_patch_grid(self):
+        """Dynamic-resolution models get dims on the merged patch grid within budget."""
+        profile = PROFILES["qwen2-vl"]
+        width, height, _, _ = profile.geometry(1920, 1080)
+        assert width % 28 == 0 and height % 28 == 0
+        assert width * height <= profile.max_pixels
+        assert profile.estimate_tokens(1920, 1080) == (width // 28) * (height // 28) + 2
+        # Small frames are not upscaled
+        assert profile.geometry(320, 240)[:2] == (308, 252)
+
+    def test_fixed_letterbox(self):
+        """Fixed-size models are letterboxed to keep the aspect ratio."""
+        assert PROFILES["llava"].geometry(1280, 720) == (336, 336, 336, 189)
+        assert PROFILES["llava"].estimate_tokens(1280, 720) == 576
+        assert PROFILES["gemma3"].estimate_tokens(640, 480) == 256
+
+    def test_tile_grid(self):
+        """Tile models pick the grid keeping the most resolution, plus a thumbnail."""
+        profile = PROFILES["llava-next"]
+        assert profile.geometry(1280, 720)[:2] == (672, 672)
+        assert profile.geometry(1280, 320)[:2] == (1344, 336)
+        assert profile.estimate_tokens(1280, 720) == 5 * 576
+        # Estimates are the same before and after preparing the frame
+        assert profile.estimate_tokens(672, 672) == profile.estimate_tokens(1280, 720)
+
+    def test_passthrough(self):
+        """Passthrough keeps the frame and has no token estimate."""
+        frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+        assert PROFILES["none"].prepare(frame) is frame
+        assert PROFILES["none"].estimate_tokens(1280, 720) is None
+
+    def test_invalid_profiles(self):
+        """Modes without their required geometry are rejected."""
+        with pytest.raises(ValueError):
+            ImageProfile("x", "fixed")
+        with pytest.raises(ValueError):
+            ImageProfile("x", "tile")
+        with pytest.raises(ValueError):
+            ImageProfile("x", "crop")
+
+
+def test_prepare_letterboxes_centered():
+    """Content is resized onto a black canvas, centered."""
+    frame = np.full((720, 1280, 3), 255, dtype=np.uint8)
+    out = PROFILES["llava"].prepare(frame)
+
+    assert out.shape == (336, 336, 3)
+    assert out[:73].max() == 0 and out[-74:].max() == 0  # (336 - 189) / 2 padding rows
+    assert out[168].min() == 255
+
+
+def test_service_follows_model_changes():
+    """VLMService re-resolves the profile when the model changes and tracks tokens."""
+    service = VLMService(model="llava:7b", api_base="http://localhost:1/v1")
+    assert service.image_profile.name == "llava"
+
+    service.model = "gemma3:4b"
+    assert service.image_profile.name == "gemma3"
+
+    service._record_image_stats(Image.new("RGB", (896, 896)), b"x" * 100, requests=3)
+    metrics = service.get_metrics()["image"]
+    assert metrics["vision_tokens"] == 256
+    assert metrics["total_vision_tokens"] == 768
+    assert service.total_upload_bytes == 300
+
+    with pytest.raises(ValueError):
+        VLMService(model="x", api_base="http://localhost:1/v1", image_profile="nope")
@@ -0,0 +1,126 @@
+"""Unit tests for sliding-window latency histograms and EWMA throughput."""
+
+import random
+
+import pytest
+
+from live_vlm_webui.metrics import (
+    NUM_BUCKETS,
+    EWMARate,
+    LatencyMetrics,
+    SlidingHistogram,
+    bucket_index,
+    bucket_value,
+)
+
+
+def exact_percentile(values, p):
+    ordered = sorted(values)
+    return ordered[max(int(-(-p * len(ordered) // 100)), 1) - 1]
+
+
+class TestSlidingHistogram:
+    """Test histogram accuracy and windowing."""
+
+    def test_bucket_relative_error(self):
+        """Bucket midpoints stay within ~2.2% of the recorded value."""
+        for value in (2e-5, 0.001, 0.0437, 0.5, 3.2, 120.0):
+            assert bucket_value(bucket_index(value)) == pytest.approx(value, rel=0.025)
+
+    def test_percentiles_match_exact_values(self):
+        """p50/p95/p99 agree with the exact order statistics within bucket error."""
+        rng = random.Random(7)
+        values = [rng.lognormvariate(-1.5, 0.6) for _ in range(20000)]
+        histogram = SlidingHistogram(window=60)
+        for value in values:
+            histogram.record(value, now=10.0)
+
+        stats = histogram.snapshot(now=10.0)
+
+        assert stats["count"] == len(values)
+        for p in (50, 95, 99):
+            assert stats[f"p{p}_ms"] / 1000 == pytest.approx(exact_percentile(values, p), rel=0.03)
+        assert stats["max_ms"] == pytest.approx(max(values) * 1000)
+
+    def test_old_samples_expire(self):
+        """Samples older than the window no longer count."""
+        histogram = SlidingHistogram(window=60, slices=12)
+        histogram.record(5.0, now=0.0)
+        histogram.record(0.1, now=50.0)
+
+        assert histogram.snapshot(now=55.0)["count"] == 2
+        assert histogram.snapshot(now=70.0)["count"] == 1
+        assert histogram.snapshot(now=70.0)["max_ms"] == pytest.approx(100.0)
+        assert histogram.snapshot(now=200.0)["count"] == 0
+
+    def test_shorter_query_window(self):
+        """A smaller window only looks at the most recent slices."""
+        histogram = SlidingHistogram(window=60, slices=12)
+        histogram.record(1.0, now=1.0)
+        histogram.record(0.2, now=58.0)
+
+        assert histogram.snapshot(window=10, now=59.0)["count"] == 1
+        assert histogram.percentile(50, window=10, now=59.0) == pytest.approx(0.2, rel=0.025)
+
+    def test_memory_is_bounded(self):
+        """No matter how many samples, each slice holds at most NUM_BUCKETS counters."""
+        histogram = SlidingHistogram(window=10, slices=5)
+        rng = random.Random(1)
+        for i in range(50000):
+            histogram.record(rng.expovariate(10), now=i * 0.01)
+
+        assert all(len(counts) <= NUM_BUCKETS for counts in histogram._slices)
+        assert len(histogram._slices) == 5
+
+    def test_mean_above_threshold(self):
+        """Conditional mean of the tail above a threshold."""
+        histogram = SlidingHistogram()
+        for value in [0.1] * 90 + [1.0] * 10:
+            histogram.record(value, now=1.0)
+
+        assert histogram.mean_above(0.5, now=1.0) == pytest.approx(1.0, rel=0.025)
+        assert histogram.mean_above(2.0, now=1.0) is None
+
+
+class TestEWMARate:
+    """Test throughput meters."""
+
+    def test_converges_to_steady_rate(self):
+        """A steady event stream converges to its rate."""
+        meter = EWMARate(window=10)
+        for t in range(100):
+            meter.mark(4, now=float(t))
+
+        assert meter.rate(now=100.0) == pytest.approx(4.0, rel=0.01)
+
+    def test_decays_when_idle(self):
+        """Without events, the rate decays towards zero."""
+        meter = EWMARate(window=10)
+        for t in range(50):
+            meter.mark(2, now=float(t))
+
+        assert meter.rate(now=60.0) < 2.0 * 0.5
+        assert meter.rate(now=500.0) == pytest.approx(0.0, abs=1e-6)
+
+
+class TestLatencyMetrics:
+    """Test the per-stage metrics bundle."""
+
+    def test_snapshot_is_cached(self):
+        """The default snapshot is recomputed at most once per cache_ttl."""
+        metrics = LatencyMetrics(("e2e",), cache_ttl=1.0)
+        metrics.record("e2e", 0.2, now=10.0)
+        first = metrics.snapshot(now=10.0)
+        metrics.record("e2e", 0.3, now=10.5)
+
+        assert metrics.snapshot(now=10.5) is first
+        assert metrics.snapshot(now=11.5)["e2e"]["count"] == 2
+
+    def test_snapshot_layout(self):
+        """Snapshots contain every stage and each throughput window."""
+        metrics = LatencyMetrics(("e2e", "encode"), rate_windows=(10.0, 60.0))
+        snapshot = metrics.snapshot(now=1.0)
+
+        assert snapshot["window_s"] == 60.0
+        assert set(snapshot["e2e"]) == {"count", "mean_ms", "max_ms", "p50_ms", "p95_ms", "p99_ms"}
+        assert set(snapshot["throughput_rps"]) == {"10s", "60s"}
@@ -0,0 +1,76 @@
+"""Unit tests for the motion region crop."""
+
+import av
+import numpy as np
+
+from live_vlm_webui.motion_crop import MotionCropper, _fit, analysis_frame, thumbnail
+from live_vlm_webui.warmup import synthetic_frame
+
+WIDTH, HEIGHT = 1280, 720
+
+
+def scene(box=None):
+    """Static scene, optionally with a bright object at (x0, y0, x1, y1)"""
+    frame = synthetic_frame(WIDTH, HEIGHT)
+    if box:
+        x0, y0, x1, y1 = box
+        frame[y0:y1, x0:x1] = 255
+    return frame
+
+
+def trained_cropper(**kwargs):
+    cropper = MotionCropper(**kwargs)
+    for _ in range(3):
+        cropper.update(analysis_frame(scene()))
+    return cropper
+
+
+def test_static_scene_has_no_motion():
+    cropper = trained_cropper()
+    assert cropper.crop_box(analysis_frame(scene()), WIDTH, HEIGHT) is None
+    assert MotionCropper().crop_box(analysis_frame(scene()), WIDTH, HEIGHT) is None
+
+
+def test_crop_covers_moving_object_with_padding():
+    cropper = trained_cropper()
+    obj = (900, 400, 1000, 560)
+    x0, y0, x1, y1 = cropper.crop_box(analysis_frame(scene(obj)), WIDTH, HEIGHT)
+    assert x0 < obj[0] and y0 < obj[1] and x1 > obj[2] and y1 > obj[3]
+    assert 0 <= x0 and 0 <= y0 and x1 <= WIDTH and y1 <= HEIGHT
+    assert (x1 - x0) * (y1 - y0) < 0.2 * WIDTH * HEIGHT
+
+
+def test_small_object_gets_minimum_size_inside_the_frame():
+    cropper = trained_cropper(min_size=0.3)
+    x0, y0, x1, y1 = cropper.crop_box(analysis_frame(scene((1240, 10, 1275, 40))), WIDTH, HEIGHT)
+    assert x1 == WIDTH and y0 == 0  # shifted back inside rather than clipped
+    assert x1 - x0 >= 0.3 * WIDTH - 2 and y1 - y0 >= 0.3 * HEIGHT - 2
+
+
+def test_large_change_sends_full_frame():
+    cropper = trained_cropper()
+    assert cropper.crop_box(analysis_frame(scene((0, 0, 1100, 700))), WIDTH, HEIGHT) is None
+
+
+def test_background_absorbs_a_parked_object():
+    cropper = trained_cropper(learning_rate=0.5)
+    parked = analysis_frame(scene((900, 400, 1000, 560)))
+    for _ in range(10):
+        cropper.update(parked)
+    assert cropper.crop_box(parked, WIDTH, HEIGHT) is None
+
+
+def test_analysis_frame_matches_for_video_frames_and_arrays():
+    img = scene((900, 400, 1000, 560))
+    from_frame = analysis_frame(av.VideoFrame.from_ndarray(img, format="bgr24"))
+    from_array = analysis_frame(img)
+    assert from_frame.shape == from_array.shape == (90, 160)
+    assert np.abs(from_frame.astype(int) - from_array.astype(int)).mean() < 4
+
+
+def test_fit_and_thumbnail():
+    assert _fit(-0.1, 0.3) == (0.0, 0.4)
+    assert _fit(0.8, 1.1) == (0.7, 1.0)
+    assert _fit(-0.2, 1.3) == (0.0, 1.0)
+    assert thumbnail(scene(), 320).shape == (180, 320, 3)
+    assert thumbnail(scene(), 2000).shape == (HEIGHT, WIDTH, 3)
@@ -0,0 +1,57 @@
+"""Unit tests for the Ollama native API helpers."""
+
+import math
+
+import pytest
+
+from live_vlm_webui.ollama_client import OllamaChatClient, native_api_base, normalize_keep_alive
+from live_vlm_webui.stub_server import keep_alive_seconds
+
+
+@pytest.mark.parametrize(
+    "api_base, expected",
+    [
+        ("http://localhost:11434/v1", "http://localhost:11434"),
+        ("http://localhost:11434/v1/", "http://localhost:11434"),
+        ("http://gpu1:11434", "http://gpu1:11434"),
+        ("https://proxy.example.com/ollama/v1", "https://proxy.example.com/ollama"),
+    ],
+)
+def test_native_api_base(api_base, expected):
+    assert native_api_base(api_base) == expected
+
+
+def test_normalize_keep_alive():
+    assert normalize_keep_alive(None) is None
+    assert normalize_keep_alive("") is None
+    assert normalize_keep_alive("600") == 600.0
+    assert normalize_keep_alive("-1") == -1.0
+    assert normalize_keep_alive(0) == 0.0
+    assert normalize_keep_alive("30m") == "30m"
+    with pytest.raises(ValueError):
+        normalize_keep_alive("forever")
+
+
+def test_parse_timings():
+    timings = OllamaChatClient.parse_timings(
+        {
+            "load_duration": 2_000_000,
+            "prompt_eval_duration": 150_000_000,
+            "eval_duration": 400_000_000,
+            "total_duration": 560_000_000,
+        }
+    )
+    assert timings == pytest.approx(
+        {"load": 0.002, "prompt_eval": 0.15, "eval": 0.4, "total": 0.56}
+    )
+    # Cached prompts omit prompt_eval_duration
+    assert OllamaChatClient.parse_timings({})["prompt_eval"] == 0.0
+
+
+def test_stub_keep_alive_parsing():
+    assert keep_alive_seconds(None) == 300.0
+    assert keep_alive_seconds(10) == 10.0
+    assert keep_alive_seconds("5m") == 300.0
+    assert keep_alive_seconds("-1") == math.inf
+    with pytest.raises(ValueError):
+        keep_alive_seconds("soon")
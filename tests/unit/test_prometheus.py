@@ -0,0 +1,65 @@
+"""Unit tests for the Prometheus text exposition registry."""
+
+import pytest
+
+from live_vlm_webui.prometheus import MetricFamily, Registry
+
+
+class TestMetricFamily:
+    """Test rendering of single metric families."""
+
+    def test_render_with_labels(self):
+        """HELP/TYPE headers are followed by labelled samples."""
+        family = MetricFamily("frames_total", "counter", "Frames seen")
+        family.add(3, session="a").add(1.5, session="b")
+
+        assert family.render() == [
+            "# HELP frames_total Frames seen",
+            "# TYPE frames_total counter",
+            'frames_total{session="a"} 3',
+            'frames_total{session="b"} 1.5',
+        ]
+
+    def test_label_escaping_and_special_values(self):
+        """Quotes, backslashes and newlines are escaped; booleans become 0/1."""
+        family = MetricFamily("up", "gauge", "Up")
+        family.add(True, url='http://x/"a"\\b\n')
+        family.add(float("inf"), url="y")
+        family.add(None, url="skipped")
+
+        lines = family.render()[2:]
+        assert lines == ['up{url="http://x/\\"a\\"\\\\b\\n"} 1', 'up{url="y"} +Inf']
+
+    def test_unknown_type_rejected(self):
+        """Only Prometheus metric types are accepted."""
+        with pytest.raises(ValueError):
+            MetricFamily("x", "histogramish", "x")
+
+
+class TestRegistry:
+    """Test scrape-time collection."""
+
+    def test_prefix_and_merge(self):
+        """Families with the same name from several collectors are rendered once."""
+        registry = Registry(prefix="app_")
+        registry.register(lambda: [MetricFamily("hits_total", "counter", "Hits").add(1, k="a")])
+        registry.register(lambda: [MetricFamily("hits_total", "counter", "Hits").add(2, k="b")])
+
+        text = registry.render()
+
+        assert text.count("# TYPE app_hits_total counter") == 1
+        assert 'app_hits_total{k="a"} 1' in text
+        assert 'app_hits_total{k="b"} 2' in text
+        assert text.endswith("\n")
+
+    def test_failing_collector_is_skipped(self):
+        """One broken collector does not break the scrape."""
+        registry = Registry()
+
+        @registry.register
+        def broken():
+            raise RuntimeError("boom")
+
+        registry.register(lambda: [MetricFamily("ok", "gauge", "Ok").add(1)])
+
+        assert "ok 1" in registry.render()
@@ -0,0 +1,72 @@
+"""Unit tests for contextual prompt layouts and prompt caching."""
+
+import pytest
+
+from live_vlm_webui.vlm_service import PREFIX_CONTEXT_INSTRUCTIONS, VLMService
+
+
+def make_service(layout, history=()):
+    service = VLMService(model="m", prompt="Describe.", prompt_layout=layout)
+    service.response_history.extend(history)
+    service._history_version += 1
+    return service
+
+
+@pytest.mark.asyncio
+async def test_inline_layout_embeds_history_before_image():
+    """Inline layout keeps the original single-text-part prompt."""
+    service = make_service("inline", ["a dog sits"])
+
+    prompt, context = await service._build_prompt_parts("Describe.")
+    messages = service._build_messages(prompt, "data:image/jpeg;base64,AAAA", context)
+
+    assert context is None
+    assert prompt.startswith("Describe.\n\n[Previous Frame Context]")
+    assert "1 frame(s) ago: a dog sits" in prompt
+    assert [part["type"] for part in messages[0]["content"]] == ["text", "image_url"]
+
+
+@pytest.mark.asyncio
+async def test_prefix_layout_keeps_stable_prefix():
+    """The text before the image is identical whatever the history contains."""
+    service = make_service("prefix_cache", ["a dog sits"])
+
+    prefix_1, context_1 = await service._build_prompt_parts("Describe.")
+    service.response_history.append("the dog stands up")
+    service._history_version += 1
+    prefix_2, context_2 = await service._build_prompt_parts("Describe.")
+    messages = service._build_messages(prefix_2, "data:image/jpeg;base64,AAAA", context_2)
+
+    assert prefix_1 == prefix_2 == f"Describe.\n\n{PREFIX_CONTEXT_INSTRUCTIONS}"
+    assert context_1 != context_2
+    assert "1 frame(s) ago: the dog stands up" in context_2
+    assert [part["type"] for part in messages[0]["content"]] == ["text", "image_url", "text"]
+
+
+@pytest.mark.asyncio
+async def test_prefix_layout_without_history_has_no_trailing_part():
+    """Before any history exists only the stable prefix and the image are sent."""
+    service = make_service("prefix_cache")
+
+    prefix, context = await service._build_prompt_parts("Describe.")
+
+    assert context is None
+    assert PREFIX_CONTEXT_INSTRUCTIONS in prefix
+
+
+@pytest.mark.asyncio
+async def test_rendered_prompt_cached_until_history_changes():
+    """The prompt is rebuilt only when the history version changes."""
+    service = make_service("inline", ["a dog sits"])
+
+    first = await service._build_prompt_parts("Describe.")
+    assert await service._build_prompt_parts("Describe.") is first
+
+    await service.clear_history()
+    assert await service._build_prompt_parts("Describe.") == ("Describe.", None)
+
+
+def test_unknown_layout_rejected():
+    """Invalid layouts raise ValueError."""
+    with pytest.raises(ValueError):
+        VLMService(model="m", prompt_layout="sideways")
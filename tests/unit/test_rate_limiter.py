@@ -0,0 +1,85 @@
+"""Unit tests for the client-side quota limiter."""
+
+import asyncio
+import time
+from email.utils import formatdate
+
+import pytest
+
+from live_vlm_webui.rate_limiter import (
+    QuotaLimiter,
+    TokenBucket,
+    get_limiter,
+    parse_retry_after,
+)
+
+
+def test_token_bucket_refill_and_debt():
+    """Buckets refill at their rate; oversized requests need a full bucket."""
+    bucket = TokenBucket(rate=10, capacity=5)
+    now = time.monotonic()
+
+    assert bucket.wait_time(5, now) == 0
+    bucket.take(5, now)
+    assert bucket.wait_time(1, now) == pytest.approx(0.1)
+    assert bucket.wait_time(50, now + 0.5) == 0  # full again, may go into debt
+    bucket.take(50, now + 0.5)
+    assert bucket.wait_time(1, now + 0.5) == pytest.approx(4.6)
+
+
+@pytest.mark.asyncio
+async def test_requests_per_minute_spreads_bursts():
+    """A burst beyond the bucket is released at the quota rate, in order."""
+    limiter = QuotaLimiter(requests_per_minute=600, burst=0.2)  # 10/s, 2 at once
+    order = []
+
+    async def request(i):
+        await limiter.acquire()
+        order.append(i)
+
+    start = time.monotonic()
+    await asyncio.gather(*[request(i) for i in range(5)])
+    elapsed = time.monotonic() - start
+
+    assert order == [0, 1, 2, 3, 4]
+    assert 0.25 < elapsed < 0.5  # 3 requests at 100 ms spacing
+    assert limiter.total_waits == 3
+
+
+@pytest.mark.asyncio
+async def test_tokens_per_minute_and_settle():
+    """Token reservations are corrected with the reported usage."""
+    limiter = QuotaLimiter(tokens_per_minute=6000, burst=1.0)  # 100 tokens/s
+    await limiter.acquire(100)
+    assert limiter.get_stats()["available_tokens"] < 5
+
+    limiter.settle(100, 20)  # only 20 were used
+    assert limiter.get_stats()["available_tokens"] == pytest.approx(80, abs=5)
+
+
+@pytest.mark.asyncio
+async def test_retry_after_blocks_everyone():
+    """penalize() pauses all requests sharing the limiter."""
+    limiter = QuotaLimiter()
+    limiter.penalize(0.2)
+
+    start = time.monotonic()
+    await limiter.acquire()
+    assert time.monotonic() - start >= 0.19
+    assert limiter.retry_after_events == 1
+
+
+def test_parse_retry_after():
+    """Seconds and HTTP dates are accepted."""
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert 8 < parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+
+
+def test_limiters_shared_per_base_and_key():
+    """Same API base and key share a limiter; other keys and changed quotas do not."""
+    a = get_limiter("http://api.example/v1/", "key-a", 60)
+    assert get_limiter("http://api.example/v1", "key-a", 60) is a
+    assert get_limiter("http://api.example/v1", "key-b", 60) is not a
+    assert get_limiter("http://api.example/v1", "key-a", 120) is not a
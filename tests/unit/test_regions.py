@@ -0,0 +1,59 @@
+"""Unit tests for regions of interest."""
+
+import numpy as np
+import pytest
+
+from live_vlm_webui.regions import MAX_ROIS, crop_regions, normalize_rois, parse_roi
+
+
+def test_normalize_rois():
+    """Names default, prompts are optional, boxes become floats."""
+    rois = normalize_rois(
+        [
+            {"name": "door", "box": ["0.1", 0.2, 0.4, 0.9], "prompt": " Open? "},
+            {"box": [0, 0, 1, 1]},
+        ]
+    )
+    assert rois == [
+        {"name": "door", "box": [0.1, 0.2, 0.4, 0.9], "prompt": "Open?"},
+        {"name": "zone2", "box": [0.0, 0.0, 1.0, 1.0], "prompt": None},
+    ]
+
+
+@pytest.mark.parametrize(
+    "items",
+    [
+        "door",
+        [{"name": "a"}],
+        [{"name": "a", "box": [0.5, 0, 0.4, 1]}],
+        [{"name": "a", "box": [0, 0, 1, 1.5]}],
+        [{"name": "a", "box": [0, 0, 1, 1]}, {"name": "a", "box": [0, 0, 1, 1]}],
+        [{"box": [0, 0, 1, 1]}] * (MAX_ROIS + 1),
+    ],
+)
+def test_invalid_rois_are_rejected(items):
+    with pytest.raises(ValueError):
+        normalize_rois(items)
+
+
+def test_parse_roi():
+    assert parse_roi("door=0.1,0.2,0.4,0.9=Is the door open?") == {
+        "name": "door",
+        "box": ["0.1", "0.2", "0.4", "0.9"],
+        "prompt": "Is the door open?",
+    }
+    assert normalize_rois([parse_roi("bay=0,0.5,1,1")])[0]["prompt"] is None
+    with pytest.raises(ValueError):
+        parse_roi("0,0,1,1")
+
+
+def test_crops_are_views_of_the_frame():
+    frame = np.zeros((720, 1280, 3), np.uint8)
+    rois = normalize_rois(
+        [{"name": "left", "box": [0, 0, 0.25, 0.5]}, {"name": "bay", "box": [0.5, 0.5, 1, 1]}]
+    )
+    left, bay = crop_regions(frame, rois)
+    assert left.shape == (360, 320, 3) and bay.shape == (360, 640, 3)
+    assert np.shares_memory(left, frame) and np.shares_memory(bay, frame)
+    bay[:] = 7
+    assert frame[719, 1279, 0] == 7
@@ -0,0 +1,83 @@
+"""Unit tests for forwarding RTSP packets to passthrough viewers."""
+
+from fractions import Fraction
+
+import av
+import pytest
+from aiortc.mediastreams import MediaStreamError
+
+from live_vlm_webui.camera_registry import PacketViewerTrack
+from live_vlm_webui.rtsp_track import with_parameter_sets
+
+SPS_PPS = b"\x00\x00\x00\x01\x67\x42\xc0\x1f\x00\x00\x00\x01\x68\xce\x3c\x80"
+IDR = b"\x00\x00\x00\x01\x65\x88\x84\x00"
+
+
+def make_packet(data, keyframe=False, pts=3000):
+    packet = av.Packet(data)
+    packet.pts = packet.dts = pts
+    packet.time_base = Fraction(1, 90000)
+    packet.is_keyframe = keyframe
+    return packet
+
+
+def test_parameter_sets_prepended_to_keyframes():
+    """Keyframes without an SPS get the stream's parameter sets in front."""
+    packet = with_parameter_sets(make_packet(IDR, keyframe=True), SPS_PPS)
+    assert bytes(packet) == SPS_PPS + IDR
+    assert packet.is_keyframe and packet.pts == 3000
+    assert packet.time_base == Fraction(1, 90000)
+
+
+@pytest.mark.parametrize(
+    "data,keyframe,extradata",
+    [
+        (SPS_PPS + IDR, True, SPS_PPS),  # In-band already
+        (b"\x00\x00\x00\x01\x41\x9a", False, SPS_PPS),  # Not a keyframe
+        (IDR, True, b"\x01\x42\xc0\x1f"),  # avcC extradata
+        (IDR, True, None),
+    ],
+)
+def test_packets_forwarded_unchanged(data, keyframe, extradata):
+    packet = make_packet(data, keyframe)
+    assert with_parameter_sets(packet, extradata) is packet
+
+
+class FakeCamera:
+    def __init__(self):
+        self._viewers = set()
+        self._packet_viewers = set()
+        self.rtsp_track = type("Track", (), {"packet_sinks": set()})()
+
+
+@pytest.mark.asyncio
+async def test_viewer_starts_at_keyframe():
+    """Packets before the first keyframe are dropped; the end of the camera ends the viewer."""
+    camera = FakeCamera()
+    viewer = PacketViewerTrack(camera)
+    for i, keyframe in enumerate([False, False, True, False]):
+        viewer._push(make_packet(b"\x00\x00\x01\x41", keyframe, pts=i))
+    viewer._push(None)
+
+    assert [(await viewer.recv()).pts for _ in range(2)] == [2, 3]
+    with pytest.raises(MediaStreamError):
+        await viewer.recv()
+    assert viewer.dropped_packets == 2
+
+
+@pytest.mark.asyncio
+async def test_slow_viewer_resyncs_at_next_keyframe():
+    """A full backlog is dropped and the viewer waits for the next keyframe."""
+    camera = FakeCamera()
+    viewer = PacketViewerTrack(camera)
+    camera.rtsp_track.packet_sinks.add(viewer._push)
+    viewer._push(make_packet(IDR, keyframe=True, pts=0))
+    for pts in range(1, PacketViewerTrack.MAX_BACKLOG + 2):
+        viewer._push(make_packet(b"\x00\x00\x01\x41", pts=pts))
+    viewer._push(make_packet(IDR, keyframe=True, pts=100))
+
+    assert (await viewer.recv()).pts == 100
+    assert viewer.dropped_packets == PacketViewerTrack.MAX_BACKLOG + 2  # Backlog + 2 deltas
+
+    viewer.stop()
+    assert not camera.rtsp_track.packet_sinks
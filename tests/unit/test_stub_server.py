@@ -0,0 +1,60 @@
+"""Unit tests for the stub server's latency model and prefix cache accounting."""
+
+import statistics
+
+import pytest
+
+from live_vlm_webui.stub_server import PrefixCache, StubConfig, StubState, tokenize_messages
+
+
+class TestLatencyDistributions:
+    """Test TTFT sampling."""
+
+    @pytest.mark.parametrize("dist", ["uniform", "normal", "lognormal", "exponential"])
+    def test_sampled_mean_matches_config(self, dist):
+        """Every distribution is centered on the configured mean TTFT."""
+        state = StubState(
+            StubConfig(ttft_ms=200, ttft_jitter_ms=50, latency_distribution=dist, seed=1)
+        )
+        samples = [state.sample_ttft() for _ in range(5000)]
+
+        assert statistics.mean(samples) == pytest.approx(0.2, rel=0.1)
+        assert min(samples) >= 0.0
+
+    def test_fixed_distribution_ignores_jitter(self):
+        """The fixed distribution always returns the mean."""
+        state = StubState(StubConfig(ttft_ms=80, ttft_jitter_ms=50))
+
+        assert {state.sample_ttft() for _ in range(10)} == {0.08}
+
+    def test_invalid_options_rejected(self):
+        """Unknown distributions and overload modes raise ValueError."""
+        with pytest.raises(ValueError):
+            StubConfig(latency_distribution="pareto")
+        with pytest.raises(ValueError):
+            StubConfig(overload="drop")
+
+
+class TestPrefixCache:
+    """Test block-level prefix cache accounting."""
+
+    def test_shared_prefix_is_cached(self):
+        """Only full blocks of a shared leading prefix count as cached."""
+        cache = PrefixCache()
+        first = [f"t{i}" for i in range(40)]
+        second = first[:36] + ["x"] * 4
+
+        assert cache.lookup_and_insert(first, 16) == 0
+        assert cache.lookup_and_insert(second, 16) == 32
+
+    def test_images_never_shared_between_frames(self):
+        """Different image data yields different image tokens."""
+
+        def message(url):
+            return [{"role": "user", "content": [{"type": "image_url", "image_url": {"url": url}}]}]
+
+        a = tokenize_messages(message("data:image/jpeg;base64,AAA"), image_tokens=4)
+        b = tokenize_messages(message("data:image/jpeg;base64,BBB"), image_tokens=4)
+
+        assert len(a) == 5
+        assert set(a[1:]).isdisjoint(b[1:])
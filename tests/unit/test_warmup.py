@@ -0,0 +1,35 @@
+"""Unit tests for the warm-up helpers."""
+
+import numpy as np
+
+from live_vlm_webui.vlm_service import VLMService
+from live_vlm_webui.warmup import synthetic_frame, synthetic_image
+
+
+def test_synthetic_frame_is_deterministic_and_textured():
+    frame = synthetic_frame(640, 360)
+    assert frame.shape == (360, 640, 3) and frame.dtype == np.uint8
+    assert np.array_equal(frame, synthetic_frame(640, 360))
+    assert frame.std() > 30
+
+
+def test_warmup_frame_follows_the_image_profile():
+    service = VLMService(model="qwen2.5-vl-7b", image_profile="qwen2-vl")
+    image = synthetic_image(service.image_profile)
+    assert image.size == service.image_profile.geometry(1280, 720)[:2]
+
+
+def test_disabled_warmup_is_not_scheduled():
+    service = VLMService(model="stub-vlm", warmup=False)
+    assert service.warmer.schedule() is None
+    assert service.warmer.state == "cold"
+
+
+def test_ping_frame_is_encoded_once_per_profile():
+    service = VLMService(model="stub-vlm", warmup=False)
+    frame = service.warmer._synthetic_frame()
+    assert frame.jpeg.startswith(b"\xff\xd8")
+    assert service.warmer._synthetic_frame() is frame
+
+    service.model = "qwen2.5-vl-7b"
+    assert service.warmer._synthetic_frame() is not frame
@@ -0,0 +1,14 @@
+"""Helpers building VLMService instances for tests."""
+
+from live_vlm_webui.vlm_service import VLMService
+
+
+def make_service(api_bases, **kwargs):
+    """VLMService over a pool of backends (the first is the primary), without history."""
+    return VLMService(
+        model="stub-vlm",
+        api_base=api_bases[0],
+        backends=api_bases[1:],
+        enable_context=False,
+        **kwargs,
+    )